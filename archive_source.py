@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+压缩包源模块
+用于直接扫描zip压缩包，并按需把选中的成员解压到本地缓存
+
+压缩包中的成员使用"压缩包路径/成员路径"形式的虚拟路径，例如D:/Drop/Pack.zip/Textures/Rock_D.png，
+扫描时只读取压缩包的中央目录，不解压任何文件。导入时由ArchiveCache把用到的成员解压到
+以压缩包内容标识命名的缓存目录中；压缩包内容未变化时，后续运行直接复用已解压的文件。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+
+# 支持的压缩包扩展名
+ARCHIVE_EXTENSIONS = (".zip",)
+
+# 同时保持打开的压缩包数量
+_MAX_OPEN_ARCHIVES = 4
+
+
+def is_archive(path):
+    """
+    判断路径是否为支持的压缩包文件
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        bool: 是否为压缩包
+    """
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+
+def split_archive_path(path):
+    """
+    把虚拟路径拆分为压缩包路径和成员路径
+
+    Args:
+        path (str): 虚拟路径，例如D:/Drop/Pack.zip/Textures/Rock_D.png
+
+    Returns:
+        tuple: (压缩包路径, "/"分隔的成员路径)，路径不在压缩包中时返回None
+    """
+    normalized = path.replace("\\", "/")
+    lowered = normalized.lower()
+    for extension in ARCHIVE_EXTENSIONS:
+        start = 0
+        while True:
+            index = lowered.find(extension + "/", start)
+            if index == -1:
+                break
+            end = index + len(extension)
+            archive_path = path[:end]
+            if os.path.isfile(archive_path):
+                return archive_path, normalized[end + 1:]
+            start = end
+    return None
+
+
+def _is_safe_member(member_name):
+    """
+    判断成员路径是否安全（不是绝对路径，也不包含".."）
+
+    Args:
+        member_name (str): 成员路径
+
+    Returns:
+        bool: 是否安全
+    """
+    if member_name.startswith("/") or ":" in member_name.split("/")[0]:
+        return False
+    return ".." not in member_name.replace("\\", "/").split("/")
+
+
+def list_archive_members(archive_path):
+    """
+    列出压缩包中的文件成员，只读取中央目录
+
+    Args:
+        archive_path (str): 压缩包路径
+
+    Returns:
+        list: "/"分隔的成员路径列表，不含目录和不安全的路径
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        return [
+            info.filename for info in archive.infolist()
+            if not info.is_dir() and _is_safe_member(info.filename)
+        ]
+
+
+class ArchiveCache:
+    """压缩包解压缓存类，按需解压成员并在多次运行之间复用"""
+
+    def __init__(self, cache_dir):
+        """
+        初始化解压缓存
+
+        Args:
+            cache_dir (str): 缓存根目录
+        """
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._archives = OrderedDict()
+
+    def local_path(self, asset_file):
+        """
+        获取资产文件在本地磁盘上的路径，必要时解压
+
+        UDIM纹理集和LOD链会同时解压所有组成文件，使它们在缓存中保持相邻。
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            str: 本地文件路径；不在压缩包中的文件原样返回
+        """
+        for source_path in asset_file.source_paths():
+            if source_path != asset_file.file_path:
+                self.extract(source_path)
+        return self.extract(asset_file.file_path)
+
+    def extract(self, path):
+        """
+        解压单个成员
+
+        Args:
+            path (str): 虚拟路径
+
+        Returns:
+            str: 本地文件路径；不在压缩包中的文件原样返回
+        """
+        split = split_archive_path(path)
+        if split is None:
+            return path
+
+        archive_path, member_name = split
+        with self._lock:
+            archive, archive_key = self._open(archive_path)
+            info = archive.getinfo(member_name)
+            target_path = os.path.join(self.cache_dir, archive_key, *member_name.split("/"))
+
+            # 同一内容的压缩包已解压过此成员
+            if os.path.isfile(target_path) and os.path.getsize(target_path) == info.file_size:
+                return target_path
+
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            temp_path = f"{target_path}.{os.getpid()}.tmp"
+            with archive.open(info) as source, open(temp_path, "wb") as target:
+                while True:
+                    chunk = source.read(1 << 20)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            os.replace(temp_path, target_path)
+            return target_path
+
+    def close(self):
+        """关闭所有打开的压缩包"""
+        with self._lock:
+            for archive, _, _ in self._archives.values():
+                archive.close()
+            self._archives.clear()
+
+    def _open(self, archive_path):
+        """
+        打开压缩包并计算内容标识，压缩包未变化时复用已打开的对象
+
+        Args:
+            archive_path (str): 压缩包路径
+
+        Returns:
+            tuple: (zipfile.ZipFile, 内容标识)
+        """
+        stat_result = os.stat(archive_path)
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+
+        cached = self._archives.get(archive_path)
+        if cached is not None and cached[2] == signature:
+            self._archives.move_to_end(archive_path)
+            return cached[0], cached[1]
+        if cached is not None:
+            cached[0].close()
+
+        archive = zipfile.ZipFile(archive_path)
+
+        # 内容标识由所有成员的名称、CRC和大小计算，与压缩包的文件名和修改时间无关
+        hasher = hashlib.blake2b(digest_size=16)
+        for info in sorted(archive.infolist(), key=lambda item: item.filename):
+            hasher.update(f"{info.filename}\0{info.CRC:08x}\0{info.file_size}\n".encode("utf-8"))
+        archive_key = hasher.hexdigest()
+
+        self._archives[archive_path] = (archive, archive_key, signature)
+        while len(self._archives) > _MAX_OPEN_ARCHIVES:
+            _, (old_archive, _, _) = self._archives.popitem(last=False)
+            old_archive.close()
+        return archive, archive_key
+
+
+# 按缓存目录共享的ArchiveCache实例
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_archive_cache(cache_dir):
+    """
+    获取共享的解压缓存，使扫描和各个处理器复用已打开的压缩包
+
+    Args:
+        cache_dir (str): 缓存根目录
+
+    Returns:
+        ArchiveCache: 解压缓存
+    """
+    with _shared_lock:
+        cache = _shared_caches.get(cache_dir)
+        if cache is None:
+            cache = ArchiveCache(cache_dir)
+            _shared_caches[cache_dir] = cache
+        return cache
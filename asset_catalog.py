@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+资产目录模块
+用于紧凑地保存扫描得到的资产文件
+
+此模块提供使用__slots__的AssetFile及其子类TextureSet（UDIM纹理集）和MeshLodGroup（LOD链），
+以及为资产分配稳定整数ID的AssetCatalog。
+同一目录下的文件共享同一个驻留的目录字符串，完整路径按需拼接，不再单独保存。
+几十万个文件的扫描结果因此可以常驻在编辑器进程中。此模块不依赖unreal。
+"""
+
+import os
+import sys
+import threading
+
+from filename_classifier import FilenameClassifier
+
+# 使用默认模式的分类器，用于未提供基础名称的AssetFile
+_default_classifier = FilenameClassifier()
+
+
+class AssetFile:
+    """表示一个资产文件"""
+
+    __slots__ = ("asset_id", "asset_type", "base_name", "file_name", "directory", "extension",
+                 "group", "_file_path")
+
+    def __init__(self, file_path, asset_type, base_name=None, file_name=None, directory=None, extension=None):
+        """
+        初始化资产文件
+
+        Args:
+            file_path (str): 文件的完整路径
+            asset_type (str): 资产类型 (fbx, texture, ma, etc.)
+            base_name (str, optional): 资产的基础名称，用于关联相关资产
+            file_name (str, optional): 文件名，扫描时已知则直接传入，避免重复拆分路径
+            directory (str, optional): 所在目录
+            extension (str, optional): 小写扩展名
+        """
+        self.asset_id = None
+        self.asset_type = sys.intern(asset_type)
+        self.file_name = file_name if file_name is not None else os.path.basename(file_path)
+        self.directory = sys.intern(directory if directory is not None else os.path.dirname(file_path))
+        self.extension = sys.intern(extension if extension is not None else os.path.splitext(self.file_name)[1].lower())
+
+        # 只有无法由目录和文件名拼接还原时才单独保存完整路径
+        self._file_path = None if os.path.join(self.directory, self.file_name) == file_path else file_path
+
+        # 如果没有提供基础名称，则从文件名中提取
+        if base_name is None:
+            self.base_name = self._extract_base_name(self.file_name)
+        else:
+            self.base_name = base_name
+
+        # 所属的资产组（见asset_relations），组内的其他资产即关联资产
+        self.group = None
+
+    @property
+    def file_path(self):
+        """str: 文件的完整路径"""
+        if self._file_path is not None:
+            return self._file_path
+        return os.path.join(self.directory, self.file_name)
+
+    @property
+    def related_assets(self):
+        """list: 与此资产同组的其他资产"""
+        if self.group is None:
+            return []
+        return [asset for asset in self.group.members if asset is not self]
+
+    @property
+    def key(self):
+        """
+        用于imported_assets、imported_textures等映射的键
+
+        已加入AssetCatalog的资产使用整数ID，否则使用文件路径。
+        """
+        return self.asset_id if self.asset_id is not None else self.file_path
+
+    def source_paths(self):
+        """
+        获取组成此资产的所有源文件路径
+
+        Returns:
+            list: 文件路径列表
+        """
+        return [self.file_path]
+
+    def _extract_base_name(self, file_name):
+        """
+        从文件名中提取基础名称
+
+        Args:
+            file_name (str): 文件名
+
+        Returns:
+            str: 基础名称
+        """
+        # 移除扩展名和末尾的类型词元
+        return _default_classifier.base_name(file_name)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.asset_type})"
+
+
+class TextureSet(AssetFile):
+    """
+    UDIM纹理集：同一目录下只有UDIM编号不同的一组纹理
+
+    file_path指向编号最小的贴图，导入时由它带出其余贴图，整组作为一个虚拟纹理导入。
+    """
+
+    __slots__ = ("tiles",)
+
+    def __init__(self, file_path, asset_type, base_name, tiles, file_name=None, directory=None, extension=None):
+        """
+        初始化UDIM纹理集
+
+        Args:
+            file_path (str): 编号最小的贴图的完整路径
+            asset_type (str): 资产类型 (texture_diffuse, etc.)
+            base_name (str): 资产的基础名称
+            tiles (list): [(UDIM编号, 文件名), ...]
+            file_name (str, optional): 编号最小的贴图的文件名
+            directory (str, optional): 所在目录
+            extension (str, optional): 小写扩展名
+        """
+        super().__init__(file_path, asset_type, base_name, file_name, directory, extension)
+        self.tiles = tuple(sorted(tiles))
+
+    @property
+    def tile_paths(self):
+        """list: 所有贴图的完整路径，按UDIM编号排序"""
+        return [os.path.join(self.directory, file_name) for _, file_name in self.tiles]
+
+    def source_paths(self):
+        return self.tile_paths
+
+    def __str__(self):
+        return f"{self.file_name} ({self.asset_type}, {len(self.tiles)} UDIM)"
+
+
+class MeshLodGroup(AssetFile):
+    """
+    LOD链：同一目录下只有LOD编号不同的一组FBX文件，例如Chair_LOD0.fbx到Chair_LOD2.fbx
+
+    file_path指向编号最小的文件，作为网格本身导入，其余文件作为后续LOD导入到同一个网格中。
+    """
+
+    __slots__ = ("lods",)
+
+    def __init__(self, file_path, asset_type, base_name, lods, file_name=None, directory=None, extension=None):
+        """
+        初始化LOD链
+
+        Args:
+            file_path (str): 编号最小的文件的完整路径
+            asset_type (str): 网格类型 (static_mesh, skeletal_mesh)
+            base_name (str): 资产的基础名称
+            lods (list): [(LOD编号, 文件名), ...]
+            file_name (str, optional): 编号最小的文件的文件名
+            directory (str, optional): 所在目录
+            extension (str, optional): 小写扩展名
+        """
+        super().__init__(file_path, asset_type, base_name, file_name, directory, extension)
+        self.lods = tuple(sorted(lods))
+
+    @property
+    def lod_paths(self):
+        """list: 所有LOD文件的完整路径，按LOD编号排序"""
+        return [os.path.join(self.directory, file_name) for _, file_name in self.lods]
+
+    def source_paths(self):
+        return self.lod_paths
+
+    def __str__(self):
+        return f"{self.file_name} ({self.asset_type}, {len(self.lods)} LOD)"
+
+
+class AssetCatalog:
+    """资产目录类，为资产分配稳定的整数ID"""
+
+    def __init__(self):
+        """初始化资产目录"""
+        self._assets = []
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def add(self, asset_file):
+        """
+        加入资产并分配ID
+
+        同一路径的文件再次加入时沿用原来的ID（例如重新扫描同一文件夹），
+        并以新的对象替换旧对象。
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            AssetFile: 传入的资产文件对象
+        """
+        with self._lock:
+            directory_ids = self._ids.setdefault(asset_file.directory, {})
+            asset_id = directory_ids.get(asset_file.file_name)
+            if asset_id is None:
+                asset_id = len(self._assets)
+                directory_ids[asset_file.file_name] = asset_id
+                self._assets.append(asset_file)
+            else:
+                self._assets[asset_id] = asset_file
+            asset_file.asset_id = asset_id
+        return asset_file
+
+    def get(self, asset_id):
+        """
+        根据ID获取资产
+
+        Args:
+            asset_id (int): 资产ID
+
+        Returns:
+            AssetFile: 资产文件对象，不存在时返回None
+        """
+        if 0 <= asset_id < len(self._assets):
+            return self._assets[asset_id]
+        return None
+
+    def find(self, file_path):
+        """
+        根据文件路径获取资产
+
+        Args:
+            file_path (str): 文件的完整路径
+
+        Returns:
+            AssetFile: 资产文件对象，不存在时返回None
+        """
+        asset_id = self._ids.get(os.path.dirname(file_path), {}).get(os.path.basename(file_path))
+        return self._assets[asset_id] if asset_id is not None else None
+
+    def __len__(self):
+        return len(self._assets)
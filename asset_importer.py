@@ -19,18 +19,22 @@ from PySide2 import QtCore, QtWidgets, QtGui
 
 # 导入自定义模块
 try:
-    from config_manager import ConfigManager
+    from config_manager import ConfigManager, DEFAULT_CONFIG_PATH, merge_config
     from folder_scanner import FolderScanner
     from asset_processor import AssetProcessor
     from texture_processor import TextureProcessor
     from material_creator import MaterialCreator
     from asset_organizer import AssetOrganizer
+    from watch_importer import WatchImporter
 except ImportError:
     print("无法导入自定义模块，请确保所有模块文件都在同一目录下")
 
 class AssetImporterGUI(QtWidgets.QMainWindow):
     """资产导入工具的主GUI类"""
 
+    # 从监视线程发送日志消息，由主线程写入日志区域
+    log_message = QtCore.Signal(str)
+
     def __init__(self):
         super(AssetImporterGUI, self).__init__()
 
@@ -39,12 +43,16 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         self.setMinimumSize(800, 600)
 
         # 初始化配置管理器
-        self.config_manager = ConfigManager()
+        self.config_manager = ConfigManager(DEFAULT_CONFIG_PATH)
         self.config = self.config_manager.load_config()
 
         # 创建主界面
         self.setup_ui()
 
+        # 监视导入器，未在监视时为None
+        self.watch_importer = None
+        self.log_message.connect(self.log)
+
         # 初始化日志
         self.log("资产导入工具已启动")
 
@@ -117,6 +125,10 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         self.import_button.clicked.connect(self.start_import)
         self.import_button.setEnabled(False)
 
+        self.watch_button = QtWidgets.QPushButton("监视文件夹")
+        self.watch_button.clicked.connect(self.toggle_watch)
+        self.watch_button.setEnabled(False)
+
         self.save_config_button = QtWidgets.QPushButton("保存配置")
         self.save_config_button.clicked.connect(self.save_config)
 
@@ -124,6 +136,7 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         self.load_config_button.clicked.connect(self.load_config)
 
         button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.watch_button)
         button_layout.addWidget(self.save_config_button)
         button_layout.addWidget(self.load_config_button)
 
@@ -169,18 +182,12 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         if folder:
             self.folder_path.setText(folder)
             self.import_button.setEnabled(True)
+            self.watch_button.setEnabled(True)
             self.log(f"已选择文件夹: {folder}")
 
     def save_config(self):
         """保存当前配置"""
-        config = {
-            "process_textures": self.process_textures.isChecked(),
-            "create_materials": self.create_materials.isChecked(),
-            "organize_folders": self.organize_folders.isChecked(),
-            "compress_textures": self.compress_textures.isChecked(),
-            "target_path": self.target_path.text(),
-            "material_template": self.material_template.text()
-        }
+        config = self._collect_import_config()
 
         file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
             self, "保存配置", "", "JSON文件 (*.json)"
@@ -197,8 +204,8 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         )
 
         if file_path:
-            config = self.config_manager.load_config(file_path)
-            self.update_ui_from_config(config)
+            self.config = self.config_manager.load_config(file_path)
+            self.update_ui_from_config(self.config)
             self.log(f"已加载配置: {file_path}")
 
     def update_ui_from_config(self, config):
@@ -210,6 +217,22 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         self.target_path.setText(config.get("target_path", "/Game/ImportedAssets"))
         self.material_template.setText(config.get("material_template", "/Game/MaterialTemplates/M_Standard"))
 
+    def _collect_import_config(self):
+        """
+        收集当前配置：加载的完整配置，由界面上的导入设置覆盖
+
+        Returns:
+            dict: 配置字典
+        """
+        return merge_config(self.config, {
+            "process_textures": self.process_textures.isChecked(),
+            "create_materials": self.create_materials.isChecked(),
+            "organize_folders": self.organize_folders.isChecked(),
+            "compress_textures": self.compress_textures.isChecked(),
+            "target_path": self.target_path.text(),
+            "material_template": self.material_template.text()
+        })
+
     def start_import(self):
         """开始导入过程"""
         # 获取当前设置
@@ -221,19 +244,13 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
             return
 
         # 收集当前配置
-        config = {
-            "process_textures": self.process_textures.isChecked(),
-            "create_materials": self.create_materials.isChecked(),
-            "organize_folders": self.organize_folders.isChecked(),
-            "compress_textures": self.compress_textures.isChecked(),
-            "target_path": target_path,
-            "material_template": self.material_template.text()
-        }
+        config = self._collect_import_config()
 
         self.log("开始导入过程...")
         self.log(f"源文件夹: {source_folder}")
         self.log(f"目标路径: {target_path}")
 
+        asset_processor = None
         try:
             # 禁用导入按钮，防止重复点击
             self.import_button.setEnabled(False)
@@ -256,6 +273,15 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
             texture_count = sum(len(textures) for textures in assets.get("textures", {}).values())
 
             self.log(f"找到 {fbx_count} 个FBX文件, {ma_count} 个MA文件, {texture_count} 个纹理文件")
+            if folder_scanner.duplicate_textures:
+                self.log(f"跳过 {len(folder_scanner.duplicate_textures)} 个内容重复的纹理，相关模型将使用相同的纹理资产")
+            for maya_file, maya_textures, missing_textures, references in folder_scanner.maya_dependencies():
+                texture_names = ", ".join(texture_file.file_name for texture_file in maya_textures) or "无"
+                self.log(f"MA文件 {maya_file.file_name} 依赖的纹理: {texture_names}")
+                if missing_textures:
+                    self.log(f"  不在源文件夹中的纹理: {', '.join(missing_textures)}")
+                if references:
+                    self.log(f"  引用的文件: {', '.join(reference.file_name for reference in references)}")
 
             # 2. 创建文件夹结构
             if config.get("organize_folders", True):
@@ -267,11 +293,19 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
             self.progress_bar.setValue(20)
             self.progress_label.setText("导入纹理...")
 
+            # MA文件由mayapy在后台转换为FBX，与导入纹理同时进行
+            asset_processor = AssetProcessor(config)
+            if asset_processor.start_maya_conversion(assets.get("ma", [])):
+                self.log(f"已开始在后台把 {ma_count} 个MA文件转换为FBX")
+
             # 3. 导入纹理
             imported_textures = {}
             if config.get("process_textures", True) and texture_count > 0:
                 texture_processor = TextureProcessor(config)
-                imported_textures = texture_processor.organize_textures(assets.get("textures", {}), target_path)
+                textures = assets.get("textures", {})
+                if config.get("import_referenced_textures_only", False):
+                    textures = folder_scanner.referenced_textures(assets)
+                imported_textures = texture_processor.organize_textures(textures, target_path)
                 self.log(f"已导入 {len(imported_textures)} 个纹理")
 
             # 更新进度
@@ -280,15 +314,16 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
 
             # 4. 导入FBX和MA文件
             imported_assets = {}
-            asset_processor = AssetProcessor(config)
 
             # 导入FBX文件
             fbx_progress_step = 30 / max(fbx_count, 1)
             for i, asset_file in enumerate(assets.get("fbx", [])):
                 self.progress_label.setText(f"导入FBX: {asset_file.file_name}")
                 imported_asset = asset_processor.import_asset(asset_file, target_path)
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -301,8 +336,10 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
             for i, asset_file in enumerate(assets.get("ma", [])):
                 self.progress_label.setText(f"导入MA: {asset_file.file_name}")
                 imported_asset = asset_processor.import_maya_file(asset_file, target_path)
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -321,7 +358,7 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
             if config.get("create_materials", True):
                 material_creator = MaterialCreator(config)
                 created_materials = material_creator.create_materials_for_assets(
-                    assets, imported_assets, imported_textures, target_path
+                    assets, imported_assets, imported_textures, target_path, folder_scanner.texture_links
                 )
                 self.log(f"已创建 {len(created_materials)} 个材质实例")
 
@@ -349,6 +386,32 @@ class AssetImporterGUI(QtWidgets.QMainWindow):
         finally:
             # 重新启用导入按钮
             self.import_button.setEnabled(True)
+            # 停止MA文件转换的mayapy进程
+            if asset_processor is not None:
+                asset_processor.stop_maya_conversion()
+
+    def toggle_watch(self):
+        """开始或停止监视源文件夹"""
+        if self.watch_importer is not None and self.watch_importer.is_running:
+            self.watch_importer.stop()
+            self.watch_importer = None
+            self.watch_button.setText("监视文件夹")
+            self.log("正在停止监视...")
+            return
+
+        source_folder = self.folder_path.text()
+        if not source_folder:
+            self.log("错误: 请选择源文件夹")
+            return
+
+        # 监视模式同时使用配置文件中的扫描和监视设置
+        config = self._collect_import_config()
+
+        self.watch_importer = WatchImporter(source_folder, config, log=self.log_message.emit)
+        if self.watch_importer.start():
+            self.watch_button.setText("停止监视")
+        else:
+            self.watch_importer = None
 
     def log(self, message):
         """添加消息到日志区域"""
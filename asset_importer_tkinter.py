@@ -20,13 +20,14 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 
 # 导入自定义模块
 try:
-    from config_manager import ConfigManager
+    from config_manager import ConfigManager, DEFAULT_CONFIG_PATH, merge_config
     from folder_scanner import FolderScanner
     from asset_processor import AssetProcessor
     from texture_processor import TextureProcessor
     from material_creator import MaterialCreator
     from asset_organizer import AssetOrganizer
     from fbx_debugger import FbxDebugger
+    from watch_importer import WatchImporter
 except ImportError:
     print("无法导入自定义模块，请确保所有模块文件都在同一目录下")
 
@@ -46,12 +47,15 @@ class AssetImporterGUI:
         self.root.minsize(800, 600)
 
         # 初始化配置管理器
-        self.config_manager = ConfigManager()
+        self.config_manager = ConfigManager(DEFAULT_CONFIG_PATH)
         self.config = self.config_manager.load_config()
 
         # 创建主界面
         self.setup_ui()
 
+        # 监视导入器，未在监视时为None
+        self.watch_importer = None
+
         # 初始化日志
         self.log("资产导入工具已启动")
 
@@ -111,6 +115,9 @@ class AssetImporterGUI:
         self.import_button = ttk.Button(button_frame, text="开始导入", command=self.start_import, state="disabled")
         self.import_button.pack(side=tk.LEFT, padx=5)
 
+        self.watch_button = ttk.Button(button_frame, text="监视文件夹", command=self.toggle_watch, state="disabled")
+        self.watch_button.pack(side=tk.LEFT, padx=5)
+
         self.save_config_button = ttk.Button(button_frame, text="保存配置", command=self.save_config)
         self.save_config_button.pack(side=tk.LEFT, padx=5)
 
@@ -212,22 +219,12 @@ class AssetImporterGUI:
             self.folder_path_var.set(folder)
             self.import_button["state"] = "normal"
             self.debug_button["state"] = "normal"
+            self.watch_button["state"] = "normal"
             self.log(f"已选择文件夹: {folder}")
 
     def save_config(self):
         """保存当前配置"""
-        config = {
-            "process_textures": self.process_textures_var.get(),
-            "create_materials": self.create_materials_var.get(),
-            "organize_folders": self.organize_folders_var.get(),
-            "compress_textures": self.compress_textures_var.get(),
-            "target_path": self.target_path_var.get(),
-            "material_template": self.material_template_var.get(),
-            "import_mode": {
-                "use_specified_folder": self.use_specified_folder_var.get(),
-                "current_browser_folder": self.current_browser_folder_var.get()
-            }
-        }
+        config = self._collect_import_config()
 
         file_path = filedialog.asksaveasfilename(
             title="保存配置",
@@ -248,8 +245,8 @@ class AssetImporterGUI:
         )
 
         if file_path:
-            config = self.config_manager.load_config(file_path)
-            self.update_ui_from_config(config)
+            self.config = self.config_manager.load_config(file_path)
+            self.update_ui_from_config(self.config)
             self.log(f"已加载配置: {file_path}")
 
     def update_ui_from_config(self, config):
@@ -281,18 +278,7 @@ class AssetImporterGUI:
             return
 
         # 收集当前配置
-        config = {
-            "process_textures": self.process_textures_var.get(),
-            "create_materials": self.create_materials_var.get(),
-            "organize_folders": self.organize_folders_var.get(),
-            "compress_textures": self.compress_textures_var.get(),
-            "target_path": self.target_path_var.get(),
-            "material_template": self.material_template_var.get(),
-            "import_mode": {
-                "use_specified_folder": self.use_specified_folder_var.get(),
-                "current_browser_folder": self.current_browser_folder_var.get()
-            }
-        }
+        config = self._collect_import_config()
 
         # 创建FBX调试对话框
         debug_window = tk.Toplevel(self.root)
@@ -372,6 +358,7 @@ class AssetImporterGUI:
             # 显示静态网格信息
             is_static = debug_result['is_static_mesh']
             result_text.insert(tk.END, f"是否为静态网格: {'是' if is_static else '否'}\n")
+            result_text.insert(tk.END, f"网格类型: {debug_result.get('mesh_type', '未知')}\n")
 
             # 显示碰撞信息
             collision_info = debug_result['has_collision']
@@ -431,6 +418,20 @@ class AssetImporterGUI:
             else:
                 result_text.insert(tk.END, f"  材质槽信息: {material_slots}\n")
 
+            # 显示网格统计（只有直接解析FBX时才有）
+            mesh_stats = debug_result.get('mesh_stats')
+            if mesh_stats:
+                result_text.insert(tk.END, "\n网格统计:\n")
+                result_text.insert(tk.END, f"  三角形数: {mesh_stats['triangles']}\n")
+                result_text.insert(tk.END, f"  顶点数: {mesh_stats['vertices']}\n")
+                result_text.insert(tk.END, f"  退化三角形数: {mesh_stats['degenerate_triangles']}\n")
+                result_text.insert(tk.END, f"  UV通道数: {mesh_stats['uv_channels']}\n")
+
+                bounds = mesh_stats.get('bounds')
+                if bounds:
+                    size = ", ".join(f"{high - low:g}" for low, high in zip(bounds['min'], bounds['max']))
+                    result_text.insert(tk.END, f"  包围盒尺寸: {size}\n")
+
         # 绑定文件选择事件
         file_listbox.bind('<<ListboxSelect>>', on_file_select)
 
@@ -450,18 +451,7 @@ class AssetImporterGUI:
             return
 
         # 收集当前配置
-        config = {
-            "process_textures": self.process_textures_var.get(),
-            "create_materials": self.create_materials_var.get(),
-            "organize_folders": self.organize_folders_var.get(),
-            "compress_textures": self.compress_textures_var.get(),
-            "target_path": target_path,
-            "material_template": self.material_template_var.get(),
-            "import_mode": {
-                "use_specified_folder": self.use_specified_folder_var.get(),
-                "current_browser_folder": self.current_browser_folder_var.get()
-            }
-        }
+        config = self._collect_import_config()
 
         self.log("开始导入过程...")
         self.log(f"源文件夹: {source_folder}")
@@ -476,6 +466,49 @@ class AssetImporterGUI:
         import_thread.daemon = True
         import_thread.start()
 
+    def _collect_import_config(self):
+        """
+        收集当前配置：加载的完整配置，由界面上的导入设置覆盖
+
+        Returns:
+            dict: 配置字典
+        """
+        return merge_config(self.config, {
+            "process_textures": self.process_textures_var.get(),
+            "create_materials": self.create_materials_var.get(),
+            "organize_folders": self.organize_folders_var.get(),
+            "compress_textures": self.compress_textures_var.get(),
+            "target_path": self.target_path_var.get(),
+            "material_template": self.material_template_var.get(),
+            "import_mode": {
+                "use_specified_folder": self.use_specified_folder_var.get(),
+                "current_browser_folder": self.current_browser_folder_var.get()
+            }
+        })
+
+    def toggle_watch(self):
+        """开始或停止监视源文件夹"""
+        if self.watch_importer is not None and self.watch_importer.is_running:
+            self.watch_importer.stop()
+            self.watch_importer = None
+            self.watch_button.configure(text="监视文件夹")
+            self.log("正在停止监视...")
+            return
+
+        source_folder = self.folder_path_var.get()
+        if not source_folder:
+            messagebox.showerror("错误", "请选择源文件夹")
+            return
+
+        # 监视模式同时使用配置文件中的扫描和监视设置
+        config = self._collect_import_config()
+
+        self.watch_importer = WatchImporter(source_folder, config, log=self.log)
+        if self.watch_importer.start():
+            self.watch_button.configure(text="停止监视")
+        else:
+            self.watch_importer = None
+
     def _import_process(self, source_folder, config):
         """
         执行导入过程
@@ -484,16 +517,50 @@ class AssetImporterGUI:
             source_folder (str): 源文件夹路径
             config (dict): 配置字典
         """
+        asset_processor = None
         try:
             # 初始化进度条
-            self.update_progress(0, "扫描文件夹...")
+            self.update_progress(0, "创建文件夹结构...")
 
-            # 1. 扫描文件夹
-            folder_scanner = FolderScanner(config)
-            assets = folder_scanner.scan_folder(source_folder)
+            # 1. 创建文件夹结构
+            if config.get("organize_folders", True):
+                asset_organizer = AssetOrganizer(config)
+                asset_organizer.create_folder_structure(config["target_path"])
 
             # 更新进度
-            self.update_progress(10, "分析资产...")
+            self.update_progress(10, "扫描文件夹并导入纹理...")
+
+            # 2. 流式扫描文件夹，每个批次识别完成后立即导入其中的纹理，
+            #    目录遍历在后台继续进行
+            folder_scanner = FolderScanner(config)
+            assets = folder_scanner.create_assets_dict()
+            imported_textures = {}
+            texture_processor = TextureProcessor(config) if config.get("process_textures", True) else None
+
+            # 只导入模型实际使用的纹理时，需要等扫描结束、所有FBX的纹理引用都已读取后再导入
+            referenced_only = config.get("import_referenced_textures_only", False)
+
+            # MA文件随扫描批次提交，由mayapy在后台转换为FBX，与导入纹理同时进行
+            asset_processor = AssetProcessor(config)
+
+            scanned_count = 0
+            for batch in folder_scanner.scan_folder_iter(source_folder, assets):
+                scanned_count += len(batch)
+                asset_processor.start_maya_conversion([asset_file for asset_file in batch if asset_file.extension == ".ma"])
+                self.update_progress(20, f"已扫描 {scanned_count} 个文件, 已导入 {len(imported_textures)} 个纹理...")
+
+                # 3. 导入本批次的纹理
+                if texture_processor and not referenced_only:
+                    batch_textures = folder_scanner.create_assets_dict(batch)["textures"]
+                    if any(batch_textures.values()):
+                        imported_textures.update(
+                            texture_processor.organize_textures(batch_textures, config["target_path"])
+                        )
+
+            if texture_processor and referenced_only:
+                imported_textures.update(texture_processor.organize_textures(
+                    folder_scanner.referenced_textures(assets), config["target_path"]
+                ))
 
             # 记录找到的资产数量
             fbx_count = len(assets.get("fbx", []))
@@ -501,21 +568,16 @@ class AssetImporterGUI:
             texture_count = sum(len(textures) for textures in assets.get("textures", {}).values())
 
             self.log(f"找到 {fbx_count} 个FBX文件, {ma_count} 个MA文件, {texture_count} 个纹理文件")
-
-            # 2. 创建文件夹结构
-            if config.get("organize_folders", True):
-                self.update_progress(15, "创建文件夹结构...")
-                asset_organizer = AssetOrganizer(config)
-                asset_organizer.create_folder_structure(config["target_path"])
-
-            # 更新进度
-            self.update_progress(20, "导入纹理...")
-
-            # 3. 导入纹理
-            imported_textures = {}
-            if config.get("process_textures", True) and texture_count > 0:
-                texture_processor = TextureProcessor(config)
-                imported_textures = texture_processor.organize_textures(assets.get("textures", {}), config["target_path"])
+            if folder_scanner.duplicate_textures:
+                self.log(f"跳过 {len(folder_scanner.duplicate_textures)} 个内容重复的纹理，相关模型将使用相同的纹理资产")
+            for maya_file, maya_textures, missing_textures, references in folder_scanner.maya_dependencies():
+                texture_names = ", ".join(texture_file.file_name for texture_file in maya_textures) or "无"
+                self.log(f"MA文件 {maya_file.file_name} 依赖的纹理: {texture_names}")
+                if missing_textures:
+                    self.log(f"  不在源文件夹中的纹理: {', '.join(missing_textures)}")
+                if references:
+                    self.log(f"  引用的文件: {', '.join(reference.file_name for reference in references)}")
+            if texture_processor:
                 self.log(f"已导入 {len(imported_textures)} 个纹理")
 
             # 更新进度
@@ -523,15 +585,16 @@ class AssetImporterGUI:
 
             # 4. 导入FBX和MA文件
             imported_assets = {}
-            asset_processor = AssetProcessor(config)
 
             # 导入FBX文件
             fbx_progress_step = 30 / max(fbx_count, 1)
             for i, asset_file in enumerate(assets.get("fbx", [])):
                 self.update_progress(50 + int((i + 0.5) * fbx_progress_step), f"导入FBX: {asset_file.file_name}")
                 imported_asset = asset_processor.import_asset(asset_file, config["target_path"])
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -541,8 +604,10 @@ class AssetImporterGUI:
             for i, asset_file in enumerate(assets.get("ma", [])):
                 self.update_progress(80 + int((i + 0.5) * ma_progress_step), f"导入MA: {asset_file.file_name}")
                 imported_asset = asset_processor.import_maya_file(asset_file, config["target_path"])
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -557,7 +622,7 @@ class AssetImporterGUI:
             if config.get("create_materials", True):
                 material_creator = MaterialCreator(config)
                 created_materials = material_creator.create_materials_for_assets(
-                    assets, imported_assets, imported_textures, config["target_path"]
+                    assets, imported_assets, imported_textures, config["target_path"], folder_scanner.texture_links
                 )
                 self.log(f"已创建 {len(created_materials)} 个材质实例")
 
@@ -583,6 +648,9 @@ class AssetImporterGUI:
         finally:
             # 重新启用导入按钮
             self.root.after(0, lambda: self.import_button.configure(state="normal"))
+            # 停止MA文件转换的mayapy进程
+            if asset_processor is not None:
+                asset_processor.stop_maya_conversion()
 
     def update_progress(self, value, text):
         """
@@ -19,13 +19,14 @@ import threading
 
 # 导入自定义模块
 try:
-    from config_manager import ConfigManager
+    from config_manager import ConfigManager, DEFAULT_CONFIG_PATH, merge_config
     from folder_scanner import FolderScanner
     from asset_processor import AssetProcessor
     from texture_processor import TextureProcessor
     from material_creator import MaterialCreator
     from asset_organizer import AssetOrganizer
     from fbx_debugger import FbxDebugger
+    from watch_importer import WatchImporter
 except ImportError:
     unreal.log_error("无法导入自定义模块，请确保所有模块文件都在同一目录下")
 
@@ -35,7 +36,7 @@ class AssetImporterTool:
     def __init__(self):
         """初始化资产导入工具"""
         # 初始化配置管理器
-        self.config_manager = ConfigManager()
+        self.config_manager = ConfigManager(DEFAULT_CONFIG_PATH)
         self.config = self.config_manager.load_config()
 
         # 初始化UI变量
@@ -61,6 +62,10 @@ class AssetImporterTool:
         # 调试按钮
         self.debug_button = None
 
+        # 监视按钮和监视导入器，未在监视时导入器为None
+        self.watch_button = None
+        self.watch_importer = None
+
         # 创建UI
         self.create_ui()
 
@@ -141,6 +146,11 @@ class AssetImporterTool:
         unreal.PythonBPLib.set_is_enabled(self.import_button, False)
         unreal.PythonBPLib.add_slot(button_layout, self.import_button)
 
+        self.watch_button = unreal.PythonBPLib.create_button("监视文件夹")
+        unreal.PythonBPLib.set_on_clicked(self.watch_button, self._on_watch_clicked)
+        unreal.PythonBPLib.set_is_enabled(self.watch_button, False)
+        unreal.PythonBPLib.add_slot(button_layout, self.watch_button)
+
         save_config_button = unreal.PythonBPLib.create_button("保存配置")
         unreal.PythonBPLib.set_on_clicked(save_config_button, self._on_save_config_clicked)
         unreal.PythonBPLib.add_slot(button_layout, save_config_button)
@@ -260,22 +270,12 @@ class AssetImporterTool:
             unreal.PythonBPLib.set_text(self.folder_path_text, folder)
             unreal.PythonBPLib.set_is_enabled(self.import_button, True)
             unreal.PythonBPLib.set_is_enabled(self.debug_button, True)
+            unreal.PythonBPLib.set_is_enabled(self.watch_button, True)
             self.log(f"已选择文件夹: {folder}")
 
     def _on_save_config_clicked(self):
         """保存配置按钮点击事件"""
-        config = {
-            "process_textures": unreal.PythonBPLib.is_checked(self.process_textures_checkbox),
-            "create_materials": unreal.PythonBPLib.is_checked(self.create_materials_checkbox),
-            "organize_folders": unreal.PythonBPLib.is_checked(self.organize_folders_checkbox),
-            "compress_textures": unreal.PythonBPLib.is_checked(self.compress_textures_checkbox),
-            "target_path": unreal.PythonBPLib.get_text(self.target_path_text),
-            "material_template": unreal.PythonBPLib.get_text(self.material_template_text),
-            "import_mode": {
-                "use_specified_folder": unreal.PythonBPLib.is_checked(self.use_specified_folder_radio),
-                "current_browser_folder": unreal.PythonBPLib.get_text(self.browser_folder_text)
-            }
-        }
+        config = self._collect_config()
 
         file_path = unreal.PythonBPLib.save_file_dialog("保存配置", "", "*.json")
         if file_path:
@@ -286,8 +286,8 @@ class AssetImporterTool:
         """加载配置按钮点击事件"""
         file_path = unreal.PythonBPLib.open_file_dialog("加载配置", "", "*.json")
         if file_path:
-            config = self.config_manager.load_config(file_path)
-            self._update_ui_from_config(config)
+            self.config = self.config_manager.load_config(file_path)
+            self._update_ui_from_config(self.config)
             self.log(f"已加载配置: {file_path}")
 
     def _update_ui_from_config(self, config):
@@ -311,6 +311,26 @@ class AssetImporterTool:
         unreal.PythonBPLib.set_is_checked(self.use_browser_folder_radio, not use_specified_folder)
         unreal.PythonBPLib.set_text(self.browser_folder_text, import_mode.get("current_browser_folder", ""))
 
+    def _collect_config(self):
+        """
+        收集当前配置：加载的完整配置，由界面上的设置覆盖
+
+        Returns:
+            dict: 配置字典
+        """
+        return merge_config(self.config, {
+            "process_textures": unreal.PythonBPLib.is_checked(self.process_textures_checkbox),
+            "create_materials": unreal.PythonBPLib.is_checked(self.create_materials_checkbox),
+            "organize_folders": unreal.PythonBPLib.is_checked(self.organize_folders_checkbox),
+            "compress_textures": unreal.PythonBPLib.is_checked(self.compress_textures_checkbox),
+            "target_path": unreal.PythonBPLib.get_text(self.target_path_text),
+            "material_template": unreal.PythonBPLib.get_text(self.material_template_text),
+            "import_mode": {
+                "use_specified_folder": unreal.PythonBPLib.is_checked(self.use_specified_folder_radio),
+                "current_browser_folder": unreal.PythonBPLib.get_text(self.browser_folder_text)
+            }
+        })
+
     def _on_import_clicked(self):
         """导入按钮点击事件"""
         # 获取当前设置
@@ -322,18 +342,7 @@ class AssetImporterTool:
             return
 
         # 收集当前配置
-        config = {
-            "process_textures": unreal.PythonBPLib.is_checked(self.process_textures_checkbox),
-            "create_materials": unreal.PythonBPLib.is_checked(self.create_materials_checkbox),
-            "organize_folders": unreal.PythonBPLib.is_checked(self.organize_folders_checkbox),
-            "compress_textures": unreal.PythonBPLib.is_checked(self.compress_textures_checkbox),
-            "target_path": target_path,
-            "material_template": unreal.PythonBPLib.get_text(self.material_template_text),
-            "import_mode": {
-                "use_specified_folder": unreal.PythonBPLib.is_checked(self.use_specified_folder_radio),
-                "current_browser_folder": unreal.PythonBPLib.get_text(self.browser_folder_text)
-            }
-        }
+        config = self._collect_config()
 
         self.log("开始导入过程...")
         self.log(f"源文件夹: {source_folder}")
@@ -347,6 +356,28 @@ class AssetImporterTool:
         import_thread.daemon = True
         import_thread.start()
 
+    def _on_watch_clicked(self):
+        """监视按钮点击事件，再次点击时停止监视"""
+        if self.watch_importer is not None and self.watch_importer.is_running:
+            self.watch_importer.stop()
+            self.watch_importer = None
+            self.log("正在停止监视...")
+            return
+
+        source_folder = unreal.PythonBPLib.get_text(self.folder_path_text)
+        if not source_folder:
+            unreal.PythonBPLib.show_message_dialog("错误", "请选择源文件夹", "确定")
+            return
+
+        # 监视模式同时使用配置文件中的扫描和监视设置
+        config = self._collect_config()
+
+        self.watch_importer = WatchImporter(source_folder, config, log=self.log)
+        if self.watch_importer.start():
+            self.log("再次点击\"监视文件夹\"可停止监视")
+        else:
+            self.watch_importer = None
+
     def _import_process(self, source_folder, config):
         """
         执行导入过程
@@ -355,16 +386,50 @@ class AssetImporterTool:
             source_folder (str): 源文件夹路径
             config (dict): 配置字典
         """
+        asset_processor = None
         try:
             # 初始化进度条
-            self.update_progress(0, "扫描文件夹...")
+            self.update_progress(0, "创建文件夹结构...")
 
-            # 1. 扫描文件夹
-            folder_scanner = FolderScanner(config)
-            assets = folder_scanner.scan_folder(source_folder)
+            # 1. 创建文件夹结构
+            if config.get("organize_folders", True):
+                asset_organizer = AssetOrganizer(config)
+                asset_organizer.create_folder_structure(config["target_path"])
 
             # 更新进度
-            self.update_progress(10, "分析资产...")
+            self.update_progress(10, "扫描文件夹并导入纹理...")
+
+            # 2. 流式扫描文件夹，每个批次识别完成后立即导入其中的纹理，
+            #    目录遍历在后台继续进行
+            folder_scanner = FolderScanner(config)
+            assets = folder_scanner.create_assets_dict()
+            imported_textures = {}
+            texture_processor = TextureProcessor(config) if config.get("process_textures", True) else None
+
+            # 只导入模型实际使用的纹理时，需要等扫描结束、所有FBX的纹理引用都已读取后再导入
+            referenced_only = config.get("import_referenced_textures_only", False)
+
+            # MA文件随扫描批次提交，由mayapy在后台转换为FBX，与导入纹理同时进行
+            asset_processor = AssetProcessor(config)
+
+            scanned_count = 0
+            for batch in folder_scanner.scan_folder_iter(source_folder, assets):
+                scanned_count += len(batch)
+                asset_processor.start_maya_conversion([asset_file for asset_file in batch if asset_file.extension == ".ma"])
+                self.update_progress(20, f"已扫描 {scanned_count} 个文件, 已导入 {len(imported_textures)} 个纹理...")
+
+                # 3. 导入本批次的纹理
+                if texture_processor and not referenced_only:
+                    batch_textures = folder_scanner.create_assets_dict(batch)["textures"]
+                    if any(batch_textures.values()):
+                        imported_textures.update(
+                            texture_processor.organize_textures(batch_textures, config["target_path"])
+                        )
+
+            if texture_processor and referenced_only:
+                imported_textures.update(texture_processor.organize_textures(
+                    folder_scanner.referenced_textures(assets), config["target_path"]
+                ))
 
             # 记录找到的资产数量
             fbx_count = len(assets.get("fbx", []))
@@ -372,21 +437,16 @@ class AssetImporterTool:
             texture_count = sum(len(textures) for textures in assets.get("textures", {}).values())
 
             self.log(f"找到 {fbx_count} 个FBX文件, {ma_count} 个MA文件, {texture_count} 个纹理文件")
-
-            # 2. 创建文件夹结构
-            if config.get("organize_folders", True):
-                self.update_progress(15, "创建文件夹结构...")
-                asset_organizer = AssetOrganizer(config)
-                asset_organizer.create_folder_structure(config["target_path"])
-
-            # 更新进度
-            self.update_progress(20, "导入纹理...")
-
-            # 3. 导入纹理
-            imported_textures = {}
-            if config.get("process_textures", True) and texture_count > 0:
-                texture_processor = TextureProcessor(config)
-                imported_textures = texture_processor.organize_textures(assets.get("textures", {}), config["target_path"])
+            if folder_scanner.duplicate_textures:
+                self.log(f"跳过 {len(folder_scanner.duplicate_textures)} 个内容重复的纹理，相关模型将使用相同的纹理资产")
+            for maya_file, maya_textures, missing_textures, references in folder_scanner.maya_dependencies():
+                texture_names = ", ".join(texture_file.file_name for texture_file in maya_textures) or "无"
+                self.log(f"MA文件 {maya_file.file_name} 依赖的纹理: {texture_names}")
+                if missing_textures:
+                    self.log(f"  不在源文件夹中的纹理: {', '.join(missing_textures)}")
+                if references:
+                    self.log(f"  引用的文件: {', '.join(reference.file_name for reference in references)}")
+            if texture_processor:
                 self.log(f"已导入 {len(imported_textures)} 个纹理")
 
             # 更新进度
@@ -394,15 +454,16 @@ class AssetImporterTool:
 
             # 4. 导入FBX和MA文件
             imported_assets = {}
-            asset_processor = AssetProcessor(config)
 
             # 导入FBX文件
             fbx_progress_step = 30 / max(fbx_count, 1)
             for i, asset_file in enumerate(assets.get("fbx", [])):
                 self.update_progress(50 + int((i + 0.5) * fbx_progress_step), f"导入FBX: {asset_file.file_name}")
                 imported_asset = asset_processor.import_asset(asset_file, config["target_path"])
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -412,8 +473,10 @@ class AssetImporterTool:
             for i, asset_file in enumerate(assets.get("ma", [])):
                 self.update_progress(80 + int((i + 0.5) * ma_progress_step), f"导入MA: {asset_file.file_name}")
                 imported_asset = asset_processor.import_maya_file(asset_file, config["target_path"])
-                if imported_asset:
-                    imported_assets[asset_file.file_path] = imported_asset
+                if asset_file.key in asset_processor.mapped_meshes:
+                    self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+                elif imported_asset:
+                    imported_assets[asset_file.key] = imported_asset
                     self.log(f"已导入: {asset_file.file_name}")
                 else:
                     self.log(f"导入失败: {asset_file.file_name}")
@@ -428,7 +491,7 @@ class AssetImporterTool:
             if config.get("create_materials", True):
                 material_creator = MaterialCreator(config)
                 created_materials = material_creator.create_materials_for_assets(
-                    assets, imported_assets, imported_textures, config["target_path"]
+                    assets, imported_assets, imported_textures, config["target_path"], folder_scanner.texture_links
                 )
                 self.log(f"已创建 {len(created_materials)} 个材质实例")
 
@@ -454,6 +517,9 @@ class AssetImporterTool:
         finally:
             # 重新启用导入按钮
             unreal.PythonBPLib.set_is_enabled(self.import_button, True)
+            # 停止MA文件转换的mayapy进程
+            if asset_processor is not None:
+                asset_processor.stop_maya_conversion()
 
     def update_progress(self, value, text):
         """
@@ -476,18 +542,7 @@ class AssetImporterTool:
             return
 
         # 收集当前配置
-        config = {
-            "process_textures": unreal.PythonBPLib.is_checked(self.process_textures_checkbox),
-            "create_materials": unreal.PythonBPLib.is_checked(self.create_materials_checkbox),
-            "organize_folders": unreal.PythonBPLib.is_checked(self.organize_folders_checkbox),
-            "compress_textures": unreal.PythonBPLib.is_checked(self.compress_textures_checkbox),
-            "target_path": unreal.PythonBPLib.get_text(self.target_path_text),
-            "material_template": unreal.PythonBPLib.get_text(self.material_template_text),
-            "import_mode": {
-                "use_specified_folder": unreal.PythonBPLib.is_checked(self.use_specified_folder_radio),
-                "current_browser_folder": unreal.PythonBPLib.get_text(self.browser_folder_text)
-            }
-        }
+        config = self._collect_config()
 
         # 创建调试窗口
         debug_window = unreal.PythonBPLib.create_window(
@@ -586,6 +641,7 @@ class AssetImporterTool:
         # 静态网格信息
         is_static = debug_result['is_static_mesh']
         result += f"是否为静态网格: {'是' if is_static else '否'}\n"
+        result += f"网格类型: {debug_result.get('mesh_type', '未知')}\n"
 
         # 碰撞信息
         collision_info = debug_result['has_collision']
@@ -645,6 +701,20 @@ class AssetImporterTool:
         else:
             result += f"  材质槽信息: {material_slots}\n"
 
+        # 网格统计（只有直接解析FBX时才有）
+        mesh_stats = debug_result.get('mesh_stats')
+        if mesh_stats:
+            result += "\n网格统计:\n"
+            result += f"  三角形数: {mesh_stats['triangles']}\n"
+            result += f"  顶点数: {mesh_stats['vertices']}\n"
+            result += f"  退化三角形数: {mesh_stats['degenerate_triangles']}\n"
+            result += f"  UV通道数: {mesh_stats['uv_channels']}\n"
+
+            bounds = mesh_stats.get('bounds')
+            if bounds:
+                size = ", ".join(f"{high - low:g}" for low, high in zip(bounds['min'], bounds['max']))
+                result += f"  包围盒尺寸: {size}\n"
+
         return result
 
     def log(self, message):
@@ -56,11 +56,11 @@ class AssetOrganizer:
         
         Args:
             assets (dict): 按类型分组的资产字典
-            imported_assets (dict): 导入的资产映射 {资产文件路径: 导入的资产}
+            imported_assets (dict): 导入的资产映射 {资产键(ID或文件路径): 导入的资产}
             target_path (str): 基础目标路径
         
         Returns:
-            dict: 组织后的资产映射 {资产文件路径: 新的资产路径}
+            dict: 组织后的资产映射 {资产键(ID或文件路径): 新的资产路径}
         """
         organized_assets = {}
         
@@ -69,27 +69,27 @@ class AssetOrganizer:
         
         # 组织FBX资产
         for asset_file in assets.get("fbx", []):
-            if asset_file.file_path not in imported_assets:
+            if asset_file.key not in imported_assets:
                 continue
             
-            imported_asset = imported_assets[asset_file.file_path]
+            imported_asset = imported_assets[asset_file.key]
             new_path = self._get_target_path_for_asset(asset_file, target_path)
             
             # 移动资产到目标路径
             if self._move_asset(imported_asset, new_path):
-                organized_assets[asset_file.file_path] = new_path
+                organized_assets[asset_file.key] = new_path
         
         # 组织MA资产（如果有）
         for asset_file in assets.get("ma", []):
-            if asset_file.file_path not in imported_assets:
+            if asset_file.key not in imported_assets:
                 continue
             
-            imported_asset = imported_assets[asset_file.file_path]
+            imported_asset = imported_assets[asset_file.key]
             new_path = self._get_target_path_for_asset(asset_file, target_path)
             
             # 移动资产到目标路径
             if self._move_asset(imported_asset, new_path):
-                organized_assets[asset_file.file_path] = new_path
+                organized_assets[asset_file.key] = new_path
         
         return organized_assets
     
@@ -158,8 +158,8 @@ class AssetOrganizer:
         
         Args:
             assets (dict): 按类型分组的资产字典
-            imported_assets (dict): 导入的资产映射 {资产文件路径: 导入的资产}
-            imported_textures (dict): 导入的纹理映射 {纹理文件路径: 导入的纹理资产}
+            imported_assets (dict): 导入的资产映射 {资产键(ID或文件路径): 导入的资产}
+            imported_textures (dict): 导入的纹理映射 {纹理键(ID或文件路径): 导入的纹理资产}
             created_materials (dict): 创建的材质实例映射 {基础名称: 材质实例}
             target_path (str): 基础目标路径
         
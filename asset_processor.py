@@ -5,12 +5,36 @@
 用于处理不同类型的资产导入
 
 此模块提供了导入FBX、MA文件和其他资产类型的功能，使用Interchange插件API。
+LOD链（MeshLodGroup）导入为一个网格，其余文件作为该网格的LOD导入。
+来自zip压缩包的文件在导入前才解压到本地缓存。
+导入静态网格前先解析FBX内容（见fbx_inspector），关闭文件中不需要的网格构建步骤。
+FBX嵌入的纹理已由扫描提取并通过TextureProcessor导入时，导入FBX不再重复导入这些纹理。
+导入网格前按几何体指纹（见mesh_fingerprint）查找已导入的相同网格，报告重复，并可映射到已有的网格而不再导入。
+MA文件由常驻的mayapy进程（见maya_converter）在后台转换为FBX，之后按FBX导入；转换可以在导入纹理之前提交。
+导入管道按设置从pipeline_cache获取，设置相同的文件共用同一个管道，不再为每个文件复制和删除管道。
 """
 
 import os
 import unreal
 import re
 
+from asset_catalog import AssetFile, MeshLodGroup
+from archive_source import get_archive_cache
+from config_manager import get_cache_dir
+from fbx_debugger import create_fbx_inspector
+from fbx_classifier import classify_fbx_file
+from fbx_media import has_embedded_media
+from maya_converter import MayaConverter, MayaConversionError, find_mayapy
+from mesh_fingerprint import MeshFingerprintRegistry
+from pipeline_cache import PipelineSettings, get_pipeline_cache
+
+# 各资产类型导入后主要资产的类名，用于在目标文件夹中找到导入的网格或动画
+IMPORTED_ASSET_CLASSES = {
+    "static_mesh": "StaticMesh",
+    "skeletal_mesh": "SkeletalMesh",
+    "animation": "AnimSequence"
+}
+
 class AssetProcessor:
     """资产处理类，用于导入不同类型的资产"""
 
@@ -27,6 +51,24 @@ class AssetProcessor:
         self.editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
         self.level_editor_subsystem = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
 
+        # 压缩包成员的解压缓存
+        self.archive_cache = get_archive_cache(get_cache_dir(self.config, "ArchiveCache"))
+
+        # 按设置复用的Interchange导入管道
+        self.pipeline_cache = get_pipeline_cache(self.config)
+
+        # 导入前分析FBX内容的检查器，第一次使用时才创建
+        self.fbx_inspector = None
+
+        # 已导入网格的指纹登记表，第一次使用时才创建
+        self.mesh_registry = None
+
+        # 映射到已有网格而没有导入的文件 {资产文件键: 已有的网格资产路径}
+        self.mapped_meshes = {}
+
+        # MA到FBX的转换队列，第一次使用时才创建；没有找到mayapy或未启用转换时为False
+        self.maya_converter = None
+
         # 启用FBX导入功能（如果需要）
         self._enable_fbx_import()
 
@@ -68,31 +110,36 @@ class AssetProcessor:
             target_path (str): 导入目标路径
 
         Returns:
-            object: 导入的资产对象
+            str: 导入的网格（或动画）的资产路径，映射到已有网格时为已有网格的资产路径，导入失败时为None
         """
-        # 创建临时管道路径
-        transient_path = "/Interchange/Pipelines/Transient/"
-        transient_pipeline_path = transient_path + "CustomAssetPipeline"
+        # 压缩包中的文件先解压到本地缓存
+        local_file_path = self.archive_cache.local_path(asset_file)
 
-        # 删除可能存在的临时管道
-        self.editor_asset_subsystem.delete_directory(transient_path)
+        # 几何体与已导入的网格相同时报告重复，按配置直接使用已有的网格
+        self.mapped_meshes.pop(asset_file.key, None)
+        fingerprint = self._mesh_fingerprint(asset_file, local_file_path)
+        existing_path = self._find_duplicate_mesh(asset_file, fingerprint)
+        if existing_path:
+            self.mapped_meshes[asset_file.key] = existing_path
+            return existing_path
 
-        # 复制默认管道
-        pipeline = self.editor_asset_subsystem.duplicate_asset(
-            "/Interchange/Pipelines/DefaultAssetsPipeline",
-            transient_pipeline_path
-        )
+        # 记录管道设置，设置相同的文件共用同一个管道（见pipeline_cache）
+        settings = PipelineSettings()
 
         # 根据资产类型配置管道
         if asset_file.asset_type == "static_mesh":
-            self._configure_static_mesh_pipeline(pipeline)
+            self._configure_static_mesh_pipeline(settings, self._analyze_fbx(local_file_path))
         elif asset_file.asset_type == "skeletal_mesh":
-            self._configure_skeletal_mesh_pipeline(pipeline)
+            self._configure_skeletal_mesh_pipeline(settings)
         elif asset_file.asset_type == "animation":
-            self._configure_animation_pipeline(pipeline)
+            self._configure_animation_pipeline(settings)
+
+        # 嵌入的纹理已提取到缓存并作为独立的纹理导入，同一张图片不再随每个模型重复导入
+        if self._extracts_embedded_media(asset_file, local_file_path):
+            settings.material_pipeline.texture_pipeline.import_textures = False
 
         # 创建源数据
-        source_data = unreal.InterchangeManager.create_source_data(asset_file.file_path)
+        source_data = unreal.InterchangeManager.create_source_data(local_file_path)
 
         # 创建导入参数
         import_asset_parameters = unreal.ImportAssetParameters()
@@ -100,36 +147,304 @@ class AssetProcessor:
 
         # 添加配置的管道
         import_asset_parameters.override_pipelines.append(
-            unreal.SoftObjectPath(transient_pipeline_path + ".CustomAssetPipeline")
+            unreal.SoftObjectPath(self.pipeline_cache.get("/Interchange/Pipelines/DefaultAssetsPipeline", settings))
         )
 
-        # 获取Interchange管理器并导入资产
+        # 记录导入前目标文件夹中的资产，用于找到新导入的资产
+        existing_assets = set(unreal.EditorAssetLibrary.list_assets(target_path, recursive=False, include_folder=False)
+                              if unreal.EditorAssetLibrary.does_directory_exist(target_path) else [])
+
+        # 获取Interchange管理器并导入资产；import_asset只返回是否成功，需要再查找导入的资产
         interchange_manager = unreal.InterchangeManager.get_interchange_manager_scripted()
-        result = interchange_manager.import_asset(target_path, source_data, import_asset_parameters)
+        imported = interchange_manager.import_asset(target_path, source_data, import_asset_parameters)
+        result = self._resolve_imported_asset(imported, asset_file, target_path, existing_assets)
+
+        # LOD链：把其余文件作为LOD导入到同一个网格
+        if result and isinstance(asset_file, MeshLodGroup):
+            self._import_lods(asset_file, result)
 
-        # 清理临时管道
-        self.editor_asset_subsystem.delete_directory(transient_path)
+        # 记录导入的网格，之后几何体相同的文件可以映射到这个网格
+        if result and fingerprint:
+            self.mesh_registry.record(fingerprint, asset_file.asset_type, result, asset_file.file_path)
 
         return result
 
-    def _configure_static_mesh_pipeline(self, pipeline):
+    def _resolve_imported_asset(self, imported, asset_file, target_path, existing_assets):
+        """
+        获取导入的网格（或动画）的资产路径
+
+        InterchangeManager.import_asset只返回是否成功。优先选择目标文件夹中新出现的对应类型的资产，
+        其中与文件同名的优先；重新导入覆盖已有资产时没有新资产，选择与文件同名的对应类型的资产。
+
+        Args:
+            imported: import_asset的返回值
+            asset_file: FBX资产文件对象
+            target_path (str): 导入目标路径
+            existing_assets (set): 导入前目标文件夹中的资产路径
+
+        Returns:
+            str: 资产路径，导入失败或找不到时返回None
+        """
+        if not imported:
+            return None
+        if isinstance(imported, str):
+            return imported
+        if isinstance(imported, unreal.Object):
+            return imported.get_path_name()
+
+        asset_class = IMPORTED_ASSET_CLASSES.get(asset_file.asset_type)
+        file_stem = os.path.splitext(asset_file.file_name)[0]
+        assets = sorted(unreal.EditorAssetLibrary.list_assets(target_path, recursive=False, include_folder=False))
+        new_assets = [path for path in assets if path not in existing_assets]
+
+        for candidates, require_name in ((new_assets, False), (assets, True)):
+            matching = [path for path in candidates if self._asset_class_name(path) == asset_class]
+            named = [path for path in matching if path.rsplit("/", 1)[-1].split(".")[0] == file_stem]
+            if named:
+                return named[0]
+            if matching and not require_name:
+                return matching[0]
+
+        unreal.log_warning(f"导入成功，但在 {target_path} 中找不到 {asset_file.file_name} 导入的{asset_class}资产")
+        return None
+
+    def _asset_class_name(self, asset_path):
+        """
+        从资产注册表获取资产的类名，不加载资产
+
+        Args:
+            asset_path (str): 资产路径
+
+        Returns:
+            str: 类名，例如StaticMesh
+        """
+        asset_data = unreal.EditorAssetLibrary.find_asset_data(asset_path)
+        class_path = getattr(asset_data, "asset_class_path", None)
+        if class_path is not None:
+            return str(class_path.asset_name)
+        return str(asset_data.asset_class)
+
+    def _import_lods(self, lod_group, mesh_asset_path):
+        """
+        将LOD链中编号最小的文件之外的文件作为LOD导入到已导入的网格
+
+        Args:
+            lod_group (MeshLodGroup): LOD链
+            mesh_asset_path (str): 已导入的网格体资产路径
+
+        Returns:
+            int: 成功导入的LOD数量
+        """
+        mesh_asset = unreal.EditorAssetLibrary.load_asset(mesh_asset_path)
+        if not mesh_asset:
+            unreal.log_warning(f"无法加载网格体资产，跳过LOD导入: {mesh_asset_path}")
+            return 0
+
+        imported_count = 0
+        for lod_slot, (lod_index, file_name) in enumerate(lod_group.lods[1:], start=1):
+            lod_path = self.archive_cache.extract(os.path.join(lod_group.directory, file_name))
+            try:
+                if isinstance(mesh_asset, unreal.StaticMesh):
+                    static_mesh_subsystem = unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem)
+                    result_index = static_mesh_subsystem.import_lod(mesh_asset, lod_slot, lod_path)
+                elif isinstance(mesh_asset, unreal.SkeletalMesh):
+                    result_index = unreal.EditorSkeletalMeshLibrary.import_lod(mesh_asset, lod_slot, lod_path)
+                else:
+                    unreal.log_warning(f"不支持为此类资产导入LOD: {mesh_asset_path}")
+                    return imported_count
+            except Exception as e:
+                unreal.log_error(f"导入LOD{lod_index}时出错: {file_name}: {e}")
+                continue
+
+            if result_index is not None and result_index < 0:
+                unreal.log_warning(f"导入LOD{lod_index}失败: {file_name}")
+                continue
+
+            imported_count += 1
+
+        if imported_count:
+            unreal.EditorAssetLibrary.save_loaded_asset(mesh_asset)
+            unreal.log(f"已为 {lod_group.base_name} 导入 {imported_count + 1} 级LOD")
+
+        return imported_count
+
+    def _extracts_embedded_media(self, asset_file, fbx_file_path):
+        """
+        检查FBX嵌入的纹理是否已由扫描提取（压缩包中的成员不提取）
+
+        Args:
+            asset_file: FBX资产文件对象
+            fbx_file_path (str): 本地FBX文件路径
+
+        Returns:
+            bool: 启用了extract_embedded_media且文件中有嵌入的媒体时为True
+        """
+        if not self.config.get("folder_scan", {}).get("extract_embedded_media", True):
+            return False
+        if fbx_file_path != asset_file.file_path:
+            return False
+        return has_embedded_media(fbx_file_path)
+
+    def _mesh_fingerprint(self, asset_file, fbx_file_path):
+        """
+        获取FBX文件的几何体指纹，用于查找重复的网格
+
+        LOD链的各级LOD导入到同一个网格，不参与查找。
+
+        Args:
+            asset_file: FBX资产文件对象
+            fbx_file_path (str): 本地FBX文件路径
+
+        Returns:
+            str: 几何体指纹，关闭重复检测、不是网格或解析失败时返回None
+        """
+        if not self.config.get("fbx_import", {}).get("duplicate_meshes", {}).get("detect", True):
+            return None
+        if asset_file.asset_type not in ("static_mesh", "skeletal_mesh") or isinstance(asset_file, MeshLodGroup):
+            return None
+
+        # 与检查结果缓存一样，SQLite连接只能在创建它的线程中使用
+        if self.fbx_inspector is None:
+            self.fbx_inspector = create_fbx_inspector(self.config)
+        if self.mesh_registry is None:
+            registry_dir = get_cache_dir(self.config, "MeshFingerprints")
+            self.mesh_registry = MeshFingerprintRegistry(os.path.join(registry_dir, "registry.sqlite"))
+
+        fbx_info = self.fbx_inspector.inspect(fbx_file_path)
+        if "error" in fbx_info:
+            return None
+        return fbx_info.get("geometry_fingerprint")
+
+    def _find_duplicate_mesh(self, asset_file, fingerprint):
+        """
+        查找几何体相同的已导入网格
+
+        找到时记录警告；只有启用map_to_existing时才返回已有网格的路径。
+        登记表中的资产已被删除时删除这条记录。
+
+        Args:
+            asset_file: FBX资产文件对象
+            fingerprint (str): 几何体指纹
+
+        Returns:
+            str: 要使用的已有网格资产路径，不映射时返回None
+        """
+        if not fingerprint:
+            return None
+
+        match = self.mesh_registry.find(fingerprint, asset_file.asset_type)
+        if match is None:
+            return None
+
+        existing_path, source_path = match
+        if source_path == asset_file.file_path:
+            return None
+        if not unreal.EditorAssetLibrary.does_asset_exist(existing_path):
+            self.mesh_registry.forget(fingerprint, asset_file.asset_type)
+            return None
+
+        map_to_existing = self.config.get("fbx_import", {}).get("duplicate_meshes", {}).get("map_to_existing", False)
+        if map_to_existing:
+            unreal.log_warning(f"{asset_file.file_name} 与 {source_path} 几何体相同，使用已有的网格: {existing_path}")
+            return existing_path
+
+        unreal.log_warning(f"{asset_file.file_name} 与 {source_path} 几何体相同（已导入为 {existing_path}）")
+        return None
+
+    def _analyze_fbx(self, fbx_file_path):
+        """
+        导入前解析FBX文件内容，用于调整管道设置
+
+        Args:
+            fbx_file_path (str): 本地FBX文件路径
+
+        Returns:
+            dict: FbxInspector的检查结果，关闭自动调整或解析失败时返回None
+        """
+        if not self.config.get("fbx_import", {}).get("auto_tune", True):
+            return None
+
+        # 检查结果缓存的SQLite连接只能在创建它的线程中使用，监视模式下导入在后台线程中进行
+        if self.fbx_inspector is None:
+            self.fbx_inspector = create_fbx_inspector(self.config)
+
+        fbx_info = self.fbx_inspector.inspect(fbx_file_path)
+        if "error" in fbx_info:
+            unreal.log_warning(f"导入前分析FBX失败，使用配置中的管道设置: {fbx_info['error']}")
+            return None
+        return fbx_info
+
+    def _tune_static_mesh_settings(self, static_mesh_config, fbx_info):
+        """
+        根据FBX内容调整静态网格的构建设置
+
+        配置中的设置是上限：只会关闭文件中不需要的步骤，不会打开配置中关闭的步骤。
+
+        Args:
+            static_mesh_config (dict): 配置中的静态网格导入设置
+            fbx_info (dict): FbxInspector的检查结果，为None时直接使用配置中的设置
+
+        Returns:
+            dict: generate_lightmap_uvs、auto_generate_collision、remove_degenerates和build_nanite
+        """
+        settings = {
+            "generate_lightmap_uvs": static_mesh_config.get("generate_lightmap_uvs", True),
+            "auto_generate_collision": static_mesh_config.get("auto_generate_collision", True),
+            "remove_degenerates": static_mesh_config.get("remove_degenerates", True),
+            "build_nanite": static_mesh_config.get("build_nanite", True)
+        }
+        if fbx_info is None:
+            return settings
+
+        skipped = []
+        render_meshes = [mesh for mesh in fbx_info["meshes"] if mesh["has_geometry"] and not mesh["is_collision"]]
+
+        # 所有网格都有第二套UV时直接用作光照贴图UV
+        if settings["generate_lightmap_uvs"] and render_meshes and all(
+                mesh["uv_channels"] >= 2 for mesh in render_meshes):
+            settings["generate_lightmap_uvs"] = False
+            skipped.append("已有第二套UV，不生成光照贴图UV")
+
+        # 文件中已有UCX_/UBX_/USP_/UCP_碰撞网格
+        if settings["auto_generate_collision"] and fbx_info["has_collision"]["has_custom_collision"]:
+            settings["auto_generate_collision"] = False
+            skipped.append("已有自定义碰撞网格，不自动生成碰撞")
+
+        if settings["remove_degenerates"] and fbx_info["mesh_stats"]["degenerate_triangles"] == 0:
+            settings["remove_degenerates"] = False
+            skipped.append("没有退化三角形，不移除退化三角形")
+
+        # 三角形较少的网格使用Nanite没有收益
+        nanite_min_triangles = static_mesh_config.get("nanite_min_triangles", 10000)
+        if settings["build_nanite"] and fbx_info["triangle_count"] < nanite_min_triangles:
+            settings["build_nanite"] = False
+            skipped.append(f"三角形数量 {fbx_info['triangle_count']} 少于 {nanite_min_triangles}，不启用Nanite")
+
+        if skipped:
+            unreal.log(f"{fbx_info['file_name']}: {'；'.join(skipped)}")
+        return settings
+
+    def _configure_static_mesh_pipeline(self, pipeline, fbx_info=None):
         """
         配置静态网格导入管道
 
         Args:
             pipeline: 要配置的管道对象
+            fbx_info (dict, optional): 导入前分析得到的FBX内容，用于关闭不需要的构建步骤
         """
         # 设置为静态网格
         pipeline.common_meshes_properties.force_all_mesh_as_type = unreal.InterchangeForceMeshType.IFMT_STATIC_MESH
 
         # 获取静态网格导入设置
         static_mesh_config = self.config.get("fbx_import", {}).get("static_mesh", {})
+        settings = self._tune_static_mesh_settings(static_mesh_config, fbx_info)
 
         # 应用设置
         pipeline.mesh_pipeline.combine_static_meshes = static_mesh_config.get("combine_meshes", False)
-        pipeline.mesh_pipeline.generate_lightmap_uvs = static_mesh_config.get("generate_lightmap_uvs", True)
-        pipeline.mesh_pipeline.auto_generate_collision = static_mesh_config.get("auto_generate_collision", True)
-        pipeline.mesh_pipeline.remove_degenerates = static_mesh_config.get("remove_degenerates", True)
+        pipeline.mesh_pipeline.generate_lightmap_uvs = settings["generate_lightmap_uvs"]
+        pipeline.mesh_pipeline.auto_generate_collision = settings["auto_generate_collision"]
+        pipeline.mesh_pipeline.remove_degenerates = settings["remove_degenerates"]
+        pipeline.mesh_pipeline.build_nanite = settings["build_nanite"]
 
         # 设置材质导入选项
         self._configure_material_pipeline(pipeline)
@@ -268,16 +583,90 @@ class AssetProcessor:
         """
         导入Maya文件
 
+        MA文件先由mayapy转换为FBX（已由start_maya_conversion提交时等待其结果），再按FBX导入，
+        网格类型由转换得到的FBX内容决定。
+
         Args:
             asset_file: Maya资产文件对象
             target_path (str): 导入目标路径
 
         Returns:
-            object: 导入的资产对象
+            object: 导入的资产对象，映射到已有网格时为已有网格的资产路径
         """
-        # Maya文件需要先转换为FBX
-        # 这里可以调用Maya的命令行工具进行转换
-        # 由于这需要Maya的安装和额外设置，这里只提供一个示例框架
+        self.mapped_meshes.pop(asset_file.key, None)
 
-        unreal.log_warning("Maya文件导入需要先转换为FBX格式。请使用Maya导出为FBX后再导入。")
-        return None
+        converter = self._get_maya_converter()
+        if not converter:
+            unreal.log_warning("Maya文件导入需要先转换为FBX格式。未找到mayapy，请设置maya_conversion.mayapy_path，"
+                               "或使用Maya导出为FBX后再导入。")
+            return None
+
+        try:
+            conversion = converter.submit(self.archive_cache.local_path(asset_file)).result()
+        except (MayaConversionError, OSError) as e:
+            unreal.log_error(f"Maya文件转换为FBX失败: {asset_file.file_path}: {e}")
+            return None
+
+        if conversion.cached:
+            unreal.log(f"使用缓存中转换好的FBX: {asset_file.file_name}")
+        fbx_file = AssetFile(
+            conversion.fbx_path, classify_fbx_file(conversion.fbx_path, "static_mesh"), asset_file.base_name
+        )
+        result = self.import_fbx(fbx_file, target_path)
+
+        # 几何体相同而映射到已有网格时按MA文件记录
+        if fbx_file.key in self.mapped_meshes:
+            self.mapped_meshes[asset_file.key] = self.mapped_meshes.pop(fbx_file.key)
+        return result
+
+    def start_maya_conversion(self, asset_files):
+        """
+        提交MA文件，在后台转换为FBX，调用方可以同时导入纹理
+
+        Args:
+            asset_files (list): MA资产文件对象列表
+
+        Returns:
+            int: 提交的文件数，没有找到mayapy或未启用转换时为0
+        """
+        converter = self._get_maya_converter()
+        if not converter:
+            return 0
+
+        submitted = 0
+        for asset_file in asset_files:
+            try:
+                converter.submit(self.archive_cache.local_path(asset_file))
+                submitted += 1
+            except OSError as e:
+                unreal.log_warning(f"无法提交Maya文件转换: {asset_file.file_path}: {e}")
+        return submitted
+
+    def stop_maya_conversion(self):
+        """停止转换队列和mayapy进程，尚未开始的转换被取消"""
+        if self.maya_converter:
+            self.maya_converter.close()
+        self.maya_converter = None
+
+    def _get_maya_converter(self):
+        """
+        获取MA到FBX的转换队列，第一次调用时根据maya_conversion配置创建
+
+        Returns:
+            MayaConverter: 转换队列，没有找到mayapy或未启用转换时为False
+        """
+        if self.maya_converter is None:
+            conversion_config = self.config.get("maya_conversion", {})
+            executable = find_mayapy(conversion_config.get("mayapy_path", ""))
+            if not conversion_config.get("enabled", True) or not executable:
+                self.maya_converter = False
+            else:
+                self.maya_converter = MayaConverter(
+                    executable,
+                    get_cache_dir(self.config, "MayaFbxCache"),
+                    script=conversion_config.get("converter_script") or None,
+                    max_workers=conversion_config.get("max_workers", 2),
+                    timeout=conversion_config.get("timeout", 600),
+                    options=conversion_config.get("export_options", {})
+                )
+        return self.maya_converter
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+资产关系模块
+用于按基础名称把模型和纹理分组
+
+此模块为每个(目录范围, 基础名称)建立一个共享的AssetGroup，组内资产只引用所属的组，
+建立关系的时间和内存都与资产数量成线性关系。目录范围可以是同一目录、相邻目录或全局。
+相邻目录范围中，以目录K为键的组包含K及其直接子目录中的资产；每个资产同时属于以所在目录和上级目录为键的两个组，
+因此同一目录、上下级目录（例如A/中的模型和A/Textures/中的纹理）和同级目录中的资产都互相关联。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+
+# 支持的关系范围
+RELATIONSHIP_SCOPES = ("directory", "parent", "global")
+
+
+class AssetGroup:
+    """共享同一基础名称（和目录范围）的一组资产"""
+
+    __slots__ = ("scope_key", "base_name", "members", "member_set", "by_type")
+
+    def __init__(self, scope_key, base_name):
+        """
+        初始化资产组
+
+        Args:
+            scope_key (str): 目录范围的键，全局范围时为空字符串
+            base_name (str): 基础名称
+        """
+        self.scope_key = scope_key
+        self.base_name = base_name
+        self.members = []
+        self.member_set = set()
+        self.by_type = {}
+
+    def add(self, asset_file):
+        """
+        加入资产
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+        """
+        self.members.append(asset_file)
+        self.member_set.add(asset_file)
+        self.by_type.setdefault(asset_file.asset_type, []).append(asset_file)
+
+    def __contains__(self, asset_file):
+        return asset_file in self.member_set
+
+    def replace(self, asset_file, replacement):
+        """
+        用内容相同的资产代替组内的资产，保持成员的顺序
+
+        Args:
+            asset_file (AssetFile): 组内被代替的资产
+            replacement (AssetFile): 代替它的资产，已在组内时只移除asset_file
+        """
+        if asset_file not in self:
+            return
+        self.member_set.discard(asset_file)
+        same_type = self.by_type[asset_file.asset_type]
+        if replacement in self:
+            self.members.remove(asset_file)
+            same_type.remove(asset_file)
+            return
+
+        self.members[self.members.index(asset_file)] = replacement
+        self.member_set.add(replacement)
+        if replacement.asset_type == asset_file.asset_type:
+            same_type[same_type.index(asset_file)] = replacement
+        else:
+            same_type.remove(asset_file)
+            self.by_type.setdefault(replacement.asset_type, []).append(replacement)
+
+    def textures(self, texture_type=None):
+        """
+        获取组内的纹理
+
+        Args:
+            texture_type (str, optional): 纹理类型 (diffuse, normal, etc.)，为None时返回所有纹理
+
+        Returns:
+            list: 纹理AssetFile列表
+        """
+        if texture_type is not None:
+            return list(self.by_type.get(f"texture_{texture_type}", []))
+        return [asset for asset in self.members if asset.asset_type.startswith("texture_")]
+
+    def meshes(self):
+        """
+        获取组内的模型文件（FBX和MA）
+
+        Returns:
+            list: AssetFile列表
+        """
+        return [asset for asset in self.members if asset.extension in (".fbx", ".ma")]
+
+    def __len__(self):
+        return len(self.members)
+
+
+class CombinedGroup:
+    """
+    资产同时所属的多个组，用法与AssetGroup相同
+
+    成员为各组成员的并集，按组的顺序排列并去除重复。
+    """
+
+    __slots__ = ("groups",)
+
+    def __init__(self, groups):
+        """
+        初始化组合的组
+
+        Args:
+            groups (list): AssetGroup列表
+        """
+        self.groups = groups
+
+    @property
+    def base_name(self):
+        """str: 基础名称"""
+        return self.groups[0].base_name
+
+    @property
+    def members(self):
+        """list: 各组成员的并集"""
+        seen = set()
+        members = []
+        for group in self.groups:
+            for asset_file in group.members:
+                if asset_file not in seen:
+                    seen.add(asset_file)
+                    members.append(asset_file)
+        return members
+
+    def __contains__(self, asset_file):
+        return any(asset_file in group for group in self.groups)
+
+    def replace(self, asset_file, replacement):
+        """
+        在每个组中用内容相同的资产代替组内的资产
+
+        Args:
+            asset_file (AssetFile): 被代替的资产
+            replacement (AssetFile): 代替它的资产
+        """
+        for group in self.groups:
+            group.replace(asset_file, replacement)
+
+    def textures(self, texture_type=None):
+        """
+        获取各组中的纹理
+
+        Args:
+            texture_type (str, optional): 纹理类型 (diffuse, normal, etc.)，为None时返回所有纹理
+
+        Returns:
+            list: 纹理AssetFile列表
+        """
+        if texture_type is not None:
+            asset_type = f"texture_{texture_type}"
+            return [asset for asset in self.members if asset.asset_type == asset_type]
+        return [asset for asset in self.members if asset.asset_type.startswith("texture_")]
+
+    def meshes(self):
+        """
+        获取各组中的模型文件（FBX和MA）
+
+        Returns:
+            list: AssetFile列表
+        """
+        return [asset for asset in self.members if asset.extension in (".fbx", ".ma")]
+
+    def __len__(self):
+        return len(self.members)
+
+
+class RelationshipIndex:
+    """资产关系索引类，按(目录范围, 基础名称)维护共享的资产组"""
+
+    def __init__(self, scope="global"):
+        """
+        初始化关系索引
+
+        Args:
+            scope (str, optional): 关系范围，directory（同一目录）、parent（同一目录、上下级目录和同级目录）
+                或global（全局）
+        """
+        if scope not in RELATIONSHIP_SCOPES:
+            raise ValueError(f"无效的关系范围: {scope}")
+        self.scope = scope
+        self.groups = {}
+
+        # 同时属于多个组的资产共用的组合 {((目录范围的键, ...), 基础名称): CombinedGroup}
+        self._combined = {}
+
+    def scope_keys(self, asset_file):
+        """
+        获取资产所属的目录范围
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            tuple: 目录范围的键；parent范围为所在目录和上级目录（位于根目录时只有一个）
+        """
+        if self.scope == "directory":
+            return (asset_file.directory,)
+        if self.scope == "parent":
+            parent = os.path.dirname(asset_file.directory)
+            if parent == asset_file.directory:
+                return (parent,)
+            return (asset_file.directory, parent)
+        return ("",)
+
+    def _groups_for(self, asset_file):
+        """
+        获取资产所属的组，不存在时创建
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            tuple: (AssetGroup列表, 资产的group：只属于一个组时为该组，否则为CombinedGroup)
+        """
+        keys = self.scope_keys(asset_file)
+        groups = []
+        for scope_key in keys:
+            key = (scope_key, asset_file.base_name)
+            group = self.groups.get(key)
+            if group is None:
+                group = AssetGroup(scope_key, asset_file.base_name)
+                self.groups[key] = group
+            groups.append(group)
+
+        if len(groups) == 1:
+            return groups, groups[0]
+        combined_key = (keys, asset_file.base_name)
+        combined = self._combined.get(combined_key)
+        if combined is None:
+            combined = CombinedGroup(groups)
+            self._combined[combined_key] = combined
+        return groups, combined
+
+    def add(self, asset_file):
+        """
+        把资产加入对应的组
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            AssetGroup: 资产所属的组（parent范围中为CombinedGroup）
+        """
+        groups, group = self._groups_for(asset_file)
+        for member_group in groups:
+            member_group.add(asset_file)
+        asset_file.group = group
+        return group
+
+    def add_duplicate(self, duplicate_file, canonical_file):
+        """
+        用规范资产代替内容相同的重复资产加入组
+
+        重复资产所在的组会包含规范资产，组内的模型因此关联到规范资产。
+        规范资产可以属于多个组，其group仍指向自身所在的组。
+
+        Args:
+            duplicate_file (AssetFile): 被合并的重复资产
+            canonical_file (AssetFile): 代替它的规范资产
+
+        Returns:
+            AssetGroup: 重复资产所属的组（parent范围中为CombinedGroup）
+        """
+        groups, group = self._groups_for(duplicate_file)
+        for member_group in groups:
+            if canonical_file not in member_group:
+                member_group.add(canonical_file)
+        duplicate_file.group = group
+        if canonical_file.group is None:
+            canonical_file.group = group
+        return group
+
+    def group_of(self, asset_file):
+        """
+        获取资产所属的组
+
+        Args:
+            asset_file (AssetFile): 资产文件对象
+
+        Returns:
+            AssetGroup: 资产所属的组，未加入索引时返回None
+        """
+        return asset_file.group
+
+    def textures_for(self, asset_file, texture_type=None):
+        """
+        获取与模型相关的纹理
+
+        Args:
+            asset_file (AssetFile): 模型文件对象
+            texture_type (str, optional): 纹理类型，为None时返回所有纹理
+
+        Returns:
+            list: 纹理AssetFile列表
+        """
+        group = self.group_of(asset_file)
+        return group.textures(texture_type) if group is not None else []
+
+    def meshes_for(self, texture_file):
+        """
+        获取与纹理相关的模型
+
+        Args:
+            texture_file (AssetFile): 纹理文件对象
+
+        Returns:
+            list: 模型AssetFile列表
+        """
+        group = self.group_of(texture_file)
+        return group.meshes() if group is not None else []
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+资产目录内存基准测试
+
+分别用原先基于__dict__的AssetFile和AssetCatalog中的紧凑AssetFile保存同一批合成文件，
+使用tracemalloc比较两种布局占用的内存。
+
+用法:
+    python benchmarks/bench_asset_catalog.py --files 300000 --directories 3000
+"""
+
+import argparse
+import gc
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asset_catalog import AssetFile, AssetCatalog
+from filename_classifier import FilenameClassifier
+
+
+SUFFIXES = ["_D.png", "_N.png", "_R.tga", "_M.tga", "_SM.fbx", ".ma", ".txt"]
+
+
+class LegacyAssetFile:
+    """原先的AssetFile布局：普通对象，单独保存各个路径字符串和关联资产列表"""
+
+    def __init__(self, file_path, asset_type, base_name):
+        self.file_path = file_path
+        self.asset_type = asset_type
+        self.file_name = os.path.basename(file_path)
+        self.directory = os.path.dirname(file_path)
+        self.extension = os.path.splitext(file_path)[1].lower()
+        self.base_name = base_name
+        self.related_assets = []
+
+
+def iter_entries(root, file_count, directory_count):
+    """
+    逐个生成合成文件的(目录, 文件名, 完整路径)，每次都创建新的字符串，模拟扫描时的情形
+
+    Args:
+        root (str): 根目录
+        file_count (int): 文件数量
+        directory_count (int): 目录数量
+
+    Yields:
+        tuple: (目录, 文件名, 完整路径)
+    """
+    files_per_directory = max(1, file_count // directory_count)
+    for i in range(file_count):
+        directory = os.path.join(root, f"Pack{i // files_per_directory // 50:03d}", f"Folder{i // files_per_directory:05d}")
+        file_name = f"Asset{i:07d}{SUFFIXES[i % len(SUFFIXES)]}"
+        yield directory, file_name, os.path.join(directory, file_name)
+
+
+def measure(build):
+    """
+    测量构建函数分配并保留的内存
+
+    Args:
+        build (callable): 返回需要保留的对象的函数
+
+    Returns:
+        tuple: (保留的对象, 字节数, 耗时秒数)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AssetCatalog内存基准测试")
+    parser.add_argument("--files", type=int, default=300000)
+    parser.add_argument("--directories", type=int, default=3000)
+    args = parser.parse_args()
+
+    root = os.path.join(os.sep, "mnt", "vendor_drop")
+    classifier = FilenameClassifier()
+
+    def build_legacy():
+        assets = []
+        for _, file_name, file_path in iter_entries(root, args.files, args.directories):
+            asset_type, base_name, _ = classifier.classify(file_name)
+            assets.append(LegacyAssetFile(file_path, asset_type, base_name))
+        return assets
+
+    def build_compact():
+        catalog = AssetCatalog()
+        for directory, file_name, file_path in iter_entries(root, args.files, args.directories):
+            asset_type, base_name, extension = classifier.classify(file_name)
+            catalog.add(AssetFile(file_path, asset_type, base_name,
+                                  file_name=file_name, directory=directory, extension=extension))
+        return catalog
+
+    legacy, legacy_bytes, legacy_time = measure(build_legacy)
+    del legacy
+    compact, compact_bytes, compact_time = measure(build_compact)
+
+    print(f"文件: {args.files}, 目录: {args.directories}")
+    print(f"原布局:   {legacy_bytes / 1048576:8.1f} MiB  ({legacy_bytes / args.files:6.0f} B/文件, {legacy_time:.2f} s)")
+    print(f"紧凑布局: {compact_bytes / 1048576:8.1f} MiB  ({compact_bytes / args.files:6.0f} B/文件, {compact_time:.2f} s)")
+    print(f"节省: {(1 - compact_bytes / legacy_bytes) * 100:.0f}%")
+
+    # 核对紧凑布局能还原出相同的路径
+    for asset_id, (_, _, file_path) in enumerate(itertools.islice(iter_entries(root, args.files, args.directories), 1000)):
+        if compact.get(asset_id).file_path != file_path or compact.find(file_path).asset_id != asset_id:
+            print(f"路径不一致: {file_path}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+目录遍历基准测试
+
+在临时目录中生成一棵较深的合成目录树，比较os.walk与DirectoryWalker的耗时，
+并检查两者列出的文件完全一致。可选地为每次os.scandir调用注入延迟，
+模拟SMB等网络共享上的目录列举往返。
+
+用法:
+    python benchmarks/bench_directory_walker.py --depth 4 --fanout 6 --files 20 --latency-ms 2
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from directory_walker import DirectoryWalker
+
+
+SUFFIXES = ["_D.png", "_N.png", "_R.tga", "_SM.fbx", "_SK.fbx", ".ma", ".txt"]
+
+
+def build_tree(root, depth, fanout, files_per_dir):
+    """
+    生成合成目录树
+
+    Args:
+        root (str): 根目录
+        depth (int): 目录深度
+        fanout (int): 每个目录的子目录数量
+        files_per_dir (int): 每个目录的文件数量
+
+    Returns:
+        int: 生成的文件总数
+    """
+    count = 0
+    stack = [(root, 0)]
+    while stack:
+        directory, level = stack.pop()
+        os.makedirs(directory, exist_ok=True)
+        for i in range(files_per_dir):
+            suffix = SUFFIXES[i % len(SUFFIXES)]
+            with open(os.path.join(directory, f"Asset{i:03d}{suffix}"), "wb"):
+                pass
+            count += 1
+        if level < depth:
+            for j in range(fanout):
+                stack.append((os.path.join(directory, f"Folder{j:02d}"), level + 1))
+    return count
+
+
+def walk_with_os_walk(root):
+    """使用os.walk列出所有文件路径"""
+    paths = set()
+    for directory, _, files in os.walk(root):
+        for file_name in files:
+            paths.add(os.path.join(directory, file_name))
+    return paths
+
+
+def walk_with_walker(root, workers):
+    """使用DirectoryWalker列出所有文件路径"""
+    paths = set()
+    for _, entries in DirectoryWalker(workers).walk(root):
+        for entry in entries:
+            paths.add(entry.path)
+    return paths
+
+
+def install_latency(latency_seconds):
+    """为os.scandir注入固定延迟，模拟网络往返"""
+    original_scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(latency_seconds)
+        return original_scandir(path)
+
+    # os.walk内部同样调用os.scandir，因此两种实现承受相同的延迟
+    os.scandir = slow_scandir
+    return original_scandir
+
+
+def timed(function, *args):
+    """执行函数并返回(结果, 耗时秒数)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DirectoryWalker基准测试")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="每次列举目录注入的模拟网络延迟（毫秒）")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="walker_bench_")
+    try:
+        file_count = build_tree(root, args.depth, args.fanout, args.files)
+        print(f"合成目录树: {file_count} 个文件, 深度 {args.depth}, 分支 {args.fanout}")
+
+        if args.latency_ms > 0:
+            install_latency(args.latency_ms / 1000.0)
+            print(f"模拟目录列举延迟: {args.latency_ms} ms")
+
+        reference, os_walk_time = timed(walk_with_os_walk, root)
+        serial, serial_time = timed(walk_with_walker, root, 1)
+        parallel, parallel_time = timed(walk_with_walker, root, args.workers)
+
+        print(f"os.walk:                    {os_walk_time:8.3f} s")
+        print(f"DirectoryWalker (1线程):    {serial_time:8.3f} s")
+        print(f"DirectoryWalker ({args.workers}线程):    {parallel_time:8.3f} s")
+
+        if reference != serial or reference != parallel:
+            print("结果不一致!")
+            return 1
+        print("结果一致")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
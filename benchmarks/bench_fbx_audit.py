@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX批量审计基准测试
+
+用fbx_fixtures生成指定数量的合成FBX（大小不同的二进制7.4压缩文件，分布在多个子文件夹中），
+分别用单进程和多进程的FbxAuditor审计整个文件夹，比较耗时并检查两者的结果一致。
+
+用法:
+    python benchmarks/bench_fbx_audit.py --files 5000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_audit import FbxAuditor, summarize
+from fbx_fixtures import build_scene, write_binary_fbx
+
+
+def create_tree(root, file_count, sizes, seed=0):
+    """
+    创建测试用的FBX文件夹
+
+    Args:
+        root (str): 根目录
+        file_count (int): 文件数量
+        sizes (list): 网格每边的四边形数量的候选值
+        seed (int): 随机种子
+
+    Returns:
+        int: 三角形总数
+    """
+    rng = random.Random(seed)
+    triangles = 0
+    for i in range(file_count):
+        directory = os.path.join(root, f"Pack{i % 50:02d}")
+        os.makedirs(directory, exist_ok=True)
+        quads_per_side = rng.choice(sizes)
+        name = f"Prop{i:05d}_SM"
+        write_binary_fbx(os.path.join(directory, name + ".fbx"), build_scene(name, quads_per_side))
+        triangles += quads_per_side * quads_per_side * 2
+    return triangles
+
+
+def timed_audit(root, workers):
+    """审计文件夹并返回(审计记录, 耗时秒数)"""
+    auditor = FbxAuditor(max_workers=workers)
+    start = time.perf_counter()
+    records = auditor.audit_folder(root)
+    return records, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FBX批量审计基准测试")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 10, 30, 60],
+                        help="网格每边的四边形数量的候选值")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="fbx_audit_bench_")
+    try:
+        triangles = create_tree(root, args.files, args.sizes)
+        print(f"文件: {args.files} 个，网格三角形共 {triangles} 个")
+
+        serial_records, serial_elapsed = timed_audit(root, 1)
+        print(f"  单进程        {serial_elapsed:8.2f} 秒")
+
+        parallel_records, parallel_elapsed = timed_audit(root, args.workers)
+        speedup = serial_elapsed / parallel_elapsed if parallel_elapsed > 0 else 0.0
+        auditor = FbxAuditor(max_workers=args.workers)
+        mode = "" if auditor._use_processes(auditor.find_fbx_files(root)) else "（文件较少，在当前进程中解析）"
+        print(f"  {args.workers:>2} 个进程    {parallel_elapsed:8.2f} 秒  加速 {speedup:.2f}x{mode}")
+
+        def strip_timing(records):
+            return [{k: v for k, v in record.items() if k != "parse_ms"} for record in records]
+
+        if strip_timing(serial_records) != strip_timing(parallel_records):
+            print("结果不一致!")
+            return 1
+
+        summary = summarize(parallel_records)
+        if summary["triangles"] != triangles or summary["errors"]:
+            print(f"统计错误: {summary}")
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
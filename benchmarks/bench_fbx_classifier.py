@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX内容分类基准测试
+
+用fbx_fixtures生成指定数量的合成FBX（大小不同的二进制7.4压缩文件），
+分别用只读取对象头的classify_fbx_file和完整解析后的document_content分类，比较耗时并检查两者的结果一致。
+
+用法:
+    python benchmarks/bench_fbx_classifier.py --files 2000 --sizes 2 10 30 60
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_parser import read_fbx
+from fbx_classifier import classify_fbx_file, document_content, resolve_mesh_type
+from fbx_fixtures import build_scene, write_binary_fbx
+
+
+def create_files(root, file_count, sizes, seed=0):
+    """
+    创建测试用的FBX文件
+
+    Args:
+        root (str): 输出目录
+        file_count (int): 文件数量
+        sizes (list): 网格每边的四边形数量的候选值
+        seed (int): 随机种子
+
+    Returns:
+        list: 文件路径
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(file_count):
+        path = os.path.join(root, f"Prop{i:05d}.fbx")
+        write_binary_fbx(path, build_scene(f"Prop{i:05d}", rng.choice(sizes)))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FBX内容分类基准测试")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 10, 30, 60],
+                        help="网格每边的四边形数量的候选值")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="fbx_classifier_bench_")
+    try:
+        paths = create_files(root, args.files, args.sizes)
+        total_size = sum(os.path.getsize(path) for path in paths)
+        print(f"文件: {len(paths)} 个，共 {total_size / (1024 * 1024):.1f} MB")
+
+        start = time.perf_counter()
+        header_types = [classify_fbx_file(path, "static_mesh") for path in paths]
+        header_elapsed = time.perf_counter() - start
+        print(f"  只读取对象头  {header_elapsed * 1000:9.1f} ms")
+
+        start = time.perf_counter()
+        full_types = [resolve_mesh_type(document_content(read_fbx(path)), "static_mesh") for path in paths]
+        full_elapsed = time.perf_counter() - start
+        speedup = full_elapsed / header_elapsed if header_elapsed > 0 else 0.0
+        print(f"  完整解析      {full_elapsed * 1000:9.1f} ms  对象头快 {speedup:.1f}x")
+
+        if header_types != full_types:
+            print("结果不一致!")
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+大文件FBX延迟读取基准测试
+
+用fbx_fixtures逐个对象写出一个指定大小的二进制FBX（7.5，模拟按分块导出的摄影测量模型：
+每块是一个带起伏的网格，各块共用相同的数组），分别测量：
+只读取对象头（read_fbx_headers）、以内存映射遍历节点树（open_fbx）和完整检查（FbxInspector.inspect）
+的耗时与峰值内存（tracemalloc，包括NumPy分配的内存，不包括内存映射的页面）。
+文件不超过--eager-limit-mb时同时测量完整读入文件的read_fbx，并检查两种方式的检查结果一致。
+
+用法:
+    python benchmarks/bench_fbx_lazy.py --size-mb 4096 --tile-quads 600
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_parser import FbxNode, read_fbx, open_fbx, read_fbx_headers
+from fbx_inspector import FbxInspector
+from fbx_fixtures import build_scene, geometry_node, grid_mesh, model_node, write_streamed_binary_fbx
+
+
+def create_scan(path, size_mb, tile_quads, compress, seed=0):
+    """
+    创建由多个网格分块组成的大文件
+
+    Args:
+        path (str): 输出路径
+        size_mb (float): 目标文件大小（MB）
+        tile_quads (int): 每个分块每边的四边形数量
+        compress (bool): 数组是否使用zlib压缩
+        seed (int): 随机种子
+
+    Returns:
+        int: 分块数量
+    """
+    rng = random.Random(seed)
+    vertices, indices, uvs = grid_mesh(tile_quads, uv_channels=1)
+    for z in range(2, len(vertices), 3):
+        vertices[z] = rng.uniform(-1.0, 1.0)
+
+    # 先写出一个分块估算每块的大小
+    probe_path = path + ".probe"
+    nodes = build_scene("Scan")
+    write_streamed_binary_fbx(probe_path, nodes, [geometry_node(10 ** 6, "Tile", vertices, indices, uvs, None, True)],
+                              compress=compress)
+    tile_size = os.path.getsize(probe_path)
+    os.remove(probe_path)
+    tile_count = max(1, int(size_mb * 1024 * 1024 // tile_size))
+
+    connections = next(node for node in nodes if node.name == "Connections")
+    for tile in range(tile_count):
+        geometry_id, model_id = 10 ** 6 + tile * 2, 10 ** 6 + tile * 2 + 1
+        connections.children.append(FbxNode("C", ["OO", model_id, 0]))
+        connections.children.append(FbxNode("C", ["OO", geometry_id, model_id]))
+
+    def tiles():
+        for tile in range(tile_count):
+            name = f"Scan_Tile{tile:04d}"
+            yield geometry_node(10 ** 6 + tile * 2, name, vertices, indices, uvs, None, True)
+            yield model_node(10 ** 6 + tile * 2 + 1, name, True)
+
+    write_streamed_binary_fbx(path, nodes, tiles(), version=7500, compress=compress)
+    return tile_count
+
+
+def measure(label, function):
+    """执行并输出耗时与峰值内存，返回结果"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<12} {elapsed * 1000:10.1f} ms  峰值内存 {peak / (1024 * 1024):8.1f} MB")
+    return result
+
+
+def count_nodes(node):
+    """统计节点及其所有子节点的数量"""
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大文件FBX延迟读取基准测试")
+    parser.add_argument("--size-mb", type=float, default=1024, help="目标文件大小（MB）")
+    parser.add_argument("--tile-quads", type=int, default=600, help="每个分块每边的四边形数量")
+    parser.add_argument("--raw", action="store_true", help="数组不压缩")
+    parser.add_argument("--eager-limit-mb", type=float, default=256,
+                        help="文件不超过该大小时同时测量完整读入的read_fbx")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="fbx_lazy_bench_")
+    try:
+        path = os.path.join(root, "Scan_SM.fbx")
+        start = time.perf_counter()
+        tile_count = create_scan(path, args.size_mb, args.tile_quads, not args.raw)
+        size = os.path.getsize(path)
+        print(f"文件: {size / (1024 * 1024):.1f} MB，{tile_count} 个分块，生成耗时 {time.perf_counter() - start:.1f} 秒")
+
+        headers = measure("对象头", lambda: read_fbx_headers(path))
+
+        def open_and_count():
+            with open_fbx(path) as document:
+                return sum(count_nodes(node) for node in document.nodes)
+        node_count = measure("节点树", open_and_count)
+        print(f"  对象 {len(headers.objects)} 个，节点 {node_count} 个")
+
+        inspector = FbxInspector()
+        result = measure("完整检查", lambda: inspector.inspect(path))
+        if "error" in result:
+            print(f"检查失败: {result['error']}")
+            return 1
+        print(f"  三角形 {result['triangle_count']} 个，顶点 {result['vertex_count']} 个")
+
+        if size > args.eager_limit_mb * 1024 * 1024:
+            return 0
+
+        eager = measure("完整读入", lambda: inspector.inspect_document(read_fbx(path), path))
+        if eager != result:
+            print("结果不一致!")
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX嵌入媒体提取基准测试
+
+用fbx_fixtures生成指定数量的二进制FBX，每个文件嵌入一张从--images张随机图片中选出的图片，
+测量EmbeddedMediaExtractor第一次提取和命中清单时的耗时与峰值内存（tracemalloc），
+并检查缓存中的文件数量与不同图片的数量一致、每个文件的内容与嵌入的图片相同。
+
+用法:
+    python benchmarks/bench_fbx_media.py --files 200 --images 20 --image-mb 4
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_parser import FbxNode
+from fbx_media import EmbeddedMediaExtractor
+from fbx_fixtures import build_scene, write_binary_fbx
+
+
+def create_files(root, file_count, images, seed=0):
+    """
+    创建嵌入了图片的FBX文件
+
+    Args:
+        root (str): 输出目录
+        file_count (int): 文件数量
+        images (list): 候选图片内容
+        seed (int): 随机种子
+
+    Returns:
+        dict: {文件路径: 嵌入的图片内容}
+    """
+    rng = random.Random(seed)
+    embedded = {}
+    for i in range(file_count):
+        image = rng.choice(images)
+        nodes = build_scene(f"Prop{i:05d}")
+        objects = next(node for node in nodes if node.name == "Objects")
+        video = next(node for node in objects.children if node.name == "Video")
+        video.children.append(FbxNode("Content", [image]))
+
+        path = os.path.join(root, f"Prop{i:05d}.fbx")
+        write_binary_fbx(path, nodes)
+        embedded[path] = image
+    return embedded
+
+
+def timed_extract(extractor, paths):
+    """提取并返回(结果, 耗时秒数, 峰值内存字节数)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = extractor.extract_many(paths)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return results, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FBX嵌入媒体提取基准测试")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--images", type=int, default=20, help="不同图片的数量")
+    parser.add_argument("--image-mb", type=float, default=4.0, help="每张图片的大小（MB）")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    image_size = int(args.image_mb * 1024 * 1024)
+    images = [b"\x89PNG\r\n\x1a\n" + rng.randbytes(image_size) for _ in range(args.images)]
+
+    root = tempfile.mkdtemp(prefix="fbx_media_bench_")
+    try:
+        embedded = create_files(root, args.files, images)
+        del images
+        paths = sorted(embedded)
+        total_size = sum(os.path.getsize(path) for path in paths)
+        print(f"文件: {len(paths)} 个，共 {total_size / (1024 * 1024):.1f} MB")
+
+        extractor = EmbeddedMediaExtractor(os.path.join(root, "cache"))
+        results, elapsed, peak = timed_extract(extractor, paths)
+        print(f"  提取      {elapsed * 1000:9.1f} ms  峰值内存 {peak / (1024 * 1024):.1f} MB")
+
+        cached, cached_elapsed, _ = timed_extract(extractor, paths)
+        print(f"  命中清单  {cached_elapsed * 1000:9.1f} ms")
+
+        unique = {media.cache_path for media_list in results.values() for media in media_list}
+        print(f"  不同图片: {len(unique)} 个（嵌入 {len(set(embedded.values()))} 个）")
+
+        if extractor.failed or cached != results or len(unique) != len(set(embedded.values())):
+            print("结果不一致!")
+            return 1
+        for path, media_list in results.items():
+            with open(media_list[0].cache_path, "rb") as f:
+                if f.read() != embedded[path]:
+                    print(f"内容不一致: {path}")
+                    return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
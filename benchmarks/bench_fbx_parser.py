@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX解析基准测试
+
+用fbx_fixtures生成不同规模的合成FBX（二进制7.4压缩、二进制7.5压缩和ASCII），
+测量FbxInspector直接解析文件得到调试结果的耗时，并检查三种格式得到的结果一致。
+在编辑器中运行时（可以导入unreal），同时测量FbxDebugger.debug_fbx_by_import
+（临时导入到/Temp/FbxDebug后读取资产信息）的耗时作为对比。
+
+用法:
+    python benchmarks/bench_fbx_parser.py --sizes 10 100 500 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_inspector import FbxInspector
+from fbx_fixtures import build_scene, write_binary_fbx, write_ascii_fbx
+
+try:
+    import unreal
+    from fbx_debugger import FbxDebugger
+except ImportError:
+    unreal = None
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def write_variants(directory, quads_per_side):
+    """
+    写出同一场景的三种格式
+
+    Args:
+        directory (str): 输出目录
+        quads_per_side (int): 网格每边的四边形数量
+
+    Returns:
+        list: [(格式名称, 文件路径), ...]
+    """
+    name = f"Grid{quads_per_side}_SM"
+    variants = []
+
+    path = os.path.join(directory, f"{name}_binary74.fbx")
+    write_binary_fbx(path, build_scene(name, quads_per_side, binary=True, version=7400), version=7400)
+    variants.append(("binary 7.4", path))
+
+    path = os.path.join(directory, f"{name}_binary75.fbx")
+    write_binary_fbx(path, build_scene(name, quads_per_side, binary=True, version=7500), version=7500)
+    variants.append(("binary 7.5", path))
+
+    path = os.path.join(directory, f"{name}_ascii.fbx")
+    write_ascii_fbx(path, build_scene(name, quads_per_side, binary=False))
+    variants.append(("ascii", path))
+    return variants
+
+
+def comparable(result):
+    """去掉与文件格式有关的字段，用于比较不同格式的结果"""
+    result = dict(result)
+    for key in ("file_path", "file_name", "fbx_version", "is_binary"):
+        result.pop(key, None)
+    return json.dumps(result, sort_keys=True)
+
+
+def best_time(function, path, repeat):
+    """重复执行并返回(最后一次的结果, 最短耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def check_fixtures(inspector):
+    """检查benchmarks/fixtures中的测试文件得到一致的结果"""
+    results = {}
+    for file_name in sorted(os.listdir(FIXTURES_DIR)):
+        if file_name.lower().endswith(".fbx"):
+            results[file_name] = comparable(inspector.inspect(os.path.join(FIXTURES_DIR, file_name)))
+    return len(set(results.values())) == 1, sorted(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FBX解析基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500],
+                        help="网格每边的四边形数量，三角形数量为其平方的两倍")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    inspector = FbxInspector()
+    consistent, fixture_names = check_fixtures(inspector)
+    print(f"测试文件 {', '.join(fixture_names)}: {'结果一致' if consistent else '结果不一致!'}")
+    if not consistent:
+        return 1
+
+    debugger = FbxDebugger() if unreal is not None else None
+    if debugger is None:
+        print("未在编辑器中运行，跳过临时导入方式的对比")
+
+    root = tempfile.mkdtemp(prefix="fbx_bench_")
+    try:
+        for quads_per_side in args.sizes:
+            triangles = quads_per_side * quads_per_side * 2
+            print(f"\n网格: {triangles} 个三角形")
+
+            reference = None
+            for label, path in write_variants(root, quads_per_side):
+                result, elapsed = best_time(inspector.inspect, path, args.repeat)
+                size_kb = os.path.getsize(path) / 1024
+                print(f"  {label:<11} {size_kb:10.1f} KB  解析 {elapsed * 1000:9.2f} ms")
+
+                if reference is None:
+                    reference = comparable(result)
+                elif comparable(result) != reference:
+                    print("  结果不一致!")
+                    return 1
+
+                if debugger is not None and label == "binary 7.4":
+                    _, import_elapsed = best_time(debugger.debug_fbx_by_import, path, 1)
+                    print(f"  {'临时导入':<9} {'':>13}  耗时 {import_elapsed * 1000:9.2f} ms")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+文件名分类基准测试
+
+生成大量合成文件名，比较FilenameClassifier与原先逐类别、逐模式子串匹配的实现的耗时，
+并核对分类结果。新实现按词元匹配，"_D"不再匹配"_Dirt"这类名称，
+因此结果还会与"按词元匹配的原实现"逐一比对：两者必须完全一致，
+与原实现的差异则全部来自词元匹配规则。
+
+用法:
+    python benchmarks/bench_filename_classifier.py --count 1000000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filename_classifier import (
+    FilenameClassifier, DEFAULT_FILENAME_PATTERNS, MESH_TYPES, TEXTURE_TYPES, TEXTURE_EXTENSIONS
+)
+
+
+WORDS = ["Rock", "Chair", "Table", "Hero", "Wall", "Dirt", "Door", "Metal", "Stone", "Crate", "Barrel", "Tree"]
+NOISE = ["_Dirt", "_Rusty", "_Spec", "_Damaged", "_Mossy", "_Edge", "_01", "_02", "_Small", "_Detail", "_Mask"]
+EXTENSIONS = [".png", ".tga", ".jpg", ".exr", ".fbx", ".fbx", ".ma", ".txt"]
+
+# 原实现中AssetFile._extract_base_name使用的硬编码后缀列表
+LEGACY_SUFFIXES = [
+    "_D", "_Diffuse", "_BaseColor", "_Albedo", "_Color",
+    "_N", "_Normal", "_Norm",
+    "_R", "_Roughness", "_Rough",
+    "_M", "_Metallic", "_Metal",
+    "_S", "_Specular", "_Spec",
+    "_E", "_Emissive", "_Emission",
+    "_SM", "_StaticMesh", "_Model",
+    "_SK", "_SkeletalMesh", "_Character",
+    "_Anim", "_Animation"
+]
+
+
+def generate_names(count, seed):
+    """
+    生成合成文件名
+
+    Args:
+        count (int): 文件名数量
+        seed (int): 随机种子
+
+    Returns:
+        list: 文件名列表
+    """
+    rng = random.Random(seed)
+    all_patterns = [pattern for patterns in DEFAULT_FILENAME_PATTERNS.values() for pattern in patterns]
+    names = []
+    for i in range(count):
+        parts = [rng.choice(WORDS), str(i % 97)]
+        for _ in range(rng.randint(0, 2)):
+            parts.append(rng.choice(NOISE if rng.random() < 0.4 else all_patterns))
+        names.append("".join(parts) + rng.choice(EXTENSIONS))
+    return names
+
+
+def legacy_classify(file_name, patterns, token_aware=False):
+    """
+    原FolderScanner的分类逻辑：逐类别、逐模式判断子串是否出现
+
+    Args:
+        file_name (str): 文件名
+        patterns (dict): 文件名模式
+        token_aware (bool): 是否要求模式后面不紧跟字母
+
+    Returns:
+        tuple: (资产类型, 基础名称)
+    """
+    name_without_ext, extension = os.path.splitext(file_name)
+    extension = extension.lower()
+
+    def match(category):
+        for pattern in patterns.get(category, []):
+            if token_aware:
+                if re.search(re.escape(pattern) + r"(?![A-Za-z])", name_without_ext):
+                    return True
+            elif pattern in name_without_ext:
+                return True
+        return False
+
+    if extension == ".fbx":
+        asset_type = next((mesh_type for mesh_type in MESH_TYPES if match(mesh_type)), "static_mesh")
+    elif extension == ".ma":
+        asset_type = "ma"
+    elif extension in TEXTURE_EXTENSIONS:
+        asset_type = "texture_" + next((texture_type for texture_type in TEXTURE_TYPES if match(texture_type)), "other")
+    else:
+        asset_type = "other"
+
+    base_name = name_without_ext
+    for suffix in LEGACY_SUFFIXES:
+        if name_without_ext.endswith(suffix):
+            base_name = name_without_ext[:-len(suffix)]
+            break
+
+    return asset_type, base_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FilenameClassifier基准测试")
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verify", type=int, default=200000,
+                        help="与按词元匹配的原实现逐一比对的文件名数量（该参照实现较慢）")
+    args = parser.parse_args()
+
+    names = generate_names(args.count, args.seed)
+    print(f"合成文件名: {len(names)} 个")
+
+    classifier = FilenameClassifier(DEFAULT_FILENAME_PATTERNS)
+
+    start = time.perf_counter()
+    new_results = [classifier.classify(name)[:2] for name in names]
+    new_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_results = [legacy_classify(name, DEFAULT_FILENAME_PATTERNS) for name in names]
+    legacy_time = time.perf_counter() - start
+
+    print(f"原实现:             {legacy_time:8.3f} s")
+    print(f"FilenameClassifier: {new_time:8.3f} s  ({legacy_time / new_time:.1f}x)")
+
+    same = sum(1 for new, legacy in zip(new_results, legacy_results) if new == legacy)
+    print(f"与原实现一致: {same}/{len(names)}（差异来自词元匹配）")
+
+    unexplained = 0
+    for name, new in zip(names[:args.verify], new_results[:args.verify]):
+        if new != legacy_classify(name, DEFAULT_FILENAME_PATTERNS, token_aware=True):
+            unexplained += 1
+            if unexplained <= 10:
+                print(f"  无法解释的差异: {name} -> {new}")
+
+    print(f"与按词元匹配的原实现比对 {min(args.verify, len(names))} 个文件名, 不一致 {unexplained} 个")
+    return 1 if unexplained else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
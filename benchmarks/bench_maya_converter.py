@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+MA到FBX转换队列基准测试
+
+用一个替身转换脚本代替mayapy（用当前的Python运行，实现与maya_fbx_export.py相同的协议）：
+第一个任务前等待--startup秒模拟Maya初始化，每个任务等待--export秒后复制一个fbx_fixtures生成的FBX。
+分别测量单个工作进程、--workers个工作进程、提交后同时在主线程中"导入纹理"（等待--textures秒）
+以及全部命中缓存时的耗时，并检查：
+输出都是有效的FBX、命中缓存时不启动工作进程、转换脚本报告的错误和工作进程崩溃都作为
+MayaConversionError返回，崩溃后的下一个任务由新的工作进程完成。
+
+用法:
+    python benchmarks/bench_maya_converter.py --files 24 --workers 4 --startup 2 --export 0.5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_parser import read_fbx_headers
+from maya_converter import MayaConverter, MayaConversionError
+from fbx_fixtures import build_scene, write_binary_fbx
+
+# 替身转换脚本：协议与maya_fbx_export.py相同，行为由任务的options控制
+STAND_IN_SCRIPT = r'''
+import json
+import shutil
+import sys
+import time
+
+RESULT_PREFIX = "@@MAYA_FBX_RESULT "
+started = False
+for line in sys.stdin:
+    line = line.strip()
+    if not line:
+        break
+    job = json.loads(line)
+    options = job["options"]
+    if not started:
+        print("stand-in: initializing")
+        time.sleep(options["startup_seconds"])
+        started = True
+    time.sleep(options["export_seconds"])
+    name = job["source"].replace("\\", "/").rsplit("/", 1)[-1]
+    if "crash" in name:
+        sys.exit(3)
+    if "broken" in name:
+        result = {"ok": False, "error": "cannot open scene"}
+    else:
+        shutil.copyfile(options["template"], job["output"])
+        result = {"ok": True}
+    sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+    sys.stdout.flush()
+'''
+
+
+def create_scenes(root, count):
+    """
+    创建内容各不相同的.ma文件
+
+    Args:
+        root (str): 输出目录
+        count (int): 文件数量
+
+    Returns:
+        list: 文件路径列表
+    """
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"Prop{i:03d}.ma")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("//Maya ASCII 2024 scene\n")
+            f.write('requires maya "2024";\n')
+            f.write(f'createNode transform -n "Prop{i:03d}";\n')
+        paths.append(path)
+    return paths
+
+
+def run(converter, paths, main_thread_seconds=0.0):
+    """
+    提交所有文件，主线程等待main_thread_seconds秒（模拟导入纹理）后再等待结果
+
+    Returns:
+        tuple: (ConversionResult列表, 耗时秒数)
+    """
+    start = time.perf_counter()
+    futures = [converter.submit(path) for path in paths]
+    if main_thread_seconds:
+        time.sleep(main_thread_seconds)
+    results = [future.result() for future in futures]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MA到FBX转换队列基准测试")
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--startup", type=float, default=2.0, help="模拟Maya初始化的秒数")
+    parser.add_argument("--export", type=float, default=0.5, help="模拟每个文件导出的秒数")
+    parser.add_argument("--textures", type=float, default=3.0, help="模拟主线程导入纹理的秒数")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="maya_converter_bench_")
+    try:
+        script = os.path.join(root, "stand_in_converter.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(STAND_IN_SCRIPT)
+        template = os.path.join(root, "template.fbx")
+        write_binary_fbx(template, build_scene("Prop"))
+        options = {"template": template, "startup_seconds": args.startup, "export_seconds": args.export}
+        scene_dir = os.path.join(root, "scenes")
+        os.makedirs(scene_dir)
+        scenes = create_scenes(scene_dir, args.files)
+
+        def converter(name, workers):
+            return MayaConverter(sys.executable, os.path.join(root, name), script=script,
+                                 max_workers=workers, timeout=60, options=options)
+
+        with converter("serial", 1) as serial:
+            _, serial_elapsed = run(serial, scenes)
+        print(f"  1 个工作进程      {serial_elapsed:8.2f} 秒")
+
+        with converter("pool", args.workers) as pool:
+            results, pool_elapsed = run(pool, scenes)
+        print(f"  {args.workers} 个工作进程      {pool_elapsed:8.2f} 秒")
+        for result in results:
+            headers = read_fbx_headers(result.fbx_path)
+            if result.cached or not headers.objects:
+                print(f"输出无效: {result.fbx_path}")
+                return 1
+
+        with converter("overlap", args.workers) as overlap:
+            _, overlap_elapsed = run(overlap, scenes, args.textures)
+        print(f"  同时导入纹理      {overlap_elapsed:8.2f} 秒（依次进行约 {args.textures + pool_elapsed:.2f} 秒）")
+
+        with converter("pool", args.workers) as cached:
+            cached_results, cached_elapsed = run(cached, scenes)
+        print(f"  命中缓存          {cached_elapsed:8.2f} 秒")
+        # 启动工作进程至少需要--startup秒
+        if not all(result.cached for result in cached_results) or cached_elapsed >= args.startup:
+            print("缓存未命中!")
+            return 1
+        if [result.fbx_path for result in cached_results] != [result.fbx_path for result in results]:
+            print("缓存路径不一致!")
+            return 1
+
+        # 转换脚本报告的错误和工作进程崩溃，替身脚本按文件名决定
+        broken = shutil.copyfile(scenes[0], os.path.join(root, "broken.ma"))
+        crash = shutil.copyfile(scenes[1], os.path.join(root, "crash.ma"))
+        with converter("errors", 1) as errors:
+            failures = 0
+            for path in (broken, crash):
+                try:
+                    errors.convert(path)
+                except MayaConversionError as e:
+                    failures += 1
+                    print(f"  预期的错误: {os.path.basename(path)}: {str(e).splitlines()[0]}")
+            recovered = errors.convert(scenes[2])
+        if failures != 2 or recovered.cached or not os.path.isfile(recovered.fbx_path):
+            print("错误处理不正确!")
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
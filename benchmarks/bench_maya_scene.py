@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Maya场景读取基准测试
+
+生成一个指定大小的Maya ASCII场景：--meshes个网格，每个网格有大段的顶点和面数据（setAttr），
+一个带file纹理节点（经过bump2d连接法线）的材质和着色组，以及若干引用的场景。
+测量maya_scene.read_maya_scene的耗时与峰值内存（tracemalloc，单独读取一次），
+并检查读取到的材质槽、纹理引用和引用文件的数量与生成的场景一致。
+
+用法:
+    python benchmarks/bench_maya_scene.py --size-mb 500 --meshes 200
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maya_scene import read_maya_scene
+
+
+def write_mesh(f, name, vertex_count, rng):
+    """写出一个网格节点，顶点数据按Maya的格式每行6个数值"""
+    f.write(f'createNode transform -n "{name}";\n')
+    f.write(f'createNode mesh -n "{name}Shape" -p "{name}";\n')
+    f.write(f'\tsetAttr -s {vertex_count} ".vt";\n')
+    f.write(f'\tsetAttr ".vt[0:{vertex_count - 1}]"')
+    for i in range(0, vertex_count * 3, 6):
+        values = " ".join(f"{rng.uniform(-100, 100):.6f}" for _ in range(min(6, vertex_count * 3 - i)))
+        f.write(f"\n\t\t {values}")
+    f.write(";\n")
+    f.write(f'\tsetAttr ".notes" -type "string" "mesh {name}; exported \\"as is\\"\nsecond line; fileTextureName";\n')
+
+
+def write_material(f, name, shapes):
+    """写出材质、纹理节点、着色组以及它们之间的连接"""
+    f.write(f'createNode lambert -n "{name}_MAT";\n')
+    f.write(f'createNode shadingEngine -n "{name}_SG";\n')
+    f.write(f'createNode file -n "{name}_color";\n')
+    f.write(f'\tsetAttr ".ftn" -type "string" "sourceimages/{name}_D.png";\n')
+    f.write(f'createNode file -n "{name}_normal";\n')
+    f.write(f'\tsetAttr ".ftn" -type "string" "sourceimages/{name}_N.png";\n')
+    f.write(f'createNode bump2d -n "{name}_bump";\n')
+    f.write(f'connectAttr "{name}_color.oc" "{name}_MAT.c";\n')
+    f.write(f'connectAttr "{name}_normal.oa" "{name}_bump.bv";\n')
+    f.write(f'connectAttr "{name}_bump.o" "{name}_MAT.n";\n')
+    f.write(f'connectAttr "{name}_MAT.oc" "{name}_SG.ss";\n')
+    for shape in shapes:
+        f.write(f'connectAttr "{shape}.iog" "{name}_SG.dsm" -na;\n')
+
+
+def create_scene(path, size_mb, mesh_count, references, seed=0):
+    """
+    创建Maya ASCII场景
+
+    Args:
+        path (str): 输出路径
+        size_mb (float): 目标文件大小（MB）
+        mesh_count (int): 网格数量，每个网格使用一个材质
+        references (int): 引用的场景数量
+        seed (int): 随机种子
+    """
+    rng = random.Random(seed)
+    # 每个顶点约33字节
+    vertex_count = max(1, int(size_mb * 1024 * 1024 / mesh_count / 33))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("//Maya ASCII 2024 scene\n//Name: bench.ma\n")
+        for i in range(references):
+            f.write(f'file -rdi 1 -ns "ref{i}" -rfn "ref{i}RN" -typ "mayaAscii" "scenes/ref{i}.ma";\n')
+            f.write(f'file -r -ns "ref{i}" -dr 1 -rfn "ref{i}RN" -typ "mayaAscii" "scenes/ref{i}.ma";\n')
+        f.write('requires maya "2024";\n')
+        for i in range(mesh_count):
+            write_mesh(f, f"Mesh{i:04d}", vertex_count, rng)
+        for i in range(mesh_count):
+            write_material(f, f"Mesh{i:04d}", [f"Mesh{i:04d}Shape"])
+        f.write("// End of bench.ma\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maya场景读取基准测试")
+    parser.add_argument("--size-mb", type=float, default=200, help="目标文件大小（MB）")
+    parser.add_argument("--meshes", type=int, default=100, help="网格数量")
+    parser.add_argument("--references", type=int, default=5, help="引用的场景数量")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="maya_scene_bench_")
+    try:
+        path = os.path.join(root, "bench.ma")
+        start = time.perf_counter()
+        create_scene(path, args.size_mb, args.meshes, args.references)
+        print(f"文件: {os.path.getsize(path) / (1024 * 1024):.1f} MB，生成耗时 {time.perf_counter() - start:.1f} 秒")
+
+        start = time.perf_counter()
+        scene = read_maya_scene(path)
+        elapsed = time.perf_counter() - start
+
+        # tracemalloc会明显拖慢逐行读取，峰值内存单独再读取一次测量
+        tracemalloc.start()
+        read_maya_scene(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  读取 {elapsed * 1000:10.1f} ms  峰值内存 {peak / (1024 * 1024):8.1f} MB")
+
+        reference_count = sum(len(slot.textures) for slot in scene.slots)
+        print(f"  材质槽 {len(scene.slots)} 个，纹理引用 {reference_count} 个，引用文件 {len(scene.references)} 个")
+        if (len(scene.slots) != args.meshes or reference_count != args.meshes * 2
+                or len(scene.references) != args.references):
+            print("结果不一致!")
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网格指纹基准测试
+
+用fbx_fixtures生成一组套件式的FBX：--unique种几何体，每种以不同名称导出--copies份，
+一半为二进制、一半为ASCII。用FbxInspector计算每个文件的几何体指纹，
+检查不同指纹的数量与几何体的种类一致（名称和文件格式不影响指纹），
+并测量mesh_fingerprint.geometry_fingerprint在大网格上的耗时；
+安装了NumPy时同时测量纯Python实现作为对比，并检查两者的结果一致。
+
+用法:
+    python benchmarks/bench_mesh_fingerprint.py --unique 20 --copies 10 --triangles 100000 1000000
+"""
+
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mesh_fingerprint
+from fbx_inspector import FbxInspector
+from fbx_fixtures import build_scene, write_binary_fbx, write_ascii_fbx, geometry_node, grid_mesh
+
+
+def create_kit(root, unique, copies):
+    """
+    创建套件式的FBX文件
+
+    Args:
+        root (str): 输出目录
+        unique (int): 几何体的种类数量
+        copies (int): 每种几何体的文件数量
+
+    Returns:
+        dict: {文件路径: 几何体编号}
+    """
+    kit = {}
+    for i in range(unique):
+        for copy in range(copies):
+            name = f"Kit{i:03d}_Var{copy:03d}_SM"
+            binary = copy % 2 == 0
+            path = os.path.join(root, f"{name}.fbx")
+            nodes = build_scene(name, quads_per_side=i + 1, binary=binary)
+            if binary:
+                write_binary_fbx(path, nodes)
+            else:
+                write_ascii_fbx(path, nodes)
+            kit[path] = i
+    return kit
+
+
+def timed_fingerprint(node, repeat):
+    """重复计算指纹并返回(结果, 最短耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = mesh_fingerprint.geometry_fingerprint(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格指纹基准测试")
+    parser.add_argument("--unique", type=int, default=20, help="几何体的种类数量")
+    parser.add_argument("--copies", type=int, default=10, help="每种几何体的文件数量")
+    parser.add_argument("--triangles", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mesh_fingerprint_bench_")
+    try:
+        kit = create_kit(root, args.unique, args.copies)
+        inspector = FbxInspector()
+        start = time.perf_counter()
+        fingerprints = {path: inspector.inspect(path)["geometry_fingerprint"] for path in kit}
+        elapsed = time.perf_counter() - start
+        print(f"文件: {len(kit)} 个  检查 {elapsed * 1000:9.1f} ms  不同指纹 {len(set(fingerprints.values()))} 个"
+              f"（几何体 {args.unique} 种）")
+
+        groups = {}
+        for path, index in kit.items():
+            groups.setdefault(index, set()).add(fingerprints[path])
+        if any(len(group) != 1 for group in groups.values()) or len(set(fingerprints.values())) != args.unique:
+            print("指纹与几何体不对应!")
+            return 1
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    numpy_module = mesh_fingerprint.np
+    if numpy_module is None:
+        print("未安装NumPy，只测量纯Python实现")
+
+    for triangles in args.triangles:
+        vertices, indices, uvs = grid_mesh(max(1, int(math.sqrt(triangles / 2))), uv_channels=2)
+        node = geometry_node(1, "Bench", vertices, indices, uvs, None, True)
+        result, elapsed = timed_fingerprint(node, args.repeat)
+        label = "NumPy" if numpy_module is not None else "纯Python"
+        print(f"{len(indices) // 2:>10} 个三角形  {label:<8} {elapsed * 1000:9.1f} ms")
+
+        if numpy_module is None:
+            continue
+
+        mesh_fingerprint.np = None
+        try:
+            python_result, python_elapsed = timed_fingerprint(node, 1)
+        finally:
+            mesh_fingerprint.np = numpy_module
+        print(f"{'':>10}             {'纯Python':<8} {python_elapsed * 1000:9.1f} ms")
+        if python_result != result:
+            print("结果不一致!")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
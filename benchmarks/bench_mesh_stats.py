@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网格统计基准测试
+
+用fbx_fixtures生成指定三角形数量的网格几何体，测量mesh_stats.geometry_stats的耗时。
+安装了NumPy时同时测量纯Python实现作为对比（--python-limit以上的规模跳过，纯Python实现太慢），
+并检查两者的结果一致。
+
+用法:
+    python benchmarks/bench_mesh_stats.py --triangles 100000 1000000 5000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mesh_stats
+from fbx_fixtures import geometry_node, grid_mesh
+
+
+def build_geometry(triangles):
+    """
+    生成大约包含指定数量三角形的网格几何体节点
+
+    Args:
+        triangles (int): 目标三角形数量
+
+    Returns:
+        FbxNode: Geometry节点
+    """
+    quads_per_side = max(1, int(math.sqrt(triangles / 2)))
+    vertices, indices, uvs = grid_mesh(quads_per_side, uv_channels=2)
+    return geometry_node(1, "Bench", vertices, indices, uvs, None, True)
+
+
+def timed_stats(node, repeat):
+    """重复统计并返回(结果, 最短耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = mesh_stats.geometry_stats(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格统计基准测试")
+    parser.add_argument("--triangles", type=int, nargs="+", default=[100000, 1000000, 5000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--python-limit", type=int, default=1000000,
+                        help="超过该三角形数量时不测量纯Python实现")
+    args = parser.parse_args()
+
+    numpy_module = mesh_stats.np
+    if numpy_module is None:
+        print("未安装NumPy，只测量纯Python实现")
+
+    for triangles in args.triangles:
+        node = build_geometry(triangles)
+        result, elapsed = timed_stats(node, args.repeat)
+        label = "NumPy" if numpy_module is not None else "纯Python"
+        print(f"{result['triangles']:>10} 个三角形  {label:<8} {elapsed * 1000:9.1f} ms")
+
+        if numpy_module is None or triangles > args.python_limit:
+            continue
+
+        mesh_stats.np = None
+        try:
+            python_result, python_elapsed = timed_stats(node, 1)
+        finally:
+            mesh_stats.np = numpy_module
+        print(f"{'':>10}             {'纯Python':<8} {python_elapsed * 1000:9.1f} ms")
+        if python_result != result:
+            print("结果不一致!")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
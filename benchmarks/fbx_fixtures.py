@@ -0,0 +1,491 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX测试文件生成工具
+
+生成结构与DCC导出结果一致的合成FBX场景（网格模型、UCX碰撞网格、材质、纹理和连接关系），
+并写出为二进制FBX（7.4/7.5，数组可选zlib压缩）或ASCII FBX。
+benchmarks/fixtures中的测试文件由此脚本生成，基准测试也用它生成大网格。
+write_streamed_binary_fbx逐个对象写入文件，用于生成几GB的测试文件而不在内存中构建整个文件。
+
+用法:
+    python benchmarks/fbx_fixtures.py --output benchmarks/fixtures
+"""
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fbx_parser import FbxNode, FBX_BINARY_MAGIC
+
+
+# array类型码 -> 二进制数组类型码
+_ARRAY_TYPE_CODES = {"f": "f", "d": "d", "q": "l", "i": "i", "b": "b"}
+
+
+def object_name(class_name, name, binary):
+    """
+    生成对象名称属性
+
+    Args:
+        class_name (str): 类名
+        name (str): 对象名称
+        binary (bool): 是否用于二进制文件
+
+    Returns:
+        str: 二进制为"名称\\x00\\x01类名"，ASCII为"类名::名称"
+    """
+    return f"{name}\x00\x01{class_name}" if binary else f"{class_name}::{name}"
+
+
+def property_entry(name, type_name, *values):
+    """
+    生成Properties70中的一个P条目
+
+    Args:
+        name (str): 属性名称
+        type_name (str): 属性类型
+        *values: 属性值
+
+    Returns:
+        FbxNode: P节点
+    """
+    return FbxNode("P", [name, type_name, "", "A"] + list(values))
+
+
+def grid_mesh(quads_per_side, uv_channels=1):
+    """
+    生成一个平面网格的几何数据
+
+    Args:
+        quads_per_side (int): 每边的四边形数量
+        uv_channels (int, optional): UV通道数量
+
+    Returns:
+        tuple: (顶点坐标array('d'), 多边形顶点索引array('i'), UV列表[(UV array('d'), UV索引array('i'))])
+    """
+    size = quads_per_side + 1
+    vertices = array("d")
+    for y in range(size):
+        for x in range(size):
+            vertices.extend((float(x), float(y), 0.0))
+
+    indices = array("i")
+    for y in range(quads_per_side):
+        for x in range(quads_per_side):
+            a = y * size + x
+            # 多边形的最后一个索引按位取反，标记多边形结束
+            indices.extend((a, a + 1, a + size + 1, ~(a + size)))
+
+    uvs = []
+    for channel in range(uv_channels):
+        uv_values = array("d")
+        for y in range(size):
+            for x in range(size):
+                uv_values.extend((x / quads_per_side, y / quads_per_side + channel))
+        uv_index = array("i", (index if index >= 0 else ~index for index in indices))
+        uvs.append((uv_values, uv_index))
+    return vertices, indices, uvs
+
+
+def geometry_node(object_id, name, vertices, indices, uvs, material_indices, binary):
+    """
+    生成Geometry节点
+
+    Args:
+        object_id (int): 对象ID
+        name (str): 名称
+        vertices (array): 顶点坐标
+        indices (array): 多边形顶点索引
+        uvs (list): UV通道列表
+        material_indices (array): 每个多边形的材质索引，为None时使用AllSame
+        binary (bool): 是否用于二进制文件
+
+    Returns:
+        FbxNode: Geometry节点
+    """
+    children = [
+        FbxNode("GeometryVersion", [124]),
+        FbxNode("Vertices", [vertices]),
+        FbxNode("PolygonVertexIndex", [indices])
+    ]
+
+    layer_elements = []
+    for channel, (uv_values, uv_index) in enumerate(uvs):
+        children.append(FbxNode("LayerElementUV", [channel], [
+            FbxNode("Version", [101]),
+            FbxNode("Name", [f"UVChannel_{channel + 1}"]),
+            FbxNode("MappingInformationType", ["ByPolygonVertex"]),
+            FbxNode("ReferenceInformationType", ["IndexToDirect"]),
+            FbxNode("UV", [uv_values]),
+            FbxNode("UVIndex", [uv_index])
+        ]))
+        layer_elements.append(("LayerElementUV", channel))
+
+    if material_indices is None:
+        mapping, materials = "AllSame", array("i", [0])
+    else:
+        mapping, materials = "ByPolygon", material_indices
+    children.append(FbxNode("LayerElementMaterial", [0], [
+        FbxNode("Version", [101]),
+        FbxNode("Name", [""]),
+        FbxNode("MappingInformationType", [mapping]),
+        FbxNode("ReferenceInformationType", ["IndexToDirect"]),
+        FbxNode("Materials", [materials])
+    ]))
+    layer_elements.append(("LayerElementMaterial", 0))
+
+    for layer_index in range(max(1, len(uvs))):
+        layer = FbxNode("Layer", [layer_index], [FbxNode("Version", [100])])
+        for element_type, element_index in layer_elements:
+            if element_index == layer_index:
+                layer.children.append(FbxNode("LayerElement", [], [
+                    FbxNode("Type", [element_type]),
+                    FbxNode("TypedIndex", [element_index])
+                ]))
+        children.append(layer)
+
+    return FbxNode("Geometry", [object_id, object_name("Geometry", name, binary), "Mesh"], children)
+
+
+def model_node(object_id, name, binary):
+    """
+    生成网格Model节点
+
+    Args:
+        object_id (int): 对象ID
+        name (str): 名称
+        binary (bool): 是否用于二进制文件
+
+    Returns:
+        FbxNode: Model节点
+    """
+    return FbxNode("Model", [object_id, object_name("Model", name, binary), "Mesh"], [
+        FbxNode("Version", [232]),
+        FbxNode("Properties70", [], [
+            property_entry("Lcl Translation", "Lcl Translation", 0.0, 0.0, 0.0),
+            property_entry("DefaultAttributeIndex", "int", 0)
+        ]),
+        FbxNode("Shading", [True]),
+        FbxNode("Culling", ["CullingOff"])
+    ])
+
+
+def build_scene(name="Crate_SM", quads_per_side=2, uv_channels=1, binary=True, version=7400):
+    """
+    生成一个合成场景：带两个材质的网格、一个UCX碰撞网格和一张漫反射纹理
+
+    Args:
+        name (str, optional): 网格名称
+        quads_per_side (int, optional): 网格每边的四边形数量，三角形数量为其平方的两倍
+        uv_channels (int, optional): UV通道数量
+        binary (bool, optional): 是否用于二进制文件
+        version (int, optional): FBX版本号
+
+    Returns:
+        list: 顶层FbxNode列表
+    """
+    vertices, indices, uvs = grid_mesh(quads_per_side, uv_channels)
+    polygon_count = quads_per_side * quads_per_side
+    material_indices = array("i", (0 if i < polygon_count // 2 else 1 for i in range(polygon_count)))
+
+    collision_vertices, collision_indices, _ = grid_mesh(1, 0)
+
+    objects = FbxNode("Objects", [], [
+        geometry_node(1001, name, vertices, indices, uvs, material_indices, binary),
+        model_node(2001, name, binary),
+        geometry_node(1002, f"UCX_{name}_00", collision_vertices, collision_indices, [], None, binary),
+        model_node(2002, f"UCX_{name}_00", binary),
+        FbxNode("Material", [3001, object_name("Material", "M_Wood", binary), ""], [
+            FbxNode("Version", [102]),
+            FbxNode("ShadingModel", ["phong"])
+        ]),
+        FbxNode("Material", [3002, object_name("Material", "M_Metal", binary), ""], [
+            FbxNode("Version", [102]),
+            FbxNode("ShadingModel", ["phong"])
+        ]),
+        FbxNode("Texture", [4001, object_name("Texture", "Crate_D", binary), ""], [
+            FbxNode("Type", ["TextureVideoClip"]),
+            FbxNode("FileName", ["C:/Assets/Textures/Crate_D.png"]),
+            FbxNode("RelativeFilename", ["Textures/Crate_D.png"])
+        ]),
+        FbxNode("Video", [5001, object_name("Video", "Crate_D", binary), "Clip"], [
+            FbxNode("Type", ["Clip"]),
+            FbxNode("FileName", ["C:/Assets/Textures/Crate_D.png"]),
+            FbxNode("RelativeFilename", ["Textures/Crate_D.png"])
+        ])
+    ])
+
+    connections = FbxNode("Connections", [], [
+        FbxNode("C", ["OO", 2001, 0]),
+        FbxNode("C", ["OO", 1001, 2001]),
+        FbxNode("C", ["OO", 3001, 2001]),
+        FbxNode("C", ["OO", 3002, 2001]),
+        FbxNode("C", ["OO", 2002, 0]),
+        FbxNode("C", ["OO", 1002, 2002]),
+        FbxNode("C", ["OP", 4001, 3001, "DiffuseColor"]),
+        FbxNode("C", ["OO", 5001, 4001])
+    ])
+
+    header = FbxNode("FBXHeaderExtension", [], [
+        FbxNode("FBXHeaderVersion", [1003]),
+        FbxNode("FBXVersion", [version]),
+        FbxNode("Creator", ["bench_fbx_parser"])
+    ])
+    global_settings = FbxNode("GlobalSettings", [], [
+        FbxNode("Version", [1000]),
+        FbxNode("Properties70", [], [
+            property_entry("UpAxis", "int", 1),
+            property_entry("UnitScaleFactor", "double", 1.0)
+        ])
+    ])
+    return [header, global_settings, objects, connections]
+
+
+def _encode_property(value, compress):
+    """
+    编码单个二进制属性
+
+    Args:
+        value: 属性值
+        compress (bool): 数组是否使用zlib压缩
+
+    Returns:
+        bytes: 编码后的属性
+    """
+    if isinstance(value, bool):
+        return b"C" + struct.pack("<?", value)
+    if isinstance(value, int):
+        if -2 ** 31 <= value < 2 ** 31:
+            return b"I" + struct.pack("<i", value)
+        return b"L" + struct.pack("<q", value)
+    if isinstance(value, float):
+        return b"D" + struct.pack("<d", value)
+    if isinstance(value, str):
+        raw = value.encode("utf-8")
+        return b"S" + struct.pack("<I", len(raw)) + raw
+    if isinstance(value, bytes):
+        return b"R" + struct.pack("<I", len(value)) + value
+    if isinstance(value, array):
+        raw = value.tobytes()
+        if sys.byteorder == "big":
+            swapped = array(value.typecode, value)
+            swapped.byteswap()
+            raw = swapped.tobytes()
+        encoding = 0
+        if compress and len(raw) > 64:
+            raw = zlib.compress(raw, 1)
+            encoding = 1
+        type_code = _ARRAY_TYPE_CODES[value.typecode].encode("ascii")
+        return type_code + struct.pack("<III", len(value), encoding, len(raw)) + raw
+    raise TypeError(f"无法编码的属性类型: {type(value)}")
+
+
+def _write_binary_node(out, node, wide, compress, base=0, encoded=None):
+    """
+    写出一个二进制节点记录
+
+    Args:
+        out (bytearray): 输出缓冲区
+        node (FbxNode): 节点
+        wide (bool): 是否使用64位记录头
+        compress (bool): 数组是否使用zlib压缩
+        base (int, optional): out开头在文件中的偏移，记录头中的结束偏移是相对文件开头的
+        encoded (dict, optional): 数组编码结果的缓存 {id(数组): (数组, 字节串)}，同一个数组只编码一次；
+            缓存中保留数组本身，避免数组释放后id被其他数组重用
+    """
+    header = struct.Struct("<QQQ" if wide else "<III")
+    start = len(out)
+    out.extend(b"\0" * header.size)
+    name = node.name.encode("ascii")
+    out.append(len(name))
+    out.extend(name)
+
+    properties_start = len(out)
+    for value in node.properties:
+        if encoded is not None and isinstance(value, array):
+            if id(value) not in encoded:
+                encoded[id(value)] = (value, _encode_property(value, compress))
+            out.extend(encoded[id(value)][1])
+        else:
+            out.extend(_encode_property(value, compress))
+    properties_length = len(out) - properties_start
+
+    if node.children or not node.properties:
+        for child in node.children:
+            _write_binary_node(out, child, wide, compress, base, encoded)
+        out.extend(b"\0" * (header.size + 1))
+
+    header.pack_into(out, start, base + len(out), len(node.properties), properties_length)
+
+
+def write_binary_fbx(file_path, nodes, version=7400, compress=True):
+    """
+    写出二进制FBX文件
+
+    Args:
+        file_path (str): 输出路径
+        nodes (list): 顶层FbxNode列表
+        version (int, optional): FBX版本号，7500及以上使用64位记录头
+        compress (bool, optional): 数组是否使用zlib压缩
+    """
+    wide = version >= 7500
+    out = bytearray(FBX_BINARY_MAGIC + b"\x1a\x00" + struct.pack("<I", version))
+    for node in nodes:
+        _write_binary_node(out, node, wide, compress)
+    out.extend(b"\0" * (25 if wide else 13))
+    # 简化的文件尾
+    out.extend(b"\0" * 16 + struct.pack("<I", version) + b"\0" * 120)
+    with open(file_path, "wb") as f:
+        f.write(out)
+
+
+def write_streamed_binary_fbx(file_path, nodes, extra_objects, version=7500, compress=True):
+    """
+    逐个对象写出二进制FBX文件，文件大小不受内存限制
+
+    extra_objects中的对象追加到Objects节点的子节点之后，每个对象编码后立即写入文件；
+    同一个数组对象只编码（压缩）一次，多个对象可以共用数组以快速生成大文件。
+
+    Args:
+        file_path (str): 输出路径
+        nodes (list): 顶层FbxNode列表，必须包含Objects节点
+        extra_objects (iterable): 追加到Objects下的FbxNode
+        version (int, optional): FBX版本号，文件超过4GB时必须为7500及以上
+        compress (bool, optional): 数组是否使用zlib压缩
+    """
+    wide = version >= 7500
+    header = struct.Struct("<QQQ" if wide else "<III")
+    encoded = {}
+    with open(file_path, "wb") as f:
+        f.write(FBX_BINARY_MAGIC + b"\x1a\x00" + struct.pack("<I", version))
+        for node in nodes:
+            if node.name != "Objects":
+                out = bytearray()
+                _write_binary_node(out, node, wide, compress, f.tell(), encoded)
+                f.write(out)
+                continue
+
+            start = f.tell()
+            f.write(b"\0" * header.size + bytes([len(b"Objects")]) + b"Objects")
+            for obj in chain(node.children, extra_objects):
+                out = bytearray()
+                _write_binary_node(out, obj, wide, compress, f.tell(), encoded)
+                f.write(out)
+            f.write(b"\0" * (header.size + 1))
+            end = f.tell()
+            f.seek(start)
+            f.write(header.pack(end, 0, 0))
+            f.seek(end)
+
+        f.write(b"\0" * (header.size + 1))
+        # 简化的文件尾
+        f.write(b"\0" * 16 + struct.pack("<I", version) + b"\0" * 120)
+
+
+def _format_ascii_value(value):
+    """
+    格式化ASCII属性值
+
+    Args:
+        value: 属性值
+
+    Returns:
+        str: 属性文本
+    """
+    if isinstance(value, bool):
+        return "T" if value else "F"
+    if isinstance(value, str):
+        return f'"{value}"'
+    return repr(value)
+
+
+def _write_ascii_node(lines, node, indent):
+    """
+    写出一个ASCII节点
+
+    Args:
+        lines (list): 输出行
+        node (FbxNode): 节点
+        indent (int): 缩进层级
+    """
+    prefix = "\t" * indent
+    if len(node.properties) == 1 and isinstance(node.properties[0], array):
+        values = node.properties[0]
+        lines.append(f"{prefix}{node.name}: *{len(values)} {{")
+        lines.append(f"{prefix}\ta: " + ",".join(repr(value) for value in values))
+        lines.append(f"{prefix}}}")
+        return
+
+    text = f"{prefix}{node.name}: " + ", ".join(_format_ascii_value(value) for value in node.properties)
+    if node.children or not node.properties:
+        lines.append(text.rstrip() + " {")
+        for child in node.children:
+            _write_ascii_node(lines, child, indent + 1)
+        lines.append(f"{prefix}}}")
+    else:
+        lines.append(text)
+
+
+def write_ascii_fbx(file_path, nodes):
+    """
+    写出ASCII FBX文件
+
+    Args:
+        file_path (str): 输出路径
+        nodes (list): 顶层FbxNode列表
+    """
+    lines = ["; FBX 7.4.0 project file", "; ----------------------------------------------------", ""]
+    for node in nodes:
+        _write_ascii_node(lines, node, 0)
+        lines.append("")
+    with open(file_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines))
+
+
+def write_fixtures(output_dir):
+    """
+    写出benchmarks/fixtures中的测试文件
+
+    Args:
+        output_dir (str): 输出目录
+
+    Returns:
+        list: 写出的文件路径
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+
+    path = os.path.join(output_dir, "Crate_SM_binary.fbx")
+    write_binary_fbx(path, build_scene(binary=True, version=7400), version=7400)
+    paths.append(path)
+
+    path = os.path.join(output_dir, "Crate_SM_binary75.fbx")
+    write_binary_fbx(path, build_scene(binary=True, version=7500), version=7500)
+    paths.append(path)
+
+    path = os.path.join(output_dir, "Crate_SM_ascii.fbx")
+    write_ascii_fbx(path, build_scene(binary=False))
+    paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成FBX测试文件")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"),
+                        help="输出目录")
+    args = parser.parse_args()
+
+    for path in write_fixtures(args.output):
+        print(f"已写出: {path} ({os.path.getsize(path)} 字节)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
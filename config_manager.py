@@ -8,9 +8,47 @@
 """
 
 import os
+import copy
 import json
 import unreal
 
+# 与此模块放在一起的配置文件，界面启动时加载
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+
+def get_cache_dir(config, name):
+    """
+    获取本地缓存目录，不存在时自动创建
+    
+    Args:
+        config (dict): 配置字典，可通过cache_dir指定缓存根目录
+        name (str): 缓存子目录名称
+    
+    Returns:
+        str: 缓存目录路径
+    """
+    base_dir = config.get("cache_dir") or os.path.join(unreal.Paths.project_saved_dir(), "AssetImporter")
+    cache_dir = os.path.join(base_dir, name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def merge_config(config, overrides):
+    """
+    用界面上的设置覆盖配置，其余部分（扫描、转换、缓存等设置）保持不变
+
+    Args:
+        config (dict): 加载的完整配置
+        overrides (dict): 界面上的设置
+
+    Returns:
+        dict: 合并后的新配置字典，不修改传入的字典
+    """
+    merged = copy.deepcopy(config)
+    merged.update(copy.deepcopy(overrides))
+    return merged
+
+
 class ConfigManager:
     """配置管理类，处理导入工具的配置"""
     
@@ -31,11 +69,14 @@ class ConfigManager:
         Returns:
             dict: 默认配置字典
         """
-        # 如果指定了默认配置文件且文件存在，则从文件加载
+        # 如果指定了默认配置文件且文件存在，则从文件加载，文件中没有的键使用内置默认值
         if self.default_config_path and os.path.exists(self.default_config_path):
             try:
                 with open(self.default_config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    file_config = json.load(f)
+                config = self._create_default_config()
+                self._deep_update(config, file_config)
+                return config
             except Exception as e:
                 unreal.log_warning(f"无法加载默认配置文件: {e}")
                 return self._create_default_config()
@@ -57,6 +98,7 @@ class ConfigManager:
             
             # 纹理设置
             "process_textures": True,
+            "import_referenced_textures_only": False,
             "compress_textures": True,
             "texture_group": "World",
             "texture_settings": {
@@ -99,12 +141,21 @@ class ConfigManager:
             
             # FBX导入设置
             "fbx_import": {
+                # 导入前解析FBX内容，关闭不需要的网格构建步骤
+                "auto_tune": True,
+                # 按几何体指纹查找已导入的相同网格；map_to_existing为True时使用已有的网格而不再导入
+                "duplicate_meshes": {
+                    "detect": True,
+                    "map_to_existing": False
+                },
                 "static_mesh": {
                     "generate_lightmap_uvs": True,
                     "combine_meshes": False,
                     "auto_generate_collision": True,
                     "remove_degenerates": True,
-                    "build_nanite": True
+                    "build_nanite": True,
+                    # 三角形数量达到该值时才启用Nanite
+                    "nanite_min_triangles": 10000
                 },
                 "skeletal_mesh": {
                     "import_morph_targets": True,
@@ -121,6 +172,66 @@ class ConfigManager:
                 }
             },
             
+            # 文件夹扫描设置
+            "folder_scan": {
+                "max_workers": 8,
+                "use_index": True,
+                "verify_files": False,
+                "stream_batch_size": 200,
+                "relationship_scope": "global",
+                "deduplicate_textures": False,
+                "hash_workers": 4,
+                "exclude": [".git/", ".svn/"],
+                "include": [],
+                "ignore_file": ".assetignore",
+                "keep_unknown_files": True,
+                "detect_udims": True,
+                "udim_min_tiles": 2,
+                "detect_lods": True,
+                "classify_fbx_by_content": True,
+                "link_fbx_textures": True,
+                "link_maya_textures": True,
+                "extract_embedded_media": True
+            },
+            
+            # 监视文件夹设置
+            "watch_folder": {
+                "debounce_seconds": 2.0,
+                "stable_seconds": 1.0,
+                "poll_interval": 2.0,
+                "use_inotify": True
+            },
+            
+            # MA文件转换设置：用常驻的mayapy进程把.ma转换为FBX后按FBX导入，结果按内容缓存；
+            # mayapy_path为空时自动查找，converter_script为空时使用maya_fbx_export.py
+            "maya_conversion": {
+                "enabled": True,
+                "mayapy_path": "",
+                "converter_script": "",
+                "max_workers": 2,
+                "timeout": 600,
+                "export_options": {
+                    "smoothing_groups": True,
+                    "triangulate": False,
+                    "embed_textures": False
+                }
+            },
+            
+            # Interchange导入管道设置：设置相同的导入共用同一个管道；
+            # persistent为True时把管道保存到persistent_path，之后的会话直接使用
+            "interchange_pipelines": {
+                "persistent": False,
+                "persistent_path": "/Game/ImportPipelines"
+            },
+            
+            # 本地缓存根目录，为空时使用项目的Saved/AssetImporter目录
+            "cache_dir": "",
+            
+            # FBX调试设置，use_cache为True时按文件内容哈希缓存调试结果
+            "fbx_debug": {
+                "use_cache": True
+            },
+            
             # 文件名模式设置
             "filename_patterns": {
                 "static_mesh": ["_SM", "_StaticMesh", "_Model"],
@@ -151,14 +262,14 @@ class ConfigManager:
                     user_config = json.load(f)
                     
                 # 合并用户配置和默认配置，确保所有必要的键都存在
-                config = self.default_config.copy()
+                config = copy.deepcopy(self.default_config)
                 self._deep_update(config, user_config)
                 return config
             except Exception as e:
                 unreal.log_warning(f"无法加载配置文件 {config_path}: {e}")
-                return self.default_config
+                return copy.deepcopy(self.default_config)
         else:
-            return self.default_config
+            return copy.deepcopy(self.default_config)
     
     def save_config(self, config, config_path):
         """
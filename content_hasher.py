@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+内容哈希模块
+用于并行计算文件内容的哈希值，识别内容完全相同的文件
+
+此模块通过mmap把文件映射到内存，再用BLAKE2计算哈希；hashlib在处理大块数据时会释放GIL，
+因此多个线程可以同时计算不同文件的哈希。已知大小和修改时间未变化的文件直接复用缓存中的哈希值。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import mmap
+import hashlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 哈希记录：文件大小、修改时间（纳秒）和内容哈希
+HashRecord = namedtuple("HashRecord", ["size", "mtime_ns", "digest"])
+
+# BLAKE2b摘要长度（字节）
+DIGEST_SIZE = 20
+
+
+def hash_file(file_path):
+    """
+    计算单个文件内容的哈希值
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        str: 十六进制的BLAKE2b哈希值
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(file_path, "rb") as f:
+        # 空文件无法映射
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+    return hasher.hexdigest()
+
+
+class ContentHasher:
+    """内容哈希类，使用线程池并行计算文件哈希，并维护哈希缓存"""
+
+    def __init__(self, max_workers=4, cache=None):
+        """
+        初始化内容哈希器
+
+        Args:
+            max_workers (int, optional): 同时计算哈希的最大线程数
+            cache (dict, optional): 已知的哈希 {文件路径: HashRecord}，通常来自扫描索引
+        """
+        self.max_workers = max(1, max_workers)
+        self.cache = cache or {}
+
+        # 本次新计算的哈希 {文件路径: HashRecord}，用于写回缓存
+        self.updated = {}
+
+    def hash_files(self, file_paths):
+        """
+        计算多个文件的哈希值
+
+        Args:
+            file_paths (list): 文件路径列表
+
+        Returns:
+            dict: {文件路径: 十六进制哈希值}，无法读取的文件不包含在结果中
+        """
+        if self.max_workers == 1 or len(file_paths) < 2:
+            results = [self._hash_one(file_path) for file_path in file_paths]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._hash_one, file_paths))
+
+        digests = {}
+        for file_path, record, is_new in results:
+            if record is None:
+                continue
+            digests[file_path] = record.digest
+            if is_new:
+                self.cache[file_path] = record
+                self.updated[file_path] = record
+        return digests
+
+    def _hash_one(self, file_path):
+        """
+        获取单个文件的哈希记录，缓存有效时不读取文件内容
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            tuple: (文件路径, HashRecord, 是否新计算)，无法读取时HashRecord为None
+        """
+        try:
+            stat_result = os.stat(file_path)
+            cached = self.cache.get(file_path)
+            if cached is not None and cached.size == stat_result.st_size and cached.mtime_ns == stat_result.st_mtime_ns:
+                return file_path, cached, False
+
+            digest = hash_file(file_path)
+        except (OSError, ValueError):
+            return file_path, None, False
+
+        return file_path, HashRecord(stat_result.st_size, stat_result.st_mtime_ns, digest), True
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+目录遍历模块
+用于并行遍历大型目录树（例如网络共享上的外包资源）
+
+此模块基于os.scandir实现目录遍历，子目录的列举在有界线程池中并发执行，
+并直接复用DirEntry中的信息，避免对同一文件重复调用stat。
+提供扫描规则（见scan_rules）时，被排除的子目录在提交列举之前就被剪枝。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class DirectoryWalker:
+    """并行目录遍历类，按目录逐批返回文件条目"""
+
+    def __init__(self, max_workers=8, rules=None):
+        """
+        初始化目录遍历器
+
+        Args:
+            max_workers (int, optional): 同时列举目录的最大线程数
+            rules (ScanRules, optional): 扫描规则，为None时返回所有目录和文件
+        """
+        self.max_workers = max(1, int(max_workers or 1))
+        self.rules = rules
+
+    def walk(self, root_path):
+        """
+        遍历目录树
+
+        与os.walk(followlinks=False)的语义保持一致：指向目录的符号链接不会被进入，
+        无法读取的目录会被静默跳过。目录返回的顺序取决于列举完成的先后。
+        被扫描规则排除的目录不会被列举，被排除的文件不会返回。
+
+        Args:
+            root_path (str): 根目录路径
+
+        Yields:
+            tuple: (目录路径, [os.DirEntry, ...])，列表中只包含文件条目
+        """
+        if self.max_workers == 1:
+            yield from self._walk_serial(root_path)
+            return
+
+        root_rules = self.rules.for_root(root_path) if self.rules is not None else None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._scan_directory, root_path, root_rules)}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    directory, subdirectories, files, rules = future.result()
+
+                    # 立即提交子目录，使网络往返尽可能重叠
+                    for subdirectory in subdirectories:
+                        pending.add(executor.submit(self._scan_directory, subdirectory, rules))
+
+                    if files:
+                        yield directory, files
+
+    def _walk_serial(self, root_path):
+        """
+        单线程遍历目录树（max_workers为1时使用）
+
+        Args:
+            root_path (str): 根目录路径
+
+        Yields:
+            tuple: (目录路径, [os.DirEntry, ...])
+        """
+        root_rules = self.rules.for_root(root_path) if self.rules is not None else None
+
+        stack = [(root_path, root_rules)]
+        while stack:
+            directory, subdirectories, files, rules = self._scan_directory(*stack.pop())
+            stack.extend((subdirectory, rules) for subdirectory in reversed(subdirectories))
+            if files:
+                yield directory, files
+
+    def _scan_directory(self, directory, rules):
+        """
+        列举单个目录并应用扫描规则
+
+        Args:
+            directory (str): 目录路径
+            rules (ScanRules): 目录所在位置生效的扫描规则，为None时不筛选
+
+        Returns:
+            tuple: (目录路径, 需要进入的子目录路径列表, 文件条目列表, 子目录使用的扫描规则)
+        """
+        directory, subdirectories, files = self._list_directory(directory)
+        if rules is not None:
+            rules, subdirectories, files = rules.filter(directory, subdirectories, files)
+        return directory, subdirectories, files, rules
+
+    def _list_directory(self, directory):
+        """
+        列举单个目录
+
+        Args:
+            directory (str): 目录路径
+
+        Returns:
+            tuple: (目录路径, 需要进入的子目录路径列表, 文件条目列表)
+        """
+        subdirectories = []
+        files = []
+
+        try:
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if is_dir:
+                        # 与os.walk一致，不进入指向目录的符号链接
+                        try:
+                            is_symlink = entry.is_symlink()
+                        except OSError:
+                            is_symlink = False
+                        if not is_symlink:
+                            subdirectories.append(entry.path)
+                    else:
+                        files.append(entry)
+        except OSError:
+            # 与os.walk一致，忽略无法读取的目录
+            pass
+
+        return directory, subdirectories, files
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX批量审计模块
+用于在导入前检查整个文件夹中的FBX文件，并输出机器可读的报告
+
+此模块按扫描规则遍历文件夹，在进程池中并行解析每个FBX文件（解析是纯Python的CPU计算，
+多进程才能利用多核；待解析的文件较少较小时直接在当前进程中解析），汇总材质槽、UCX_碰撞网格、蒙皮、动画栈和网格统计，写出JSON或CSV报告。
+几何体指纹相同的文件在报告中标记为重复，duplicate_of为其中第一个文件的路径。
+指定缓存目录时，内容未变化的文件直接使用FbxResultCache中的检查结果，只有变化的文件才会重新解析。
+此模块不依赖unreal，可以直接在命令行中运行：
+
+    python fbx_audit.py D:/Drop --json audit.json --csv audit.csv --workers 8 --cache-dir D:/AuditCache
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from directory_walker import DirectoryWalker
+from scan_rules import ScanRules
+from fbx_inspector import FbxInspector, RESULT_VERSION
+from fbx_result_cache import FbxResultCache
+
+# 待解析的文件少于此数量且总大小小于PARALLEL_MIN_BYTES时在当前进程中解析：
+# 小文件的解析只需一两毫秒，启动工作进程并传递结果的开销反而更大
+PARALLEL_MIN_FILES = 512
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# CSV报告的列
+CSV_COLUMNS = [
+    "file_path", "error", "fbx_version", "is_binary", "mesh_type", "mesh_count", "triangle_count", "vertex_count",
+    "degenerate_triangles", "uv_channels", "bounds_size",
+    "material_slots", "missing_material_slots", "has_ucx_collision", "collision_meshes",
+    "is_skinned", "animation_stacks", "geometry_fingerprint", "duplicate_of", "cached", "parse_ms"
+]
+
+
+def inspect_file(fbx_file_path, config=None):
+    """
+    检查单个FBX文件，在工作进程中执行
+
+    Args:
+        fbx_file_path (str): FBX文件路径
+        config (dict, optional): 配置字典
+
+    Returns:
+        tuple: (FBX文件路径, 检查结果, 耗时毫秒数)
+    """
+    start = time.perf_counter()
+    result = FbxInspector(config).inspect(fbx_file_path)
+    return fbx_file_path, result, (time.perf_counter() - start) * 1000
+
+
+def _inspect_file_task(task):
+    """
+    进程池任务入口，参数打包为元组以便按块提交
+
+    Args:
+        task (tuple): (FBX文件路径, 配置字典)
+
+    Returns:
+        tuple: (FBX文件路径, 检查结果, 耗时毫秒数)
+    """
+    return inspect_file(*task)
+
+
+def make_record(fbx_file_path, result, elapsed_ms, cached=False):
+    """
+    根据检查结果生成审计记录
+
+    Args:
+        fbx_file_path (str): FBX文件路径
+        result (dict): FbxInspector的检查结果
+        elapsed_ms (float): 解析耗时（毫秒）
+        cached (bool, optional): 结果是否来自缓存
+
+    Returns:
+        dict: 审计记录
+    """
+    if "error" in result:
+        return {"file_path": fbx_file_path, "error": result["error"], "cached": cached,
+                "parse_ms": round(elapsed_ms, 2)}
+
+    collision = result["has_collision"]
+    material_slots = result["material_slots"]
+    mesh_stats = result["mesh_stats"]
+    bounds = mesh_stats["bounds"]
+    return {
+        "file_path": fbx_file_path,
+        "error": "",
+        "fbx_version": result["fbx_version"],
+        "is_binary": result["is_binary"],
+        "mesh_type": result["mesh_type"],
+        "mesh_count": sum(1 for mesh in result["meshes"] if not mesh["is_collision"]),
+        "triangle_count": result["triangle_count"],
+        "vertex_count": result["vertex_count"],
+        "degenerate_triangles": mesh_stats["degenerate_triangles"],
+        "uv_channels": mesh_stats["uv_channels"],
+        "bounds_size": [high - low for low, high in zip(bounds["min"], bounds["max"])] if bounds else [],
+        "material_slots": [slot["name"] for slot in material_slots["material_slots"] if slot["has_material"]],
+        "missing_material_slots": material_slots["missing_material_slots"],
+        "has_ucx_collision": collision["has_ucx_collision"],
+        "collision_meshes": collision["collision_meshes"],
+        "is_skinned": result["is_skinned"],
+        "animation_stacks": result["animation_stacks"],
+        "geometry_fingerprint": result["geometry_fingerprint"] or "",
+        "duplicate_of": "",
+        "meshes": result["meshes"],
+        "cached": cached,
+        "parse_ms": round(elapsed_ms, 2)
+    }
+
+
+class FbxAuditor:
+    """FBX批量审计类，在进程池中并行检查文件夹中的所有FBX文件"""
+
+    def __init__(self, config=None, max_workers=None, cache_dir=None):
+        """
+        初始化审计器
+
+        Args:
+            config (dict, optional): 配置字典，folder_scan中的规则用于筛选文件
+            max_workers (int, optional): 进程数量，默认为CPU核心数
+            cache_dir (str, optional): 缓存根目录，检查结果缓存在其中的FbxDebugCache目录，
+                与编辑器中FbxDebugger使用的缓存相同；为None时不使用缓存
+        """
+        self.config = config or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inspector = FbxInspector(self.config)
+
+        scan_config = self.config.get("folder_scan", {})
+        self.scan_rules = ScanRules.from_config(scan_config)
+        self.walk_workers = scan_config.get("max_workers", 8)
+
+        self.cache = None
+        if cache_dir:
+            self.cache = FbxResultCache(os.path.join(cache_dir, "FbxDebugCache", "results.sqlite"), RESULT_VERSION)
+
+    def find_fbx_files(self, folder_path):
+        """
+        按扫描规则列出文件夹中的所有FBX文件
+
+        Args:
+            folder_path (str): 文件夹路径
+
+        Returns:
+            list: 排序后的FBX文件路径列表
+        """
+        fbx_files = []
+        for _, entries in DirectoryWalker(self.walk_workers, self.scan_rules).walk(folder_path):
+            fbx_files.extend(entry.path for entry in entries if entry.name.lower().endswith(".fbx"))
+        return sorted(fbx_files)
+
+    def audit_files(self, fbx_files, progress=None):
+        """
+        并行审计多个FBX文件，命中缓存的文件不再解析
+
+        Args:
+            fbx_files (list): FBX文件路径列表
+            progress (callable, optional): 每完成一个文件调用一次，参数为(已完成数量, 总数)
+
+        Returns:
+            list: 审计记录列表，顺序与fbx_files一致，几何体重复的记录已标记duplicate_of
+        """
+        total = len(fbx_files)
+        records = {}
+
+        digests = {}
+        if self.cache is not None:
+            digests = self.cache.digests(fbx_files, self.walk_workers)
+            cached_results = self.cache.get_many(digests.values())
+            for fbx_file in fbx_files:
+                content = cached_results.get(digests.get(fbx_file))
+                if content is not None:
+                    result = self.inspector.with_file_fields(content, fbx_file)
+                    records[fbx_file] = make_record(fbx_file, result, 0.0, cached=True)
+                    self._report(progress, len(records), total)
+
+        new_results = {}
+        for fbx_file, result, elapsed_ms in self._inspect_files([f for f in fbx_files if f not in records]):
+            records[fbx_file] = make_record(fbx_file, result, elapsed_ms)
+            if "error" not in result and fbx_file in digests:
+                new_results[digests[fbx_file]] = self.inspector.content_fields(result)
+            self._report(progress, len(records), total)
+
+        if self.cache is not None and new_results:
+            self.cache.put_many(new_results)
+
+        ordered = [records[fbx_file] for fbx_file in fbx_files]
+        mark_duplicate_geometry(ordered)
+        return ordered
+
+    def _inspect_files(self, fbx_files):
+        """
+        在进程池中检查FBX文件
+
+        Args:
+            fbx_files (list): FBX文件路径列表
+
+        Yields:
+            tuple: (FBX文件路径, 检查结果, 耗时毫秒数)
+        """
+        tasks = [(fbx_file, self.config) for fbx_file in fbx_files]
+        if not self._use_processes(fbx_files):
+            yield from map(_inspect_file_task, tasks)
+            return
+
+        # 小文件的解析很快，按块提交以减少进程间往返
+        chunksize = max(1, min(32, len(tasks) // (self.max_workers * 4)))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(_inspect_file_task, tasks, chunksize=chunksize)
+
+    def _use_processes(self, fbx_files):
+        """
+        判断是否值得使用进程池
+
+        每个进程至少分到两个文件，并且文件数量或总大小足以抵消启动进程和传递结果的开销时才使用进程池。
+
+        Args:
+            fbx_files (list): 待解析的FBX文件路径列表
+
+        Returns:
+            bool: 使用进程池时为True
+        """
+        if self.max_workers == 1 or len(fbx_files) < self.max_workers * 2:
+            return False
+        if len(fbx_files) >= PARALLEL_MIN_FILES:
+            return True
+
+        total_size = 0
+        for fbx_file in fbx_files:
+            try:
+                total_size += os.path.getsize(fbx_file)
+            except OSError:
+                continue
+            if total_size >= PARALLEL_MIN_BYTES:
+                return True
+        return False
+
+    def audit_folder(self, folder_path, progress=None):
+        """
+        审计文件夹中的所有FBX文件
+
+        Args:
+            folder_path (str): 文件夹路径
+            progress (callable, optional): 进度回调，参数为(已完成数量, 总数)
+
+        Returns:
+            list: 审计记录列表
+        """
+        return self.audit_files(self.find_fbx_files(folder_path), progress)
+
+    def _report(self, progress, done, total):
+        """
+        报告审计进度
+
+        Args:
+            progress (callable): 进度回调，为None时忽略
+            done (int): 已完成数量
+            total (int): 文件总数
+        """
+        if progress is not None:
+            progress(done, total)
+
+
+def mark_duplicate_geometry(records):
+    """
+    标记几何体与之前的文件相同的记录
+
+    网格类型和几何体指纹都相同的文件中，第一个文件之外的记录的duplicate_of设为第一个文件的路径。
+
+    Args:
+        records (list): 审计记录列表，按顺序比较
+    """
+    first_files = {}
+    for record in records:
+        if record["error"] or not record["geometry_fingerprint"]:
+            continue
+        key = (record["mesh_type"], record["geometry_fingerprint"])
+        first_file = first_files.setdefault(key, record["file_path"])
+        if first_file != record["file_path"]:
+            record["duplicate_of"] = first_file
+
+
+def summarize(records):
+    """
+    汇总审计结果
+
+    Args:
+        records (list): 审计记录列表
+
+    Returns:
+        dict: 汇总信息
+    """
+    valid = [record for record in records if not record["error"]]
+    return {
+        "files": len(records),
+        "errors": len(records) - len(valid),
+        "triangles": sum(record["triangle_count"] for record in valid),
+        "with_degenerate_triangles": sum(1 for record in valid if record["degenerate_triangles"]),
+        "with_ucx_collision": sum(1 for record in valid if record["has_ucx_collision"]),
+        "with_missing_materials": sum(1 for record in valid if record["missing_material_slots"]),
+        "skinned": sum(1 for record in valid if record["is_skinned"]),
+        "with_animation": sum(1 for record in valid if record["animation_stacks"]),
+        "duplicate_geometry": sum(1 for record in valid if record["duplicate_of"]),
+        "cached": sum(1 for record in records if record["cached"])
+    }
+
+
+def write_json(records, report_path):
+    """
+    写出JSON报告
+
+    Args:
+        records (list): 审计记录列表
+        report_path (str): 报告路径
+    """
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summarize(records), "files": records}, f, ensure_ascii=False, indent=2)
+
+
+def write_csv(records, report_path):
+    """
+    写出CSV报告，每个文件一行，列表字段以";"连接
+
+    Args:
+        records (list): 审计记录列表
+        report_path (str): 报告路径
+    """
+    with open(report_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            row = {}
+            for column in CSV_COLUMNS:
+                value = record.get(column, "")
+                row[column] = ";".join(str(item) for item in value) if isinstance(value, list) else value
+            writer.writerow(row)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="批量审计文件夹中的FBX文件")
+    parser.add_argument("folder", help="要审计的文件夹")
+    parser.add_argument("--json", dest="json_path", help="JSON报告路径")
+    parser.add_argument("--csv", dest="csv_path", help="CSV报告路径")
+    parser.add_argument("--workers", type=int, default=None, help="进程数量，默认为CPU核心数")
+    parser.add_argument("--config", help="配置文件路径，使用其中的folder_scan规则、filename_patterns和cache_dir")
+    parser.add_argument("--cache-dir", help="检查结果的缓存根目录，默认使用配置中的cache_dir，都为空时不缓存")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+    auditor = FbxAuditor(config, args.workers, args.cache_dir or config.get("cache_dir"))
+    start = time.perf_counter()
+    fbx_files = auditor.find_fbx_files(args.folder)
+    print(f"找到 {len(fbx_files)} 个FBX文件，使用 {auditor.max_workers} 个进程审计")
+
+    def progress(done, total):
+        if done == total or done % 500 == 0:
+            print(f"已审计 {done}/{total}")
+
+    records = auditor.audit_files(fbx_files, progress)
+    elapsed = time.perf_counter() - start
+
+    if args.json_path:
+        write_json(records, args.json_path)
+        print(f"JSON报告已写入: {args.json_path}")
+    if args.csv_path:
+        write_csv(records, args.csv_path)
+        print(f"CSV报告已写入: {args.csv_path}")
+
+    summary = summarize(records)
+    print(
+        f"审计完成，耗时 {elapsed:.1f} 秒: {summary['files']} 个文件，{summary['errors']} 个解析失败，"
+        f"共 {summary['triangles']} 个三角形，{summary['with_degenerate_triangles']} 个有退化三角形，"
+        f"{summary['with_ucx_collision']} 个带UCX碰撞，"
+        f"{summary['with_missing_materials']} 个缺失材质，{summary['skinned']} 个带蒙皮，"
+        f"{summary['with_animation']} 个带动画，{summary['duplicate_geometry']} 个与其他文件几何体相同，"
+        f"{summary['cached']} 个使用缓存结果"
+    )
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX内容分类模块
+用于根据FBX文件中的对象判断网格类型（静态网格、骨骼网格或动画）
+
+分类只需要对象头：Mesh子类型的Geometry或Model表示有网格几何体，Skin子类型的Deformer表示蒙皮，
+AnimationCurve对象（FBX 6.x中为Takes下带模型通道的Take）表示有动画曲线。
+classify_fbx_file通过fbx_parser.read_fbx_headers只读取对象头，二进制文件按记录头跳过几何数据，
+因此扫描时对上千个文件分类的开销也很小。只有AnimationStack而没有动画曲线的文件不视为动画，
+多数DCC软件导出静态网格时也会写出一个空的动画栈。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+from collections import namedtuple
+
+from fbx_parser import read_fbx_headers, FbxParseError
+
+# 内容分类规则的版本号，规则变化时递增，使扫描索引中缓存的分类结果失效
+CONTENT_CLASSIFIER_VERSION = 1
+
+# 分类依据：是否有网格几何体、是否有蒙皮、是否有动画曲线
+FbxContent = namedtuple("FbxContent", ["has_mesh", "has_skin", "has_animation"])
+
+
+def summarize_objects(objects, has_take_animation=False):
+    """
+    根据对象的类名和子类型汇总分类依据
+
+    Args:
+        objects (iterable): 带class_name和sub_type属性的对象（FbxObjectHeader或FbxObject）
+        has_take_animation (bool, optional): 6.x的Takes中是否有带模型通道的Take
+
+    Returns:
+        FbxContent: 分类依据
+    """
+    has_mesh = False
+    has_skin = False
+    has_animation = has_take_animation
+    for obj in objects:
+        if obj.sub_type == "Mesh" and obj.class_name in ("Geometry", "Model"):
+            has_mesh = True
+        elif obj.class_name == "Deformer" and obj.sub_type == "Skin":
+            has_skin = True
+        elif obj.class_name == "AnimationCurve":
+            has_animation = True
+    return FbxContent(has_mesh, has_skin, has_animation)
+
+
+def read_fbx_content(file_path):
+    """
+    只读取对象头，得到FBX文件的分类依据
+
+    Args:
+        file_path (str): FBX文件路径
+
+    Returns:
+        FbxContent: 分类依据
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX
+        OSError: 无法读取文件
+    """
+    headers = read_fbx_headers(file_path)
+    return summarize_objects(headers.objects, headers.has_take_animation)
+
+
+def document_content(document):
+    """
+    从已解析的FBX文档得到分类依据
+
+    Args:
+        document (FbxDocument): 解析结果
+
+    Returns:
+        FbxContent: 分类依据
+    """
+    takes = document.find("Takes")
+    has_take_animation = takes is not None and any(
+        take.find("Model") is not None for take in takes.find_all("Take")
+    )
+    return summarize_objects(document.objects.values(), has_take_animation)
+
+
+def resolve_mesh_type(content, name_type):
+    """
+    结合文件内容和文件名确定网格类型
+
+    有蒙皮的文件为骨骼网格；文件名标识为动画且带有动画曲线时仍为动画（导出动画时常常包含蒙皮网格）。
+    没有蒙皮的网格为静态网格，没有网格只有动画曲线的文件为动画。内容无法判断时使用文件名的结果。
+
+    Args:
+        content (FbxContent): 分类依据，为None时直接使用文件名的结果
+        name_type (str): 根据文件名识别的网格类型
+
+    Returns:
+        str: static_mesh、skeletal_mesh或animation
+    """
+    if content is None:
+        return name_type
+    if content.has_skin:
+        if name_type == "animation" and content.has_animation:
+            return "animation"
+        return "skeletal_mesh"
+    if content.has_mesh:
+        return "static_mesh"
+    if content.has_animation:
+        return "animation"
+    return name_type
+
+
+def classify_fbx_file(file_path, name_type):
+    """
+    根据FBX文件的对象头确定网格类型
+
+    Args:
+        file_path (str): FBX文件路径
+        name_type (str): 根据文件名识别的网格类型
+
+    Returns:
+        str: 网格类型，文件无法读取或不是有效的FBX时返回name_type
+    """
+    try:
+        content = read_fbx_content(file_path)
+    except (FbxParseError, OSError):
+        return name_type
+    return resolve_mesh_type(content, name_type)
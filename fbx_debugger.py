@@ -5,12 +5,39 @@ FBX调试模块
 用于在导入前分析和调试FBX文件
 
 此模块提供了检查FBX文件的各种信息，包括静态物体标识、碰撞信息和材质槽完整性。
+debug_fbx直接解析FBX文件（见fbx_parser和fbx_inspector），不需要临时导入；
+debug_fbx_by_import保留了原先通过临时导入读取资产信息的方式，用于对比。
+直接解析的结果按文件内容哈希缓存在cache_dir下的FbxDebugCache目录中，重新打开调试窗口时不再重复解析。
 """
 
 import os
 import unreal
 import re
 
+from config_manager import get_cache_dir
+from fbx_inspector import FbxInspector, RESULT_VERSION
+from fbx_result_cache import FbxResultCache
+
+
+def create_fbx_inspector(config):
+    """
+    创建FBX检查器，配置允许时使用cache_dir下FbxDebugCache目录中的检查结果缓存
+
+    缓存使用SQLite连接，只能在创建它的线程中使用。
+
+    Args:
+        config (dict): 配置字典
+
+    Returns:
+        FbxInspector: FBX检查器
+    """
+    result_cache = None
+    if config.get("fbx_debug", {}).get("use_cache", True):
+        cache_path = os.path.join(get_cache_dir(config, "FbxDebugCache"), "results.sqlite")
+        result_cache = FbxResultCache(cache_path, RESULT_VERSION)
+    return FbxInspector(config, result_cache)
+
+
 class FbxDebugger:
     """FBX调试类，用于分析FBX文件"""
     
@@ -23,15 +50,19 @@ class FbxDebugger:
         """
         self.config = config or {}
         
-        # 获取编辑器子系统
-        self.editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
-        self.level_editor_subsystem = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+        # 直接解析FBX文件的检查器，检查结果缓存在磁盘上
+        self.inspector = create_fbx_inspector(self.config)
         
-        # 启用FBX导入功能（如果需要）
-        self._enable_fbx_import()
+        # 编辑器子系统，只有通过临时导入调试时才需要
+        self.editor_asset_subsystem = None
+        self.level_editor_subsystem = None
     
     def _enable_fbx_import(self):
         """启用Interchange FBX导入功能"""
+        if self.editor_asset_subsystem is None:
+            self.editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
+            self.level_editor_subsystem = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+        
         unreal.SystemLibrary.execute_console_command(
             self.level_editor_subsystem.get_world(), 
             'Interchange.FeatureFlags.Import.FBX true'
@@ -39,7 +70,22 @@ class FbxDebugger:
     
     def debug_fbx(self, fbx_file_path):
         """
-        调试FBX文件
+        调试FBX文件，直接解析文件内容
+        
+        Args:
+            fbx_file_path (str): FBX文件路径
+        
+        Returns:
+            dict: 调试结果
+        """
+        result = self.inspector.inspect(fbx_file_path)
+        if "error" in result:
+            unreal.log_warning(result["error"])
+        return result
+    
+    def debug_fbx_by_import(self, fbx_file_path):
+        """
+        通过临时导入调试FBX文件（原先的方式，导入到/Temp/FbxDebug后读取资产信息再删除）
         
         Args:
             fbx_file_path (str): FBX文件路径
@@ -53,6 +99,8 @@ class FbxDebugger:
         if not fbx_file_path.lower().endswith('.fbx'):
             return {"error": f"不是FBX文件: {fbx_file_path}"}
         
+        self._enable_fbx_import()
+        
         # 创建临时导入路径
         temp_import_path = "/Temp/FbxDebug"
         
@@ -70,10 +118,12 @@ class FbxDebugger:
             return {"error": f"导入FBX文件失败: {fbx_file_path}"}
         
         # 分析结果
+        mesh_type = self.inspector.mesh_type(fbx_file_path)
         result = {
             "file_path": fbx_file_path,
             "file_name": os.path.basename(fbx_file_path),
-            "is_static_mesh": self._is_static_mesh(fbx_file_path),
+            "mesh_type": mesh_type,
+            "is_static_mesh": mesh_type == "static_mesh",
             "has_collision": self._check_collision(imported_asset),
             "material_slots": self._check_material_slots(imported_asset)
         }
@@ -95,8 +145,8 @@ class FbxDebugger:
             str: 导入的资产路径
         """
         try:
-            # 创建临时管道路径
-            transient_path = "/Interchange/Pipelines/Transient/"
+            # 创建临时管道路径（使用单独的目录，不删除pipeline_cache复用的管道）
+            transient_path = "/Interchange/Pipelines/Transient/FbxDebugger/"
             transient_pipeline_path = transient_path + "DebugPipeline"
             
             # 删除可能存在的临时管道
@@ -132,34 +182,6 @@ class FbxDebugger:
             unreal.log_error(f"导入FBX文件进行调试时出错: {e}")
             return None
     
-    def _is_static_mesh(self, fbx_file_path):
-        """
-        检查FBX文件是否为静态网格
-        
-        Args:
-            fbx_file_path (str): FBX文件路径
-        
-        Returns:
-            bool: 是否为静态网格
-        """
-        # 检查文件名是否包含静态网格标识
-        file_name = os.path.basename(fbx_file_path)
-        
-        # 检查是否包含SM_前缀
-        if file_name.startswith("SM_") or "_SM_" in file_name:
-            return True
-        
-        # 检查配置中的静态网格模式
-        filename_patterns = self.config.get("filename_patterns", {})
-        static_mesh_patterns = filename_patterns.get("static_mesh", ["_SM", "_StaticMesh", "_Model"])
-        
-        for pattern in static_mesh_patterns:
-            if pattern in file_name:
-                return True
-        
-        # 默认情况下，如果没有明确标识，假设为静态网格
-        return True
-    
     def _check_collision(self, asset_path):
         """
         检查资产是否包含碰撞信息
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX检查模块
+用于根据解析出的FBX内容生成调试信息
+
+此模块使用fbx_parser直接读取文件，统计网格模型、材质槽、碰撞网格、蒙皮和动画栈，
+并通过mesh_stats统计每个网格的三角形、顶点、包围盒、UV通道和退化三角形，
+不需要把文件导入到引擎。结果的格式与FbxDebugger.debug_fbx的返回值一致。
+网格类型由fbx_classifier根据蒙皮、网格几何体和动画曲线判断，内容无法判断时才使用文件名模式。
+每个网格模型和整个文件的几何体指纹由mesh_fingerprint计算，用于识别不同文件中相同的网格。
+文件以open_fbx的内存映射打开，几何数组在统计时才逐个解码，几GB的文件也不会整个读入内存。
+提供FbxResultCache时，按文件内容哈希复用缓存的检查结果，只有内容变化的文件才会重新解析。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+
+from fbx_parser import open_fbx, FbxParseError, PARSER_VERSION
+from mesh_stats import array_chunks, geometry_stats, merge_stats
+from fbx_classifier import FbxContent, document_content, resolve_mesh_type, classify_fbx_file
+from mesh_fingerprint import model_fingerprint, combine_fingerprints
+from filename_classifier import FilenameClassifier
+
+# 检查器版本，检查结果的字段或统计方式变化时递增，用于使缓存的检查结果失效
+INSPECTOR_VERSION = 4
+
+# 检查结果的版本，作为结果缓存键的一部分
+RESULT_VERSION = f"{PARSER_VERSION}.{INSPECTOR_VERSION}"
+
+# 与文件路径相关的字段，不保存在结果缓存中，命中缓存后重新生成（内容无法判断网格类型时取决于文件名）
+FILE_FIELDS = ("file_path", "file_name", "mesh_type", "is_static_mesh")
+
+# UE识别的自定义碰撞网格前缀
+COLLISION_PREFIXES = ("UCX_", "UBX_", "USP_", "UCP_")
+
+class FbxInspector:
+    """FBX检查类，分析解析出的FBX对象和连接关系"""
+
+    def __init__(self, config=None, cache=None):
+        """
+        初始化FBX检查器
+
+        Args:
+            config (dict, optional): 配置字典
+            cache (FbxResultCache, optional): 检查结果缓存，结果版本应为RESULT_VERSION
+        """
+        self.config = config or {}
+        self.cache = cache
+        self.classifier = FilenameClassifier(self.config.get("filename_patterns", {}))
+
+    def inspect(self, fbx_file_path):
+        """
+        检查FBX文件
+
+        Args:
+            fbx_file_path (str): FBX文件路径
+
+        Returns:
+            dict: 检查结果，出错时只包含error
+        """
+        if not os.path.exists(fbx_file_path):
+            return {"error": f"文件不存在: {fbx_file_path}"}
+
+        if not fbx_file_path.lower().endswith('.fbx'):
+            return {"error": f"不是FBX文件: {fbx_file_path}"}
+
+        digest = None
+        if self.cache is not None:
+            try:
+                digest = self.cache.digest(fbx_file_path)
+            except OSError as e:
+                return {"error": f"读取FBX文件失败: {fbx_file_path}: {e}"}
+
+            cached = self.cache.get(digest)
+            if cached is not None:
+                return self.with_file_fields(cached, fbx_file_path)
+
+        # 几何数组在检查过程中才解码，数据损坏的错误也可能在检查时出现
+        try:
+            with open_fbx(fbx_file_path) as document:
+                result = self.inspect_document(document, fbx_file_path)
+        except (FbxParseError, OSError) as e:
+            return {"error": f"解析FBX文件失败: {fbx_file_path}: {e}"}
+
+        if digest is not None:
+            self.cache.put(digest, self.content_fields(result))
+        return result
+
+    def content_fields(self, result):
+        """
+        去掉检查结果中与文件路径相关的字段，得到只取决于文件内容、可以缓存的部分
+
+        Args:
+            result (dict): 检查结果
+
+        Returns:
+            dict: 可缓存的检查结果
+        """
+        return {key: value for key, value in result.items() if key not in FILE_FIELDS}
+
+    def with_file_fields(self, content, fbx_file_path):
+        """
+        为缓存的检查结果补充与文件路径相关的字段
+
+        Args:
+            content (dict): 可缓存的检查结果
+            fbx_file_path (str): FBX文件路径
+
+        Returns:
+            dict: 完整的检查结果
+        """
+        file_name = os.path.basename(fbx_file_path)
+        mesh_content = content.get("mesh_content")
+        mesh_type = resolve_mesh_type(
+            FbxContent(**mesh_content) if mesh_content is not None else None,
+            self.classifier.mesh_type(file_name)
+        )
+
+        result = {
+            "file_path": fbx_file_path,
+            "file_name": file_name,
+            "mesh_type": mesh_type,
+            "is_static_mesh": mesh_type == "static_mesh"
+        }
+        result.update(content)
+        return result
+
+    def mesh_type(self, fbx_file_path):
+        """
+        只读取对象头，确定FBX文件的网格类型
+
+        Args:
+            fbx_file_path (str): FBX文件路径
+
+        Returns:
+            str: static_mesh、skeletal_mesh或animation，文件无法解析时按文件名判断
+        """
+        return classify_fbx_file(fbx_file_path, self.classifier.mesh_type(os.path.basename(fbx_file_path)))
+
+    def inspect_document(self, document, fbx_file_path):
+        """
+        检查已解析的FBX文档
+
+        Args:
+            document (FbxDocument): 解析结果
+            fbx_file_path (str): FBX文件路径
+
+        Returns:
+            dict: 检查结果
+        """
+        meshes = self._collect_meshes(document)
+        render_meshes = [mesh for mesh in meshes if not mesh["is_collision"]]
+
+        return self.with_file_fields({
+            "fbx_version": document.version,
+            "is_binary": document.is_binary,
+            "has_collision": self._check_collision(meshes),
+            "material_slots": self._check_material_slots(meshes),
+            "meshes": meshes,
+            "is_skinned": any(mesh["is_skinned"] for mesh in meshes),
+            "animation_stacks": [stack.name for stack in document.objects_of("AnimationStack")],
+            "triangle_count": sum(mesh["triangles"] for mesh in render_meshes),
+            "vertex_count": sum(mesh["vertices"] for mesh in render_meshes),
+            "mesh_stats": merge_stats(render_meshes),
+            "geometry_fingerprint": combine_fingerprints(mesh["fingerprint"] for mesh in meshes),
+            "mesh_content": document_content(document)._asdict(),
+            "object_counts": self._count_objects(document)
+        }, fbx_file_path)
+
+    def _collect_meshes(self, document):
+        """
+        收集网格模型及其材质、几何体和蒙皮信息
+
+        Args:
+            document (FbxDocument): 解析结果
+
+        Returns:
+            list: 每个网格模型的信息字典
+        """
+        meshes = []
+        for model in document.objects_of("Model", "Mesh"):
+            materials = [material.name for material in document.children(model.id, "Material")]
+            geometries = document.children(model.id, "Geometry")
+            geometry_nodes = [geometry.node for geometry in geometries]
+
+            # FBX 6.x中几何数据直接保存在Model节点中
+            if not geometry_nodes and model.node.find("Vertices") is not None:
+                geometry_nodes = [model.node]
+
+            # 几何体引用的材质索引超出已连接的材质数量时，对应的多边形没有材质
+            material_indices = set()
+            for geometry_node in geometry_nodes:
+                material_indices.update(self._material_indices(geometry_node))
+
+            is_skinned = any(
+                deformer.sub_type == "Skin"
+                for geometry in geometries
+                for deformer in document.children(geometry.id, "Deformer")
+            )
+
+            mesh = {
+                "name": model.name,
+                "materials": materials,
+                "missing_material_indices": sorted(index for index in material_indices if index >= len(materials)),
+                "has_geometry": bool(geometry_nodes),
+                "is_collision": model.name.upper().startswith(COLLISION_PREFIXES),
+                "is_skinned": is_skinned,
+                "fingerprint": model_fingerprint(model.node, geometry_nodes)
+            }
+            mesh.update(merge_stats(geometry_stats(geometry_node) for geometry_node in geometry_nodes))
+            meshes.append(mesh)
+        return meshes
+
+    def _material_indices(self, geometry_node):
+        """
+        读取几何体LayerElementMaterial中使用的材质索引
+
+        Args:
+            geometry_node (FbxNode): Geometry节点
+
+        Returns:
+            set: 材质索引集合
+        """
+        indices = set()
+        for layer_element in geometry_node.find_all("LayerElementMaterial"):
+            _, chunks = array_chunks(layer_element, "Materials")
+            for chunk in chunks:
+                indices.update(int(index) for index in set(chunk))
+        return indices
+
+    def _count_objects(self, document):
+        """
+        统计各类对象的数量
+
+        Args:
+            document (FbxDocument): 解析结果
+
+        Returns:
+            dict: {类名: 数量}
+        """
+        counts = {}
+        for obj in document.objects.values():
+            counts[obj.class_name] = counts.get(obj.class_name, 0) + 1
+        return counts
+
+    def _check_collision(self, meshes):
+        """
+        检查文件中的自定义碰撞网格
+
+        Args:
+            meshes (list): 网格模型信息
+
+        Returns:
+            dict: 碰撞信息
+        """
+        collision_meshes = [mesh["name"] for mesh in meshes if mesh["is_collision"]]
+        has_ucx_collision = any(name.upper().startswith("UCX_") for name in collision_meshes)
+
+        return {
+            "has_collision": bool(collision_meshes),
+            "has_custom_collision": bool(collision_meshes),
+            "has_ucx_collision": has_ucx_collision,
+            "collision_meshes": collision_meshes,
+            "details": ", ".join(collision_meshes) if collision_meshes else "未找到UCX_/UBX_/USP_/UCP_碰撞网格"
+        }
+
+    def _check_material_slots(self, meshes):
+        """
+        根据网格模型连接的材质生成材质槽信息
+
+        导入静态网格时同名材质合并为一个材质槽，因此按材质名称去重。
+        没有连接材质的网格，以及引用了不存在的材质索引的网格，计为缺失材质。
+
+        Args:
+            meshes (list): 网格模型信息
+
+        Returns:
+            dict: 材质槽信息
+        """
+        material_slots = []
+        missing_materials = []
+        seen = set()
+
+        for mesh in meshes:
+            if mesh["is_collision"]:
+                continue
+
+            for material_name in mesh["materials"]:
+                if material_name in seen:
+                    continue
+                seen.add(material_name)
+                material_slots.append({
+                    "index": len(material_slots),
+                    "name": material_name,
+                    "has_material": True
+                })
+
+            missing = []
+            if not mesh["materials"] and mesh["has_geometry"]:
+                missing.append(mesh["name"])
+            missing.extend(f"{mesh['name']}[{index}]" for index in mesh["missing_material_indices"])
+
+            for slot_name in missing:
+                material_slots.append({
+                    "index": len(material_slots),
+                    "name": slot_name,
+                    "has_material": False
+                })
+                missing_materials.append(slot_name)
+
+        return {
+            "has_materials": len(material_slots) > len(missing_materials),
+            "total_slots": len(material_slots),
+            "missing_materials": len(missing_materials),
+            "material_slots": material_slots,
+            "missing_material_slots": missing_materials
+        }
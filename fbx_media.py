@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX嵌入媒体模块
+用于把FBX中以Video Content嵌入的纹理图片提取到按内容寻址的缓存中
+
+fbx_parser.iter_video_contents分块读取嵌入的内容，提取时边写临时文件边计算BLAKE2哈希（与content_hasher相同），
+完成后放入缓存目录中的"<哈希>/<原文件名>"。多个FBX嵌入的同一张图片在缓存中只有一份，
+文件名沿用FBX中记录的名称，因此导入后的纹理资产名称与FBX自己导入时一致。
+清单（SQLite）按FBX路径、大小和修改时间记录提取结果，FBX未变化且缓存文件仍在时不再读取FBX。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import tempfile
+from collections import namedtuple
+
+from content_hasher import DIGEST_SIZE
+from fbx_parser import iter_video_contents, FbxParseError
+
+# 提取的媒体：Video对象名称、FBX中记录的绝对路径和相对路径、内容哈希和缓存中的文件路径
+EmbeddedMedia = namedtuple("EmbeddedMedia", ["video", "file_name", "relative_file_name", "digest", "cache_path"])
+
+# FBX中没有记录文件名时按文件头识别扩展名
+_MEDIA_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"DDS ", ".dds"),
+    (b"BM", ".bmp"),
+    (b"II*\x00", ".tif"),
+    (b"MM\x00*", ".tif"),
+    (b"\x76\x2f\x31\x01", ".exr"),
+    (b"#?RADIANCE", ".hdr"),
+    (b"8BPS", ".psd")
+)
+
+# 缓存文件名中不允许的字符
+_INVALID_FILE_NAME_CHARACTERS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def media_file_name(video, header=b""):
+    """
+    确定嵌入媒体在缓存中的文件名
+
+    Args:
+        video (FbxVideoContent): Video对象的信息
+        header (bytes, optional): 内容开头的字节，FBX中没有记录文件名时用于识别扩展名
+
+    Returns:
+        str: 文件名
+    """
+    for path in (video.relative_file_name, video.file_name):
+        file_name = re.split(r"[\\/]", path)[-1] if path else ""
+        if file_name:
+            return _INVALID_FILE_NAME_CHARACTERS.sub("_", file_name)
+
+    extension = next((ext for signature, ext in _MEDIA_SIGNATURES if header.startswith(signature)), ".bin")
+    return _INVALID_FILE_NAME_CHARACTERS.sub("_", video.name or "Embedded") + extension
+
+
+def media_reference_paths(media, fbx_directory):
+    """
+    获取FBX中引用这份媒体的路径，材质中的纹理引用通常使用相同的路径
+
+    Args:
+        media (EmbeddedMedia): 提取的媒体
+        fbx_directory (str): FBX文件所在目录
+
+    Returns:
+        list: 绝对路径和相对FBX目录解析后的路径
+    """
+    paths = []
+    if media.file_name:
+        paths.append(media.file_name)
+    if media.relative_file_name:
+        paths.append(os.path.join(fbx_directory, media.relative_file_name.replace("\\", "/")))
+    return paths
+
+
+def has_embedded_media(fbx_path):
+    """
+    检查FBX是否嵌入了媒体，找到第一份非空内容即返回
+
+    Args:
+        fbx_path (str): FBX文件路径
+
+    Returns:
+        bool: 是否有嵌入的媒体，文件无法读取时为False
+    """
+    try:
+        for _, chunks in iter_video_contents(fbx_path):
+            if any(chunks):
+                return True
+    except (FbxParseError, OSError):
+        return False
+    return False
+
+
+class EmbeddedMediaExtractor:
+    """嵌入媒体提取类，把FBX中嵌入的媒体流式写入按内容寻址的缓存"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, cache_dir):
+        """
+        初始化提取器
+
+        Args:
+            cache_dir (str): 缓存目录，提取的文件和清单都保存在其中
+        """
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.sqlite")
+
+        # 最近一次extract_many中无法读取的文件 {FBX路径: 错误信息}
+        self.failed = {}
+
+    def extract(self, fbx_path):
+        """
+        提取单个FBX中嵌入的媒体
+
+        Args:
+            fbx_path (str): FBX文件路径
+
+        Returns:
+            list: EmbeddedMedia列表
+
+        Raises:
+            FbxParseError: 文件不是有效的FBX
+            OSError: 无法读取文件
+        """
+        connection = self._connect()
+        try:
+            return self._extract_one(connection, fbx_path)
+        finally:
+            connection.close()
+
+    def extract_many(self, fbx_paths):
+        """
+        提取多个FBX中嵌入的媒体
+
+        清单在每次调用时打开和关闭，因此同一个提取器可以在不同线程中使用（不能同时使用）。
+
+        Args:
+            fbx_paths (iterable): FBX文件路径
+
+        Returns:
+            dict: {FBX路径: EmbeddedMedia列表}，无法读取的文件不包含在结果中，错误记录在failed中
+        """
+        self.failed = {}
+        results = {}
+        connection = self._connect()
+        try:
+            for fbx_path in fbx_paths:
+                try:
+                    results[fbx_path] = self._extract_one(connection, fbx_path)
+                except (FbxParseError, OSError) as e:
+                    self.failed[fbx_path] = str(e)
+        finally:
+            connection.close()
+        return results
+
+    def _connect(self):
+        """
+        打开清单数据库，结构版本变化时清空旧数据
+
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        connection = sqlite3.connect(self.manifest_path)
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        stored = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+        if stored.get("schema_version") != str(self.SCHEMA_VERSION):
+            connection.execute("DROP TABLE IF EXISTS media")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, media TEXT NOT NULL)"
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", ("schema_version", str(self.SCHEMA_VERSION))
+        )
+        connection.commit()
+        return connection
+
+    def _extract_one(self, connection, fbx_path):
+        """
+        提取一个FBX中嵌入的媒体，清单中的记录仍然有效时直接返回
+
+        Args:
+            connection (sqlite3.Connection): 清单数据库连接
+            fbx_path (str): FBX文件路径
+
+        Returns:
+            list: EmbeddedMedia列表
+        """
+        stat_result = os.stat(fbx_path)
+        row = connection.execute("SELECT size, mtime_ns, media FROM media WHERE path = ?", (fbx_path,)).fetchone()
+        if row is not None and row[0] == stat_result.st_size and row[1] == stat_result.st_mtime_ns:
+            media = [EmbeddedMedia(*item) for item in json.loads(row[2])]
+            if all(os.path.isfile(item.cache_path) for item in media):
+                return media
+
+        media = []
+        for video, chunks in iter_video_contents(fbx_path):
+            item = self._store(video, chunks)
+            if item is not None:
+                media.append(item)
+
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO media (path, size, mtime_ns, media) VALUES (?, ?, ?, ?)",
+                (fbx_path, stat_result.st_size, stat_result.st_mtime_ns,
+                 json.dumps([list(item) for item in media], ensure_ascii=False))
+            )
+        return media
+
+    def _store(self, video, chunks):
+        """
+        把一份嵌入内容写入缓存
+
+        内容先写入临时文件并同时计算哈希；缓存中已有相同内容时删除临时文件，沿用已有的文件。
+
+        Args:
+            video (FbxVideoContent): Video对象的信息
+            chunks (iterator): 数据块迭代器
+
+        Returns:
+            EmbeddedMedia: 提取的媒体，内容为空时返回None
+        """
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        header = b""
+        size = 0
+        handle, temp_path = tempfile.mkstemp(prefix="extract_", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                for chunk in chunks:
+                    if len(header) < 16:
+                        header += chunk[:16]
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            if not size:
+                return None
+
+            digest = hasher.hexdigest()
+            media_dir = os.path.join(self.cache_dir, digest)
+            existing = os.listdir(media_dir) if os.path.isdir(media_dir) else []
+            if existing:
+                cache_path = os.path.join(media_dir, sorted(existing)[0])
+            else:
+                os.makedirs(media_dir, exist_ok=True)
+                cache_path = os.path.join(media_dir, media_file_name(video, header))
+                os.replace(temp_path, cache_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return EmbeddedMedia(video.name, video.file_name, video.relative_file_name, digest, cache_path)
+
@@ -0,0 +1,1656 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX解析模块
+用于直接读取FBX文件的节点树、对象和连接关系，不需要导入到引擎
+
+此模块同时支持二进制FBX（包括zlib压缩的数组属性）和ASCII FBX，解析结果统一为FbxNode树：
+二进制文件中的数组属性解码为array.array，ASCII文件中的"*N { a: ... }"数组也转换为相同的形式。
+FbxDocument在节点树之上建立对象表（Model、Geometry、Material、Deformer等）和连接关系的索引。
+只需要知道文件中有哪些对象时，read_fbx_headers只读取Objects下每个对象的头部（ID、类名、名称和子类型），
+二进制文件按记录头中的结束偏移跳过几何数据，ASCII文件逐行扫描而不解析数组。
+read_fbx指定object_classes时只完整读取这些类型的对象（例如材质和纹理），其余对象只保留对象头，
+用于不需要几何数据的查询；选择性读取时Video对象中嵌入的媒体内容（Content）也不读取，
+iter_video_contents按记录头定位嵌入内容后分块读取（ASCII文件逐块解码base64），整个文件和整个媒体都不会读入内存。
+open_fbx以内存映射打开二进制文件，按记录头中的结束偏移遍历节点，数组属性（以及R类型的原始数据）保留为FbxLazyArray，
+只有查询用到时才解压，文件本身不读入内存，适用于几GB的文件；ASCII文件仍完整解析。
+此模块只使用标准库，不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+import sys
+import mmap
+import zlib
+import base64
+import struct
+import binascii
+from array import array
+from collections import namedtuple
+
+# 解析器版本，解析结果的格式变化时递增，用于使缓存的解析结果失效
+PARSER_VERSION = 1
+
+# 二进制FBX文件头
+FBX_BINARY_MAGIC = b"Kaydara FBX Binary  \x00"
+
+# 二进制文件头长度：魔数、0x1A 0x00和uint32版本号
+_BINARY_HEADER_SIZE = 27
+
+# 从此版本开始，节点记录头中的偏移和数量使用64位整数
+_WIDE_RECORD_VERSION = 7500
+
+# 按类型选择性读取时保留的顶层节点，其余顶层节点（Definitions、Takes等）不读取
+_SELECTED_TOP_LEVEL = ("FBXHeaderExtension", "Objects", "Connections")
+
+# 按类型选择性读取时对象中不读取的子节点：Video中嵌入的媒体内容，可能有几十MB
+_SKIPPED_OBJECT_CHILDREN = frozenset(["Content"])
+
+# 流式读取嵌入媒体时每个数据块的字节数（ASCII文件为每次读取的字符数）
+MEDIA_CHUNK_SIZE = 1 << 20
+
+# 分块解码延迟数组时每块的元素数量
+ARRAY_CHUNK_ITEMS = 1 << 20
+
+# 二进制对象名称中名称和类名之间的分隔符
+_BINARY_NAME_SEPARATOR = "\x00\x01"
+
+# 标量属性类型码 -> (struct格式, 字节数)
+_SCALAR_FORMATS = {
+    "Y": ("<h", 2),
+    "C": ("<?", 1),
+    "I": ("<i", 4),
+    "F": ("<f", 4),
+    "D": ("<d", 8),
+    "L": ("<q", 8)
+}
+
+# 数组属性类型码 -> (array类型码, 元素字节数)
+_ARRAY_FORMATS = {
+    "f": ("f", 4),
+    "d": ("d", 8),
+    "l": ("q", 8),
+    "i": ("i", 4),
+    "b": ("b", 1)
+}
+
+# 连接关系：类型（OO对象到对象，OP对象到属性）、子对象ID、父对象ID和属性名称
+FbxConnection = namedtuple("FbxConnection", ["kind", "child", "parent", "property"])
+
+# 对象头：对象ID、类名（节点名称）、对象名称和子类型，不包含对象的属性和几何数据
+FbxObjectHeader = namedtuple("FbxObjectHeader", ["id", "class_name", "name", "sub_type"])
+
+# 只读取对象头的结果：版本号、是否为二进制、FbxObjectHeader列表，以及Takes中是否有带模型通道的Take（6.x的动画）
+FbxHeaders = namedtuple("FbxHeaders", ["version", "is_binary", "objects", "has_take_animation"])
+
+# 嵌入的媒体：Video对象的ID和名称、FileName和RelativeFilename中记录的路径，以及内容的字节数（ASCII文件解码前未知，为None）
+FbxVideoContent = namedtuple("FbxVideoContent", ["id", "name", "file_name", "relative_file_name", "size"])
+
+# Video中记录媒体文件路径的子节点名称
+_VIDEO_PATH_FIELDS = ("FileName", "Filename", "RelativeFilename")
+
+
+class FbxParseError(ValueError):
+    """FBX文件格式错误"""
+
+
+class FbxLazyArray:
+    """
+    内存映射文件中尚未解码的数组属性
+
+    只记录数组在文件中的位置，decode()时才解压，结果不缓存，调用方用完即可释放。
+    R类型的原始数据也以此表示，decode()返回bytes。
+    """
+
+    __slots__ = ("source", "type_code", "length", "encoding", "offset", "stored_length")
+
+    def __init__(self, source, type_code, length, encoding, offset, stored_length):
+        """
+        初始化延迟数组
+
+        Args:
+            source (mmap.mmap): 文件的内存映射
+            type_code (str): 属性类型码 (f, d, l, i, b, R)
+            length (int): 元素数量（R类型为字节数）
+            encoding (int): 0为原始数据，1为zlib压缩
+            offset (int): 存储的数据在文件中的偏移
+            stored_length (int): 存储的字节数
+        """
+        self.source = source
+        self.type_code = type_code
+        self.length = length
+        self.encoding = encoding
+        self.offset = offset
+        self.stored_length = stored_length
+
+    def __len__(self):
+        return self.length
+
+    def decode(self):
+        """
+        解码整个数组
+
+        Returns:
+            array.array: 解码后的数组，R类型为bytes
+
+        Raises:
+            FbxParseError: 数据损坏
+        """
+        payload = self.source[self.offset:self.offset + self.stored_length]
+        if self.type_code == "R":
+            return payload
+        try:
+            return decode_array(self.type_code, self.length, self.encoding, payload)
+        except zlib.error as e:
+            raise FbxParseError(f"数组解压失败（偏移 {self.offset}）: {e}")
+
+    def chunks(self, chunk_items=ARRAY_CHUNK_ITEMS):
+        """
+        分块解码数组，压缩的数组边读边解压，任何时候只有一块数据在内存中
+
+        Args:
+            chunk_items (int, optional): 每块的元素数量
+
+        Yields:
+            array.array: 数据块，R类型为bytes
+
+        Raises:
+            FbxParseError: 编码未知或数据损坏
+        """
+        if self.type_code == "R":
+            item_size = 1
+        else:
+            typecode, item_size = _ARRAY_FORMATS[self.type_code]
+        chunk_bytes = max(1, chunk_items) * item_size
+        end = self.offset + self.stored_length
+
+        if self.encoding == 0:
+            raw_chunks = (
+                self.source[offset:min(offset + chunk_bytes, end)] for offset in range(self.offset, end, chunk_bytes)
+            )
+        elif self.encoding == 1:
+            raw_chunks = self._inflate(chunk_bytes)
+        else:
+            raise FbxParseError(f"未知的数组编码 {self.encoding}")
+
+        total = 0
+        for raw in raw_chunks:
+            total += len(raw)
+            if self.type_code == "R":
+                yield raw
+                continue
+            if len(raw) % item_size:
+                raise FbxParseError(f"数组长度不一致: 应为 {self.length * item_size} 字节")
+            values = array(typecode)
+            values.frombytes(raw)
+            if sys.byteorder == "big":
+                values.byteswap()
+            yield values
+
+        if total != self.length * item_size:
+            raise FbxParseError(f"数组长度不一致: 应为 {self.length * item_size} 字节，实际 {total} 字节")
+
+    def _inflate(self, chunk_bytes):
+        """
+        分块解压数组
+
+        Args:
+            chunk_bytes (int): 每块的字节数，必须是元素字节数的整数倍
+
+        Yields:
+            bytes: 解压后的数据块
+        """
+        decompressor = zlib.decompressobj()
+        offset = self.offset
+        end = self.offset + self.stored_length
+        pending = b""
+        try:
+            while True:
+                if decompressor.unconsumed_tail:
+                    data = decompressor.unconsumed_tail
+                elif offset < end and not decompressor.eof:
+                    data = self.source[offset:min(offset + MEDIA_CHUNK_SIZE, end)]
+                    offset += len(data)
+                else:
+                    break
+
+                pending += decompressor.decompress(data, chunk_bytes - len(pending))
+                if len(pending) == chunk_bytes:
+                    yield pending
+                    pending = b""
+            pending += decompressor.flush()
+        except zlib.error as e:
+            raise FbxParseError(f"数组解压失败（偏移 {self.offset}）: {e}")
+        if pending:
+            yield pending
+
+    def __repr__(self):
+        return f"FbxLazyArray({self.type_code!r}, {self.length} 个元素)"
+
+
+class FbxNode:
+    """FBX节点，包含名称、属性值列表和子节点"""
+
+    __slots__ = ("name", "properties", "children")
+
+    def __init__(self, name, properties=None, children=None):
+        """
+        初始化节点
+
+        Args:
+            name (str): 节点名称
+            properties (list, optional): 属性值列表
+            children (list, optional): 子节点列表
+        """
+        self.name = name
+        self.properties = properties if properties is not None else []
+        self.children = children if children is not None else []
+
+    def find(self, name):
+        """
+        查找第一个指定名称的子节点
+
+        Args:
+            name (str): 子节点名称
+
+        Returns:
+            FbxNode: 子节点，不存在时返回None
+        """
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def find_all(self, name):
+        """
+        查找所有指定名称的子节点
+
+        Args:
+            name (str): 子节点名称
+
+        Returns:
+            list: FbxNode列表
+        """
+        return [child for child in self.children if child.name == name]
+
+    def value(self, index=0, default=None):
+        """
+        获取属性值
+
+        Args:
+            index (int, optional): 属性索引
+            default (optional): 属性不存在时的默认值
+
+        Returns:
+            属性值
+        """
+        if index < len(self.properties):
+            return self.properties[index]
+        return default
+
+    def child_value(self, name, default=None):
+        """
+        获取子节点的第一个属性值，例如Geometry下的MappingInformationType
+
+        Args:
+            name (str): 子节点名称
+            default (optional): 子节点不存在时的默认值
+
+        Returns:
+            属性值
+        """
+        child = self.find(name)
+        return child.value(0, default) if child is not None else default
+
+    def __repr__(self):
+        return f"FbxNode({self.name!r}, {len(self.properties)} 个属性, {len(self.children)} 个子节点)"
+
+
+class FbxObject:
+    """Objects下的一个对象，例如Model、Geometry、Material或Deformer"""
+
+    __slots__ = ("id", "class_name", "name", "sub_type", "node")
+
+    def __init__(self, object_id, class_name, name, sub_type, node):
+        """
+        初始化对象
+
+        Args:
+            object_id: 对象ID（二进制和7.x ASCII为整数，6.x ASCII为完整名称字符串）
+            class_name (str): 节点名称，例如Model、Geometry
+            name (str): 对象名称
+            sub_type (str): 子类型，例如Mesh、Skin、Cluster
+            node (FbxNode): 对象节点
+        """
+        self.id = object_id
+        self.class_name = class_name
+        self.name = name
+        self.sub_type = sub_type
+        self.node = node
+
+    def __repr__(self):
+        return f"FbxObject({self.class_name}::{self.name}, {self.sub_type!r})"
+
+
+def split_object_name(raw_name):
+    """
+    拆分对象名称属性
+
+    二进制文件使用"名称\\x00\\x01类名"，ASCII文件使用"类名::名称"。
+
+    Args:
+        raw_name (str): 原始名称属性
+
+    Returns:
+        tuple: (名称, 类名)，没有类名时类名为空字符串
+    """
+    if _BINARY_NAME_SEPARATOR in raw_name:
+        name, class_name = raw_name.split(_BINARY_NAME_SEPARATOR, 1)
+        return name, class_name
+    if "::" in raw_name:
+        class_name, name = raw_name.split("::", 1)
+        return name, class_name
+    return raw_name, ""
+
+
+def _object_identity(properties):
+    """
+    从对象节点的属性中取出对象ID、名称和子类型
+
+    Args:
+        properties (list): 对象节点的属性值列表，不能为空
+
+    Returns:
+        tuple: (对象ID, 对象名称, 子类型)
+    """
+    first = properties[0]
+    if isinstance(first, str):
+        # 6.x ASCII：没有数字ID，以完整名称作为ID
+        object_id = first
+        raw_name = first
+        sub_type = properties[1] if len(properties) > 1 else ""
+    else:
+        object_id = first
+        raw_name = properties[1] if len(properties) > 1 else ""
+        sub_type = properties[2] if len(properties) > 2 else ""
+
+    name, _ = split_object_name(raw_name if isinstance(raw_name, str) else "")
+    return object_id, name, sub_type if isinstance(sub_type, str) else ""
+
+
+def properties70(node):
+    """
+    读取节点的Properties70（或6.x的Properties60）属性表
+
+    Args:
+        node (FbxNode): 对象节点
+
+    Returns:
+        dict: {属性名称: 值列表}，值列表不含名称、类型和标志
+    """
+    table = node.find("Properties70") or node.find("Properties60")
+    if table is None:
+        return {}
+
+    values = {}
+    for entry in table.children:
+        if not entry.properties:
+            continue
+        # Properties70: 名称、类型、标签、标志、值...；Properties60: 名称、类型、标志、值...
+        skip = 4 if table.name == "Properties70" else 3
+        values[entry.properties[0]] = entry.properties[skip:]
+    return values
+
+
+class FbxDocument:
+    """解析后的FBX文件，提供对象表和连接关系的查询"""
+
+    def __init__(self, nodes, version, is_binary, source=None):
+        """
+        初始化文档
+
+        Args:
+            nodes (list): 顶层FbxNode列表
+            version (int): FBX版本号，例如7400
+            is_binary (bool): 是否为二进制文件
+            source (mmap.mmap, optional): 延迟数组所在的内存映射，close()时关闭
+        """
+        self.nodes = nodes
+        self.version = version
+        self.is_binary = is_binary
+        self.source = source
+
+        self.objects = {}
+        self.connections = []
+        self._children = {}
+        self._parents = {}
+
+        self._index_objects()
+        self._index_connections()
+
+    def find(self, name):
+        """
+        查找顶层节点
+
+        Args:
+            name (str): 节点名称
+
+        Returns:
+            FbxNode: 节点，不存在时返回None
+        """
+        for node in self.nodes:
+            if node.name == name:
+                return node
+        return None
+
+    def objects_of(self, class_name, sub_type=None):
+        """
+        获取指定类型的对象
+
+        Args:
+            class_name (str): 节点名称，例如Model
+            sub_type (str, optional): 子类型，例如Mesh
+
+        Returns:
+            list: FbxObject列表，按文件中的顺序
+        """
+        return [
+            obj for obj in self.objects.values()
+            if obj.class_name == class_name and (sub_type is None or obj.sub_type == sub_type)
+        ]
+
+    def children(self, object_id, class_name=None):
+        """
+        获取连接到对象上的子对象，按连接顺序（材质的连接顺序即材质槽顺序）
+
+        Args:
+            object_id: 父对象ID
+            class_name (str, optional): 只返回指定类型的子对象
+
+        Returns:
+            list: FbxObject列表
+        """
+        result = []
+        for connection in self._children.get(object_id, ()):
+            obj = self.objects.get(connection.child)
+            if obj is not None and (class_name is None or obj.class_name == class_name):
+                result.append(obj)
+        return result
+
+    def parents(self, object_id, class_name=None):
+        """
+        获取对象连接到的父对象
+
+        Args:
+            object_id: 子对象ID
+            class_name (str, optional): 只返回指定类型的父对象
+
+        Returns:
+            list: FbxObject列表
+        """
+        result = []
+        for connection in self._parents.get(object_id, ()):
+            obj = self.objects.get(connection.parent)
+            if obj is not None and (class_name is None or obj.class_name == class_name):
+                result.append(obj)
+        return result
+
+    def child_connections(self, object_id):
+        """
+        获取以对象为父对象的连接，包括OP连接的属性名称
+
+        Args:
+            object_id: 父对象ID
+
+        Returns:
+            list: FbxConnection列表
+        """
+        return list(self._children.get(object_id, ()))
+
+    def close(self):
+        """关闭文件的内存映射，之后不能再解码文档中的FbxLazyArray"""
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _index_objects(self):
+        """为Objects下的对象建立ID索引"""
+        objects_node = self.find("Objects")
+        if objects_node is None:
+            return
+
+        for node in objects_node.children:
+            if not node.properties:
+                continue
+
+            object_id, name, sub_type = _object_identity(node.properties)
+            self.objects[object_id] = FbxObject(object_id, node.name, name, sub_type, node)
+
+    def _index_connections(self):
+        """建立双向的连接索引"""
+        connections_node = self.find("Connections")
+        if connections_node is None:
+            return
+
+        for node in connections_node.children:
+            if node.name not in ("C", "Connect") or len(node.properties) < 3:
+                continue
+            connection = FbxConnection(
+                node.properties[0], node.properties[1], node.properties[2], node.value(3, "")
+            )
+            self.connections.append(connection)
+            self._children.setdefault(connection.parent, []).append(connection)
+            self._parents.setdefault(connection.child, []).append(connection)
+
+
+def is_binary_fbx(header):
+    """
+    判断文件头是否为二进制FBX
+
+    Args:
+        header (bytes): 文件开头的字节
+
+    Returns:
+        bool: 是否为二进制FBX
+    """
+    return header[:len(FBX_BINARY_MAGIC)] == FBX_BINARY_MAGIC
+
+
+def read_fbx(file_path, object_classes=None):
+    """
+    读取并解析FBX文件
+
+    Args:
+        file_path (str): FBX文件路径
+        object_classes (iterable, optional): 只完整读取这些类型的对象，其余对象只保留对象头的属性值（没有子节点），
+            顶层节点只读取FBXHeaderExtension、Objects和Connections；为None时完整读取整个文件
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX
+        OSError: 无法读取文件
+    """
+    if object_classes is not None:
+        object_classes = frozenset(object_classes)
+        with open(file_path, "rb") as f:
+            header = f.read(_BINARY_HEADER_SIZE)
+            if is_binary_fbx(header):
+                return _read_binary_selected(f, header, object_classes)
+        return _read_ascii_selected(file_path, object_classes)
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return parse_fbx(data)
+
+
+def open_fbx(file_path):
+    """
+    以内存映射打开FBX文件，数组属性在查询时才解码
+
+    二进制文件的节点树按记录头遍历，标量和字符串属性立即解码，数组属性和R类型的原始数据为FbxLazyArray。
+    返回的文档持有文件的内存映射，用完后应调用close()（或用with语句），之后不能再解码其中的数组。
+    ASCII文件没有记录头，与read_fbx相同地完整解析。
+
+    Args:
+        file_path (str): FBX文件路径
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX
+        OSError: 无法读取文件
+    """
+    with open(file_path, "rb") as f:
+        if not is_binary_fbx(f.read(_BINARY_HEADER_SIZE)):
+            return read_fbx(file_path)
+        try:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            raise FbxParseError(f"无法映射FBX文件: {e}")
+
+    try:
+        return parse_binary(source, lazy=True)
+    except BaseException:
+        source.close()
+        raise
+
+
+def iter_video_contents(file_path, chunk_size=MEDIA_CHUNK_SIZE):
+    """
+    流式读取Video对象中嵌入的媒体内容（通常是纹理图片）
+
+    二进制文件按记录头跳到Content属性后分块读取原始字节，ASCII文件分块读取并解码base64字符串，
+    只有Content不为空的Video会返回。
+
+    Args:
+        file_path (str): FBX文件路径
+        chunk_size (int, optional): 每个数据块的大小
+
+    Yields:
+        tuple: (FbxVideoContent, 数据块迭代器)；数据块必须在取下一项之前读完，之后迭代器失效
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX或嵌入内容损坏
+        OSError: 无法读取文件
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(_BINARY_HEADER_SIZE)
+        if is_binary_fbx(header):
+            yield from _iter_binary_video_contents(f, header, chunk_size)
+            return
+    yield from _iter_ascii_video_contents(file_path, chunk_size)
+
+
+def parse_fbx(data):
+    """
+    解析FBX文件内容，自动识别二进制或ASCII格式
+
+    Args:
+        data (bytes): 文件内容
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 内容不是有效的FBX
+    """
+    if is_binary_fbx(data):
+        return parse_binary(data)
+    return parse_ascii(data.decode("utf-8", errors="replace"))
+
+
+def read_fbx_headers(file_path):
+    """
+    只读取FBX文件中的对象头，不解析对象的属性和几何数据
+
+    Args:
+        file_path (str): FBX文件路径
+
+    Returns:
+        FbxHeaders: 版本号、格式和对象头列表
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX
+        OSError: 无法读取文件
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(_BINARY_HEADER_SIZE)
+        if is_binary_fbx(header):
+            return _read_binary_headers(f, header)
+    return _read_ascii_headers(file_path)
+
+
+# ---------------------------------------------------------------- 二进制格式
+
+def parse_binary(data, lazy=False):
+    """
+    解析二进制FBX
+
+    Args:
+        data (bytes): 文件内容，lazy为True时为文件的内存映射
+        lazy (bool, optional): 数组属性是否保留为FbxLazyArray，文档关闭时关闭data
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 文件结构损坏
+    """
+    if len(data) < _BINARY_HEADER_SIZE or not is_binary_fbx(data):
+        raise FbxParseError("不是二进制FBX文件")
+
+    version = struct.unpack_from("<I", data, 23)[0]
+    reader = _BinaryReader(data if lazy else memoryview(data), version >= _WIDE_RECORD_VERSION, lazy=lazy)
+
+    nodes = []
+    offset = _BINARY_HEADER_SIZE
+    try:
+        while offset < len(data):
+            node, offset = reader.read_node(offset)
+            if node is None:
+                break
+            nodes.append(node)
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError) as e:
+        raise FbxParseError(f"二进制FBX结构损坏（偏移 {offset}）: {e}")
+
+    # 只有文件头的文件通常是写入中断或被截断
+    if not nodes:
+        raise FbxParseError("二进制FBX中没有任何节点记录")
+
+    return FbxDocument(nodes, version, True, data if lazy else None)
+
+
+class _BinaryReader:
+    """二进制FBX节点记录的读取器"""
+
+    def __init__(self, data, wide, base=0, lazy=False):
+        """
+        初始化读取器
+
+        Args:
+            data (memoryview): 文件内容，或从base开始的一段文件内容；lazy为True时为整个文件的内存映射
+            wide (bool): 节点记录头是否使用64位整数（7.5及以上版本）
+            base (int, optional): data开头在文件中的偏移，记录头中的结束偏移是相对文件开头的
+            lazy (bool, optional): 数组属性和R类型的原始数据是否保留为FbxLazyArray
+        """
+        self.data = data
+        self.header = struct.Struct("<QQQ" if wide else "<III")
+        self.base = base
+        self.lazy = lazy
+
+    def read_node(self, offset):
+        """
+        读取一个节点记录及其子节点
+
+        Args:
+            offset (int): 记录开始的偏移（相对data）
+
+        Returns:
+            tuple: (FbxNode, 下一条记录的偏移)；遇到空记录时FbxNode为None
+        """
+        data = self.data
+        end_offset, property_count, _ = self.header.unpack_from(data, offset)
+        offset += self.header.size
+        name_length = data[offset]
+        offset += 1
+
+        # 空记录标记子节点列表或文件的结束
+        if end_offset == 0:
+            return None, offset
+
+        end_offset -= self.base
+        if end_offset > len(data):
+            raise FbxParseError(f"节点记录超出文件末尾（偏移 {offset + self.base}）")
+
+        name = bytes(data[offset:offset + name_length]).decode("ascii")
+        offset += name_length
+
+        properties = []
+        for _ in range(property_count):
+            value, offset = self.read_property(offset)
+            properties.append(value)
+
+        children = []
+        while offset < end_offset:
+            child, offset = self.read_node(offset)
+            if child is None:
+                break
+            children.append(child)
+
+        return FbxNode(name, properties, children), end_offset
+
+    def read_property(self, offset):
+        """
+        读取一个属性值
+
+        Args:
+            offset (int): 属性开始的偏移
+
+        Returns:
+            tuple: (属性值, 下一个属性的偏移)
+        """
+        data = self.data
+        type_code = chr(data[offset])
+        offset += 1
+
+        scalar = _SCALAR_FORMATS.get(type_code)
+        if scalar is not None:
+            value = struct.unpack_from(scalar[0], data, offset)[0]
+            return value, offset + scalar[1]
+
+        if type_code in _ARRAY_FORMATS:
+            length, encoding, stored_length = struct.unpack_from("<III", data, offset)
+            offset += 12
+            if offset + stored_length > len(data):
+                raise FbxParseError(f"数组超出文件末尾（偏移 {offset + self.base}）")
+            if self.lazy:
+                return FbxLazyArray(data, type_code, length, encoding, offset, stored_length), offset + stored_length
+            payload = data[offset:offset + stored_length]
+            return decode_array(type_code, length, encoding, payload), offset + stored_length
+
+        if type_code == "S" or type_code == "R":
+            length = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+            if self.lazy and type_code == "R":
+                return FbxLazyArray(data, type_code, length, 0, offset, length), offset + length
+            raw = bytes(data[offset:offset + length])
+            if type_code == "S":
+                return raw.decode("utf-8", errors="replace"), offset + length
+            return raw, offset + length
+
+        raise FbxParseError(f"未知的属性类型 {type_code!r}（偏移 {offset - 1}）")
+
+
+def decode_array(type_code, length, encoding, payload):
+    """
+    解码二进制数组属性
+
+    Args:
+        type_code (str): 数组类型码 (f, d, l, i, b)
+        length (int): 元素数量
+        encoding (int): 0为原始数据，1为zlib压缩
+        payload: 存储的字节
+
+    Returns:
+        array.array: 解码后的数组
+
+    Raises:
+        FbxParseError: 编码未知或长度不一致
+    """
+    typecode, item_size = _ARRAY_FORMATS[type_code]
+    if encoding == 1:
+        raw = zlib.decompress(payload)
+    elif encoding == 0:
+        raw = bytes(payload)
+    else:
+        raise FbxParseError(f"未知的数组编码 {encoding}")
+
+    if len(raw) != length * item_size:
+        raise FbxParseError(f"数组长度不一致: 应为 {length * item_size} 字节，实际 {len(raw)} 字节")
+
+    values = array(typecode)
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+# 只读取记录头时得到的记录信息：名称、起始和结束偏移、属性数量、属性的起始偏移和字节数、子节点的起始偏移
+_RecordHeader = namedtuple("_RecordHeader", [
+    "name", "offset", "end_offset", "property_count", "properties_offset", "properties_length", "children_offset"
+])
+
+
+def _read_binary_headers(f, header):
+    """
+    读取二进制FBX的对象头
+
+    只读取顶层记录、Objects下每个对象的记录头和属性，以及Takes下各个Take的子节点名称，
+    其余数据按记录头中的结束偏移直接跳过。
+
+    Args:
+        f: 以二进制模式打开的文件
+        header (bytes): 已读取的文件头
+
+    Returns:
+        FbxHeaders: 读取结果
+
+    Raises:
+        FbxParseError: 文件结构损坏
+    """
+    if len(header) < _BINARY_HEADER_SIZE:
+        raise FbxParseError("不是二进制FBX文件")
+
+    version = struct.unpack_from("<I", header, 23)[0]
+    reader = _BinaryHeaderReader(f, version >= _WIDE_RECORD_VERSION)
+
+    objects = []
+    has_take_animation = False
+    record_count = 0
+    try:
+        for record in reader.records(_BINARY_HEADER_SIZE, reader.size):
+            record_count += 1
+            if record.name == "Objects":
+                for child in reader.records(record.children_offset, record.end_offset):
+                    properties = reader.properties(child)
+                    if properties:
+                        object_id, name, sub_type = _object_identity(properties)
+                        objects.append(FbxObjectHeader(object_id, child.name, name, sub_type))
+            elif record.name == "Takes" and not has_take_animation:
+                has_take_animation = any(
+                    take.name == "Take" and any(
+                        channel.name == "Model" for channel in reader.records(take.children_offset, take.end_offset)
+                    )
+                    for take in reader.records(record.children_offset, record.end_offset)
+                )
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError) as e:
+        raise FbxParseError(f"二进制FBX结构损坏: {e}")
+
+    if not record_count:
+        raise FbxParseError("二进制FBX中没有任何节点记录")
+
+    return FbxHeaders(version, True, objects, has_take_animation)
+
+
+class _BinaryHeaderReader:
+    """只读取二进制FBX记录头的读取器，按结束偏移跳过不需要的记录内容"""
+
+    def __init__(self, f, wide):
+        """
+        初始化读取器
+
+        Args:
+            f: 以二进制模式打开的文件
+            wide (bool): 节点记录头是否使用64位整数（7.5及以上版本）
+        """
+        self.file = f
+        self.wide = wide
+        self.header = struct.Struct("<QQQ" if wide else "<III")
+        self.size = f.seek(0, os.SEEK_END)
+
+    def records(self, offset, end):
+        """
+        依次读取同一层级的记录头
+
+        Args:
+            offset (int): 第一条记录的偏移
+            end (int): 该层级的结束偏移
+
+        Yields:
+            _RecordHeader: 记录头，遇到空记录时结束
+        """
+        while offset < end:
+            record = self.read_record(offset)
+            if record is None:
+                return
+            yield record
+            offset = record.end_offset
+
+    def read_record(self, offset):
+        """
+        读取一条记录的记录头和名称
+
+        Args:
+            offset (int): 记录开始的偏移
+
+        Returns:
+            _RecordHeader: 记录头，空记录时返回None
+
+        Raises:
+            FbxParseError: 记录头不完整或偏移无效
+        """
+        f = self.file
+        f.seek(offset)
+        raw = f.read(self.header.size + 1)
+        if len(raw) < self.header.size + 1:
+            raise FbxParseError(f"记录头不完整（偏移 {offset}）")
+
+        end_offset, property_count, properties_length = self.header.unpack_from(raw)
+        if end_offset == 0:
+            return None
+        if end_offset <= offset or end_offset > self.size:
+            raise FbxParseError(f"节点记录超出文件末尾（偏移 {offset}）")
+
+        name_length = raw[-1]
+        name = f.read(name_length).decode("ascii")
+        properties_offset = offset + len(raw) + name_length
+        return _RecordHeader(name, offset, end_offset, property_count, properties_offset, properties_length,
+                             properties_offset + properties_length)
+
+    def properties(self, record):
+        """
+        读取记录的属性值
+
+        Args:
+            record (_RecordHeader): 记录头
+
+        Returns:
+            list: 属性值列表
+        """
+        self.file.seek(record.properties_offset)
+        reader = _BinaryReader(memoryview(self.file.read(record.properties_length)), self.wide)
+        values = []
+        offset = 0
+        for _ in range(record.property_count):
+            value, offset = reader.read_property(offset)
+            values.append(value)
+        return values
+
+    def read_node(self, record, skipped_children=None):
+        """
+        完整读取一条记录及其子节点
+
+        Args:
+            record (_RecordHeader): 记录头
+            skipped_children (frozenset, optional): 不读取的直接子节点名称
+
+        Returns:
+            FbxNode: 节点
+        """
+        if skipped_children:
+            children = [
+                self.read_node(child) for child in self.records(record.children_offset, record.end_offset)
+                if child.name not in skipped_children
+            ]
+            return FbxNode(record.name, self.properties(record), children)
+
+        self.file.seek(record.offset)
+        data = memoryview(self.file.read(record.end_offset - record.offset))
+        node, _ = _BinaryReader(data, self.wide, record.offset).read_node(0)
+        return node
+
+    def raw_property(self, record):
+        """
+        定位记录第一个属性中的原始字节（R类型）或字符串（S类型）数据，不读取数据本身
+
+        Args:
+            record (_RecordHeader): 记录头
+
+        Returns:
+            tuple: (数据的起始偏移, 字节数)，第一个属性不是原始数据时字节数为0
+        """
+        if not record.property_count or record.properties_length < 5:
+            return record.properties_offset, 0
+
+        self.file.seek(record.properties_offset)
+        type_code, length = struct.unpack("<cI", self.file.read(5))
+        if type_code not in (b"R", b"S"):
+            return record.properties_offset, 0
+
+        offset = record.properties_offset + 5
+        if offset + length > record.properties_offset + record.properties_length:
+            raise FbxParseError(f"嵌入数据超出记录范围（偏移 {record.offset}）")
+        return offset, length
+
+    def chunks(self, offset, size, chunk_size):
+        """
+        分块读取一段数据
+
+        Args:
+            offset (int): 起始偏移
+            size (int): 字节数
+            chunk_size (int): 每块的字节数
+
+        Yields:
+            bytes: 数据块
+
+        Raises:
+            FbxParseError: 文件在数据结束前截断
+        """
+        end = offset + size
+        while offset < end:
+            # 其他读取可能移动了文件位置，每次都重新定位
+            self.file.seek(offset)
+            chunk = self.file.read(min(chunk_size, end - offset))
+            if not chunk:
+                raise FbxParseError(f"嵌入数据不完整（偏移 {offset}）")
+            offset += len(chunk)
+            yield chunk
+
+
+def _read_binary_selected(f, header, object_classes):
+    """
+    按对象类型选择性读取二进制FBX
+
+    Args:
+        f: 以二进制模式打开的文件
+        header (bytes): 已读取的文件头
+        object_classes (frozenset): 完整读取的对象类型
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 文件结构损坏
+    """
+    if len(header) < _BINARY_HEADER_SIZE:
+        raise FbxParseError("不是二进制FBX文件")
+
+    version = struct.unpack_from("<I", header, 23)[0]
+    reader = _BinaryHeaderReader(f, version >= _WIDE_RECORD_VERSION)
+
+    nodes = []
+    record_count = 0
+    try:
+        for record in reader.records(_BINARY_HEADER_SIZE, reader.size):
+            record_count += 1
+            if record.name == "Objects":
+                children = [
+                    reader.read_node(child, _SKIPPED_OBJECT_CHILDREN) if child.name in object_classes
+                    else FbxNode(child.name, reader.properties(child))
+                    for child in reader.records(record.children_offset, record.end_offset)
+                ]
+                nodes.append(FbxNode(record.name, reader.properties(record), children))
+            elif record.name in _SELECTED_TOP_LEVEL:
+                nodes.append(reader.read_node(record))
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError) as e:
+        raise FbxParseError(f"二进制FBX结构损坏: {e}")
+
+    if not record_count:
+        raise FbxParseError("二进制FBX中没有任何节点记录")
+
+    return FbxDocument(nodes, version, True)
+
+
+def _iter_binary_video_contents(f, header, chunk_size):
+    """
+    流式读取二进制FBX中Video对象嵌入的媒体内容
+
+    Args:
+        f: 以二进制模式打开的文件
+        header (bytes): 已读取的文件头
+        chunk_size (int): 每个数据块的字节数
+
+    Yields:
+        tuple: (FbxVideoContent, 数据块迭代器)
+
+    Raises:
+        FbxParseError: 文件结构损坏
+    """
+    if len(header) < _BINARY_HEADER_SIZE:
+        raise FbxParseError("不是二进制FBX文件")
+
+    version = struct.unpack_from("<I", header, 23)[0]
+    reader = _BinaryHeaderReader(f, version >= _WIDE_RECORD_VERSION)
+
+    try:
+        for record in reader.records(_BINARY_HEADER_SIZE, reader.size):
+            if record.name != "Objects":
+                continue
+            for video in reader.records(record.children_offset, record.end_offset):
+                if video.name != "Video":
+                    continue
+
+                paths = {}
+                content = None
+                for field in reader.records(video.children_offset, video.end_offset):
+                    if field.name in _VIDEO_PATH_FIELDS and field.property_count:
+                        paths[field.name] = str(reader.properties(field)[0])
+                    elif field.name == "Content":
+                        content = field
+                if content is None:
+                    continue
+
+                offset, size = reader.raw_property(content)
+                if not size:
+                    continue
+
+                object_id, name, _ = _object_identity(reader.properties(video))
+                file_name = paths.get("FileName") or paths.get("Filename", "")
+                yield (FbxVideoContent(object_id, name, file_name, paths.get("RelativeFilename", ""), size),
+                       reader.chunks(offset, size, chunk_size))
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError) as e:
+        raise FbxParseError(f"二进制FBX结构损坏: {e}")
+
+
+# ---------------------------------------------------------------- ASCII格式
+
+# ASCII词法单元：注释、字符串、节点名称（以冒号结尾）、数组长度标记、数字、花括号、逗号和其他裸词
+_ASCII_TOKEN = re.compile(r"""
+    (?P<comment>;[^\n]*)
+  | "(?P<string>[^"]*)"
+  | (?P<key>[A-Za-z_][A-Za-z0-9_|]*)\s*:(?!:)
+  | \*(?P<count>\d+)
+  | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?![A-Za-z_])
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<comma>,)
+  | (?P<word>[^\s,{}";]+)
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+
+def _ascii_number(text):
+    """
+    把数字文本转换为int或float
+
+    Args:
+        text (str): 数字文本
+
+    Returns:
+        int | float: 数值
+    """
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def _ascii_array(body):
+    """
+    把ASCII数组的内容转换为array.array，与二进制文件的数组属性保持一致
+
+    Args:
+        body (str): "{ a: 1,2,3 }"中花括号内的文本
+
+    Returns:
+        array.array: 整数数组（q）或浮点数组（d）
+
+    Raises:
+        FbxParseError: 数组内容不是数字
+    """
+    body = body.strip()
+    if body.startswith("a"):
+        body = body[1:].lstrip()
+        if body.startswith(":"):
+            body = body[1:]
+
+    # 直接按逗号拆分，比逐个匹配词法单元快得多
+    parts = [part for part in body.split(",") if part.strip()]
+    try:
+        if "." in body or "e" in body or "E" in body:
+            return array("d", map(float, parts))
+        return array("q", map(int, parts))
+    except ValueError as e:
+        raise FbxParseError(f"无效的数组内容: {e}")
+
+
+def parse_ascii(text):
+    """
+    解析ASCII FBX
+
+    Args:
+        text (str): 文件内容
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 花括号不匹配或不是FBX文件
+    """
+    # 未结束的父节点栈，current为正在读取属性的节点
+    root = FbxNode("")
+    stack = [root]
+    current = None
+
+    position = 0
+    length = len(text)
+    while position < length:
+        match = _ASCII_TOKEN.match(text, position)
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "space" or kind == "comment" or kind == "comma":
+            continue
+
+        if kind == "key":
+            current = FbxNode(match.group("key"))
+            stack[-1].children.append(current)
+        elif kind == "open":
+            if current is None:
+                raise FbxParseError(f"多余的{{（位置 {match.start()}）")
+            stack.append(current)
+            current = None
+        elif kind == "close":
+            if len(stack) == 1:
+                raise FbxParseError(f"多余的}}（位置 {match.start()}）")
+            stack.pop()
+            current = None
+        elif current is None:
+            continue
+        elif kind == "string":
+            current.properties.append(match.group("string"))
+        elif kind == "number":
+            current.properties.append(_ascii_number(match.group("number")))
+        elif kind == "count":
+            # "Name: *N { a: ... }"转换为与二进制相同的数组属性
+            open_position = text.find("{", position)
+            close_position = text.find("}", open_position)
+            if open_position == -1 or close_position == -1:
+                raise FbxParseError(f"数组不完整（位置 {match.start()}）")
+            current.properties.append(_ascii_array(text[open_position + 1:close_position]))
+            position = close_position + 1
+            current = None
+        else:
+            current.properties.append(match.group("word"))
+
+    if len(stack) != 1:
+        raise FbxParseError("花括号不匹配，文件可能不完整")
+    if not root.children:
+        raise FbxParseError("不是FBX文件")
+
+    version = 0
+    header = next((node for node in root.children if node.name == "FBXHeaderExtension"), None)
+    if header is not None:
+        version = header.child_value("FBXVersion", 0) or 0
+
+    return FbxDocument(root.children, version, False)
+
+
+# ASCII对象头中的属性值：字符串或整数
+_ASCII_HEADER_VALUE = re.compile(r'"([^"]*)"|([-+]?\d+)')
+
+# ASCII节点的开头："名称:"及其后的内容
+_ASCII_NODE_START = re.compile(r"([A-Za-z_][A-Za-z0-9_|]*)\s*:(?!:)(.*)")
+
+# ASCII中的字符串，统计花括号前去掉
+_ASCII_STRING = re.compile(r'"[^"]*"')
+
+# ASCII中Content的base64字符串之间允许出现的字符
+_ASCII_CONTENT_SEPARATORS = frozenset(" \t\r\n,")
+
+
+def _ascii_line_braces(line):
+    """
+    统计ASCII FBX中一行的花括号（不计字符串中的花括号）
+
+    Args:
+        line (str): 一行文本
+
+    Returns:
+        tuple: (去掉首尾空白的文本, 左花括号数量, 右花括号数量)；注释行的数量为0
+    """
+    stripped = line.strip()
+    if stripped.startswith(";"):
+        return stripped, 0, 0
+    code = _ASCII_STRING.sub("", stripped) if '"' in stripped else stripped
+    return stripped, code.count("{"), code.count("}")
+
+
+def _read_ascii_headers(file_path):
+    """
+    逐行扫描ASCII FBX，读取对象头
+
+    只根据每行的花括号维护当前所在的节点路径，不解析数组和属性表。
+
+    Args:
+        file_path (str): FBX文件路径
+
+    Returns:
+        FbxHeaders: 读取结果
+
+    Raises:
+        FbxParseError: 不是FBX文件
+        OSError: 无法读取文件
+    """
+    version = 0
+    objects = []
+    has_take_animation = False
+    found_node = False
+
+    # 当前所在的节点路径
+    path = []
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if "{" not in line and "}" not in line:
+                if path == ["FBXHeaderExtension"] and "FBXVersion" in line:
+                    match = _ASCII_NODE_START.match(line.strip())
+                    if match is not None and match.group(1) == "FBXVersion" and match.group(2).strip().isdigit():
+                        version = int(match.group(2))
+                continue
+
+            stripped, opens, closes = _ascii_line_braces(line)
+            if opens:
+                match = _ASCII_NODE_START.match(stripped)
+                name = match.group(1) if match is not None else ""
+                found_node = found_node or match is not None
+
+                if path == ["Objects"] and match is not None:
+                    properties = [
+                        value.group(1) if value.group(1) is not None else int(value.group(2))
+                        for value in _ASCII_HEADER_VALUE.finditer(match.group(2))
+                    ]
+                    if properties:
+                        object_id, object_name, sub_type = _object_identity(properties)
+                        objects.append(FbxObjectHeader(object_id, name, object_name, sub_type))
+                elif path == ["Takes", "Take"] and name == "Model":
+                    has_take_animation = True
+
+                path.append(name)
+                path.extend([""] * (opens - 1))
+
+            if closes:
+                del path[max(0, len(path) - closes):]
+
+    if not found_node:
+        raise FbxParseError("不是FBX文件")
+
+    return FbxHeaders(version, False, objects, has_take_animation)
+
+
+def _read_ascii_selected(file_path, object_classes):
+    """
+    按对象类型选择性读取ASCII FBX
+
+    逐行扫描时丢弃不需要的顶层节点和对象内容（对象只保留头部一行），再解析剩余的文本。
+
+    Args:
+        file_path (str): FBX文件路径
+        object_classes (frozenset): 完整读取的对象类型
+
+    Returns:
+        FbxDocument: 解析结果
+
+    Raises:
+        FbxParseError: 不是FBX文件
+        OSError: 无法读取文件
+    """
+    kept = []
+    path = []
+
+    # 正在跳过的节点所在的深度，没有跳过时为None
+    skip_depth = None
+
+    # 是否位于对象的Content（嵌入媒体的base64字符串，可以跨多行）中
+    in_content = False
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if "{" not in line and "}" not in line:
+                if skip_depth is not None:
+                    continue
+                if len(path) == 2 and path[0] == "Objects":
+                    stripped = line.lstrip()
+                    if in_content and (not stripped or stripped[0] in '",'):
+                        continue
+                    in_content = stripped.startswith("Content:")
+                    if in_content:
+                        continue
+                kept.append(line)
+                continue
+
+            in_content = False
+
+            stripped, opens, closes = _ascii_line_braces(line)
+            name = ""
+            if opens:
+                match = _ASCII_NODE_START.match(stripped)
+                name = match.group(1) if match is not None else ""
+
+            if skip_depth is not None:
+                pass
+            elif opens and not path and name not in _SELECTED_TOP_LEVEL:
+                skip_depth = 0
+            elif opens and path == ["Objects"] and name not in object_classes:
+                # 只保留对象头，跳过的内容直接以右花括号闭合
+                skip_depth = 1
+                kept.append(line if closes else stripped + "\n}\n")
+            else:
+                kept.append(line)
+
+            if opens:
+                path.append(name)
+                path.extend([""] * (opens - 1))
+            if closes:
+                del path[max(0, len(path) - closes):]
+
+            if skip_depth is not None and len(path) <= skip_depth:
+                skip_depth = None
+
+    return parse_ascii("".join(kept))
+
+
+def _iter_ascii_video_contents(file_path, chunk_size):
+    """
+    流式读取ASCII FBX中Video对象嵌入的媒体内容
+
+    逐行维护当前所在的节点路径，在Objects下的Video中遇到Content时按块解码其后的base64字符串。
+
+    Args:
+        file_path (str): FBX文件路径
+        chunk_size (int): 每次读取的字符数
+
+    Yields:
+        tuple: (FbxVideoContent, 数据块迭代器)；Content为空时数据块迭代器不产生数据
+
+    Raises:
+        FbxParseError: 不是FBX文件或base64内容损坏
+        OSError: 无法读取文件
+    """
+    found_node = False
+    path = []
+
+    # 当前所在的Video：对象ID、名称和已读取的路径 {子节点名称: 路径}
+    video = None
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        reader = _AsciiContentReader(f, chunk_size)
+        while True:
+            line = reader.readline()
+            if not line:
+                break
+
+            if "{" not in line and "}" not in line:
+                if video is None or len(path) != 2:
+                    continue
+                match = _ASCII_NODE_START.match(line.strip())
+                if match is None:
+                    continue
+
+                key = match.group(1)
+                if key in _VIDEO_PATH_FIELDS:
+                    value = _ASCII_HEADER_VALUE.match(match.group(2).strip())
+                    if value is not None and value.group(1) is not None:
+                        video[2][key] = value.group(1)
+                elif key == "Content":
+                    object_id, name, paths = video
+                    file_name = paths.get("FileName") or paths.get("Filename", "")
+                    chunks = reader.content_chunks(match.group(2))
+                    yield FbxVideoContent(object_id, name, file_name, paths.get("RelativeFilename", ""), None), chunks
+
+                    # 调用方没有读完时跳过剩余的内容
+                    for _ in chunks:
+                        pass
+                continue
+
+            stripped, opens, closes = _ascii_line_braces(line)
+            if opens:
+                match = _ASCII_NODE_START.match(stripped)
+                name = match.group(1) if match is not None else ""
+                found_node = found_node or match is not None
+
+                if path == ["Objects"] and name == "Video":
+                    properties = [
+                        value.group(1) if value.group(1) is not None else int(value.group(2))
+                        for value in _ASCII_HEADER_VALUE.finditer(match.group(2))
+                    ]
+                    object_id, object_name, _ = _object_identity(properties) if properties else (None, "", "")
+                    video = (object_id, object_name, {})
+
+                path.append(name)
+                path.extend([""] * (opens - 1))
+
+            if closes:
+                del path[max(0, len(path) - closes):]
+                if len(path) < 2:
+                    video = None
+
+    if not found_node:
+        raise FbxParseError("不是FBX文件")
+
+
+class _AsciiContentReader:
+    """按行读取ASCII FBX的读取器，遇到Content时按块读取其后的base64字符串，单行的长度不受限制"""
+
+    def __init__(self, f, chunk_size):
+        """
+        初始化读取器
+
+        Args:
+            f: 以文本模式打开的文件
+            chunk_size (int): 每次读取的最大字符数，超过该长度的行分多次返回
+        """
+        self.file = f
+        self.chunk_size = chunk_size
+
+        # 读取Content后剩余的文本，下次readline时先返回
+        self.pending = ""
+
+    def readline(self):
+        """
+        读取一行（最多chunk_size个字符）
+
+        Returns:
+            str: 一行文本，文件结束时为空字符串
+        """
+        if not self.pending:
+            return self.file.readline(self.chunk_size)
+
+        end = self.pending.find("\n")
+        if end >= 0:
+            line, self.pending = self.pending[:end + 1], self.pending[end + 1:]
+            return line
+        line, self.pending = self.pending, ""
+        return line + self.file.readline(self.chunk_size)
+
+    def content_chunks(self, text):
+        """
+        解码以逗号分隔、可以跨行的base64字符串，遇到其他内容时结束，其余文本留给readline
+
+        Args:
+            text (str): Content所在行中冒号之后的文本
+
+        Yields:
+            bytes: 解码后的数据块
+
+        Raises:
+            FbxParseError: base64内容损坏
+        """
+        encoded = ""
+        in_string = False
+        finished = False
+        while not finished:
+            if not text:
+                if self.pending:
+                    text, self.pending = self.pending, ""
+                else:
+                    text = self.file.read(self.chunk_size)
+                if not text:
+                    break
+
+            position = 0
+            while position < len(text):
+                if in_string:
+                    end = text.find('"', position)
+                    if end < 0:
+                        encoded += text[position:]
+                        break
+                    # 每个字符串是完整的base64编码，结束时全部解码
+                    encoded += text[position:end]
+                    position = end + 1
+                    in_string = False
+                    if encoded:
+                        yield _decode_base64(encoded)
+                    encoded = ""
+                elif text[position] == '"':
+                    in_string = True
+                    position += 1
+                elif text[position] in _ASCII_CONTENT_SEPARATORS:
+                    position += 1
+                else:
+                    self.pending = text[position:] + self.pending
+                    finished = True
+                    break
+            text = ""
+
+            usable = len(encoded) - len(encoded) % 4
+            if usable:
+                yield _decode_base64(encoded[:usable])
+                encoded = encoded[usable:]
+
+        if encoded:
+            yield _decode_base64(encoded)
+
+
+def _decode_base64(text):
+    """
+    解码base64文本
+
+    Args:
+        text (str): base64文本，长度不是4的倍数时补齐填充
+
+    Returns:
+        bytes: 解码结果
+
+    Raises:
+        FbxParseError: 内容不是有效的base64
+    """
+    try:
+        return base64.b64decode(text + "=" * (-len(text) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise FbxParseError(f"嵌入内容不是有效的base64: {e}")
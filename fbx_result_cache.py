@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX检查结果缓存模块
+用于在磁盘上缓存FbxInspector的检查结果，避免重复解析内容未变化的FBX文件
+
+此模块使用SQLite保存检查结果，以文件内容哈希和结果版本（解析器版本与检查器版本）为键，
+因此文件被移动或复制后仍能命中缓存，解析逻辑更新后旧结果自动失效。
+文件的大小和修改时间未变化时直接复用记录的内容哈希，不必重新读取文件。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import json
+import sqlite3
+
+from content_hasher import ContentHasher, HashRecord, hash_file
+
+
+class FbxResultCache:
+    """FBX检查结果缓存类，基于SQLite"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, result_version):
+        """
+        初始化检查结果缓存
+
+        Args:
+            db_path (str): SQLite数据库文件路径
+            result_version (str): 检查结果的版本，版本不同的缓存结果会被清除
+        """
+        self.db_path = db_path
+        self.result_version = str(result_version)
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """创建数据表；结构版本变化时清空旧数据，并删除其他结果版本的缓存"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        stored = dict(cursor.execute("SELECT key, value FROM meta").fetchall())
+        if stored.get("schema_version") != str(self.SCHEMA_VERSION):
+            cursor.execute("DROP TABLE IF EXISTS file_hashes")
+            cursor.execute("DROP TABLE IF EXISTS results")
+
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "digest TEXT NOT NULL, result_version TEXT NOT NULL, result TEXT NOT NULL, "
+            "PRIMARY KEY (digest, result_version))"
+        )
+        cursor.execute("DELETE FROM results WHERE result_version != ?", (self.result_version,))
+        cursor.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            ("schema_version", str(self.SCHEMA_VERSION))
+        )
+        self.connection.commit()
+
+    def digest(self, file_path):
+        """
+        获取文件的内容哈希，大小和修改时间未变化时复用记录的哈希
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            str: 十六进制哈希值
+
+        Raises:
+            OSError: 无法读取文件
+        """
+        stat_result = os.stat(file_path)
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, digest FROM file_hashes WHERE path = ?", (file_path,)
+        ).fetchone()
+        if row is not None and row[0] == stat_result.st_size and row[1] == stat_result.st_mtime_ns:
+            return row[2]
+
+        digest = hash_file(file_path)
+        self._store_file_hashes({file_path: HashRecord(stat_result.st_size, stat_result.st_mtime_ns, digest)})
+        return digest
+
+    def digests(self, file_paths, max_workers=4):
+        """
+        并行获取多个文件的内容哈希
+
+        Args:
+            file_paths (list): 文件路径列表
+            max_workers (int, optional): 同时计算哈希的最大线程数
+
+        Returns:
+            dict: {文件路径: 十六进制哈希值}，无法读取的文件不包含在结果中
+        """
+        known = {
+            path: HashRecord(size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in self.connection.execute(
+                "SELECT path, size, mtime_ns, digest FROM file_hashes")
+        }
+        hasher = ContentHasher(max_workers, known)
+        digests = hasher.hash_files(file_paths)
+        self._store_file_hashes(hasher.updated)
+        return digests
+
+    def get(self, digest):
+        """
+        读取缓存的检查结果
+
+        Args:
+            digest (str): 文件内容哈希
+
+        Returns:
+            dict: 检查结果，未缓存时返回None
+        """
+        row = self.connection.execute(
+            "SELECT result FROM results WHERE digest = ? AND result_version = ?", (digest, self.result_version)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def get_many(self, digests):
+        """
+        批量读取缓存的检查结果
+
+        Args:
+            digests (iterable): 文件内容哈希
+
+        Returns:
+            dict: {内容哈希: 检查结果}，只包含已缓存的结果
+        """
+        wanted = list(set(digests))
+        results = {}
+        # 分批查询，避免超出SQLite的参数数量限制
+        for start in range(0, len(wanted), 500):
+            batch = wanted[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for digest, result in self.connection.execute(
+                    f"SELECT digest, result FROM results WHERE result_version = ? AND digest IN ({placeholders})",
+                    [self.result_version] + batch):
+                results[digest] = json.loads(result)
+        return results
+
+    def put(self, digest, result):
+        """
+        写入检查结果
+
+        Args:
+            digest (str): 文件内容哈希
+            result (dict): 检查结果
+        """
+        self.put_many({digest: result})
+
+    def put_many(self, results):
+        """
+        批量写入检查结果
+
+        Args:
+            results (dict): {内容哈希: 检查结果}
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (digest, result_version, result) VALUES (?, ?, ?)",
+                [(digest, self.result_version, json.dumps(result, ensure_ascii=False))
+                 for digest, result in results.items()]
+            )
+
+    def _store_file_hashes(self, records):
+        """
+        记录文件的内容哈希
+
+        Args:
+            records (dict): {文件路径: HashRecord}
+        """
+        if not records:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                [(path, record.size, record.mtime_ns, record.digest) for path, record in records.items()]
+            )
+
+    def close(self):
+        """关闭数据库连接"""
+        self.connection.close()
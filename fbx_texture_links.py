@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+FBX纹理引用模块
+用于从FBX的Texture、Video和Material连接中提取每个材质槽引用的纹理文件，并与扫描到的纹理对应
+
+FBX中纹理通过OP连接挂到材质的某个属性上（例如DiffuseColor、NormalMap），
+Texture和Video对象的FileName、RelativeFilename记录了纹理文件的路径。
+read_texture_links只完整读取Material、Texture、LayeredTexture和Video对象，几何数据和Video中嵌入的媒体内容不会被读取。
+TextureLinkIndex按"模型 -> 材质槽 -> 纹理文件"建立索引，依次按绝对路径、相对FBX的路径和文件名
+把引用对应到扫描到的纹理，因此模型和纹理的基础名称不同时也能准确地连接材质。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from fbx_parser import read_fbx, PARSER_VERSION
+from fbx_inspector import COLLISION_PREFIXES
+
+# 纹理引用提取逻辑的版本号，提取结果的结构或规则变化时递增，使缓存的结果失效
+LINKS_VERSION = f"{PARSER_VERSION}.1"
+
+# 提取纹理引用时需要完整读取的对象类型
+LINK_OBJECT_CLASSES = ("Material", "Texture", "LayeredTexture", "Video")
+
+# 材质属性名称（小写，去掉"Maya|"等前缀）到纹理类型的映射，
+# 包括FBX标准材质、Maya（含Stingray PBS）和3ds Max物理材质的常见属性
+PROPERTY_TEXTURE_TYPES = {
+    "diffusecolor": "diffuse",
+    "basecolor": "diffuse",
+    "base_color_map": "diffuse",
+    "tex_color_map": "diffuse",
+    "normalmap": "normal",
+    "bump": "normal",
+    "normalcamera": "normal",
+    "bump_map": "normal",
+    "tex_normal_map": "normal",
+    "shininessexponent": "roughness",
+    "specularroughness": "roughness",
+    "roughness_map": "roughness",
+    "tex_roughness_map": "roughness",
+    "reflectionfactor": "metallic",
+    "metalness": "metallic",
+    "metalness_map": "metallic",
+    "tex_metallic_map": "metallic",
+    "specularcolor": "specular",
+    "specularfactor": "specular",
+    "emissivecolor": "emissive",
+    "emissivefactor": "emissive",
+    "emissioncolor": "emissive",
+    "emit_color_map": "emissive",
+    "tex_emissive_map": "emissive"
+}
+
+# 纹理引用：材质属性、由属性确定的纹理类型（无法确定时为None）、绝对路径和相对路径
+TextureReference = namedtuple("TextureReference", ["property", "texture_type", "file_name", "relative_file_name"])
+
+# 材质槽：槽编号、材质名称和TextureReference列表
+MaterialSlotLinks = namedtuple("MaterialSlotLinks", ["index", "material", "textures"])
+
+# UDIM文件名中的编号占位符
+_UDIM_TOKEN = re.compile(r"<udim>", re.IGNORECASE)
+
+
+def property_texture_type(property_name):
+    """
+    根据材质属性名称确定纹理类型
+
+    Args:
+        property_name (str): 材质属性名称，例如DiffuseColor、Maya|TEX_normal_map
+
+    Returns:
+        str: 纹理类型，无法确定时返回None
+    """
+    return PROPERTY_TEXTURE_TYPES.get(property_name.rsplit("|", 1)[-1].lower())
+
+
+def extract_texture_links(document):
+    """
+    从FBX文档中提取每个材质槽引用的纹理
+
+    材质槽按网格模型连接材质的顺序编号，同名材质合并为一个槽，碰撞网格的材质不计入，
+    与FbxInspector统计材质槽的方式一致。
+
+    Args:
+        document (FbxDocument): 解析结果（可以是只读取了LINK_OBJECT_CLASSES的文档）
+
+    Returns:
+        list: MaterialSlotLinks列表
+    """
+    slots = []
+    seen = set()
+    for model in document.objects_of("Model", "Mesh"):
+        if model.name.upper().startswith(COLLISION_PREFIXES):
+            continue
+        for material in document.children(model.id, "Material"):
+            if material.name in seen:
+                continue
+            seen.add(material.name)
+            slots.append(MaterialSlotLinks(len(slots), material.name, _material_textures(document, material)))
+    return slots
+
+
+def _material_textures(document, material):
+    """
+    收集连接到材质属性上的纹理
+
+    Args:
+        document (FbxDocument): 解析结果
+        material (FbxObject): Material对象
+
+    Returns:
+        list: TextureReference列表
+    """
+    references = []
+    for connection in document.child_connections(material.id):
+        source = document.objects.get(connection.child)
+        if source is None or not connection.property:
+            continue
+
+        # LayeredTexture的各层纹理都计入它所连接的属性
+        if source.class_name == "LayeredTexture":
+            textures = document.children(source.id, "Texture")
+        elif source.class_name == "Texture":
+            textures = [source]
+        else:
+            continue
+
+        texture_type = property_texture_type(connection.property)
+        for texture in textures:
+            file_name, relative_file_name = _texture_paths(document, texture)
+            if file_name or relative_file_name:
+                references.append(TextureReference(connection.property, texture_type, file_name, relative_file_name))
+    return references
+
+
+def _texture_paths(document, texture):
+    """
+    读取Texture对象的文件路径，Texture中没有时使用连接的Video对象
+
+    Args:
+        document (FbxDocument): 解析结果
+        texture (FbxObject): Texture对象
+
+    Returns:
+        tuple: (绝对路径, 相对路径)，不存在的项为空字符串
+    """
+    for obj in [texture] + document.children(texture.id, "Video"):
+        file_name = obj.node.child_value("FileName", "") or obj.node.child_value("Filename", "")
+        relative_file_name = obj.node.child_value("RelativeFilename", "")
+        if file_name or relative_file_name:
+            return str(file_name), str(relative_file_name)
+    return "", ""
+
+
+def read_texture_links(file_path):
+    """
+    读取FBX文件中每个材质槽引用的纹理，不读取几何数据
+
+    Args:
+        file_path (str): FBX文件路径
+
+    Returns:
+        list: MaterialSlotLinks列表
+
+    Raises:
+        FbxParseError: 文件不是有效的FBX
+        OSError: 无法读取文件
+    """
+    return extract_texture_links(read_fbx(file_path, LINK_OBJECT_CLASSES))
+
+
+def _path_key(path):
+    """
+    把路径规范化为查表用的键，FBX中的路径可能使用任意一种分隔符
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        str: 规范化的路径
+    """
+    return os.path.normcase(os.path.normpath(path.replace("\\", "/")))
+
+
+def _name_key(path):
+    """
+    取路径中的文件名作为查表用的键，UDIM占位符按第一块贴图（1001）处理
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        str: 小写文件名
+    """
+    return _UDIM_TOKEN.sub("1001", re.split(r"[\\/]", path)[-1]).lower()
+
+
+class TextureLinkIndex:
+    """纹理引用索引类，记录每个模型的材质槽引用了哪些扫描到的纹理"""
+
+    def __init__(self):
+        """初始化纹理引用索引"""
+        self._textures_by_path = {}
+        self._textures_by_name = {}
+        self._meshes = {}
+        self._resolved = {}
+
+        # 被内容相同的纹理代替的纹理 {纹理的键: 代替它的纹理AssetFile}
+        self._replaced = {}
+
+        # 模型中嵌入的纹理 {模型的键: ({路径键: 纹理AssetFile}, {文件名键: 纹理AssetFile})}
+        self._embedded = {}
+
+    def add_texture(self, texture_file, file_path=None):
+        """
+        加入扫描到的纹理
+
+        Args:
+            texture_file (AssetFile): 纹理文件对象，UDIM纹理集按每块贴图的文件名加入
+            file_path (str, optional): 以另一个路径引用同一纹理，例如被合并的重复纹理的路径
+        """
+        paths = [file_path] if file_path is not None else texture_file.source_paths()
+        for path in paths:
+            self._textures_by_path[_path_key(path)] = texture_file
+            self._textures_by_name.setdefault(_name_key(path), []).append(texture_file)
+        self._resolved.clear()
+
+    def replace_texture(self, texture_file, replacement):
+        """
+        用内容相同的另一个纹理代替已加入的纹理，之前对应到texture_file的引用都改为对应到replacement
+
+        Args:
+            texture_file (AssetFile): 被代替的纹理
+            replacement (AssetFile): 代替它的纹理
+        """
+        self._replaced[texture_file.key] = replacement
+        self._resolved.clear()
+
+    def add_embedded(self, mesh_file, texture_file, file_paths):
+        """
+        加入模型中嵌入的纹理
+
+        嵌入的纹理只用于该模型的纹理引用，并且优先于扫描到的纹理：
+        不同FBX常在同一路径下记录内容不同的嵌入图片。
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+            texture_file (AssetFile): 从模型中提取的纹理
+            file_paths (list): FBX中引用这张图片的路径
+        """
+        paths, names = self._embedded.setdefault(mesh_file.key, ({}, {}))
+        for path in file_paths:
+            paths[_path_key(path)] = texture_file
+            names[_name_key(path)] = texture_file
+        self._resolved.pop(mesh_file.key, None)
+
+    def add_mesh(self, mesh_file, slots):
+        """
+        加入模型的材质槽和纹理引用
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+            slots (list): MaterialSlotLinks列表
+        """
+        self._meshes[mesh_file.key] = (mesh_file, slots)
+        self._resolved.pop(mesh_file.key, None)
+
+    def has_links(self, mesh_file):
+        """
+        检查模型是否有可以对应到扫描纹理的纹理引用
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+
+        Returns:
+            bool: 至少一个材质槽引用了扫描到的纹理时为True
+        """
+        return any(textures for _, _, textures in self.slots_for(mesh_file))
+
+    def slots_for(self, mesh_file):
+        """
+        获取模型每个材质槽对应的纹理
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+
+        Returns:
+            list: [(槽编号, 材质名称, {纹理类型: 纹理AssetFile}), ...]；
+                材质属性无法确定纹理类型时使用纹理文件名识别的类型
+        """
+        key = mesh_file.key
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve_slots(key)
+        return self._resolved[key]
+
+    def meshes_for(self, texture_file):
+        """
+        获取引用了纹理的模型
+
+        Args:
+            texture_file (AssetFile): 纹理文件对象
+
+        Returns:
+            list: 模型AssetFile列表
+        """
+        return [
+            mesh_file for mesh_file, _ in self._meshes.values()
+            if any(texture_file in textures.values() for _, _, textures in self.slots_for(mesh_file))
+        ]
+
+    def referenced_textures(self):
+        """
+        获取被任一模型引用的纹理
+
+        Returns:
+            list: 纹理AssetFile列表，不重复
+        """
+        referenced = {}
+        for mesh_file, _ in self._meshes.values():
+            for _, _, textures in self.slots_for(mesh_file):
+                for texture_file in textures.values():
+                    referenced.setdefault(texture_file.key, texture_file)
+        return list(referenced.values())
+
+    def unresolved_references(self):
+        """
+        获取无法对应到扫描纹理的引用，通常是纹理不在扫描的文件夹中
+
+        Returns:
+            list: [(模型AssetFile, 材质名称, TextureReference), ...]
+        """
+        unresolved = []
+        for mesh_file, slots in self._meshes.values():
+            for slot in slots:
+                for reference in slot.textures:
+                    if self.resolve(mesh_file, reference) is None:
+                        unresolved.append((mesh_file, slot.material, reference))
+        return unresolved
+
+    def resolve(self, mesh_file, reference):
+        """
+        把纹理引用对应到扫描到的纹理
+
+        依次尝试FBX中记录的绝对路径、相对FBX所在目录的路径和文件名，每一步都先查找模型中嵌入的纹理；
+        同名纹理有多个时选择与FBX所在目录最接近的一个。
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+            reference (TextureReference): 纹理引用
+
+        Returns:
+            AssetFile: 纹理文件对象，无法对应时返回None
+        """
+        texture_file = self._lookup(mesh_file, reference)
+        while texture_file is not None and texture_file.key in self._replaced:
+            texture_file = self._replaced[texture_file.key]
+        return texture_file
+
+    def _lookup(self, mesh_file, reference):
+        """
+        按路径和文件名查找纹理引用对应的纹理，不考虑被代替的纹理
+
+        Args:
+            mesh_file (AssetFile): 模型文件对象
+            reference (TextureReference): 纹理引用
+
+        Returns:
+            AssetFile: 纹理文件对象，无法对应时返回None
+        """
+        path_keys = []
+        if reference.file_name:
+            path_keys.append(_path_key(reference.file_name))
+        if reference.relative_file_name:
+            relative_path = os.path.join(mesh_file.directory, reference.relative_file_name.replace("\\", "/"))
+            path_keys.append(_path_key(relative_path))
+        name_key = _name_key(reference.relative_file_name or reference.file_name)
+
+        embedded_paths, embedded_names = self._embedded.get(mesh_file.key, ({}, {}))
+        for textures_by_path in (embedded_paths, self._textures_by_path):
+            for path_key in path_keys:
+                texture_file = textures_by_path.get(path_key)
+                if texture_file is not None:
+                    return texture_file
+
+        if name_key in embedded_names:
+            return embedded_names[name_key]
+        candidates = self._textures_by_name.get(name_key)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        return max(candidates, key=lambda candidate: self._shared_path_length(mesh_file.directory, candidate.directory))
+
+    def _resolve_slots(self, key):
+        """
+        对应模型所有材质槽的纹理引用
+
+        Args:
+            key: 模型的键
+
+        Returns:
+            list: [(槽编号, 材质名称, {纹理类型: 纹理AssetFile}), ...]
+        """
+        entry = self._meshes.get(key)
+        if entry is None:
+            return []
+
+        mesh_file, slots = entry
+        resolved = []
+        for slot in slots:
+            textures = {}
+            for reference in slot.textures:
+                texture_file = self.resolve(mesh_file, reference)
+                if texture_file is None:
+                    continue
+                texture_type = reference.texture_type
+                if texture_type is None and texture_file.asset_type.startswith("texture_"):
+                    texture_type = texture_file.asset_type[8:]
+                if texture_type is not None:
+                    textures.setdefault(texture_type, texture_file)
+            resolved.append((slot.index, slot.material, textures))
+        return resolved
+
+    def _shared_path_length(self, directory, other):
+        """
+        计算两个目录的公共上级路径长度
+
+        Args:
+            directory (str): 目录
+            other (str): 另一个目录
+
+        Returns:
+            int: 公共路径的长度，位于不同驱动器时为-1
+        """
+        try:
+            return len(os.path.commonpath([directory, other]))
+        except ValueError:
+            return -1
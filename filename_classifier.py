@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+文件名分类模块
+用于根据文件名模式识别资产类型、纹理类型和基础名称
+
+此模块把配置中的filename_patterns编译为一个分类器，每个文件名只需扫描一遍，
+即可同时得到资产类型、纹理类型和基础名称。常见的"_字母"形式的模式通过一个词元正则表达式
+切出文件名中的词元后查表匹配；其他形式的模式合并为一个组合正则表达式。
+模式按词元匹配：模式前后紧邻字母时不算匹配，因此"_D"不会匹配"Rock_Dirt"。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+from collections import namedtuple
+
+# 默认的文件名模式，配置中没有filename_patterns时使用
+DEFAULT_FILENAME_PATTERNS = {
+    "static_mesh": ["_SM", "_StaticMesh", "_Model"],
+    "skeletal_mesh": ["_SK", "_SkeletalMesh", "_Character"],
+    "animation": ["_Anim", "_Animation"],
+    "diffuse": ["_D", "_Diffuse", "_BaseColor", "_Albedo", "_Color"],
+    "normal": ["_N", "_Normal", "_Norm"],
+    "roughness": ["_R", "_Roughness", "_Rough"],
+    "metallic": ["_M", "_Metallic", "_Metal"],
+    "specular": ["_S", "_Specular", "_Spec"],
+    "emissive": ["_E", "_Emissive", "_Emission"]
+}
+
+# 网格类型，按优先级排列；FBX文件没有匹配任何模式时视为静态网格
+MESH_TYPES = ("static_mesh", "skeletal_mesh", "animation")
+
+# 纹理类型，按优先级排列；没有匹配任何模式时视为other
+TEXTURE_TYPES = ("diffuse", "normal", "roughness", "metallic", "specular", "emissive")
+
+# 识别为纹理的文件扩展名
+TEXTURE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tga", ".bmp", ".exr", ".hdr")
+
+# 分类结果：资产类型、基础名称和小写扩展名
+Classification = namedtuple("Classification", ["asset_type", "base_name", "extension"])
+
+# 可以查表匹配的简单模式："_"加若干字母
+_SIMPLE_PATTERN = re.compile(r"_[A-Za-z]+")
+
+# 切出文件名中"_"之后的字母词元
+_TOKEN_REGEX = re.compile(r"_([A-Za-z]+)")
+
+# UDIM编号后缀："."或"_"加四位编号，例如Body_BaseColor.1001、Body_BaseColor_1002
+_UDIM_REGEX = re.compile(r"(.+?)([._])(\d{4})\Z")
+
+# UDIM编号范围：1001 + u + 10 * v
+UDIM_FIRST = 1001
+UDIM_LAST = 1999
+
+# 拆分结果：去掉编号后的名称、分隔符和UDIM编号
+UdimName = namedtuple("UdimName", ["prefix", "separator", "udim"])
+
+# LOD后缀："_LOD"加编号，例如Chair_LOD0、Chair_lod2
+_LOD_REGEX = re.compile(r"(.+?)[_.-]LOD(\d{1,2})\Z", re.IGNORECASE)
+
+# 拆分结果：去掉LOD后缀的名称和LOD编号
+LodName = namedtuple("LodName", ["prefix", "lod_index"])
+
+
+def split_udim(stem):
+    """
+    拆分不含扩展名的文件名中的UDIM编号
+
+    Args:
+        stem (str): 不含扩展名的文件名
+
+    Returns:
+        UdimName: 拆分结果，文件名不以UDIM编号结尾时返回None
+    """
+    match = _UDIM_REGEX.match(stem)
+    if match is None:
+        return None
+    udim = int(match.group(3))
+    if not UDIM_FIRST <= udim <= UDIM_LAST:
+        return None
+    return UdimName(match.group(1), match.group(2), udim)
+
+
+def split_lod(stem):
+    """
+    拆分不含扩展名的文件名中的LOD后缀
+
+    Args:
+        stem (str): 不含扩展名的文件名
+
+    Returns:
+        LodName: 拆分结果，文件名不以LOD后缀结尾时返回None
+    """
+    match = _LOD_REGEX.match(stem)
+    if match is None:
+        return None
+    return LodName(match.group(1), int(match.group(2)))
+
+
+class FilenameClassifier:
+    """文件名分类类，把文件名模式编译为单次扫描的分类器"""
+
+    def __init__(self, filename_patterns=None):
+        """
+        初始化文件名分类器
+
+        Args:
+            filename_patterns (dict, optional): {类别: [模式, ...]}，为空时使用默认模式
+        """
+        self.filename_patterns = filename_patterns or DEFAULT_FILENAME_PATTERNS
+
+        mesh_priority = {mesh_type: i for i, mesh_type in enumerate(MESH_TYPES)}
+        texture_priority = {texture_type: i for i, texture_type in enumerate(TEXTURE_TYPES)}
+
+        # 收集所有模式；同一模式出现在多个类别时保留优先级最高的类别
+        alternatives = {}
+        for category in list(MESH_TYPES) + list(TEXTURE_TYPES) + sorted(self.filename_patterns):
+            for pattern in self.filename_patterns.get(category, []):
+                if pattern and pattern not in alternatives:
+                    alternatives[pattern] = category
+
+        # 简单模式按词元查表；其他模式合并为一个组合正则表达式，较长的模式优先
+        self._token_info = {}
+        complex_patterns = []
+        for pattern, category in alternatives.items():
+            info = (mesh_priority.get(category), texture_priority.get(category))
+            if _SIMPLE_PATTERN.fullmatch(pattern):
+                self._token_info[pattern[1:]] = info
+            else:
+                complex_patterns.append((pattern, info))
+        complex_patterns.sort(key=lambda item: -len(item[0]))
+
+        parts = []
+        self._group_info = {}
+        for i, (pattern, info) in enumerate(complex_patterns):
+            group_name = f"g{i}"
+            parts.append(f"(?P<{group_name}>{self._compile_pattern(pattern)})")
+            self._group_info[group_name] = info
+
+        self._regex = re.compile("|".join(parts)) if parts else None
+
+    def _compile_pattern(self, pattern):
+        """
+        把单个模式转换为按词元匹配的正则表达式
+
+        Args:
+            pattern (str): 文件名模式
+
+        Returns:
+            str: 正则表达式片段
+        """
+        expression = re.escape(pattern)
+        if pattern[0].isalpha():
+            expression = r"(?<![A-Za-z])" + expression
+        if pattern[-1].isalpha():
+            expression = expression + r"(?![A-Za-z])"
+        return expression
+
+    def classify(self, file_name):
+        """
+        一次性识别文件的资产类型和基础名称
+
+        Args:
+            file_name (str): 文件名（含扩展名）
+
+        Returns:
+            Classification: 分类结果，asset_type为网格类型、"texture_<纹理类型>"、"ma"或"other"
+        """
+        stem, extension = os.path.splitext(file_name)
+        extension = extension.lower()
+
+        mesh_index, texture_index, base_name = self._scan(stem)
+
+        if extension == ".fbx":
+            asset_type = MESH_TYPES[mesh_index] if mesh_index is not None else "static_mesh"
+        elif extension == ".ma":
+            asset_type = "ma"
+        elif extension in TEXTURE_EXTENSIONS:
+            asset_type = "texture_" + (TEXTURE_TYPES[texture_index] if texture_index is not None else "other")
+        else:
+            asset_type = "other"
+
+        return Classification(asset_type, base_name, extension)
+
+    def mesh_type(self, file_name):
+        """
+        根据文件名识别网格类型
+
+        Args:
+            file_name (str): 文件名
+
+        Returns:
+            str: 网格类型，没有匹配时为static_mesh
+        """
+        mesh_index = self._scan(os.path.splitext(file_name)[0])[0]
+        return MESH_TYPES[mesh_index] if mesh_index is not None else "static_mesh"
+
+    def texture_type(self, file_name):
+        """
+        根据文件名识别纹理类型
+
+        Args:
+            file_name (str): 文件名
+
+        Returns:
+            str: 纹理类型，没有匹配时为other
+        """
+        texture_index = self._scan(os.path.splitext(file_name)[0])[1]
+        return TEXTURE_TYPES[texture_index] if texture_index is not None else "other"
+
+    def base_name(self, file_name):
+        """
+        从文件名中提取基础名称（移除扩展名和末尾的类型词元）
+
+        Args:
+            file_name (str): 文件名
+
+        Returns:
+            str: 基础名称
+        """
+        return self._scan(os.path.splitext(file_name)[0])[2]
+
+    def _scan(self, stem):
+        """
+        扫描一遍不含扩展名的文件名
+
+        Args:
+            stem (str): 不含扩展名的文件名
+
+        Returns:
+            tuple: (网格类型优先级, 纹理类型优先级, 基础名称)，未匹配的类型为None
+        """
+        mesh_index = None
+        texture_index = None
+        base_name = stem
+
+        token_info = self._token_info
+        tokens = _TOKEN_REGEX.findall(stem)
+        for token in tokens:
+            info = token_info.get(token)
+            if info is None:
+                continue
+            match_mesh, match_texture = info
+            if match_mesh is not None and (mesh_index is None or match_mesh < mesh_index):
+                mesh_index = match_mesh
+            if match_texture is not None and (texture_index is None or match_texture < texture_index):
+                texture_index = match_texture
+
+        # 最后一个词元位于末尾且是已知模式时，从基础名称中移除
+        if tokens and tokens[-1] in token_info and stem.endswith("_" + tokens[-1]):
+            base_name = stem[:-len(tokens[-1]) - 1]
+
+        if self._regex is None:
+            return mesh_index, texture_index, base_name
+
+        stem_length = len(stem)
+        for match in self._regex.finditer(stem):
+            match_mesh, match_texture = self._group_info[match.lastgroup]
+            if match_mesh is not None and (mesh_index is None or match_mesh < mesh_index):
+                mesh_index = match_mesh
+            if match_texture is not None and (texture_index is None or match_texture < texture_index):
+                texture_index = match_texture
+            if match.end() == stem_length and match.start() < len(base_name):
+                base_name = stem[:match.start()]
+
+        return mesh_index, texture_index, base_name
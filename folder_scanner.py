@@ -5,103 +5,485 @@
 用于扫描文件夹并识别不同类型的资产文件
 
 此模块提供了扫描文件夹、识别资产类型和分析资产关系的功能。
+FBX文件的网格类型默认由文件内容决定（只读取对象头），内容无法判断时才使用文件名模式。
+除了按基础名称关联，还会读取FBX材质连接的纹理文件，建立准确的"模型 -> 材质槽 -> 纹理"索引。
+FBX中以Video Content嵌入的纹理会被提取到按内容寻址的缓存，每份不同的图片只作为一个纹理资产导入一次。
+FBX的纹理引用、嵌入媒体和Maya场景按(路径, 大小, 修改时间)缓存，重新扫描时只读取新增或修改的文件。
+Maya ASCII（.ma）场景的file纹理节点和着色组同样加入纹理引用索引，扫描报告可以列出每个场景依赖的纹理。
 """
 
 import os
 import re
+import json
+import hashlib
+import queue
+import stat
+import threading
+import zipfile
 import unreal
 
-class AssetFile:
-    """表示一个资产文件"""
+from config_manager import get_cache_dir
+from directory_walker import DirectoryWalker
+from scan_index import ScanIndex, IncrementalWalker, FileRecord, ParsedResultCache
+from filename_classifier import FilenameClassifier, split_udim, split_lod
+from fbx_classifier import classify_fbx_file, CONTENT_CLASSIFIER_VERSION
+from fbx_texture_links import TextureLinkIndex, read_texture_links, LINKS_VERSION
+from fbx_media import EmbeddedMediaExtractor, media_reference_paths
+from fbx_parser import FbxParseError
+from maya_scene import read_maya_scene_cached, get_scene_cache, MayaParseError
+from asset_catalog import AssetFile, AssetCatalog, TextureSet, MeshLodGroup
+from asset_relations import RelationshipIndex
+from content_hasher import ContentHasher
+from archive_source import is_archive, list_archive_members
+from scan_rules import ScanRules
+
+# 分类逻辑的版本号，分类规则的实现变化时递增，使扫描索引中缓存的分类结果失效
+CLASSIFIER_VERSION = 2
+
+# 流式扫描结束的标记
+_SCAN_FINISHED = object()
+
+
+class FolderScanner:
+    """文件夹扫描类，用于扫描和分析资产文件夹"""
     
-    def __init__(self, file_path, asset_type, base_name=None):
+    def __init__(self, config=None):
         """
-        初始化资产文件
+        初始化文件夹扫描器
         
         Args:
-            file_path (str): 文件的完整路径
-            asset_type (str): 资产类型 (fbx, texture, ma, etc.)
-            base_name (str, optional): 资产的基础名称，用于关联相关资产
-        """
-        self.file_path = file_path
-        self.asset_type = asset_type
-        self.file_name = os.path.basename(file_path)
-        self.directory = os.path.dirname(file_path)
-        self.extension = os.path.splitext(file_path)[1].lower()
-        
-        # 如果没有提供基础名称，则从文件名中提取
-        if base_name is None:
-            self.base_name = self._extract_base_name(self.file_name)
-        else:
-            self.base_name = base_name
+            config (dict, optional): 配置字典，包含文件名模式等设置
+        """
+        self.config = config or {}
+        self.filename_patterns = self.config.get("filename_patterns", {})
+        
+        # 由文件名模式编译的分类器，配置中没有模式时使用默认模式
+        self.classifier = FilenameClassifier(self.filename_patterns)
+        
+        # 扫描设置
+        self.scan_config = self.config.get("folder_scan", {})
+        self.max_workers = self.scan_config.get("max_workers", 8)
+        self.use_index = self.scan_config.get("use_index", True)
+        self.verify_files = self.scan_config.get("verify_files", False)
+        self.stream_batch_size = self.scan_config.get("stream_batch_size", 200)
+        self.deduplicate_textures = self.scan_config.get("deduplicate_textures", False)
+        self.hash_workers = self.scan_config.get("hash_workers", 4)
+        self.keep_unknown_files = self.scan_config.get("keep_unknown_files", True)
+        self.detect_udims = self.scan_config.get("detect_udims", True)
+        self.udim_min_tiles = self.scan_config.get("udim_min_tiles", 2)
+        self.detect_lods = self.scan_config.get("detect_lods", True)
+        self.classify_fbx_by_content = self.scan_config.get("classify_fbx_by_content", True)
+        self.link_fbx_textures = self.scan_config.get("link_fbx_textures", True)
+        self.link_maya_textures = self.scan_config.get("link_maya_textures", True)
+        self.extract_embedded_media = self.scan_config.get("extract_embedded_media", True)
+        
+        # 包含/排除规则和各文件夹中的忽略文件
+        self.scan_rules = ScanRules.from_config(self.scan_config)
         
-        # 初始化关联资产
-        self.related_assets = []
+        # 上次扫描相对于索引的变化 {"added": [...], "removed": [...], "modified": [...]}
+        self.last_scan_changes = None
+        
+        # 资产关系索引，按(目录范围, 基础名称)分组
+        self.relationship_scope = self.scan_config.get("relationship_scope", "global")
+        self.relationships = RelationshipIndex(self.relationship_scope)
+        
+        # FBX和Maya场景材质引用的纹理索引，按模型和材质槽记录扫描到的纹理
+        self.texture_links = TextureLinkIndex()
+        
+        # 读取到的Maya场景 {.ma文件的键: (AssetFile, MayaScene)}
+        self.maya_scenes = {}
+        
+        # 资产目录，为扫描到的每个文件分配稳定的整数ID
+        self.catalog = AssetCatalog()
+        
+        # 内容完全相同而被合并的纹理 [(重复的AssetFile, 规范AssetFile), ...]
+        self.duplicate_textures = []
+        self._canonical_textures = {}
+        # 每份内容的重复纹理在duplicate_textures中的位置 {内容哈希: [序号, ...]}
+        self._duplicate_indices = {}
+        # 流式扫描中被之后批次的纹理代替的规范纹理 [(原规范AssetFile, 新规范AssetFile, 内容哈希), ...]
+        self._replaced_canonicals = []
+        
+        # FBX中嵌入的纹理：每份内容对应一个纹理资产 {内容哈希: AssetFile}，
+        # 以及每个FBX嵌入的媒体 {FBX的键: [(EmbeddedMedia, 纹理AssetFile), ...]}；提取器第一次使用时才创建
+        self.media_extractor = None
+        self.embedded_textures = {}
+        self.embedded_media = {}
+        
+        # 遍历时得到的文件大小和修改时间 {文件路径: (大小, 修改时间)}，用于判断解析结果是否仍然有效
+        self.file_signatures = {}
+        
+        # 在多次扫描之间保留的解析结果：FBX材质引用的纹理和Maya场景（同时保存在扫描索引中，
+        # Maya场景缓存与MA转换共用），以及FBX嵌入的媒体
+        self.texture_link_cache = ParsedResultCache("fbx_texture_links", LINKS_VERSION)
+        self.maya_scene_cache = get_scene_cache()
+        self.embedded_media_cache = ParsedResultCache("fbx_embedded_media", EmbeddedMediaExtractor.SCHEMA_VERSION)
     
-    def _extract_base_name(self, file_name):
+    def scan_folder(self, folder_path, changed_paths=None):
         """
-        从文件名中提取基础名称
+        扫描文件夹并识别资产
         
         Args:
-            file_name (str): 文件名
+            folder_path (str): 要扫描的文件夹路径，也可以是zip压缩包（只读取目录，不解压）
+            changed_paths (iterable, optional): 已知发生变化的路径（例如文件夹监视器报告的路径），
+                所在目录未变化时也与索引比较，用于发现在原位置被覆盖写入的文件；包含folder_path时检查所有文件
         
         Returns:
-            str: 基础名称
+            dict: 按类型分组的资产文件字典
         """
-        # 移除扩展名
-        name_without_ext = os.path.splitext(file_name)[0]
+        if not os.path.exists(folder_path):
+            unreal.log_error(f"文件夹不存在: {folder_path}")
+            return {}
         
-        # 移除常见的后缀模式
-        common_suffixes = [
-            "_D", "_Diffuse", "_BaseColor", "_Albedo", "_Color",
-            "_N", "_Normal", "_Norm",
-            "_R", "_Roughness", "_Rough",
-            "_M", "_Metallic", "_Metal",
-            "_S", "_Specular", "_Spec",
-            "_E", "_Emissive", "_Emission",
-            "_SM", "_StaticMesh", "_Model",
-            "_SK", "_SkeletalMesh", "_Character",
-            "_Anim", "_Animation"
-        ]
+        # 初始化结果字典
+        assets = self.create_assets_dict()
+        self._load_parsed_results(folder_path)
+        
+        # 并行遍历文件夹，按目录路径排序以保证结果顺序稳定
+        scanned_files = []
+        for directory, asset_files in sorted(self._iter_directory_assets(folder_path, changed_paths),
+                                            key=lambda batch: batch[0]):
+            scanned_files.extend(asset_files)
         
-        for suffix in common_suffixes:
-            if name_without_ext.endswith(suffix):
-                return name_without_ext[:-len(suffix)]
+        # 提取FBX中嵌入的纹理
+        self._reset_embedded_media()
+        scanned_files.extend(self._extract_embedded_media(scanned_files))
         
-        return name_without_ext
+        # 合并内容完全相同的纹理
+        self._reset_duplicates()
+        if self.deduplicate_textures:
+            hasher = self._create_hasher(folder_path)
+            scanned_files = self._collapse_duplicates(scanned_files, hasher)
+            self._save_hashes(folder_path, hasher)
+        
+        for asset_file in scanned_files:
+            self._add_asset(asset_file, assets)
+        
+        # 分析资产关系
+        self._analyze_asset_relationships(assets)
+        self._save_parsed_results(folder_path)
+        
+        return assets
     
-    def __str__(self):
-        return f"{self.file_name} ({self.asset_type})"
-
-
-class FolderScanner:
-    """文件夹扫描类，用于扫描和分析资产文件夹"""
+    def scan_folder_iter(self, folder_path, assets=None, batch_size=None):
+        """
+        流式扫描文件夹，边列举目录边返回已识别的资产批次
+        
+        目录遍历在后台线程中进行，调用方处理某个批次（例如导入纹理）时遍历不会停止。
+        每个批次在返回前都会加入assets并更新资产关系，遍历结束后assets与scan_folder的结果内容一致。
+        启用纹理去重时，与之前批次内容相同的纹理不会出现在批次中；路径比之前返回的规范纹理更小时，
+        该纹理随批次返回并代替之前的规范纹理（从assets中移除），使结果与目录的遍历顺序无关。
+        批次中FBX嵌入的纹理第一次出现时随该批次一起返回。
+        
+        Args:
+            folder_path (str): 要扫描的文件夹路径
+            assets (dict, optional): 用于累积结果的资产字典，通常由create_assets_dict创建
+            batch_size (int, optional): 每个批次的最少文件数，默认使用配置中的stream_batch_size
+        
+        Yields:
+            list: AssetFile列表
+        """
+        if not os.path.exists(folder_path):
+            unreal.log_error(f"文件夹不存在: {folder_path}")
+            return
+        
+        if assets is None:
+            assets = self.create_assets_dict()
+        if batch_size is None:
+            batch_size = self.stream_batch_size
+        
+        # 在后台线程中遍历目录，通过队列把每个目录的结果交给调用方
+        batch_queue = queue.Queue()
+        stop_event = threading.Event()
+        
+        def produce():
+            try:
+                for _, asset_files in self._iter_directory_assets(folder_path):
+                    if stop_event.is_set():
+                        break
+                    batch_queue.put(asset_files)
+                batch_queue.put(_SCAN_FINISHED)
+            except Exception as e:
+                batch_queue.put(e)
+        
+        producer = threading.Thread(target=produce, name="FolderScannerStream")
+        producer.daemon = True
+        producer.start()
+        
+        self._reset_relationships()
+        self._reset_duplicates()
+        self._reset_embedded_media()
+        self._load_parsed_results(folder_path)
+        hasher = self._create_hasher(folder_path) if self.deduplicate_textures else None
+        pending = []
+        try:
+            while True:
+                item = batch_queue.get()
+                
+                if item is _SCAN_FINISHED:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                
+                pending.extend(item)
+                
+                # 队列中暂无更多结果时即使批次未满也先交出，避免空等
+                if len(pending) < batch_size and not batch_queue.empty():
+                    continue
+                
+                yield self._publish_batch(pending, assets, hasher)
+                pending = []
+            
+            if pending:
+                yield self._publish_batch(pending, assets, hasher)
+        finally:
+            stop_event.set()
+            if hasher is not None:
+                self._save_hashes(folder_path, hasher)
+            self._save_parsed_results(folder_path)
     
-    def __init__(self, config=None):
+    def _publish_batch(self, asset_files, assets, hasher=None):
         """
-        初始化文件夹扫描器
+        将一批资产加入结果字典并更新资产关系
         
         Args:
-            config (dict, optional): 配置字典，包含文件名模式等设置
+            asset_files (list): AssetFile列表
+            assets (dict): 用于累积结果的资产字典
+            hasher (ContentHasher, optional): 内容哈希器，提供时合并重复的纹理
+        
+        Returns:
+            list: 加入结果的AssetFile列表（包括新提取的嵌入纹理，不含被合并的重复纹理）
         """
-        self.config = config or {}
-        self.filename_patterns = self.config.get("filename_patterns", {})
+        asset_files = asset_files + self._extract_embedded_media(asset_files)
+        
+        duplicate_count = len(self.duplicate_textures)
+        replaced_count = len(self._replaced_canonicals)
+        if hasher is not None:
+            asset_files = self._collapse_duplicates(asset_files, hasher)
+        
+        for asset_file in asset_files:
+            self._add_asset(asset_file, assets)
+            self._add_relationship(asset_file)
+        
+        # 之前批次返回的规范纹理被路径更小的纹理代替：从结果中移除，所在的组和纹理引用改为新的规范纹理
+        for previous_file, canonical_file, digest in self._replaced_canonicals[replaced_count:]:
+            self._remove_asset(previous_file, assets)
+            groups = {id(previous_file.group): previous_file.group}
+            for index in self._duplicate_indices.get(digest, ()):
+                if index < duplicate_count:
+                    duplicate_file = self.duplicate_textures[index][0]
+                    groups[id(duplicate_file.group)] = duplicate_file.group
+            for group in groups.values():
+                if group is not None:
+                    group.replace(previous_file, canonical_file)
+            self.texture_links.replace_texture(previous_file, canonical_file)
+        
+        for duplicate_file, canonical_file in self.duplicate_textures[duplicate_count:]:
+            self.relationships.add_duplicate(duplicate_file, canonical_file)
+            self.texture_links.add_texture(canonical_file, duplicate_file.file_path)
+        return asset_files
     
-    def scan_folder(self, folder_path):
+    def _reset_duplicates(self):
+        """清空重复纹理的记录"""
+        self.duplicate_textures = []
+        self._canonical_textures = {}
+        self._duplicate_indices = {}
+        self._replaced_canonicals = []
+    
+    def _reset_embedded_media(self):
+        """清空嵌入纹理的记录"""
+        self.embedded_textures = {}
+        self.embedded_media = {}
+    
+    def _extract_embedded_media(self, asset_files):
         """
-        扫描文件夹并识别资产
+        提取FBX中嵌入的纹理，为每份不同的内容创建一个纹理资产
+        
+        多个FBX嵌入同一张图片时只创建一个纹理资产，通过TextureProcessor导入一次，
+        各FBX材质引用这张图片的路径在纹理引用索引中都对应到这个资产。
+        纹理资产的文件名沿用FBX中记录的名称，按文件名识别纹理类型和基础名称；不是纹理的媒体不提取。
+        压缩包中的成员尚未解压，不提取。
+        
+        Args:
+            asset_files (list): AssetFile列表
+        
+        Returns:
+            list: 新创建的纹理AssetFile列表
+        """
+        if not self.extract_embedded_media:
+            return []
+        
+        fbx_files = []
+        signatures = {}
+        for asset_file in asset_files:
+            if asset_file.extension != ".fbx" or asset_file.asset_type == "animation":
+                continue
+            signature = self._file_signature(asset_file.file_path)
+            if signature is not None:
+                fbx_files.append(asset_file)
+                signatures[asset_file.file_path] = signature
+        if not fbx_files:
+            return []
+        
+        # 之前的扫描已提取过、之后未变化的FBX直接使用记录的结果
+        extracted = {}
+        changed_paths = []
+        for file_path, signature in signatures.items():
+            record = self.embedded_media_cache.lookup(file_path, signature)
+            if record is not None:
+                extracted[file_path] = record.result
+            else:
+                changed_paths.append(file_path)
+        
+        if changed_paths:
+            if self.media_extractor is None:
+                self.media_extractor = EmbeddedMediaExtractor(get_cache_dir(self.config, "EmbeddedMedia"))
+            for file_path, media in self.media_extractor.extract_many(changed_paths).items():
+                self.embedded_media_cache.put(file_path, signatures[file_path], media)
+                extracted[file_path] = media
+            for file_path, error in self.media_extractor.failed.items():
+                unreal.log_warning(f"无法提取FBX中嵌入的媒体: {file_path}: {error}")
+        
+        created = []
+        for fbx_file in fbx_files:
+            linked = []
+            for media in extracted.get(fbx_file.file_path, []):
+                texture_file = self.embedded_textures.get(media.digest)
+                if texture_file is None:
+                    file_name = os.path.basename(media.cache_path)
+                    asset_type, base_name, extension = self.classifier.classify(file_name)
+                    if not asset_type.startswith("texture_"):
+                        continue
+                    texture_file = self._add_to_catalog(file_name, media.cache_path, os.path.dirname(media.cache_path),
+                                                        asset_type, base_name, extension)
+                    self.embedded_textures[media.digest] = texture_file
+                    created.append(texture_file)
+                linked.append((media, texture_file))
+            if linked:
+                self.embedded_media[fbx_file.key] = linked
+        return created
+    
+    def embedded_textures_for(self, mesh_files):
+        """
+        获取模型嵌入的纹理
+        
+        Args:
+            mesh_files (iterable): 模型AssetFile
+        
+        Returns:
+            list: 纹理AssetFile列表，不重复；与扫描到的纹理内容相同而被合并时为规范纹理
+        """
+        textures = {}
+        for mesh_file in mesh_files:
+            for media, texture_file in self.embedded_media.get(mesh_file.key, []):
+                texture_file = self._canonical_textures.get(media.digest, texture_file)
+                textures.setdefault(texture_file.key, texture_file)
+        return list(textures.values())
+    
+    def _create_hasher(self, folder_path):
+        """
+        创建内容哈希器，启用扫描索引时载入索引中缓存的哈希
         
         Args:
             folder_path (str): 要扫描的文件夹路径
         
         Returns:
-            dict: 按类型分组的资产文件字典
+            ContentHasher: 内容哈希器
         """
-        if not os.path.exists(folder_path):
-            unreal.log_error(f"文件夹不存在: {folder_path}")
-            return {}
+        cache = None
+        if self.use_index:
+            index = ScanIndex(self._get_index_path(folder_path), self._get_classifier_key())
+            try:
+                cache = index.load_content_hashes()
+            finally:
+                index.close()
+        return ContentHasher(self.hash_workers, cache)
+    
+    def _save_hashes(self, folder_path, hasher):
+        """
+        将新计算的哈希写回扫描索引
         
-        # 初始化结果字典
+        Args:
+            folder_path (str): 要扫描的文件夹路径
+            hasher (ContentHasher): 内容哈希器
+        """
+        if not self.use_index:
+            return
+        
+        removed = (self.last_scan_changes or {}).get("removed", [])
+        if not hasher.updated and not removed:
+            return
+        
+        index = ScanIndex(self._get_index_path(folder_path), self._get_classifier_key())
+        try:
+            index.store_content_hashes(hasher.updated, removed)
+        finally:
+            index.close()
+        hasher.updated = {}
+    
+    def _collapse_duplicates(self, asset_files, hasher):
+        """
+        计算纹理的内容哈希，把内容完全相同的纹理合并为一个规范资产
+        
+        每组相同内容中路径最小的纹理作为规范资产（扫描到的纹理优先于FBX中嵌入的纹理），
+        其余纹理记录到duplicate_textures中，不再出现在返回的列表里；规范资产因此与文件的扫描顺序无关。
+        流式扫描时之前批次的规范资产可能被路径更小的纹理代替，代替关系记录在_replaced_canonicals中。
+        
+        Args:
+            asset_files (list): AssetFile列表
+            hasher (ContentHasher): 内容哈希器
+        
+        Returns:
+            list: 去除重复纹理后的AssetFile列表
+        """
+        # UDIM纹理集由多个文件组成，不参与合并
+        textures = [asset_file for asset_file in asset_files
+                    if asset_file.asset_type.startswith("texture_") and not isinstance(asset_file, TextureSet)]
+        if not textures:
+            return asset_files
+        
+        digests = hasher.hash_files([texture.file_path for texture in textures])
+        
+        def rank(texture, digest):
+            return self.embedded_textures.get(digest) is texture, texture.file_path
+        
+        duplicates = set()
+        for texture in sorted(textures, key=lambda texture: texture.file_path):
+            digest = digests.get(texture.file_path)
+            if digest is None:
+                continue
+            
+            canonical = self._canonical_textures.setdefault(digest, texture)
+            if canonical is texture:
+                continue
+            
+            indices = self._duplicate_indices.setdefault(digest, [])
+            if rank(texture, digest) < rank(canonical, digest):
+                # 之前的批次中的规范纹理排在后面，改为当前纹理，已记录的重复纹理也对应到当前纹理
+                self._canonical_textures[digest] = texture
+                self._replaced_canonicals.append((canonical, texture, digest))
+                for index in indices:
+                    self.duplicate_textures[index] = (self.duplicate_textures[index][0], texture)
+                texture, canonical = canonical, texture
+            
+            indices.append(len(self.duplicate_textures))
+            self.duplicate_textures.append((texture, canonical))
+            duplicates.add(id(texture))
+        
+        if not duplicates:
+            return asset_files
+        return [asset_file for asset_file in asset_files if id(asset_file) not in duplicates]
+    
+    def create_assets_dict(self, asset_files=()):
+        """
+        创建按类型分组的资产字典
+        
+        Args:
+            asset_files (iterable, optional): 需要放入字典的AssetFile
+        
+        Returns:
+            dict: 按类型分组的资产文件字典
+        """
         assets = {
             "fbx": [],
             "ma": [],
@@ -117,101 +499,448 @@ class FolderScanner:
             "other": []
         }
         
-        # 递归扫描文件夹
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                extension = os.path.splitext(file)[1].lower()
+        for asset_file in asset_files:
+            self._add_asset(asset_file, assets)
+        
+        return assets
+    
+    def _iter_directory_assets(self, folder_path, changed_paths=None):
+        """
+        遍历文件夹并识别每个目录中的文件
+        
+        启用扫描索引时，未变化目录中的文件直接复用索引中的分类结果，遍历完成后更新索引，
+        并在last_scan_changes中记录新增、删除和修改的文件。
+        
+        Args:
+            folder_path (str): 要扫描的文件夹路径
+            changed_paths (iterable, optional): 已知发生变化的路径，见scan_folder
+        
+        Yields:
+            tuple: (目录路径, [AssetFile, ...])，目录的先后顺序取决于列举完成的先后
+        """
+        if is_archive(folder_path):
+            self.last_scan_changes = None
+            yield from self._iter_archive_assets(folder_path)
+            return
+        
+        if not self.use_index:
+            walker = DirectoryWalker(self.max_workers, self.scan_rules)
+            for directory, entries in walker.walk(folder_path):
+                classified = [(entry.name, entry.path) + tuple(self._classify_file(entry.name, entry.path))
+                              for entry in entries]
+                asset_files = self._build_directory_assets(directory, classified)
+                if asset_files:
+                    yield directory, asset_files
+            return
+        
+        index = ScanIndex(self._get_index_path(folder_path), self._get_classifier_key())
+        try:
+            snapshot = index.load_snapshot()
+            changed_paths = set(changed_paths or ())
+            verify_files = self.verify_files or os.path.normpath(folder_path) in map(os.path.normpath, changed_paths)
+            walker = IncrementalWalker(snapshot, self.max_workers, verify_files, self.scan_rules, changed_paths)
+            
+            listed_files = {}
+            classified_paths = set()
+            for directory, entries in walker.walk(folder_path):
+                classified = []
+                for entry in entries:
+                    if entry.asset_type is None:
+                        asset_type, base_name, extension = self._classify_file(entry.name, entry.path)
+                        if asset_type != "other" or self.keep_unknown_files:
+                            classified_paths.add(entry.path)
+                    else:
+                        asset_type, base_name, extension = entry.asset_type, entry.base_name, None
+                    
+                    self.file_signatures[entry.path] = (entry.size, entry.mtime_ns)
+                    if directory in walker.listed_directories:
+                        listed_files.setdefault(directory, {})[entry.name] = FileRecord(
+                            entry.size, entry.mtime_ns, asset_type, base_name
+                        )
+                    
+                    classified.append((entry.name, entry.path, asset_type, base_name, extension))
                 
-                # 根据扩展名和文件名模式识别资产类型
-                if extension == ".fbx":
-                    asset_file = self._process_fbx_file(file_path)
-                    assets["fbx"].append(asset_file)
-                elif extension == ".ma":
-                    asset_file = AssetFile(file_path, "ma")
-                    assets["ma"].append(asset_file)
-                elif extension in [".png", ".jpg", ".jpeg", ".tga", ".bmp", ".exr", ".hdr"]:
-                    texture_type = self._identify_texture_type(file)
-                    asset_file = AssetFile(file_path, f"texture_{texture_type}")
-                    assets["textures"][texture_type].append(asset_file)
-                else:
-                    asset_file = AssetFile(file_path, "other")
-                    assets["other"].append(asset_file)
+                asset_files = self._build_directory_assets(directory, classified)
+                if asset_files:
+                    yield directory, asset_files
+            
+            # 被规则排除的文件也写入索引（不分类），规则变化时无需重新列举
+            for directory, entries in walker.listed_entries.items():
+                directory_files = listed_files.setdefault(directory, {})
+                for entry in entries:
+                    if entry.name not in directory_files:
+                        directory_files[entry.name] = FileRecord(
+                            entry.size, entry.mtime_ns, entry.asset_type or "", entry.base_name or ""
+                        )
+            
+            # 已删除（或被规则剪枝）目录中的文件也计入删除列表
+            removed_directories = walker.removed_directories()
+            removed = list(walker.removed)
+            for directory in removed_directories:
+                removed.extend(os.path.join(directory, name) for name in snapshot.files.get(directory, {}))
+            
+            index.apply_scan(walker.listed_directories, listed_files, removed_directories)
+        finally:
+            index.close()
         
-        # 分析资产关系
-        self._analyze_asset_relationships(assets)
+        # 只报告参与扫描的文件，被规则排除的文件不计入变化
+        def was_scanned(path):
+            record = snapshot.files.get(os.path.dirname(path), {}).get(os.path.basename(path))
+            return record is not None and record.asset_type != "" and (
+                record.asset_type != "other" or self.keep_unknown_files)
         
-        return assets
+        self.last_scan_changes = {
+            "added": sorted(path for path in walker.added if path in classified_paths),
+            "removed": sorted(path for path in removed if was_scanned(path)),
+            "modified": sorted(path for path in walker.modified if path in classified_paths)
+        }
+        
+        if snapshot.directories:
+            unreal.log(
+                f"增量扫描: 重新列举 {len(walker.listed_directories)} 个目录，"
+                f"新增 {len(self.last_scan_changes['added'])} 个文件，删除 {len(self.last_scan_changes['removed'])} 个文件，"
+                f"修改 {len(self.last_scan_changes['modified'])} 个文件"
+            )
+    
+    def _iter_archive_assets(self, archive_path):
+        """
+        遍历zip压缩包的中央目录并识别每个目录中的文件
+        
+        成员使用"压缩包路径/成员路径"形式的虚拟路径，导入时再由ArchiveCache按需解压。
+        压缩包中的忽略文件不会被读取，配置中的包含/排除规则照常生效。
+        
+        Args:
+            archive_path (str): 压缩包路径
+        
+        Yields:
+            tuple: (虚拟目录路径, [AssetFile, ...])
+        """
+        try:
+            members = list_archive_members(archive_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            unreal.log_error(f"无法读取压缩包: {archive_path}: {e}")
+            return
+        
+        # 按成员所在目录分组
+        directories = {}
+        for member_name in members:
+            parts = member_name.split("/")
+            directory = os.path.join(archive_path, *parts[:-1])
+            directories.setdefault(directory, []).append(parts[-1])
+        
+        rules = self.scan_rules.for_root(archive_path)
+        excluded = {}
+        
+        def is_excluded(directory):
+            # 目录本身或任一上级目录被排除时跳过
+            if directory == archive_path:
+                return False
+            if directory not in excluded:
+                excluded[directory] = (rules.excludes_directory(directory)
+                                       or is_excluded(os.path.dirname(directory)))
+            return excluded[directory]
+        
+        for directory in sorted(directories):
+            if is_excluded(directory):
+                continue
+            
+            # 压缩包成员尚未解压，FBX只按文件名分类
+            classified = []
+            for file_name in directories[directory]:
+                file_path = os.path.join(directory, file_name)
+                if rules.includes_file(file_path, file_name):
+                    classified.append((file_name, file_path) + tuple(self.classifier.classify(file_name)))
+            
+            asset_files = self._build_directory_assets(directory, classified)
+            if asset_files:
+                yield directory, asset_files
     
-    def _process_fbx_file(self, file_path):
+    def _file_signature(self, file_path):
         """
-        处理FBX文件，确定其类型（静态网格、骨骼网格或动画）
+        获取文件的大小和修改时间，优先使用遍历时得到的值
         
         Args:
-            file_path (str): FBX文件路径
+            file_path (str): 文件路径
         
         Returns:
-            AssetFile: 处理后的资产文件对象
+            tuple: (大小, 修改时间)，文件不存在（例如压缩包中尚未解压的成员）时返回None
         """
-        file_name = os.path.basename(file_path)
+        signature = self.file_signatures.get(file_path)
+        if signature is not None:
+            return signature
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        return stat_result.st_size, stat_result.st_mtime_ns
+    
+    def _load_parsed_results(self, folder_path):
+        """
+        启用扫描索引时，从索引载入之前保存的解析结果（每个文件夹只载入一次）
         
-        # 根据文件名判断FBX类型
-        if self._match_pattern(file_name, self.filename_patterns.get("static_mesh", [])):
-            fbx_type = "static_mesh"
-        elif self._match_pattern(file_name, self.filename_patterns.get("skeletal_mesh", [])):
-            fbx_type = "skeletal_mesh"
-        elif self._match_pattern(file_name, self.filename_patterns.get("animation", [])):
-            fbx_type = "animation"
-        else:
-            # 默认为静态网格
-            fbx_type = "static_mesh"
+        Args:
+            folder_path (str): 要扫描的文件夹路径
+        """
+        if not self.use_index or is_archive(folder_path):
+            return
+        index_path = self._get_index_path(folder_path)
+        caches = [cache for cache in (self.texture_link_cache, self.maya_scene_cache)
+                  if index_path not in cache.loaded_indexes]
+        if not caches:
+            return
+        index = ScanIndex(index_path, self._get_classifier_key())
+        try:
+            for cache in caches:
+                cache.load(index)
+        finally:
+            index.close()
+    
+    def _save_parsed_results(self, folder_path):
+        """
+        将新的解析结果写回扫描索引，并删除已删除文件的结果
+        
+        Args:
+            folder_path (str): 要扫描的文件夹路径
+        """
+        if not self.use_index or is_archive(folder_path):
+            return
+        
+        removed = (self.last_scan_changes or {}).get("removed", [])
+        for file_path in removed:
+            self.file_signatures.pop(file_path, None)
+            self.embedded_media_cache.records.pop(file_path, None)
+        if not (self.texture_link_cache.updated or self.maya_scene_cache.updated or removed):
+            return
         
-        return AssetFile(file_path, fbx_type)
+        index = ScanIndex(self._get_index_path(folder_path), self._get_classifier_key())
+        try:
+            self.texture_link_cache.save(index, removed)
+            self.maya_scene_cache.save(index, removed)
+        finally:
+            index.close()
     
-    def _identify_texture_type(self, file_name):
+    def _get_index_path(self, folder_path):
         """
-        根据文件名识别纹理类型
+        获取文件夹对应的扫描索引路径
         
         Args:
-            file_name (str): 纹理文件名
+            folder_path (str): 要扫描的文件夹路径
         
         Returns:
-            str: 纹理类型 (diffuse, normal, roughness, etc.)
+            str: SQLite数据库文件路径
         """
-        # 检查文件名是否匹配已知的纹理类型模式
-        if self._match_pattern(file_name, self.filename_patterns.get("diffuse", [])):
-            return "diffuse"
-        elif self._match_pattern(file_name, self.filename_patterns.get("normal", [])):
-            return "normal"
-        elif self._match_pattern(file_name, self.filename_patterns.get("roughness", [])):
-            return "roughness"
-        elif self._match_pattern(file_name, self.filename_patterns.get("metallic", [])):
-            return "metallic"
-        elif self._match_pattern(file_name, self.filename_patterns.get("specular", [])):
-            return "specular"
-        elif self._match_pattern(file_name, self.filename_patterns.get("emissive", [])):
-            return "emissive"
-        else:
-            return "other"
+        folder_key = hashlib.blake2b(os.path.abspath(folder_path).encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(get_cache_dir(self.config, "ScanIndex"), f"{folder_key}.sqlite")
     
-    def _match_pattern(self, file_name, patterns):
+    def _get_classifier_key(self):
         """
-        检查文件名是否匹配给定的模式列表
+        获取当前分类规则的标识
+        
+        Returns:
+            str: 由分类逻辑版本、FBX内容分类设置和文件名模式计算出的标识
+        """
+        patterns = json.dumps(self.filename_patterns, sort_keys=True)
+        content_key = f"content{CONTENT_CLASSIFIER_VERSION}" if self.classify_fbx_by_content else "name"
+        return (f"{CLASSIFIER_VERSION}:{content_key}:"
+                f"{hashlib.blake2b(patterns.encode('utf-8'), digest_size=16).hexdigest()}")
+    
+    def _classify_file(self, file_name, file_path):
+        """
+        识别文件的资产类型和基础名称
+        
+        启用classify_fbx_by_content时，FBX文件的网格类型根据文件中的蒙皮、网格几何体和动画曲线确定，
+        只读取对象头；文件内容无法判断时使用文件名模式的结果。
         
         Args:
             file_name (str): 文件名
-            patterns (list): 模式列表
+            file_path (str): 文件的完整路径
+        
+        Returns:
+            Classification: 分类结果
+        """
+        classification = self.classifier.classify(file_name)
+        if classification.extension == ".fbx" and self.classify_fbx_by_content:
+            return classification._replace(asset_type=classify_fbx_file(file_path, classification.asset_type))
+        return classification
+    
+    def _add_asset(self, asset_file, assets):
+        """
+        将资产文件加入结果字典的对应分组
+        
+        Args:
+            asset_file (AssetFile): 资产文件对象
+            assets (dict): 按类型分组的资产字典
+        """
+        if asset_file.extension == ".fbx":
+            assets["fbx"].append(asset_file)
+        elif asset_file.extension == ".ma":
+            assets["ma"].append(asset_file)
+        elif asset_file.asset_type.startswith("texture_"):
+            assets["textures"][asset_file.asset_type[8:]].append(asset_file)
+        else:
+            assets["other"].append(asset_file)
+    
+    def _remove_asset(self, asset_file, assets):
+        """
+        从结果字典中移除资产文件
+        
+        Args:
+            asset_file (AssetFile): 资产文件对象
+            assets (dict): 按类型分组的资产字典
+        """
+        if asset_file.extension == ".fbx":
+            group = assets["fbx"]
+        elif asset_file.extension == ".ma":
+            group = assets["ma"]
+        elif asset_file.asset_type.startswith("texture_"):
+            group = assets["textures"][asset_file.asset_type[8:]]
+        else:
+            group = assets["other"]
+        if asset_file in group:
+            group.remove(asset_file)
+    
+    def _build_directory_assets(self, directory, classified):
+        """
+        为一个目录中已分类的文件创建资产文件对象
+        
+        未知类型的文件按keep_unknown_files决定是否保留；启用UDIM检测时，
+        只有UDIM编号不同的纹理合并为一个TextureSet；启用LOD检测时，
+        只有LOD编号不同的FBX文件合并为一个MeshLodGroup。
+        
+        Args:
+            directory (str): 目录路径
+            classified (list): [(文件名, 完整路径, 资产类型, 基础名称, 扩展名或None), ...]
+        
+        Returns:
+            list: AssetFile列表
+        """
+        texture_sets = []
+        if self.detect_udims:
+            classified, texture_sets = self._group_udim_tiles(directory, classified)
+        
+        lod_groups = []
+        if self.detect_lods:
+            classified, lod_groups = self._group_lod_chains(directory, classified)
+        
+        asset_files = [
+            self._add_to_catalog(file_name, file_path, directory, asset_type, base_name, extension)
+            for file_name, file_path, asset_type, base_name, extension in classified
+            if asset_type != "other" or self.keep_unknown_files
+        ]
+        asset_files.extend(texture_sets)
+        asset_files.extend(lod_groups)
+        return asset_files
+    
+    def _group_udim_tiles(self, directory, classified):
+        """
+        把同一目录中只有UDIM编号不同的纹理合并为TextureSet
+        
+        例如Body_BaseColor.1001.png到Body_BaseColor.1040.png合并为一个纹理集，
+        纹理集按去掉编号后的名称（Body_BaseColor.png）识别类型和基础名称。
+        
+        Args:
+            directory (str): 目录路径
+            classified (list): [(文件名, 完整路径, 资产类型, 基础名称, 扩展名或None), ...]
         
         Returns:
-            bool: 是否匹配
+            tuple: (未合并的条目列表, TextureSet列表)
+        """
+        candidates = {}
+        for item in classified:
+            if not item[2].startswith("texture_"):
+                continue
+            stem, extension = os.path.splitext(item[0])
+            udim_name = split_udim(stem)
+            if udim_name is not None:
+                key = (udim_name.prefix, udim_name.separator, extension.lower())
+                candidates.setdefault(key, []).append((udim_name.udim, item))
+        
+        texture_sets = []
+        grouped = set()
+        for (prefix, _, extension), tiles in candidates.items():
+            if len(tiles) < max(self.udim_min_tiles, 1):
+                continue
+            
+            tiles.sort(key=lambda tile: tile[0])
+            first_name, first_path = tiles[0][1][:2]
+            asset_type, base_name, _ = self.classifier.classify(prefix + extension)
+            texture_sets.append(self.catalog.add(TextureSet(
+                first_path, asset_type, base_name, [(udim, item[0]) for udim, item in tiles],
+                file_name=first_name, directory=directory, extension=extension
+            )))
+            grouped.update(item[0] for _, item in tiles)
+        
+        if not grouped:
+            return classified, texture_sets
+        return [item for item in classified if item[0] not in grouped], texture_sets
+    
+    def _group_lod_chains(self, directory, classified):
+        """
+        把同一目录中只有LOD编号不同的FBX文件合并为MeshLodGroup
+        
+        例如Chair_LOD0.fbx、Chair_LOD1.fbx和Chair_LOD2.fbx合并为一个带3级LOD的网格，
+        LOD链按去掉后缀后的名称（Chair.fbx）识别基础名称，网格类型按文件名识别，
+        启用FBX内容分类时使用LOD0文件的分类结果。动画文件不参与合并。
+        
+        Args:
+            directory (str): 目录路径
+            classified (list): [(文件名, 完整路径, 资产类型, 基础名称, 扩展名或None), ...]
+        
+        Returns:
+            tuple: (未合并的条目列表, MeshLodGroup列表)
+        """
+        candidates = {}
+        for item in classified:
+            stem, extension = os.path.splitext(item[0])
+            if extension.lower() != ".fbx":
+                continue
+            lod_name = split_lod(stem)
+            if lod_name is not None:
+                candidates.setdefault(lod_name.prefix, []).append((lod_name.lod_index, item))
+        
+        lod_groups = []
+        grouped = set()
+        for prefix, lods in candidates.items():
+            if len(lods) < 2 or len({lod_index for lod_index, _ in lods}) != len(lods):
+                continue
+            
+            lods.sort(key=lambda lod: lod[0])
+            asset_type, base_name, _ = self.classifier.classify(prefix + ".fbx")
+            if self.classify_fbx_by_content:
+                asset_type = lods[0][1][2]
+            if asset_type == "animation":
+                continue
+            
+            first_name, first_path = lods[0][1][:2]
+            lod_groups.append(self.catalog.add(MeshLodGroup(
+                first_path, asset_type, base_name, [(lod_index, item[0]) for lod_index, item in lods],
+                file_name=first_name, directory=directory, extension=".fbx"
+            )))
+            grouped.update(item[0] for _, item in lods)
+        
+        if not grouped:
+            return classified, lod_groups
+        return [item for item in classified if item[0] not in grouped], lod_groups
+    
+    def _add_to_catalog(self, file_name, file_path, directory, asset_type, base_name, extension=None):
         """
-        name_without_ext = os.path.splitext(file_name)[0]
+        创建资产文件对象并加入资产目录
         
-        for pattern in patterns:
-            if pattern in name_without_ext:
-                return True
+        Args:
+            file_name (str): 文件名
+            file_path (str): 文件的完整路径
+            directory (str): 所在目录
+            asset_type (str): 资产类型
+            base_name (str): 基础名称
+            extension (str, optional): 小写扩展名
         
-        return False
+        Returns:
+            AssetFile: 创建的资产文件对象
+        """
+        return self.catalog.add(AssetFile(file_path, asset_type, base_name,
+                                          file_name=file_name, directory=directory, extension=extension))
     
     def _analyze_asset_relationships(self, assets):
         """
@@ -220,26 +949,146 @@ class FolderScanner:
         Args:
             assets (dict): 按类型分组的资产字典
         """
-        # 创建基础名称到资产的映射
-        base_name_map = {}
+        self._reset_relationships()
         
         # 收集所有资产的基础名称
         for asset_type in ["fbx", "ma"]:
             for asset in assets[asset_type]:
-                if asset.base_name not in base_name_map:
-                    base_name_map[asset.base_name] = []
-                base_name_map[asset.base_name].append(asset)
+                self._add_relationship(asset)
         
         # 收集纹理的基础名称
         for texture_type in assets["textures"]:
             for texture in assets["textures"][texture_type]:
-                if texture.base_name not in base_name_map:
-                    base_name_map[texture.base_name] = []
-                base_name_map[texture.base_name].append(texture)
-        
-        # 建立关系
-        for base_name, related_assets in base_name_map.items():
-            if len(related_assets) > 1:
-                # 如果有多个相关资产，则建立它们之间的关系
-                for asset in related_assets:
-                    asset.related_assets = [a for a in related_assets if a != asset]
+                self._add_relationship(texture)
+        
+        # 重复纹理所在的组改为包含规范纹理，引用重复纹理路径的材质也对应到规范纹理
+        for duplicate_file, canonical_file in self.duplicate_textures:
+            self.relationships.add_duplicate(duplicate_file, canonical_file)
+            self.texture_links.add_texture(canonical_file, duplicate_file.file_path)
+    
+    def _reset_relationships(self):
+        """清空资产关系索引、纹理引用索引和读取到的Maya场景"""
+        self.relationships = RelationshipIndex(self.relationship_scope)
+        self.texture_links = TextureLinkIndex()
+        self.maya_scenes = {}
+    
+    def _add_relationship(self, asset):
+        """
+        将资产加入关系索引中对应的组，组内资产互为关联资产
+        
+        启用link_fbx_textures时，纹理同时加入纹理引用索引，FBX模型读取其材质引用的纹理；
+        启用link_maya_textures时，Maya场景读取其着色组引用的纹理。
+        
+        Args:
+            asset (AssetFile): 资产文件对象
+        """
+        if asset.asset_type == "other":
+            return
+        
+        self.relationships.add(asset)
+        
+        if not (self.link_fbx_textures or self.link_maya_textures):
+            return
+        if asset.asset_type.startswith("texture_"):
+            self.texture_links.add_texture(asset)
+        elif asset.extension == ".fbx" and asset.asset_type != "animation" and self.link_fbx_textures:
+            self._link_fbx_textures(asset)
+        elif asset.extension == ".ma" and self.link_maya_textures:
+            self._link_maya_textures(asset)
+    
+    def _link_fbx_textures(self, asset):
+        """
+        读取FBX材质引用的纹理并加入纹理引用索引
+        
+        只读取材质、纹理和连接，不读取几何数据。压缩包中的成员尚未解压，不读取。
+        FBX嵌入的纹理以FBX中记录的路径加入索引，只用于该模型，并优先于同一路径上扫描到的纹理。
+        
+        Args:
+            asset (AssetFile): FBX模型文件对象
+        """
+        signature = self._file_signature(asset.file_path)
+        if signature is None:
+            return
+        
+        for media, texture_file in self.embedded_media.get(asset.key, []):
+            # 嵌入的图片与扫描到的纹理内容相同而被合并时对应到规范纹理
+            texture_file = self._canonical_textures.get(media.digest, texture_file)
+            self.texture_links.add_embedded(asset, texture_file, media_reference_paths(media, asset.directory))
+        
+        try:
+            slots = self.texture_link_cache.get(asset.file_path, signature, read_texture_links)
+        except (FbxParseError, OSError) as e:
+            unreal.log_warning(f"无法读取FBX的纹理引用: {asset.file_path}: {e}")
+            return
+        
+        if any(slot.textures for slot in slots):
+            self.texture_links.add_mesh(asset, slots)
+    
+    def _link_maya_textures(self, asset):
+        """
+        读取Maya ASCII场景中着色组引用的纹理并加入纹理引用索引
+        
+        每个有成员的着色组对应一个材质槽。压缩包中的成员尚未解压，不读取。
+        
+        Args:
+            asset (AssetFile): .ma文件对象
+        """
+        signature = self._file_signature(asset.file_path)
+        if signature is None:
+            return
+        
+        try:
+            scene = read_maya_scene_cached(asset.file_path, signature)
+        except (MayaParseError, OSError) as e:
+            unreal.log_warning(f"无法读取Maya场景的纹理引用: {asset.file_path}: {e}")
+            return
+        
+        self.maya_scenes[asset.key] = (asset, scene)
+        if any(slot.textures for slot in scene.slots):
+            self.texture_links.add_mesh(asset, scene.slots)
+    
+    def maya_dependencies(self):
+        """
+        获取每个Maya场景依赖的纹理和引用的文件，用于扫描报告
+        
+        Returns:
+            list: [(.ma文件AssetFile, 依赖的纹理AssetFile列表, 不在扫描文件夹中的纹理路径列表, MayaReference列表), ...]
+        """
+        dependencies = []
+        for asset, scene in self.maya_scenes.values():
+            textures = {}
+            missing = []
+            for slot in scene.slots:
+                for reference in slot.textures:
+                    texture_file = self.texture_links.resolve(asset, reference)
+                    if texture_file is not None:
+                        textures.setdefault(texture_file.key, texture_file)
+                    else:
+                        path = reference.relative_file_name or reference.file_name
+                        if path not in missing:
+                            missing.append(path)
+            dependencies.append((asset, list(textures.values()), missing, scene.references))
+        return dependencies
+    
+    def referenced_textures(self, assets):
+        """
+        只保留模型实际使用的纹理
+        
+        材质引用了扫描到的纹理的模型只保留被引用的纹理；没有纹理引用信息的模型仍保留按基础名称关联的纹理。
+        
+        Args:
+            assets (dict): 按类型分组的资产字典
+        
+        Returns:
+            dict: 按纹理类型分组的纹理字典，结构与assets["textures"]相同
+        """
+        used = {texture_file.key for texture_file in self.texture_links.referenced_textures()}
+        for asset_type in ("fbx", "ma"):
+            for mesh_file in assets.get(asset_type, []):
+                if not self.texture_links.has_links(mesh_file):
+                    used.update(texture_file.key for texture_file in self.relationships.textures_for(mesh_file))
+        
+        return {
+            texture_type: [texture_file for texture_file in textures if texture_file.key in used]
+            for texture_type, textures in assets.get("textures", {}).items()
+        }
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+文件夹监视模块
+用于监视源文件夹中的文件变化
+
+此模块在Linux上通过inotify（使用ctypes直接调用libc，不需要额外库）接收文件系统事件，
+在其他平台或inotify不可用时（例如监视数量超过上限）退回到定时轮询。
+连续的写入会被合并：变化停止一段时间（防抖时间）之后才通知调用方；
+wait_for_stable_files用于确认文件已经停止增长，避免导入仍在复制中的文件。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import ctypes
+import ctypes.util
+
+# inotify事件掩码
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF)
+
+# inotify_event结构的固定部分：wd、mask、cookie、len
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    """基于inotify的事件源，递归监视所有子目录"""
+
+    # 无事件时每次等待的秒数
+    idle_timeout = 0.5
+
+    def __init__(self, root_path, exclude_directory=None):
+        """
+        初始化inotify事件源
+
+        Args:
+            root_path (str): 监视的根目录
+            exclude_directory (callable, optional): 判断目录是否不需要监视的函数
+
+        Raises:
+            OSError: inotify不可用或监视数量超过系统上限
+        """
+        self.root_path = root_path
+        self.exclude_directory = exclude_directory
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self._watches = {}
+        try:
+            self._add_tree(root_path)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory):
+        """
+        监视单个目录
+
+        Args:
+            directory (str): 目录路径
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            # 目录在添加监视前已被删除时忽略
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(error, f"{os.strerror(error)}: {directory}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory):
+        """
+        监视目录及其所有子目录
+
+        Args:
+            directory (str): 目录路径
+
+        Returns:
+            list: 目录树中已存在的文件路径（监视建立之前创建的文件）
+        """
+        existing_files = []
+        for current, subdirectories, files in os.walk(directory):
+            if self.exclude_directory is not None:
+                subdirectories[:] = [name for name in subdirectories
+                                     if not self.exclude_directory(os.path.join(current, name))]
+            self._add_watch(current)
+            existing_files.extend(os.path.join(current, name) for name in files)
+        return existing_files
+
+    def read(self, timeout):
+        """
+        等待并读取事件
+
+        Args:
+            timeout (float): 最长等待秒数
+
+        Returns:
+            list: 发生变化的路径列表
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        changed = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+                offset += name_length
+
+                if mask & _IN_Q_OVERFLOW:
+                    # 事件队列溢出，无法得知具体变化，由调用方重新扫描
+                    changed.append(self.root_path)
+                    continue
+
+                directory = self._watches.get(wd)
+                if mask & _IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                if directory is None:
+                    continue
+
+                path = os.path.join(directory, name) if name else directory
+                changed.append(path)
+
+                # 新建或移入的目录需要加入监视，其中已有的文件也算作变化
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    if self.exclude_directory is None or not self.exclude_directory(path):
+                        changed.extend(self._add_tree(path))
+        return changed
+
+    def close(self):
+        """关闭inotify文件描述符"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """定时轮询的事件源，比较前后两次的文件大小和修改时间"""
+
+    def __init__(self, root_path, exclude_directory=None, poll_interval=2.0):
+        """
+        初始化轮询事件源
+
+        Args:
+            root_path (str): 监视的根目录
+            exclude_directory (callable, optional): 判断目录是否不需要监视的函数
+            poll_interval (float, optional): 轮询间隔秒数
+        """
+        self.root_path = root_path
+        self.exclude_directory = exclude_directory
+        self.idle_timeout = poll_interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        """
+        记录目录树中所有文件的大小和修改时间
+
+        Returns:
+            dict: {文件路径: (大小, 修改时间)}
+        """
+        snapshot = {}
+        stack = [self.root_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.exclude_directory is None or not self.exclude_directory(entry.path):
+                                    stack.append(entry.path)
+                            else:
+                                stat_result = entry.stat()
+                                snapshot[entry.path] = (stat_result.st_size, stat_result.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return snapshot
+
+    def read(self, timeout):
+        """
+        等待一段时间后比较文件状态
+
+        Args:
+            timeout (float): 等待秒数
+
+        Returns:
+            list: 发生变化（新增、修改或删除）的路径列表
+        """
+        time.sleep(timeout)
+        snapshot = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = snapshot
+
+        changed = [path for path, signature in snapshot.items() if previous.get(path) != signature]
+        changed.extend(path for path in previous if path not in snapshot)
+        return changed
+
+    def close(self):
+        """轮询事件源没有需要释放的资源"""
+
+
+class FolderWatcher:
+    """文件夹监视类，合并连续的变化后通知调用方"""
+
+    def __init__(self, folder_path, debounce_seconds=2.0, poll_interval=2.0, use_inotify=True, exclude_directory=None):
+        """
+        初始化文件夹监视器
+
+        Args:
+            folder_path (str): 监视的文件夹
+            debounce_seconds (float, optional): 防抖时间，变化停止这么久之后才通知
+            poll_interval (float, optional): 轮询模式下的轮询间隔
+            use_inotify (bool, optional): 是否优先使用inotify
+            exclude_directory (callable, optional): 判断目录是否不需要监视的函数
+        """
+        self.folder_path = folder_path
+        self.debounce_seconds = debounce_seconds
+
+        self.backend = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self.backend = _InotifyBackend(folder_path, exclude_directory)
+                self.backend_name = "inotify"
+            except (OSError, AttributeError):
+                # inotify不可用或监视数量超过fs.inotify.max_user_watches
+                self.backend = None
+
+        if self.backend is None:
+            self.backend = _PollingBackend(folder_path, exclude_directory, poll_interval)
+            self.backend_name = "polling"
+
+    def wait_for_changes(self, stop_event=None, timeout=None):
+        """
+        等待一批变化结束
+
+        有变化发生后继续收集，直到debounce_seconds内不再有新的变化才返回。
+
+        Args:
+            stop_event (threading.Event, optional): 设置后立即返回
+            timeout (float, optional): 没有任何变化时最长等待的秒数，为None时一直等待
+
+        Returns:
+            set: 发生变化的路径集合；停止或超时时可能为空
+        """
+        changed = set()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while stop_event is None or not stop_event.is_set():
+            wait_seconds = self.debounce_seconds if changed else self.backend.idle_timeout
+            if deadline is not None and not changed:
+                wait_seconds = max(0.0, min(wait_seconds, deadline - time.monotonic()))
+
+            paths = self.backend.read(wait_seconds)
+            if paths:
+                changed.update(paths)
+                continue
+
+            if changed:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        return changed
+
+    def close(self):
+        """停止监视"""
+        self.backend.close()
+
+
+def _file_signature(file_path):
+    """
+    获取文件的大小和修改时间
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        tuple: (大小, 修改时间)，文件不存在时返回None
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return None
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+
+def wait_for_stable_files(file_paths, stable_seconds=1.0, stop_event=None):
+    """
+    确认文件已经停止增长
+
+    在stable_seconds前后各记录一次文件的大小和修改时间，两次一致的文件视为已写入完成。
+
+    Args:
+        file_paths (iterable): 文件路径
+        stable_seconds (float, optional): 观察时间
+        stop_event (threading.Event, optional): 设置后立即返回
+
+    Returns:
+        tuple: (已稳定的路径列表, 仍在变化的路径列表)；已不存在的文件不出现在任何一个列表中
+    """
+    before = {file_path: _file_signature(file_path) for file_path in file_paths}
+    if stop_event is not None:
+        stop_event.wait(stable_seconds)
+    else:
+        time.sleep(stable_seconds)
+
+    stable = []
+    changing = []
+    for file_path, signature in before.items():
+        current = _file_signature(file_path)
+        if current is None:
+            continue
+        if current == signature:
+            stable.append(file_path)
+        else:
+            changing.append(file_path)
+    return stable, changing
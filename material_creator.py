@@ -5,6 +5,8 @@
 用于创建材质实例和连接纹理
 
 此模块提供了创建材质实例、连接纹理到材质参数和组织材质的功能。
+提供FolderScanner的纹理引用索引时，按FBX中每个材质槽实际引用的纹理创建材质实例并分配到对应的槽，
+没有纹理引用信息的模型仍按基础名称关联的纹理创建材质。
 """
 
 import os
@@ -186,18 +188,19 @@ class MaterialCreator:
             unreal.log_error(f"分配材质到网格体时出错: {e}")
             return False
 
-    def create_materials_for_assets(self, assets, imported_assets, imported_textures, target_path):
+    def create_materials_for_assets(self, assets, imported_assets, imported_textures, target_path, texture_links=None):
         """
         为导入的资产创建材质
 
         Args:
             assets (dict): 按类型分组的资产字典
-            imported_assets (dict): 导入的资产映射 {资产文件路径: 导入的资产}
-            imported_textures (dict): 导入的纹理映射 {纹理文件路径: 导入的纹理资产}
+            imported_assets (dict): 导入的资产映射 {资产键(ID或文件路径): 导入的资产}
+            imported_textures (dict): 导入的纹理映射 {纹理键(ID或文件路径): 导入的纹理资产}
             target_path (str): 基础目标路径
+            texture_links (TextureLinkIndex, optional): FBX材质槽引用的纹理索引，通常为FolderScanner.texture_links
 
         Returns:
-            dict: 创建的材质实例映射 {基础名称: 材质实例}
+            dict: 创建的材质实例映射 {基础名称: 材质实例或{材质槽名称: 材质实例}}
         """
         created_materials = {}
 
@@ -205,21 +208,30 @@ class MaterialCreator:
         from asset_processor import AssetProcessor
         asset_processor = AssetProcessor(self.config)
 
-        # 处理FBX资产
-        for asset_file in assets.get("fbx", []):
+        # 处理FBX资产，以及由MA文件转换为FBX导入的资产
+        for asset_file in assets.get("fbx", []) + assets.get("ma", []):
             # 检查资产是否已导入
-            if asset_file.file_path not in imported_assets:
+            if asset_file.key not in imported_assets:
                 continue
 
             # 获取导入的资产
-            imported_asset = imported_assets[asset_file.file_path]
+            imported_asset = imported_assets[asset_file.key]
+
+            # FBX中记录了每个材质槽引用的纹理时，按槽准确连接
+            if texture_links is not None and texture_links.has_links(asset_file):
+                slot_materials = self.create_linked_materials(
+                    asset_file, imported_asset, texture_links.slots_for(asset_file), imported_textures, target_path
+                )
+                if slot_materials:
+                    created_materials[asset_file.base_name] = slot_materials
+                continue
 
             # 收集相关纹理
             asset_textures = {}
             for related_asset in asset_file.related_assets:
-                if related_asset.file_path in imported_textures:
+                if related_asset.key in imported_textures:
                     texture_type = self._get_texture_type(related_asset)
-                    asset_textures[texture_type] = imported_textures[related_asset.file_path]
+                    asset_textures[texture_type] = imported_textures[related_asset.key]
 
             # 检查是否使用材质槽映射
             if self.use_slot_mapping:
@@ -272,6 +284,92 @@ class MaterialCreator:
 
         return created_materials
 
+    def create_linked_materials(self, asset_file, imported_asset, slots, imported_textures, target_path):
+        """
+        按FBX材质槽引用的纹理创建材质实例，并分配到网格体的对应槽
+
+        Args:
+            asset_file (AssetFile): 模型文件对象
+            imported_asset: 导入的网格体资产
+            slots (list): TextureLinkIndex.slots_for的结果 [(槽编号, 材质名称, {纹理类型: 纹理AssetFile}), ...]
+            imported_textures (dict): 导入的纹理映射 {纹理键(ID或文件路径): 导入的纹理资产}
+            target_path (str): 基础目标路径
+
+        Returns:
+            dict: {材质槽名称: 材质实例}
+        """
+        slot_materials = {}
+        for slot_index, slot_name, slot_textures in slots:
+            textures = {
+                texture_type: imported_textures[texture_file.key]
+                for texture_type, texture_file in slot_textures.items()
+                if texture_file.key in imported_textures
+            }
+            if not textures:
+                continue
+
+            if self.use_slot_mapping:
+                material_instance = self.create_material_instance_for_slot(asset_file.base_name, slot_name, textures)
+            else:
+                material_instance = self.create_material_instance(
+                    f"{asset_file.base_name}_{slot_name}",
+                    target_path,
+                    textures,
+                    self._get_material_template_for_asset(asset_file)
+                )
+
+            if material_instance:
+                slot_materials[slot_name] = material_instance
+                self.assign_material_to_slot(imported_asset, slot_name, slot_index, material_instance)
+                unreal.log(f"已按FBX纹理引用为 {asset_file.file_name} 的材质槽 {slot_name} 连接 {len(textures)} 张纹理")
+
+        return slot_materials
+
+    def assign_material_to_slot(self, mesh_asset, slot_name, slot_index, material_instance):
+        """
+        将材质实例分配给网格体的指定材质槽
+
+        优先按槽名称（即FBX中的材质名称）查找，找不到时使用FBX中的槽编号。
+
+        Args:
+            mesh_asset: 网格体资产
+            slot_name (str): 材质槽名称
+            slot_index (int): 材质槽编号
+            material_instance: 材质实例
+
+        Returns:
+            bool: 是否成功分配
+        """
+        try:
+            mesh_object = unreal.EditorAssetLibrary.load_asset(mesh_asset)
+            if not mesh_object:
+                unreal.log_warning(f"无法加载网格体: {mesh_asset}")
+                return False
+
+            if isinstance(mesh_object, unreal.StaticMesh):
+                material_index = mesh_object.get_material_index(slot_name)
+                if material_index < 0:
+                    material_index = slot_index
+                mesh_object.set_material(material_index, material_instance)
+            elif isinstance(mesh_object, unreal.SkeletalMesh):
+                materials = list(mesh_object.get_editor_property("materials"))
+                matched = [i for i, material in enumerate(materials)
+                           if str(material.get_editor_property("material_slot_name")) == slot_name]
+                if not matched and slot_index < len(materials):
+                    matched = [slot_index]
+                for i in matched:
+                    materials[i].set_editor_property("material_interface", material_instance)
+                mesh_object.set_editor_property("materials", materials)
+            else:
+                unreal.log_warning(f"不支持的网格体类型: {type(mesh_object)}")
+                return False
+
+            unreal.EditorAssetLibrary.save_loaded_asset(mesh_object)
+            return True
+        except Exception as e:
+            unreal.log_error(f"分配材质到材质槽 {slot_name} 时出错: {e}")
+            return False
+
     def _format_material_instance_name(self, asset_name, slot_name=None, template_path=None):
         """
         根据命名规则格式化材质实例名称
@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Maya转换模块
+用于在后台把Maya ASCII（.ma）文件批量转换为FBX，转换结果按源文件内容缓存
+
+MayaConverter维护一组常驻的mayapy工作进程，每个进程只启动（初始化Maya、加载fbxmaya插件）一次，
+之后依次转换分配给它的文件；转换在后台线程中进行，调用方可以同时在主线程中导入纹理。
+工作进程运行转换脚本（默认为maya_fbx_export.py），通过标准输入输出逐行交换JSON：
+    输入: {"source": ".ma路径", "output": "FBX路径", "options": {...}}，空行或关闭输入时退出
+    输出: 以RESULT_PREFIX开头的一行，后接{"ok": true}或{"ok": false, "error": "原因"}，其他输出被忽略
+任何实现了这个协议的脚本都可以代替mayapy，例如用普通的Python运行的替身脚本测试转换队列。
+缓存键包括源文件、场景引用的文件和转换脚本的内容哈希以及导出选项，任一项变化时重新转换；
+缓存命中时不启动工作进程。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import sys
+import glob
+import json
+import queue
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import namedtuple, deque
+from concurrent.futures import Future
+
+from content_hasher import hash_file, DIGEST_SIZE
+from maya_scene import read_maya_scene_cached, find_workspace_root, MayaParseError
+
+# 转换逻辑的版本号，计入缓存键，转换方式变化时递增，使旧的缓存失效
+CONVERTER_VERSION = 1
+
+# 工作进程输出结果时使用的前缀
+RESULT_PREFIX = "@@MAYA_FBX_RESULT "
+
+# 默认的转换脚本，由mayapy运行
+DEFAULT_CONVERTER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maya_fbx_export.py")
+
+# 转换失败时错误信息中保留的工作进程输出行数
+OUTPUT_TAIL_LINES = 20
+
+# 常见的Maya安装位置，未配置mayapy路径时按版本从新到旧查找
+MAYAPY_SEARCH_PATTERNS = (
+    "C:/Program Files/Autodesk/Maya*/bin/mayapy.exe",
+    "/Applications/Autodesk/maya*/Maya.app/Contents/bin/mayapy",
+    "/usr/autodesk/maya*/bin/mayapy"
+)
+
+# 转换结果：源文件路径、FBX路径和是否来自缓存
+ConversionResult = namedtuple("ConversionResult", ["source_path", "fbx_path", "cached"])
+
+# 停止工作线程的标记
+_STOP = object()
+
+
+class MayaConversionError(RuntimeError):
+    """Maya文件转换失败"""
+
+
+def find_mayapy(configured_path=""):
+    """
+    查找mayapy可执行文件
+
+    依次使用配置的路径、MAYA_LOCATION环境变量、PATH和常见的安装位置。
+
+    Args:
+        configured_path (str, optional): 配置的mayapy路径
+
+    Returns:
+        str: mayapy路径，没有找到时返回None
+    """
+    if configured_path:
+        return configured_path if os.path.isfile(configured_path) else shutil.which(configured_path)
+
+    executable = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    maya_location = os.environ.get("MAYA_LOCATION")
+    if maya_location:
+        for candidate in (os.path.join(maya_location, "bin", executable),
+                          os.path.join(maya_location, "Contents", "bin", executable)):
+            if os.path.isfile(candidate):
+                return candidate
+
+    found = shutil.which(executable)
+    if found:
+        return found
+
+    for pattern in MAYAPY_SEARCH_PATTERNS:
+        candidates = sorted(glob.glob(pattern), reverse=True)
+        if candidates:
+            return candidates[0]
+    return None
+
+
+def _reference_paths(scene_path):
+    """
+    获取场景引用的文件在本地的路径
+
+    相对路径依次按Maya项目根目录和场景所在目录解析，找不到的文件以原路径返回。
+    场景使用与扫描共用的缓存读取，扫描时已读取过的未变化场景不再重新读取。
+
+    Args:
+        scene_path (str): .ma文件路径
+
+    Returns:
+        list: 文件路径列表
+    """
+    try:
+        scene = read_maya_scene_cached(scene_path)
+    except (MayaParseError, OSError):
+        return []
+
+    directory = os.path.dirname(os.path.abspath(scene_path))
+    roots = [root for root in (find_workspace_root(directory), directory) if root]
+    paths = []
+    for reference in scene.references:
+        file_name = reference.file_name.replace("\\", "/")
+        candidates = [file_name] + [os.path.join(root, file_name) for root in roots]
+        paths.append(next((path for path in candidates if os.path.isfile(path)), file_name))
+    return paths
+
+
+class _ConverterProcess:
+    """一个常驻的转换工作进程"""
+
+    def __init__(self, command):
+        """
+        启动工作进程
+
+        Args:
+            command (list): 命令行
+        """
+        # 编辑器进程中的PYTHONHOME、PYTHONPATH指向编辑器自带的Python，不能传给mayapy
+        env = {key: value for key, value in os.environ.items() if key not in ("PYTHONHOME", "PYTHONPATH")}
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            env=env, text=True, encoding="utf-8", errors="replace", bufsize=1,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        )
+        self.tail = deque(maxlen=OUTPUT_TAIL_LINES)
+
+        # 后台线程读取输出，使等待结果时可以超时
+        self.lines = queue.Queue()
+        reader = threading.Thread(target=self._read_output, name="MayaConverterOutput")
+        reader.daemon = True
+        reader.start()
+
+    def _read_output(self):
+        """把工作进程的输出逐行放入队列，进程退出时放入None"""
+        for line in self.process.stdout:
+            self.lines.put(line.rstrip("\r\n"))
+        self.lines.put(None)
+
+    def convert(self, source_path, output_path, options, timeout):
+        """
+        让工作进程转换一个文件
+
+        Args:
+            source_path (str): .ma文件路径
+            output_path (str): 输出的FBX路径
+            options (dict): 导出选项
+            timeout (float): 等待结果的最长时间（秒）
+
+        Returns:
+            dict: 工作进程返回的结果
+
+        Raises:
+            MayaConversionError: 工作进程退出或超时
+        """
+        job = {"source": source_path, "output": output_path, "options": options}
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            raise MayaConversionError(f"无法向转换进程发送任务: {e}{self._tail_text()}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.kill()
+                raise MayaConversionError(f"转换超过 {timeout} 秒未完成{self._tail_text()}")
+            if line is None:
+                raise MayaConversionError(f"转换进程已退出（返回值 {self.process.wait()}）{self._tail_text()}")
+            if line.startswith(RESULT_PREFIX):
+                try:
+                    return json.loads(line[len(RESULT_PREFIX):])
+                except ValueError:
+                    raise MayaConversionError(f"无法识别转换进程的结果: {line}")
+            self.tail.append(line)
+
+    def _tail_text(self):
+        """工作进程最近的输出，附在错误信息后"""
+        return ("\n" + "\n".join(self.tail)) if self.tail else ""
+
+    def is_alive(self):
+        """检查工作进程是否仍在运行"""
+        return self.process.poll() is None
+
+    def close(self, timeout=10):
+        """
+        关闭输入让工作进程退出，超时后强制结束
+
+        Args:
+            timeout (float): 等待退出的最长时间（秒）
+        """
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        """强制结束工作进程"""
+        self.process.kill()
+        self.process.wait()
+
+
+class MayaConverter:
+    """Maya到FBX的转换队列类，使用常驻的mayapy进程池并行转换，并按内容缓存结果"""
+
+    def __init__(self, executable, cache_dir, script=None, max_workers=2, timeout=600, options=None):
+        """
+        初始化转换队列，工作进程在第一个需要转换的文件提交时才启动
+
+        Args:
+            executable (str): mayapy路径（测试时可以是任意Python解释器）
+            cache_dir (str): 转换结果的缓存目录
+            script (str, optional): 转换脚本路径，默认为maya_fbx_export.py
+            max_workers (int, optional): 最多同时运行的工作进程数
+            timeout (float, optional): 单个文件转换的最长时间（秒），包括工作进程启动的时间
+            options (dict, optional): 传给转换脚本的导出选项
+        """
+        self.executable = executable
+        self.cache_dir = cache_dir
+        self.script = script or DEFAULT_CONVERTER_SCRIPT
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.options = options or {}
+
+        self._jobs = queue.Queue()
+        self._futures = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self._settings_digest = None
+        self._closed = False
+
+    def submit(self, source_path):
+        """
+        提交一个文件，在后台转换
+
+        未修改的文件重复提交时返回同一个Future（上次转换失败或被取消时重新转换）。
+
+        Args:
+            source_path (str): .ma文件路径
+
+        Returns:
+            Future: 结果为ConversionResult，转换失败时抛出MayaConversionError
+
+        Raises:
+            OSError: 源文件不存在
+        """
+        source_path = os.path.abspath(source_path)
+        stat_result = os.stat(source_path)
+        key = (source_path, stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            if self._closed:
+                raise MayaConversionError("转换队列已关闭")
+            future = self._futures.get(key)
+            if future is not None and not (future.done() and (future.cancelled() or future.exception())):
+                return future
+
+            future = Future()
+            self._futures[key] = future
+            self._jobs.put((source_path, future))
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name=f"MayaConverter{len(self._threads)}")
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def convert(self, source_path):
+        """
+        转换一个文件并等待结果
+
+        Args:
+            source_path (str): .ma文件路径
+
+        Returns:
+            ConversionResult: 转换结果
+
+        Raises:
+            MayaConversionError: 转换失败
+        """
+        return self.submit(source_path).result()
+
+    def close(self):
+        """停止工作线程和工作进程，尚未开始的转换被取消"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+
+        while True:
+            try:
+                _, future = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+        for _ in threads:
+            self._jobs.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def cache_key(self, source_path):
+        """
+        计算文件的缓存键
+
+        Args:
+            source_path (str): .ma文件路径
+
+        Returns:
+            str: 十六进制的BLAKE2b哈希值
+        """
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        hasher.update(self._settings().encode("ascii"))
+        hasher.update(hash_file(source_path).encode("ascii"))
+        for path in _reference_paths(source_path):
+            digest = hash_file(path) if os.path.isfile(path) else "missing"
+            hasher.update(f"{path}:{digest}".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def cached_path(self, source_path):
+        """
+        获取文件在缓存中的FBX路径
+
+        Args:
+            source_path (str): .ma文件路径
+
+        Returns:
+            str: FBX路径（文件名与源文件相同），文件不一定存在
+        """
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(self.cache_dir, self.cache_key(source_path), stem + ".fbx")
+
+    def _settings(self):
+        """转换脚本内容、导出选项和转换逻辑版本的哈希，只计算一次"""
+        if self._settings_digest is None:
+            script_digest = hash_file(self.script) if os.path.isfile(self.script) else ""
+            settings = json.dumps([CONVERTER_VERSION, script_digest, self.options], sort_keys=True)
+            self._settings_digest = hashlib.blake2b(settings.encode("utf-8"), digest_size=DIGEST_SIZE).hexdigest()
+        return self._settings_digest
+
+    def _work(self):
+        """工作线程：依次处理队列中的文件，需要转换时才启动工作进程"""
+        process = None
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is _STOP:
+                    break
+                source_path, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result, process = self._convert(source_path, process)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            if process is not None:
+                process.close()
+
+    def _convert(self, source_path, process):
+        """
+        转换一个文件，缓存中已有结果时直接返回
+
+        Args:
+            source_path (str): .ma文件路径
+            process (_ConverterProcess): 本线程的工作进程，可以为None
+
+        Returns:
+            tuple: (ConversionResult, 本线程的工作进程)
+
+        Raises:
+            MayaConversionError: 转换失败
+            OSError: 无法读取源文件或写入缓存
+        """
+        fbx_path = self.cached_path(source_path)
+        if os.path.isfile(fbx_path):
+            return ConversionResult(source_path, fbx_path, True), process
+
+        if process is None or not process.is_alive():
+            if not self.executable:
+                raise MayaConversionError("未找到mayapy")
+            process = _ConverterProcess([self.executable, self.script])
+
+        # 先写入同一目录中的临时文件，完成后再改名，中断的转换不会留下不完整的缓存
+        directory = os.path.dirname(fbx_path)
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(suffix=".fbx", dir=directory)
+        os.close(handle)
+        try:
+            reply = process.convert(source_path, temp_path, self.options, self.timeout)
+            if not reply.get("ok"):
+                raise MayaConversionError(reply.get("error") or "转换失败")
+            if os.path.getsize(temp_path) == 0:
+                raise MayaConversionError("转换脚本没有输出FBX")
+            os.replace(temp_path, fbx_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return ConversionResult(source_path, fbx_path, False), process
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Maya转FBX脚本
+由MayaConverter以常驻的mayapy工作进程运行（mayapy maya_fbx_export.py），Maya只初始化一次，
+之后从标准输入逐行读取转换任务：打开.ma文件（加载所有引用），用fbxmaya插件把整个场景导出为FBX，
+并在标准输出中输出以RESULT_PREFIX开头的一行结果。协议见maya_converter模块。
+需要Maya 2022或更高版本（Python 3）。此脚本只在mayapy中运行，不会被编辑器导入。
+"""
+
+import sys
+import json
+
+# 结果行的前缀，与maya_converter.RESULT_PREFIX相同
+RESULT_PREFIX = "@@MAYA_FBX_RESULT "
+
+# 导出选项到FBX导出命令的映射
+EXPORT_FLAGS = {
+    "smoothing_groups": "FBXExportSmoothingGroups",
+    "smooth_mesh": "FBXExportSmoothMesh",
+    "tangents": "FBXExportTangents",
+    "triangulate": "FBXExportTriangulate",
+    "embed_textures": "FBXExportEmbeddedTextures",
+    "animation": "FBXExportBakeComplexAnimation",
+    "skins": "FBXExportSkins",
+    "shapes": "FBXExportShapes",
+    "input_connections": "FBXExportInputConnections"
+}
+
+# 默认的导出选项，任务中的options覆盖这些值
+DEFAULT_OPTIONS = {
+    "smoothing_groups": True,
+    "tangents": False,
+    "triangulate": False,
+    "embed_textures": False,
+    "animation": False,
+    "skins": True,
+    "shapes": True,
+    "input_connections": True,
+    "up_axis": "",
+    "fbx_version": ""
+}
+
+
+def reply(result):
+    """
+    输出一个任务的结果
+
+    Args:
+        result (dict): {"ok": True}或{"ok": False, "error": 原因}
+    """
+    sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+    sys.stdout.flush()
+
+
+def export_scene(cmds, mel, source_path, output_path, options):
+    """
+    打开场景并导出为FBX
+
+    Args:
+        cmds: maya.cmds模块
+        mel: maya.mel模块
+        source_path (str): .ma文件路径
+        output_path (str): 输出的FBX路径
+        options (dict): 导出选项
+    """
+    cmds.file(new=True, force=True)
+    cmds.file(source_path, open=True, force=True, prompt=False, ignoreVersion=True, loadReferenceDepth="all")
+
+    settings = dict(DEFAULT_OPTIONS)
+    settings.update(options)
+
+    mel.eval("FBXResetExport")
+    for name, command in EXPORT_FLAGS.items():
+        if name in settings:
+            mel.eval("{} -v {}".format(command, "true" if settings[name] else "false"))
+    if settings["up_axis"]:
+        mel.eval("FBXExportUpAxis {}".format(settings["up_axis"]))
+    if settings["fbx_version"]:
+        mel.eval("FBXExportFileVersion -v {}".format(settings["fbx_version"]))
+    mel.eval('FBXExport -f "{}"'.format(output_path.replace("\\", "/")))
+
+
+def main():
+    """初始化Maya并依次处理标准输入中的任务，空行或输入结束时退出"""
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    import maya.cmds as cmds
+    import maya.mel as mel
+    cmds.loadPlugin("fbxmaya", quiet=True)
+
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                break
+            try:
+                job = json.loads(line)
+                export_scene(cmds, mel, job["source"], job["output"], job.get("options") or {})
+            except Exception as e:
+                reply({"ok": False, "error": "{}: {}".format(type(e).__name__, e)})
+            else:
+                reply({"ok": True})
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Maya场景模块
+用于在不启动Maya的情况下读取Maya ASCII（.ma）文件中的纹理、着色组和引用的文件
+
+.ma文件是一系列MEL语句：createNode创建节点，setAttr设置当前节点的属性，
+connectAttr连接两个节点的属性，file -r引用其他场景。read_maya_scene逐行扫描文件，
+只拼接和解析需要的语句（节点、连接、纹理路径和引用），网格等节点的大段setAttr数据只扫描到语句结束，
+因此内存占用与文件大小无关。着色组（shadingEngine）按创建顺序对应为材质槽，
+从材质的属性沿连接向上游查找file等纹理节点（经过bump2d、layeredTexture等中间节点），
+得到与fbx_texture_links相同的MaterialSlotLinks，可以直接加入TextureLinkIndex。
+read_maya_scene_cached按(路径, 大小, 修改时间)缓存读取结果，扫描和MA转换共用，未变化的场景只读取一次。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from fbx_texture_links import TextureReference, MaterialSlotLinks, property_texture_type
+from scan_index import ParsedResultCache
+
+# 场景读取逻辑的版本号，读取结果的结构或规则变化时递增，使缓存的结果失效
+SCENE_VERSION = 1
+
+# Maya ASCII文件的文件头
+MAYA_ASCII_HEADER = "//Maya ASCII"
+
+# 纹理节点类型到记录文件路径的属性（短名称和长名称）
+TEXTURE_NODE_ATTRIBUTES = {
+    "file": ("ftn", "filetexturename"),
+    "psdFileTex": ("ftn", "filetexturename"),
+    "aiImage": ("filename",),
+    "RedshiftNormalMap": ("tex0",)
+}
+
+# Maya材质属性（小写，短名称和长名称）到纹理类型的映射，未列出的属性使用property_texture_type
+MAYA_ATTRIBUTE_TEXTURE_TYPES = {
+    "c": "diffuse",
+    "color": "diffuse",
+    "bc": "diffuse",
+    "base_color": "diffuse",
+    "n": "normal",
+    "normal_camera": "normal",
+    "sr": "roughness",
+    "specular_roughness": "roughness",
+    "m": "metallic",
+    "metalness": "metallic",
+    "sc": "specular",
+    "ic": "emissive",
+    "incandescence": "emissive",
+    "ec": "emissive",
+    "emission_color": "emissive"
+}
+
+# 从材质向上游查找纹理节点时最多经过的中间节点层数
+MAX_UPSTREAM_DEPTH = 8
+
+# 需要完整读取的语句
+_STATEMENT_KEYWORDS = ("createNode", "select", "setAttr", "connectAttr", "file", "requires")
+
+# 语句中的词：双引号字符串（可以包含转义字符）或不含空白和分号的词
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s;"]+)')
+
+# 字符串中的转义字符
+_ESCAPE = re.compile(r"\\(.)")
+
+# 字符串引号和转义字符，用于跟踪跨行的字符串
+_QUOTE = re.compile(r'\\.|"')
+
+# Windows盘符或以分隔符开头的绝对路径
+_ABSOLUTE_PATH = re.compile(r"^(?:[A-Za-z]:)?[\\/]")
+
+# 纹理节点：节点名称和记录的文件路径
+MayaFileTexture = namedtuple("MayaFileTexture", ["node", "file_name"])
+
+# 引用的场景：文件路径、命名空间和文件类型（例如mayaAscii、FBX）
+MayaReference = namedtuple("MayaReference", ["file_name", "namespace", "file_type"])
+
+# 场景内容：Maya版本、MayaFileTexture列表、MaterialSlotLinks列表、
+# 着色组的成员 {着色组名称: [成员, ...]} 和MayaReference列表
+MayaScene = namedtuple("MayaScene", ["version", "textures", "slots", "assignments", "references"])
+
+
+class MayaParseError(ValueError):
+    """文件不是有效的Maya ASCII文件"""
+
+
+def _unquote(text):
+    """去掉字符串中的转义字符"""
+    return _ESCAPE.sub(r"\1", text) if "\\" in text else text
+
+
+def _tokens(statement):
+    """
+    把语句拆分为词
+
+    Args:
+        statement (str): 语句文本
+
+    Returns:
+        list: [(词, 是否为字符串), ...]
+    """
+    return [
+        (_unquote(quoted), True) if word == "" else (word, False)
+        for quoted, word in _TOKEN.findall(statement)
+    ]
+
+
+def _split_plug(plug, current_node):
+    """
+    把属性路径拆分为节点和属性名称
+
+    Args:
+        plug (str): 属性路径，例如"file1.ftn"、".ftn"或"lambert1.c"
+        current_node (str): 以"."开头时使用的当前节点
+
+    Returns:
+        tuple: (节点名称, 小写属性名称)，属性名称不含数组下标和子属性
+    """
+    node, _, attribute = plug.partition(".")
+    if not node:
+        node = current_node
+    attribute = attribute.split(".", 1)[0].split("[", 1)[0].lower()
+    return _node_name(node), attribute
+
+
+def _node_name(name):
+    """去掉节点名称开头的"|"和":"（默认节点和DAG路径）"""
+    return name.lstrip("|:") if name else name
+
+
+def attribute_texture_type(attribute):
+    """
+    根据Maya材质属性名称确定纹理类型
+
+    Args:
+        attribute (str): 属性名称，例如c、normalCamera、baseColor
+
+    Returns:
+        str: 纹理类型，无法确定时返回None
+    """
+    attribute = attribute.lower()
+    return MAYA_ATTRIBUTE_TEXTURE_TYPES.get(attribute) or property_texture_type(attribute)
+
+
+def find_workspace_root(directory, max_levels=5):
+    """
+    查找Maya项目的根目录（包含workspace.mel的目录），场景中的相对纹理路径相对于项目根目录
+
+    Args:
+        directory (str): 场景文件所在的目录
+        max_levels (int): 最多向上查找的层数
+
+    Returns:
+        str: 项目根目录，没有找到时返回None
+    """
+    directory = os.path.abspath(directory)
+    for _ in range(max_levels + 1):
+        if os.path.isfile(os.path.join(directory, "workspace.mel")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return None
+
+
+class _MayaAsciiReader:
+    """逐条读取.ma语句并记录节点、连接、纹理路径和引用"""
+
+    def __init__(self):
+        """初始化读取状态"""
+        self.version = ""
+        self.node_types = {}
+        self.current_node = None
+        self.current_type = None
+        self.texture_paths = {}
+        self.shading_engines = []
+        self.connections = {}
+        self.references = {}
+
+    def read(self, lines):
+        """
+        读取所有语句
+
+        Args:
+            lines (iterable): 文件的各行文本
+        """
+        collecting = False
+        in_statement = False
+        in_string = False
+        parts = []
+        for line in lines:
+            # 跳过的语句中不含引号和分号的行（例如网格数据）不需要任何处理
+            if in_statement and not collecting and '"' not in line and ";" not in line:
+                continue
+            if not in_statement:
+                stripped = line.lstrip()
+                if not stripped or stripped.startswith("//"):
+                    continue
+                in_statement = True
+                collecting = self._wants(stripped)
+                parts = []
+            if collecting:
+                parts.append(line)
+            if '"' in line:
+                in_string = self._string_state(line, in_string)
+            if not in_string and line.rstrip().endswith(";"):
+                if collecting:
+                    self._handle(_tokens("".join(parts)))
+                in_statement = False
+                collecting = False
+
+    def _string_state(self, line, in_string):
+        """
+        跟踪一行结束时是否仍在字符串中
+
+        Args:
+            line (str): 一行文本
+            in_string (bool): 行开始时是否在字符串中
+
+        Returns:
+            bool: 行结束时是否在字符串中
+        """
+        for match in _QUOTE.finditer(line):
+            if match.group() == '"':
+                in_string = not in_string
+        return in_string
+
+    def _wants(self, line):
+        """
+        判断是否需要完整读取以line开头的语句
+
+        setAttr只在当前节点是纹理节点或语句直接设置纹理路径时读取，网格数据等大段setAttr只扫描到语句结束。
+
+        Args:
+            line (str): 语句的第一行（已去掉开头的空白）
+
+        Returns:
+            bool: 需要读取时为True
+        """
+        keyword = line.split(None, 1)[0]
+        if keyword == "setAttr":
+            return self.current_type in TEXTURE_NODE_ATTRIBUTES or "ftn" in line or "fileTextureName" in line
+        return keyword in _STATEMENT_KEYWORDS
+
+    def _handle(self, tokens):
+        """
+        处理一条语句
+
+        Args:
+            tokens (list): [(词, 是否为字符串), ...]
+        """
+        if not tokens:
+            return
+        keyword = tokens[0][0]
+        if keyword == "createNode":
+            self._create_node(tokens)
+        elif keyword == "select":
+            self._select(tokens)
+        elif keyword == "setAttr":
+            self._set_attr(tokens)
+        elif keyword == "connectAttr":
+            self._connect_attr(tokens)
+        elif keyword == "file":
+            self._file(tokens)
+        elif keyword == "requires" and len(tokens) >= 3 and tokens[1][0] == "maya":
+            self.version = tokens[2][0]
+
+    def _flag_value(self, tokens, *flags):
+        """获取命令参数的值，没有该参数时返回None"""
+        for i in range(1, len(tokens) - 1):
+            if not tokens[i][1] and tokens[i][0] in flags:
+                return tokens[i + 1][0]
+        return None
+
+    def _create_node(self, tokens):
+        """createNode 类型 -n "名称" [-p "父节点"]"""
+        if len(tokens) < 2:
+            return
+        node_type = tokens[1][0]
+        name = _node_name(self._flag_value(tokens, "-n", "-name"))
+        self.current_node, self.current_type = name, node_type
+        if not name:
+            return
+        self.node_types[name] = node_type
+        if node_type == "shadingEngine":
+            self.shading_engines.append(name)
+
+    def _select(self, tokens):
+        """select -ne ":节点"，之后的setAttr作用于该节点"""
+        names = [value for value, quoted in tokens[1:] if not value.startswith("-") or quoted]
+        if names:
+            self.current_node = _node_name(names[-1])
+            self.current_type = self.node_types.get(self.current_node)
+
+    def _set_attr(self, tokens):
+        """setAttr ".ftn" -type "string" "路径"，只记录纹理节点的文件路径"""
+        if len(tokens) < 3:
+            return
+        node, attribute = _split_plug(tokens[1][0], self.current_node)
+        node_type = self.node_types.get(node, self.current_type if node == self.current_node else None)
+        if attribute not in TEXTURE_NODE_ATTRIBUTES.get(node_type, ("ftn", "filetexturename")):
+            return
+
+        values = [value for value, quoted in tokens[2:] if quoted]
+        if values and values[-1] != "string":
+            self.texture_paths[node] = values[-1]
+
+    def _connect_attr(self, tokens):
+        """connectAttr "源节点.属性" "目标节点.属性"，按目标节点记录"""
+        plugs = [value for value, quoted in tokens[1:] if quoted]
+        if len(plugs) < 2:
+            return
+        source_node, source_attribute = _split_plug(plugs[0], self.current_node)
+        target_node, target_attribute = _split_plug(plugs[1], self.current_node)
+        # initialShadingGroup等默认着色组不在文件中创建，以连接到其dagSetMembers的节点识别
+        if (target_attribute in ("dsm", "dagsetmembers") and target_node not in self.node_types
+                and target_node not in self.shading_engines):
+            self.shading_engines.append(target_node)
+        self.connections.setdefault(target_node, []).append((target_attribute, source_node, source_attribute))
+
+    def _file(self, tokens):
+        """file -rdi/-r ... "路径"，同一文件的多条引用语句只记录一次"""
+        flags = {value for value, quoted in tokens[1:] if not quoted}
+        if not flags & {"-r", "-rdi", "-reference"}:
+            return
+        paths = [value for value, quoted in tokens[1:] if quoted]
+        if not paths:
+            return
+        path = paths[-1]
+        namespace = self._flag_value(tokens, "-ns", "-namespace") or ""
+        file_type = self._flag_value(tokens, "-typ", "-type") or ""
+        if path not in self.references or (namespace and not self.references[path].namespace):
+            self.references[path] = MayaReference(path, namespace, file_type)
+
+    def build(self, workspace_root=None):
+        """
+        根据读取的语句生成场景内容
+
+        Args:
+            workspace_root (str, optional): Maya项目根目录，用于解析相对纹理路径
+
+        Returns:
+            MayaScene: 场景内容
+        """
+        textures = [MayaFileTexture(node, path) for node, path in self.texture_paths.items()]
+
+        slots = []
+        assignments = {}
+        seen = set()
+        for engine in self.shading_engines:
+            incoming = self.connections.get(engine, [])
+            members = [source for attribute, source, _ in incoming if attribute in ("dsm", "dagsetmembers")]
+            assignments[engine] = members
+            if not members:
+                continue
+
+            material = next(
+                (source for attribute, source, _ in incoming if attribute in ("ss", "surfaceshader")), None
+            ) or next((source for attribute, source, _ in incoming if attribute in ("ais", "aisurfaceshader")), engine)
+            if material in seen:
+                continue
+            seen.add(material)
+            slots.append(MaterialSlotLinks(len(slots), material, self._material_textures(material, workspace_root)))
+
+        return MayaScene(self.version, textures, slots, assignments, list(self.references.values()))
+
+    def _material_textures(self, material, workspace_root):
+        """
+        从材质的各个属性向上游查找纹理节点
+
+        Args:
+            material (str): 材质节点名称
+            workspace_root (str): Maya项目根目录，可以为None
+
+        Returns:
+            list: TextureReference列表
+        """
+        references = []
+        seen = set()
+        for attribute, source, _ in self.connections.get(material, []):
+            texture_type = attribute_texture_type(attribute)
+            for node in self._upstream_textures(source):
+                if (attribute, node) in seen:
+                    continue
+                seen.add((attribute, node))
+                path = self.texture_paths[node]
+                if _ABSOLUTE_PATH.match(path):
+                    references.append(TextureReference(attribute, texture_type, path, ""))
+                elif workspace_root is not None:
+                    references.append(TextureReference(attribute, texture_type, os.path.join(workspace_root, path), path))
+                else:
+                    references.append(TextureReference(attribute, texture_type, "", path))
+        return references
+
+    def _upstream_textures(self, node):
+        """
+        查找节点本身或其上游的纹理节点
+
+        Args:
+            node (str): 节点名称
+
+        Returns:
+            list: 有文件路径的纹理节点名称，按连接顺序
+        """
+        found = []
+        visited = set()
+        pending = [(node, 0)]
+        while pending:
+            node, depth = pending.pop(0)
+            if node in visited:
+                continue
+            visited.add(node)
+            if node in self.texture_paths:
+                found.append(node)
+                continue
+            if depth < MAX_UPSTREAM_DEPTH:
+                pending.extend((source, depth + 1) for _, source, _ in self.connections.get(node, []))
+        return found
+
+
+def read_maya_scene(file_path):
+    """
+    读取Maya ASCII文件中的纹理节点、着色组和引用的文件，不启动Maya
+
+    相对纹理路径按场景所在的Maya项目（向上查找workspace.mel）解析，没有项目时相对场景所在的目录。
+
+    Args:
+        file_path (str): .ma文件路径
+
+    Returns:
+        MayaScene: 场景内容
+
+    Raises:
+        MayaParseError: 文件不是Maya ASCII文件
+        OSError: 无法读取文件
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        header = f.readline()
+        if not header.lstrip("\ufeff").startswith(MAYA_ASCII_HEADER):
+            raise MayaParseError("不是Maya ASCII文件")
+        reader = _MayaAsciiReader()
+        reader.read(f)
+    return reader.build(find_workspace_root(os.path.dirname(os.path.abspath(file_path))))
+
+
+# 扫描和MA转换共用的场景缓存
+_scene_cache = ParsedResultCache("maya_scenes", SCENE_VERSION)
+
+
+def get_scene_cache():
+    """
+    获取共用的场景缓存，FolderScanner用它在扫描索引中保存读取结果
+
+    Returns:
+        ParsedResultCache: 场景缓存
+    """
+    return _scene_cache
+
+
+def read_maya_scene_cached(file_path, signature=None):
+    """
+    读取Maya ASCII文件，文件的大小和修改时间未变化时直接返回上次的结果
+
+    Args:
+        file_path (str): .ma文件路径
+        signature (tuple, optional): 已知的(大小, 修改时间)，为None时重新stat
+
+    Returns:
+        MayaScene: 场景内容
+
+    Raises:
+        MayaParseError: 文件不是Maya ASCII文件
+        OSError: 无法读取文件
+    """
+    if signature is None:
+        stat_result = os.stat(file_path)
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+    return _scene_cache.get(file_path, signature, read_maya_scene)
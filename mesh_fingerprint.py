@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网格指纹模块
+用于根据FBX几何体的顶点、索引和UV计算指纹，识别不同FBX文件中相同的网格
+
+顶点坐标、UV和模型的局部变换按容差量化为整数后再计算BLAKE2哈希，导出时的浮点误差不影响结果；
+多边形索引、UV的映射方式和UV索引原样计入。名称（模型、材质、文件名）不计入指纹，
+因此套件中以不同名称重复导出的同一个道具得到相同的指纹。顶点顺序不同的网格视为不同的网格。
+安装了NumPy时量化以向量运算完成，没有NumPy时退回到纯Python实现，两者的结果相同。
+open_fbx得到的延迟数组分块解压后逐块计入哈希，计算指纹不需要整个数组同时在内存中。
+MeshFingerprintRegistry在SQLite中记录已导入网格的指纹和资产路径，用于导入时查找相同的网格。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import sys
+import math
+import sqlite3
+import hashlib
+from array import array
+
+from fbx_parser import properties70
+from mesh_stats import array_chunks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 指纹算法的版本，计入哈希，算法或容差变化时递增，使旧的指纹不再匹配
+FINGERPRINT_VERSION = 1
+
+# 顶点坐标和平移的量化容差（FBX文件单位，通常为厘米）
+POSITION_TOLERANCE = 1e-3
+
+# UV的量化容差，小于16K纹理的一个像素
+UV_TOLERANCE = 1e-5
+
+# 旋转（度）和缩放的量化容差
+TRANSFORM_TOLERANCE = 1e-4
+
+# 计入指纹的模型局部变换属性
+TRANSFORM_PROPERTIES = (
+    "Lcl Translation", "Lcl Rotation", "Lcl Scaling",
+    "GeometricTranslation", "GeometricRotation", "GeometricScaling"
+)
+
+# 指纹长度（字节）
+FINGERPRINT_SIZE = 16
+
+
+def _quantized_bytes(values, tolerance):
+    """
+    把浮点数组按容差量化为整数，返回小端int64字节串
+
+    非有限值（NaN、无穷大）按0处理。
+
+    Args:
+        values: array.array或list
+        tolerance (float): 量化容差
+
+    Returns:
+        bytes: 量化结果
+    """
+    if np is not None:
+        if isinstance(values, array):
+            data = np.frombuffer(values, dtype=values.typecode).astype(np.float64)
+        else:
+            data = np.asarray(values, dtype=np.float64)
+        data = np.nan_to_num(data, nan=0.0, posinf=0.0, neginf=0.0)
+        return np.rint(data / tolerance).astype("<i8").tobytes()
+
+    quantized = array("q", (round(value / tolerance) if math.isfinite(value) else 0 for value in values))
+    if sys.byteorder == "big":
+        quantized.byteswap()
+    return quantized.tobytes()
+
+
+def _integer_bytes(values):
+    """
+    把整数数组转为小端int64字节串
+
+    Args:
+        values: array.array或list
+
+    Returns:
+        bytes: 转换结果
+    """
+    if np is not None:
+        if isinstance(values, array):
+            return np.frombuffer(values, dtype=values.typecode).astype("<i8").tobytes()
+        return np.asarray(values, dtype=np.int64).astype("<i8").tobytes()
+
+    converted = array("q", (int(value) for value in values))
+    if sys.byteorder == "big":
+        converted.byteswap()
+    return converted.tobytes()
+
+
+def _update(hasher, tag, data):
+    """
+    把一段带标签和长度的数据计入哈希，避免不同字段的数据拼接后产生歧义
+
+    Args:
+        hasher: hashlib哈希对象
+        tag (str): 字段标签
+        data (bytes): 数据
+    """
+    hasher.update(f"{tag}:{len(data)}:".encode("utf-8"))
+    hasher.update(data)
+
+
+def _update_array(hasher, tag, node, name, convert):
+    """
+    分块把子节点中的数组计入哈希，结果与整个数组转换后调用_update相同
+
+    Args:
+        hasher: hashlib哈希对象
+        tag (str): 字段标签
+        node (FbxNode): 父节点
+        name (str): 子节点名称
+        convert (callable): 把一块数组转为每个元素8字节的字节串
+    """
+    length, chunks = array_chunks(node, name)
+    hasher.update(f"{tag}:{length * 8}:".encode("utf-8"))
+    for chunk in chunks:
+        hasher.update(convert(chunk))
+
+
+def geometry_fingerprint(geometry_node):
+    """
+    计算几何体的指纹
+
+    Args:
+        geometry_node (FbxNode): Geometry节点（FBX 6.x中为Model节点）
+
+    Returns:
+        str: 十六进制指纹
+    """
+    hasher = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    _update(hasher, f"v{FINGERPRINT_VERSION}", b"")
+    _update_array(hasher, "positions", geometry_node, "Vertices",
+                  lambda values: _quantized_bytes(values, POSITION_TOLERANCE))
+    _update_array(hasher, "indices", geometry_node, "PolygonVertexIndex", _integer_bytes)
+
+    for layer_element in geometry_node.find_all("LayerElementUV"):
+        mapping = (f"{layer_element.child_value('MappingInformationType', '')}/"
+                   f"{layer_element.child_value('ReferenceInformationType', '')}")
+        _update(hasher, "uv_mapping", mapping.encode("utf-8"))
+        _update_array(hasher, "uv", layer_element, "UV", lambda values: _quantized_bytes(values, UV_TOLERANCE))
+        _update_array(hasher, "uv_index", layer_element, "UVIndex", _integer_bytes)
+    return hasher.hexdigest()
+
+
+def model_fingerprint(model_node, geometry_nodes):
+    """
+    计算网格模型的指纹，包括局部变换和所有几何体
+
+    Args:
+        model_node (FbxNode): Model节点
+        geometry_nodes (list): 模型的Geometry节点
+
+    Returns:
+        str: 十六进制指纹，模型没有几何体时为None
+    """
+    if not geometry_nodes:
+        return None
+
+    hasher = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    properties = properties70(model_node)
+    for name in TRANSFORM_PROPERTIES:
+        values = [value for value in properties.get(name, []) if isinstance(value, (int, float))]
+        tolerance = POSITION_TOLERANCE if name.endswith("Translation") else TRANSFORM_TOLERANCE
+        _update(hasher, name, _quantized_bytes(values, tolerance))
+
+    for geometry_node in geometry_nodes:
+        _update(hasher, "geometry", geometry_fingerprint(geometry_node).encode("ascii"))
+    return hasher.hexdigest()
+
+
+def combine_fingerprints(fingerprints):
+    """
+    合并文件中各个网格模型的指纹，与模型的顺序无关
+
+    Args:
+        fingerprints (iterable): 十六进制指纹，None会被忽略
+
+    Returns:
+        str: 十六进制指纹，没有任何指纹时为None
+    """
+    fingerprints = sorted(fingerprint for fingerprint in fingerprints if fingerprint)
+    if not fingerprints:
+        return None
+
+    hasher = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    for fingerprint in fingerprints:
+        _update(hasher, "model", fingerprint.encode("ascii"))
+    return hasher.hexdigest()
+
+
+class MeshFingerprintRegistry:
+    """已导入网格的指纹登记类，基于SQLite"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path):
+        """
+        初始化指纹登记表
+
+        Args:
+            db_path (str): SQLite数据库文件路径
+        """
+        self.db_path = db_path
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """创建数据表，结构版本变化时清空旧数据"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        stored = dict(cursor.execute("SELECT key, value FROM meta").fetchall())
+        if stored.get("schema_version") != str(self.SCHEMA_VERSION):
+            cursor.execute("DROP TABLE IF EXISTS meshes")
+
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS meshes ("
+            "fingerprint TEXT NOT NULL, mesh_type TEXT NOT NULL, asset_path TEXT NOT NULL, source_path TEXT NOT NULL, "
+            "PRIMARY KEY (fingerprint, mesh_type))"
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            ("schema_version", str(self.SCHEMA_VERSION))
+        )
+        self.connection.commit()
+
+    def find(self, fingerprint, mesh_type):
+        """
+        查找指纹相同的已导入网格
+
+        Args:
+            fingerprint (str): 文件的几何体指纹
+            mesh_type (str): 网格类型，只匹配同类型的网格
+
+        Returns:
+            tuple: (资产路径, 源文件路径)，没有记录时返回None
+        """
+        row = self.connection.execute(
+            "SELECT asset_path, source_path FROM meshes WHERE fingerprint = ? AND mesh_type = ?",
+            (fingerprint, mesh_type)
+        ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def record(self, fingerprint, mesh_type, asset_path, source_path):
+        """
+        记录导入的网格，同一指纹只保留最近一次导入的资产
+
+        Args:
+            fingerprint (str): 文件的几何体指纹
+            mesh_type (str): 网格类型
+            asset_path (str): 导入的资产路径
+            source_path (str): 源FBX文件路径
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meshes (fingerprint, mesh_type, asset_path, source_path) VALUES (?, ?, ?, ?)",
+                (fingerprint, mesh_type, asset_path, source_path)
+            )
+
+    def forget(self, fingerprint, mesh_type):
+        """
+        删除记录，用于资产已被删除的情况
+
+        Args:
+            fingerprint (str): 文件的几何体指纹
+            mesh_type (str): 网格类型
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM meshes WHERE fingerprint = ? AND mesh_type = ?", (fingerprint, mesh_type)
+            )
+
+    def close(self):
+        """关闭数据库连接"""
+        self.connection.close()
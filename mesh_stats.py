@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网格统计模块
+用于根据FBX几何体的顶点和索引数组统计三角形数量、顶点数量、包围盒、UV通道数量和退化三角形数量
+
+安装了NumPy时，解析器得到的array.array通过np.frombuffer直接作为NumPy数组使用（不复制索引数据），
+多边形的扇形三角化和三角形面积都以分批的向量运算完成；没有NumPy时退回到纯Python实现，
+结果相同，但大网格会慢很多。包围盒是几何体局部坐标系中的范围，未应用节点变换和单位换算。
+open_fbx得到的延迟数组（FbxLazyArray）在统计时才解码：顶点坐标需要随机访问，整个解码；
+多边形索引分块解压，按多边形边界切分后逐块三角化，不需要整个索引数组同时在内存中。
+此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+from array import array
+from itertools import chain
+
+from fbx_parser import FbxLazyArray, ARRAY_CHUNK_ITEMS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 三角形两倍面积不超过包围盒对角线长度平方的该比例时视为退化三角形
+DEGENERATE_AREA_RATIO = 1e-12
+
+# 向量计算时每批处理的三角形数量，用于限制临时数组占用的内存
+TRIANGLE_BATCH_SIZE = 1 << 20
+
+
+def node_array(node, name):
+    """
+    读取子节点中的数组
+
+    FBX 7.x中数组是子节点的唯一属性；FBX 6.x的ASCII文件中数组的元素直接作为子节点的多个属性。
+
+    Args:
+        node (FbxNode): 父节点
+        name (str): 子节点名称
+
+    Returns:
+        数组（array.array或list），子节点不存在时为空列表；延迟数组在此时解码
+    """
+    child = node.find(name)
+    if child is None or not child.properties:
+        return []
+    if len(child.properties) == 1 and not isinstance(child.properties[0], (int, float, str, bytes)):
+        values = child.properties[0]
+        return values.decode() if isinstance(values, FbxLazyArray) else values
+    return [value for value in child.properties if isinstance(value, (int, float))]
+
+
+def array_chunks(node, name, chunk_items=ARRAY_CHUNK_ITEMS):
+    """
+    分块读取子节点中的数组，延迟数组边解压边返回，其余数组作为一块返回
+
+    Args:
+        node (FbxNode): 父节点
+        name (str): 子节点名称
+        chunk_items (int, optional): 延迟数组每块的元素数量
+
+    Returns:
+        tuple: (元素数量, 数据块迭代器)
+    """
+    child = node.find(name)
+    if child is not None and len(child.properties) == 1 and isinstance(child.properties[0], FbxLazyArray):
+        values = child.properties[0]
+        return len(values), values.chunks(chunk_items)
+
+    values = node_array(node, name)
+    return len(values), iter([values] if len(values) else [])
+
+
+def empty_stats():
+    """
+    获取空的网格统计
+
+    Returns:
+        dict: 各项均为零的网格统计
+    """
+    return {
+        "triangles": 0,
+        "vertices": 0,
+        "degenerate_triangles": 0,
+        "uv_channels": 0,
+        "bounds": None
+    }
+
+
+def geometry_stats(geometry_node):
+    """
+    统计几何体的网格信息
+
+    n边形按扇形三角化为n-2个三角形。索引超出顶点范围的三角形计为退化三角形。
+
+    Args:
+        geometry_node (FbxNode): Geometry节点（FBX 6.x中为Model节点）
+
+    Returns:
+        dict: 网格统计，包含triangles、vertices、degenerate_triangles、uv_channels和bounds
+    """
+    stats = empty_stats()
+    stats["uv_channels"] = len(geometry_node.find_all("LayerElementUV"))
+
+    _, index_chunks = array_chunks(geometry_node, "PolygonVertexIndex")
+    vertices = node_array(geometry_node, "Vertices")
+    if np is not None:
+        stats.update(_numpy_stats(index_chunks, vertices))
+    else:
+        stats.update(_python_stats(index_chunks, vertices))
+    return stats
+
+
+def merge_stats(stats_list):
+    """
+    合并多个几何体的网格统计
+
+    Args:
+        stats_list (iterable): 网格统计列表
+
+    Returns:
+        dict: 合并后的网格统计，UV通道数量取最大值，包围盒取并集
+    """
+    merged = empty_stats()
+    for stats in stats_list:
+        merged["triangles"] += stats["triangles"]
+        merged["vertices"] += stats["vertices"]
+        merged["degenerate_triangles"] += stats["degenerate_triangles"]
+        merged["uv_channels"] = max(merged["uv_channels"], stats["uv_channels"])
+
+        bounds = stats["bounds"]
+        if bounds is None:
+            continue
+        if merged["bounds"] is None:
+            merged["bounds"] = {"min": list(bounds["min"]), "max": list(bounds["max"])}
+        else:
+            merged["bounds"] = {
+                "min": [min(a, b) for a, b in zip(merged["bounds"]["min"], bounds["min"])],
+                "max": [max(a, b) for a, b in zip(merged["bounds"]["max"], bounds["max"])]
+            }
+    return merged
+
+
+def _degenerate_threshold(bounds):
+    """
+    根据包围盒计算退化三角形的两倍面积阈值
+
+    Args:
+        bounds (dict): 包围盒
+
+    Returns:
+        float: 两倍面积阈值
+    """
+    if bounds is None:
+        return 0.0
+    diagonal_squared = sum((high - low) ** 2 for low, high in zip(bounds["min"], bounds["max"]))
+    return DEGENERATE_AREA_RATIO * diagonal_squared
+
+
+def _as_numpy(values, dtype):
+    """
+    把解析得到的数组转为NumPy数组，array.array不复制数据
+
+    Args:
+        values: array.array或list
+        dtype: 目标类型
+
+    Returns:
+        numpy.ndarray: 一维数组
+    """
+    if isinstance(values, array):
+        return np.frombuffer(values, dtype=values.typecode).astype(dtype, copy=False)
+    return np.asarray(values, dtype=dtype)
+
+
+def _polygon_chunks(index_chunks):
+    """
+    把索引数据块按多边形边界重新切分
+
+    除最后一块外，每块都以多边形的最后一个顶点（负数索引）结束；跨块的多边形并入下一块。
+
+    Args:
+        index_chunks (iterable): PolygonVertexIndex的数据块
+
+    Yields:
+        numpy.ndarray: int64索引数组
+    """
+    carry = None
+    for chunk in index_chunks:
+        values = _as_numpy(chunk, np.int64)
+        if carry is not None and len(carry):
+            values = np.concatenate((carry, values))
+
+        ends = np.flatnonzero(values < 0)
+        if not len(ends):
+            carry = values
+            continue
+
+        cut = int(ends[-1]) + 1
+        yield values[:cut]
+        carry = values[cut:]
+
+    # 最后一个多边形缺少结束标记
+    if carry is not None and len(carry):
+        yield carry
+
+
+def _numpy_stats(index_chunks, vertices):
+    """
+    使用NumPy统计网格信息
+
+    Args:
+        index_chunks (iterable): PolygonVertexIndex的数据块
+        vertices: Vertices数组
+
+    Returns:
+        dict: triangles、vertices、degenerate_triangles和bounds
+    """
+    positions = _as_numpy(vertices, np.float64)
+    positions = positions[:len(positions) - len(positions) % 3].reshape(-1, 3)
+    vertex_count = len(positions)
+
+    # 按坐标轴拆成三个连续数组，按索引取值时比按行取值快得多
+    columns = positions.T.copy()
+    bounds = None
+    if vertex_count:
+        bounds = {"min": columns.min(axis=1).tolist(), "max": columns.max(axis=1).tolist()}
+
+    threshold = _degenerate_threshold(bounds)
+    triangles = 0
+    degenerate = 0
+    for index_array in _polygon_chunks(index_chunks):
+        # 负数索引标记多边形的最后一个顶点，实际索引为其按位取反；最后一个多边形缺少结束标记时视为已结束
+        is_end = index_array < 0
+        corners = np.where(is_end, ~index_array, index_array)
+        is_end[-1] = True
+
+        for a, b, c in _fan_triangles(corners, is_end):
+            triangles += len(a)
+            degenerate += _count_degenerate(columns, a, b, c, threshold * threshold)
+
+    return {
+        "triangles": triangles,
+        "vertices": vertex_count,
+        "degenerate_triangles": degenerate,
+        "bounds": bounds
+    }
+
+
+def _fan_triangles(corners, is_end):
+    """
+    对多边形做扇形三角化，分批生成三角形的顶点索引
+
+    所有多边形边数相同时（全部为三角形或四边形的常见情况）直接把索引重排为二维数组，
+    否则为每个位置求出所在多边形的首顶点。
+
+    Args:
+        corners (numpy.ndarray): 多边形顶点索引（已还原结束标记）
+        is_end (numpy.ndarray): 每个位置是否为多边形的最后一个顶点
+
+    Yields:
+        tuple: (首顶点索引, 第二个顶点索引, 第三个顶点索引)，每项为一维数组
+    """
+    polygon_count = int(np.count_nonzero(is_end))
+    sides = len(corners) // polygon_count
+    if sides * polygon_count == len(corners) and is_end[sides - 1::sides].all():
+        grid = corners.reshape(polygon_count, sides)
+        for start in range(0, polygon_count, TRIANGLE_BATCH_SIZE):
+            rows = grid[start:start + TRIANGLE_BATCH_SIZE]
+            first = np.ascontiguousarray(rows[:, 0])
+            for corner in range(1, sides - 1):
+                yield first, np.ascontiguousarray(rows[:, corner]), np.ascontiguousarray(rows[:, corner + 1])
+        return
+
+    # 多边形中除首尾外的每个位置p对应三角形(首顶点, p, p + 1)
+    is_start = np.empty_like(is_end)
+    is_start[0] = True
+    is_start[1:] = is_end[:-1]
+    polygon_start = np.maximum.accumulate(np.where(is_start, np.arange(len(corners)), 0))
+    triangle_positions = np.flatnonzero(~is_start & ~is_end)
+    for start in range(0, len(triangle_positions), TRIANGLE_BATCH_SIZE):
+        batch = triangle_positions[start:start + TRIANGLE_BATCH_SIZE]
+        yield corners[polygon_start[batch]], corners[batch], corners[batch + 1]
+
+
+def _count_degenerate(columns, a, b, c, threshold_squared):
+    """
+    统计一批三角形中的退化三角形
+
+    Args:
+        columns (numpy.ndarray): 形状为(3, 顶点数量)的顶点坐标
+        a, b, c (numpy.ndarray): 三角形的顶点索引
+        threshold_squared (float): 两倍面积阈值的平方
+
+    Returns:
+        int: 退化三角形数量，包括索引超出顶点范围的三角形
+    """
+    vertex_count = columns.shape[1]
+    invalid = 0
+    valid = (a < vertex_count) & (b < vertex_count) & (c < vertex_count)
+    if not valid.all():
+        invalid = len(a) - int(np.count_nonzero(valid))
+        a, b, c = a[valid], b[valid], c[valid]
+
+    x, y, z = columns
+    ax, ay, az = x[a], y[a], z[a]
+    ux, uy, uz = x[b] - ax, y[b] - ay, z[b] - az
+    vx, vy, vz = x[c] - ax, y[c] - ay, z[c] - az
+
+    # 叉积的平方长度，原地计算以减少临时数组
+    cross_x = uy * vz
+    cross_x -= uz * vy
+    cross_y = uz * vx
+    cross_y -= ux * vz
+    cross_z = ux * vy
+    cross_z -= uy * vx
+    cross_x *= cross_x
+    cross_y *= cross_y
+    cross_z *= cross_z
+    cross_x += cross_y
+    cross_x += cross_z
+    return invalid + int(np.count_nonzero(cross_x <= threshold_squared))
+
+
+def _python_stats(index_chunks, vertices):
+    """
+    不使用NumPy统计网格信息
+
+    Args:
+        index_chunks (iterable): PolygonVertexIndex的数据块
+        vertices: Vertices数组
+
+    Returns:
+        dict: triangles、vertices、degenerate_triangles和bounds
+    """
+    vertex_count = len(vertices) // 3
+    bounds = None
+    if vertex_count:
+        axes = [vertices[axis:vertex_count * 3:3] for axis in range(3)]
+        bounds = {"min": [float(min(values)) for values in axes], "max": [float(max(values)) for values in axes]}
+
+    threshold = _degenerate_threshold(bounds)
+    threshold_squared = threshold * threshold
+
+    def is_degenerate(a, b, c):
+        if a >= vertex_count or b >= vertex_count or c >= vertex_count:
+            return True
+        ax, ay, az = vertices[a * 3], vertices[a * 3 + 1], vertices[a * 3 + 2]
+        ux, uy, uz = vertices[b * 3] - ax, vertices[b * 3 + 1] - ay, vertices[b * 3 + 2] - az
+        vx, vy, vz = vertices[c * 3] - ax, vertices[c * 3 + 1] - ay, vertices[c * 3 + 2] - az
+        cx, cy, cz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+        return cx * cx + cy * cy + cz * cz <= threshold_squared
+
+    def fan_degenerate(polygon):
+        first = polygon[0]
+        return sum(
+            1 for corner in range(1, len(polygon) - 1) if is_degenerate(first, polygon[corner], polygon[corner + 1])
+        )
+
+    triangles = 0
+    degenerate = 0
+    polygon = []
+    for index in chain.from_iterable(index_chunks):
+        if index >= 0:
+            polygon.append(index)
+            continue
+        polygon.append(~index)
+        triangles += max(0, len(polygon) - 2)
+        degenerate += fan_degenerate(polygon)
+        polygon = []
+
+    # 最后一个多边形缺少结束标记时视为已结束
+    if polygon:
+        triangles += max(0, len(polygon) - 2)
+        degenerate += fan_degenerate(polygon)
+
+    return {
+        "triangles": triangles,
+        "vertices": vertex_count,
+        "degenerate_triangles": degenerate,
+        "bounds": bounds
+    }
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Interchange管道缓存模块
+用于在整个编辑器会话中复用配置好的Interchange导入管道
+
+导入每个文件时不再删除临时目录、复制默认管道、配置、导入后再删除，而是先把配置方法作用于PipelineSettings，
+记录要设置的属性；默认管道路径和这些属性的指纹相同的导入共用同一个管道资产，
+管道的创建次数只与不同配置的数量有关，与文件数量无关。
+管道默认创建在临时目录中，只在本次会话中复用；启用persistent时保存为项目中的资产，之后的会话直接使用。
+"""
+
+import hashlib
+import threading
+import unreal
+
+# 临时管道所在的目录，会话中第一次使用时清空上次会话留下的管道
+TRANSIENT_PIPELINE_PATH = "/Interchange/Pipelines/Transient/AssetImporter"
+
+# 管道指纹的长度（字节），附加在管道资产名称后
+FINGERPRINT_SIZE = 8
+
+# 管道缓存的版本号，记录和应用设置的方式变化时递增，使持久化的管道失效
+PIPELINE_CACHE_VERSION = 1
+
+# 引擎版本，第一次计算指纹时读取
+_engine_version = None
+
+
+def _get_engine_version():
+    """
+    获取引擎版本，升级引擎后默认管道可能变化，持久化的管道随之失效
+
+    Returns:
+        str: 引擎版本
+    """
+    global _engine_version
+    if _engine_version is None:
+        _engine_version = str(unreal.SystemLibrary.get_engine_version())
+    return _engine_version
+
+
+def _value_key(value):
+    """
+    把属性值转为稳定的文本，用于计算指纹
+
+    结构体使用export_text，枚举使用名称，不使用可能包含对象地址的repr。
+
+    Args:
+        value: 属性值
+
+    Returns:
+        str: 文本
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    export_text = getattr(value, "export_text", None)
+    if callable(export_text):
+        return f"{type(value).__name__}({export_text()})"
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        return f"{type(value).__name__}.{name}"
+    return repr(value)
+
+
+class PipelineSettings:
+    """
+    管道设置记录类
+
+    代替管道对象传给_configure_*方法，记录对子对象属性的赋值和set_editor_property调用，
+    之后可以计算指纹，或按相同的顺序应用到真实的管道。
+    """
+
+    def __init__(self, path=(), operations=None):
+        """
+        初始化设置记录
+
+        Args:
+            path (tuple): 子对象的属性路径，例如("mesh_pipeline",)
+            operations (list, optional): 与父对象共用的操作列表
+        """
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_operations", operations if operations is not None else [])
+
+    def __getattr__(self, name):
+        """访问子对象，例如pipeline.texture_pipeline"""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return PipelineSettings(self._path + (name,), self._operations)
+
+    def __setattr__(self, name, value):
+        """记录属性赋值"""
+        self._operations.append((self._path, name, value, False))
+
+    def set_editor_property(self, name, value):
+        """记录set_editor_property调用"""
+        self._operations.append((self._path, name, value, True))
+
+    def fingerprint(self, template_path):
+        """
+        计算管道的指纹
+
+        指纹包括缓存版本、引擎版本、默认管道路径和记录的全部设置。
+
+        Args:
+            template_path (str): 复制的默认管道路径
+
+        Returns:
+            str: 十六进制指纹
+        """
+        hasher = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+        hasher.update(f"{PIPELINE_CACHE_VERSION}:{_get_engine_version()}:{template_path}".encode("utf-8"))
+        for path, name, value, editor_property in self._operations:
+            hasher.update(f"\n{'.'.join(path + (name,))}={_value_key(value)}:{int(editor_property)}".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def apply(self, pipeline):
+        """
+        把记录的设置应用到管道
+
+        Args:
+            pipeline: 管道对象
+        """
+        for path, name, value, editor_property in self._operations:
+            target = pipeline
+            for attribute in path:
+                target = getattr(target, attribute)
+            try:
+                if editor_property:
+                    target.set_editor_property(name, value)
+                else:
+                    setattr(target, name, value)
+            except Exception as e:
+                unreal.log_warning(f"当前引擎版本的管道不支持设置 {'.'.join(path + (name,))}，将使用默认值: {e}")
+
+
+class InterchangePipelineCache:
+    """Interchange管道缓存类，按默认管道和设置的指纹复用管道资产"""
+
+    def __init__(self, persistent=False, persistent_path="/Game/ImportPipelines"):
+        """
+        初始化管道缓存
+
+        Args:
+            persistent (bool, optional): 是否把管道保存为项目中的资产，供之后的会话使用
+            persistent_path (str, optional): 保存管道资产的目录
+        """
+        self.persistent = persistent
+        self.pipeline_path = persistent_path.rstrip("/") if persistent else TRANSIENT_PIPELINE_PATH
+        self.editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
+
+        # 本次会话中可以使用的管道 {指纹: 管道对象路径}
+        self._pipelines = {}
+        self._lock = threading.Lock()
+
+        # 本次会话创建的管道数量
+        self.created_count = 0
+
+        # 上次会话留下的临时管道的配置可能已经过时（默认管道可能被修改），不复用
+        if not self.persistent:
+            self.editor_asset_subsystem.delete_directory(self.pipeline_path)
+
+    def get(self, template_path, settings):
+        """
+        获取配置好的管道，没有相同配置的管道时复制默认管道并应用设置
+
+        Args:
+            template_path (str): 默认管道路径，例如/Interchange/Pipelines/DefaultAssetsPipeline
+            settings (PipelineSettings): 记录的管道设置
+
+        Returns:
+            str: 管道的对象路径，可用于ImportAssetParameters.override_pipelines
+        """
+        fingerprint = settings.fingerprint(template_path)
+        with self._lock:
+            object_path = self._pipelines.get(fingerprint)
+            if object_path is not None and unreal.EditorAssetLibrary.does_asset_exist(object_path):
+                return object_path
+
+            asset_name = f"{template_path.rsplit('/', 1)[-1]}_{fingerprint}"
+            asset_path = f"{self.pipeline_path}/{asset_name}"
+            object_path = f"{asset_path}.{asset_name}"
+
+            # 名称包含指纹，之前会话保存的同名管道配置相同，直接使用
+            if not (self.persistent and unreal.EditorAssetLibrary.does_asset_exist(asset_path)):
+                self._create(template_path, asset_path, settings)
+
+            self._pipelines[fingerprint] = object_path
+            return object_path
+
+    def _create(self, template_path, asset_path, settings):
+        """
+        复制默认管道并应用设置
+
+        Args:
+            template_path (str): 默认管道路径
+            asset_path (str): 新管道的资产路径
+            settings (PipelineSettings): 记录的管道设置
+        """
+        if unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+            unreal.EditorAssetLibrary.delete_asset(asset_path)
+
+        pipeline = self.editor_asset_subsystem.duplicate_asset(template_path, asset_path)
+        settings.apply(pipeline)
+        if self.persistent:
+            unreal.EditorAssetLibrary.save_asset(asset_path, only_if_is_dirty=False)
+        self.created_count += 1
+
+    def clear(self):
+        """删除本次会话创建的临时管道，持久化的管道保留"""
+        with self._lock:
+            self._pipelines.clear()
+            if not self.persistent:
+                self.editor_asset_subsystem.delete_directory(self.pipeline_path)
+
+
+# 按配置共享的管道缓存，纹理、模型和材质处理器在同一个会话中共用
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_pipeline_cache(config):
+    """
+    获取共享的管道缓存
+
+    Args:
+        config (dict): 配置字典，使用interchange_pipelines部分
+
+    Returns:
+        InterchangePipelineCache: 管道缓存
+    """
+    pipeline_config = config.get("interchange_pipelines", {})
+    persistent = pipeline_config.get("persistent", False)
+    persistent_path = pipeline_config.get("persistent_path", "/Game/ImportPipelines")
+    key = (persistent, persistent_path if persistent else None)
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = InterchangePipelineCache(persistent, persistent_path)
+            _shared_caches[key] = cache
+        return cache
@@ -0,0 +1,498 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描索引模块
+用于持久化保存文件夹扫描结果，实现增量扫描
+
+此模块使用SQLite记录每个目录的修改时间以及每个文件的大小、修改时间和分类结果。
+再次扫描时，修改时间未变化的目录不再列举，直接复用上次的结果，
+并报告新增、删除和修改的文件。索引同时缓存文件的内容哈希和解析结果（例如FBX材质引用的纹理），
+这些缓存与分类规则无关，分类规则变化时不会清空。此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from collections import namedtuple
+
+from directory_walker import DirectoryWalker
+from content_hasher import HashRecord
+
+# 索引条目：文件名、完整路径、大小、修改时间（纳秒）、缓存的资产类型和基础名称
+# 未命中缓存（新增或修改）的文件asset_type和base_name为None
+IndexedEntry = namedtuple("IndexedEntry", ["name", "path", "size", "mtime_ns", "asset_type", "base_name"])
+
+# 目录记录：修改时间（纳秒）和子目录路径列表
+DirectoryRecord = namedtuple("DirectoryRecord", ["mtime_ns", "subdirectories"])
+
+# 文件记录：大小、修改时间（纳秒）、资产类型和基础名称
+# 被扫描规则排除、未经分类的文件资产类型和基础名称为空字符串
+FileRecord = namedtuple("FileRecord", ["size", "mtime_ns", "asset_type", "base_name"])
+
+# 解析结果记录：文件大小、修改时间（纳秒）和解析结果
+ParsedRecord = namedtuple("ParsedRecord", ["size", "mtime_ns", "result"])
+
+# 路径列表的分隔符，NUL不会出现在合法路径中
+_PATH_SEPARATOR = "\0"
+
+
+class ScanSnapshot:
+    """扫描索引在内存中的快照，供遍历线程只读访问"""
+
+    def __init__(self, directories=None, files=None):
+        """
+        初始化快照
+
+        Args:
+            directories (dict, optional): {目录路径: DirectoryRecord}
+            files (dict, optional): {目录路径: {文件名: FileRecord}}
+        """
+        self.directories = directories or {}
+        self.files = files or {}
+
+
+class ScanIndex:
+    """持久化扫描索引类，基于SQLite"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, classifier_key=""):
+        """
+        初始化扫描索引
+
+        Args:
+            db_path (str): SQLite数据库文件路径
+            classifier_key (str, optional): 分类规则的标识，规则变化时缓存的分类结果失效
+        """
+        self.db_path = db_path
+        self.classifier_key = classifier_key
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """创建数据表；结构版本或分类规则变化时清空旧数据"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        stored = dict(cursor.execute("SELECT key, value FROM meta").fetchall())
+        if (stored.get("schema_version") != str(self.SCHEMA_VERSION)
+                or stored.get("classifier_key") != self.classifier_key):
+            cursor.execute("DROP TABLE IF EXISTS directories")
+            cursor.execute("DROP TABLE IF EXISTS files")
+
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS directories ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, subdirectories TEXT NOT NULL)"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "directory TEXT NOT NULL, name TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "asset_type TEXT NOT NULL, base_name TEXT NOT NULL, PRIMARY KEY (directory, name))"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS content_hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS parsed_results ("
+            "kind TEXT NOT NULL, path TEXT NOT NULL, version TEXT NOT NULL, size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, result BLOB NOT NULL, PRIMARY KEY (kind, path))"
+        )
+        cursor.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [("schema_version", str(self.SCHEMA_VERSION)), ("classifier_key", self.classifier_key)]
+        )
+        self.connection.commit()
+
+    def load_snapshot(self):
+        """
+        将索引内容读入内存
+
+        Returns:
+            ScanSnapshot: 索引快照
+        """
+        directories = {}
+        for path, mtime_ns, subdirectories in self.connection.execute(
+                "SELECT path, mtime_ns, subdirectories FROM directories"):
+            directories[path] = DirectoryRecord(
+                mtime_ns, subdirectories.split(_PATH_SEPARATOR) if subdirectories else []
+            )
+
+        files = {}
+        for directory, name, size, mtime_ns, asset_type, base_name in self.connection.execute(
+                "SELECT directory, name, size, mtime_ns, asset_type, base_name FROM files"):
+            files.setdefault(directory, {})[name] = FileRecord(size, mtime_ns, asset_type, base_name)
+
+        return ScanSnapshot(directories, files)
+
+    def apply_scan(self, listed_directories, listed_files, removed_directories):
+        """
+        将一次扫描的结果写回索引
+
+        Args:
+            listed_directories (dict): 本次重新列举的目录 {目录路径: DirectoryRecord}
+            listed_files (dict): 重新列举目录中的文件 {目录路径: {文件名: FileRecord}}
+            removed_directories (iterable): 已不存在的目录路径
+        """
+        with self.connection:
+            for directory in removed_directories:
+                self.connection.execute("DELETE FROM directories WHERE path = ?", (directory,))
+                self.connection.execute("DELETE FROM files WHERE directory = ?", (directory,))
+
+            for directory, record in listed_directories.items():
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO directories (path, mtime_ns, subdirectories) VALUES (?, ?, ?)",
+                    (directory, record.mtime_ns, _PATH_SEPARATOR.join(record.subdirectories))
+                )
+                self.connection.execute("DELETE FROM files WHERE directory = ?", (directory,))
+                self.connection.executemany(
+                    "INSERT INTO files (directory, name, size, mtime_ns, asset_type, base_name) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (directory, name, file_record.size, file_record.mtime_ns,
+                         file_record.asset_type, file_record.base_name)
+                        for name, file_record in listed_files.get(directory, {}).items()
+                    ]
+                )
+
+    def load_content_hashes(self):
+        """
+        读取缓存的内容哈希
+
+        Returns:
+            dict: {文件路径: HashRecord}
+        """
+        return {
+            path: HashRecord(size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in self.connection.execute(
+                "SELECT path, size, mtime_ns, digest FROM content_hashes")
+        }
+
+    def store_content_hashes(self, records, removed_paths=()):
+        """
+        写入新计算的内容哈希，并删除已不存在的文件的哈希
+
+        Args:
+            records (dict): {文件路径: HashRecord}
+            removed_paths (iterable, optional): 已删除的文件路径
+        """
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM content_hashes WHERE path = ?", [(path,) for path in removed_paths]
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO content_hashes (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                [(path, record.size, record.mtime_ns, record.digest) for path, record in records.items()]
+            )
+
+    def load_parsed_results(self, kind, version):
+        """
+        读取缓存的解析结果，并删除其他版本的结果
+
+        Args:
+            kind (str): 解析结果的种类，例如fbx_texture_links
+            version (str): 解析逻辑的版本
+
+        Returns:
+            dict: {文件路径: ParsedRecord}
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM parsed_results WHERE kind = ? AND version != ?", (kind, str(version))
+            )
+        records = {}
+        for path, size, mtime_ns, result in self.connection.execute(
+                "SELECT path, size, mtime_ns, result FROM parsed_results WHERE kind = ?", (kind,)):
+            try:
+                records[path] = ParsedRecord(size, mtime_ns, pickle.loads(result))
+            except Exception:
+                # 无法还原的结果视为未缓存，重新解析
+                continue
+        return records
+
+    def store_parsed_results(self, kind, version, records, removed_paths=()):
+        """
+        写入新的解析结果，并删除已不存在的文件的结果
+
+        Args:
+            kind (str): 解析结果的种类
+            version (str): 解析逻辑的版本
+            records (dict): {文件路径: ParsedRecord}
+            removed_paths (iterable, optional): 已删除的文件路径
+        """
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM parsed_results WHERE kind = ? AND path = ?", [(kind, path) for path in removed_paths]
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO parsed_results (kind, path, version, size, mtime_ns, result) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, path, str(version), record.size, record.mtime_ns,
+                  pickle.dumps(record.result, protocol=pickle.HIGHEST_PROTOCOL))
+                 for path, record in records.items()]
+            )
+
+    def close(self):
+        """关闭数据库连接"""
+        self.connection.close()
+
+
+class ParsedResultCache:
+    """
+    文件解析结果缓存类
+
+    按(路径, 大小, 修改时间)在内存中保存解析结果，文件未变化时直接复用，不再读取文件。
+    同一个缓存在多次扫描之间保留；启用扫描索引时还可以从索引载入，并把新的结果写回索引。
+    可以在多个线程中同时使用，解析在锁之外进行。
+    """
+
+    def __init__(self, kind, version):
+        """
+        初始化解析结果缓存
+
+        Args:
+            kind (str): 解析结果的种类，用作索引中的键
+            version (str): 解析逻辑的版本，版本变化时索引中的旧结果失效
+        """
+        self.kind = kind
+        self.version = str(version)
+        self.records = {}
+        # 尚未写回索引的结果 {文件路径: ParsedRecord}
+        self.updated = {}
+        # 已从中载入结果的索引路径
+        self.loaded_indexes = set()
+        self._lock = threading.Lock()
+
+    def get(self, file_path, signature, parse):
+        """
+        获取文件的解析结果，文件大小或修改时间变化时重新解析
+
+        Args:
+            file_path (str): 文件路径
+            signature (tuple): 文件当前的(大小, 修改时间)
+            parse (callable): 解析函数，参数为文件路径；抛出的异常原样传出，不缓存
+
+        Returns:
+            object: 解析结果
+        """
+        record = self.lookup(file_path, signature)
+        if record is not None:
+            return record.result
+
+        result = parse(file_path)
+        self.put(file_path, signature, result)
+        return result
+
+    def lookup(self, file_path, signature):
+        """
+        查找仍然有效的解析结果
+
+        Args:
+            file_path (str): 文件路径
+            signature (tuple): 文件当前的(大小, 修改时间)
+
+        Returns:
+            ParsedRecord: 缓存的记录，没有或已失效时返回None
+        """
+        with self._lock:
+            record = self.records.get(file_path)
+        if record is not None and (record.size, record.mtime_ns) == tuple(signature):
+            return record
+        return None
+
+    def put(self, file_path, signature, result):
+        """
+        记录文件的解析结果
+
+        Args:
+            file_path (str): 文件路径
+            signature (tuple): 文件的(大小, 修改时间)
+            result (object): 解析结果
+        """
+        record = ParsedRecord(signature[0], signature[1], result)
+        with self._lock:
+            self.records[file_path] = record
+            self.updated[file_path] = record
+
+    def load(self, index):
+        """
+        从扫描索引载入解析结果，每个索引只载入一次
+
+        Args:
+            index (ScanIndex): 扫描索引
+        """
+        if index.db_path in self.loaded_indexes:
+            return
+        self.loaded_indexes.add(index.db_path)
+        records = index.load_parsed_results(self.kind, self.version)
+        with self._lock:
+            for path, record in records.items():
+                self.records.setdefault(path, record)
+
+    def save(self, index, removed_paths=()):
+        """
+        把新的解析结果写回扫描索引
+
+        Args:
+            index (ScanIndex): 扫描索引
+            removed_paths (iterable, optional): 已删除的文件路径
+        """
+        removed_paths = list(removed_paths)
+        with self._lock:
+            for path in removed_paths:
+                self.records.pop(path, None)
+            updated, self.updated = self.updated, {}
+        if updated or removed_paths:
+            index.store_parsed_results(self.kind, self.version, updated, removed_paths)
+
+
+class IncrementalWalker(DirectoryWalker):
+    """
+    基于扫描索引快照的增量目录遍历类
+
+    修改时间未变化的目录不调用os.scandir，直接返回快照中的文件和子目录；
+    目录的修改时间只反映直接子项的增删，因此子目录仍会逐个检查。
+    在原位置被覆盖写入的文件不会改变目录的修改时间，如需检测，
+    可启用verify_files，对未变化目录中的文件逐个stat；
+    或者通过verify_paths只检查已知发生变化的文件（例如文件夹监视器报告的路径）。
+    快照保存的是未经扫描规则筛选的列举结果，规则变化后无需重建索引。
+    """
+
+    def __init__(self, snapshot, max_workers=8, verify_files=False, rules=None, verify_paths=None):
+        """
+        初始化增量遍历器
+
+        Args:
+            snapshot (ScanSnapshot): 上次扫描的索引快照
+            max_workers (int, optional): 同时列举目录的最大线程数
+            verify_files (bool, optional): 是否对未变化目录中的文件逐个stat
+            rules (ScanRules, optional): 扫描规则
+            verify_paths (iterable, optional): 未变化目录中也要stat的文件路径；目录路径表示其中的所有文件
+        """
+        super().__init__(max_workers, rules)
+        self.snapshot = snapshot
+        self.verify_files = verify_files
+        self.verify_paths = set(verify_paths or ())
+
+        self._lock = threading.Lock()
+        self.visited_directories = set()
+        self.listed_directories = {}
+        # 需要写回索引的目录中的全部文件（含被规则排除的文件）{目录路径: [IndexedEntry, ...]}
+        self.listed_entries = {}
+        self.added = []
+        self.modified = []
+        self.removed = []
+
+    def _list_directory(self, directory):
+        """
+        列举单个目录，优先使用快照
+
+        Args:
+            directory (str): 目录路径
+
+        Returns:
+            tuple: (目录路径, 需要进入的子目录路径列表, IndexedEntry列表)
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return directory, [], []
+
+        with self._lock:
+            self.visited_directories.add(directory)
+
+        cached_directory = self.snapshot.directories.get(directory)
+        cached_files = self.snapshot.files.get(directory, {})
+
+        if cached_directory is not None and cached_directory.mtime_ns == mtime_ns:
+            return directory, cached_directory.subdirectories, self._reuse_directory(directory, cached_files)
+
+        # 目录已变化或首次扫描，重新列举
+        _, subdirectories, dir_entries = super()._list_directory(directory)
+
+        entries = []
+        added = []
+        modified = []
+        for dir_entry in dir_entries:
+            try:
+                stat_result = dir_entry.stat()
+            except OSError:
+                continue
+
+            cached = cached_files.get(dir_entry.name)
+            if cached is not None and cached.size == stat_result.st_size and cached.mtime_ns == stat_result.st_mtime_ns:
+                entries.append(IndexedEntry(dir_entry.name, dir_entry.path, cached.size, cached.mtime_ns,
+                                            cached.asset_type or None, cached.base_name or None))
+            else:
+                entries.append(IndexedEntry(dir_entry.name, dir_entry.path, stat_result.st_size,
+                                            stat_result.st_mtime_ns, None, None))
+                (added if cached is None else modified).append(dir_entry.path)
+
+        listed_names = {dir_entry.name for dir_entry in dir_entries}
+        removed = [os.path.join(directory, name) for name in cached_files if name not in listed_names]
+
+        with self._lock:
+            self.listed_directories[directory] = DirectoryRecord(mtime_ns, subdirectories)
+            self.listed_entries[directory] = entries
+            self.added.extend(added)
+            self.modified.extend(modified)
+            self.removed.extend(removed)
+
+        return directory, subdirectories, entries
+
+    def _reuse_directory(self, directory, cached_files):
+        """
+        复用快照中未变化目录的文件
+
+        Args:
+            directory (str): 目录路径
+            cached_files (dict): {文件名: FileRecord}
+
+        Returns:
+            list: IndexedEntry列表
+        """
+        entries = []
+        modified = []
+        removed = []
+        verify_directory = self.verify_files or directory in self.verify_paths
+
+        for name, cached in cached_files.items():
+            path = os.path.join(directory, name)
+
+            if verify_directory or path in self.verify_paths:
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    # 目录的修改时间未变化但文件已不存在（例如修改时间精度不足），按删除处理
+                    removed.append(path)
+                    continue
+                if stat_result.st_size != cached.size or stat_result.st_mtime_ns != cached.mtime_ns:
+                    entries.append(IndexedEntry(name, path, stat_result.st_size, stat_result.st_mtime_ns,
+                                                None, None))
+                    modified.append(path)
+                    continue
+
+            entries.append(IndexedEntry(name, path, cached.size, cached.mtime_ns,
+                                        cached.asset_type or None, cached.base_name or None))
+
+        if modified or removed:
+            # 有文件被修改或删除时整个目录重新写入索引
+            with self._lock:
+                self.listed_directories[directory] = self.snapshot.directories[directory]
+                self.listed_entries[directory] = entries
+                self.modified.extend(modified)
+                self.removed.extend(removed)
+
+        return entries
+
+    def removed_directories(self):
+        """
+        获取快照中存在但本次未访问到的目录
+
+        Returns:
+            list: 已删除的目录路径列表
+        """
+        return [directory for directory in self.snapshot.directories if directory not in self.visited_directories]
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描规则模块
+用于按gitignore风格的规则筛选扫描到的目录和文件
+
+此模块支持配置中的包含/排除模式，以及放在各个文件夹中的忽略文件（默认为.assetignore）。
+规则语法与.gitignore一致：
+- 不含"/"的模式匹配任意层级的名称，例如"*.psd"、"Backup"
+- 含"/"的模式相对于规则所在的目录（配置中的规则相对于扫描根目录），例如"Textures/Source/*.tga"
+- 以"/"结尾的模式只匹配目录，例如"RenderCache/"
+- "*"不跨越目录，"**"可以匹配任意层级，"?"匹配单个字符，"[...]"匹配字符集合
+- 以"!"开头的模式重新包含之前被排除的路径；以"#"开头的行是注释
+后出现的规则优先，子文件夹中忽略文件的规则排在上级规则之后。
+被排除的目录在遍历时直接剪枝，不会被列举。此模块不依赖unreal，可以在编辑器之外使用。
+"""
+
+import os
+import re
+
+# 默认的忽略文件名
+DEFAULT_IGNORE_FILE = ".assetignore"
+
+# 文件系统不区分大小写时（Windows），模式也不区分大小写
+_REGEX_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _normalize_path(path):
+    """
+    统一使用"/"作为路径分隔符
+
+    Args:
+        path (str): 路径
+
+    Returns:
+        str: 规范化的路径
+    """
+    return path.replace("\\", "/").rstrip("/")
+
+
+def _translate_glob(pattern):
+    """
+    把glob模式转换为正则表达式
+
+    Args:
+        pattern (str): 去掉前后"/"的glob模式
+
+    Returns:
+        str: 正则表达式
+    """
+    parts = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                parts.append("[" + content.replace("\\", "\\\\") + "]")
+                i = end + 1
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+class ScanRule:
+    """单条扫描规则"""
+
+    __slots__ = ("base", "pattern", "negate", "directory_only", "regex")
+
+    def __init__(self, pattern, base=""):
+        """
+        初始化扫描规则
+
+        Args:
+            pattern (str): gitignore风格的模式
+            base (str, optional): 规则所在的目录（"/"分隔），含"/"的模式相对于此目录
+        """
+        self.base = base
+        self.pattern = pattern
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        self.directory_only = pattern.endswith("/")
+        anchored = "/" in pattern.rstrip("/")
+        pattern = pattern.strip("/")
+
+        # 不含"/"的模式匹配任意层级的名称
+        if anchored:
+            expression = _translate_glob(pattern)
+        else:
+            expression = "(?:.*/)?" + _translate_glob(pattern)
+        self.regex = re.compile(expression + r"\Z", _REGEX_FLAGS)
+
+    def matches(self, path, is_directory):
+        """
+        判断路径是否匹配此规则
+
+        Args:
+            path (str): "/"分隔的完整路径
+            is_directory (bool): 路径是否为目录
+
+        Returns:
+            bool: 是否匹配
+        """
+        if self.directory_only and not is_directory:
+            return False
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return False
+            path = path[len(self.base) + 1:]
+        return self.regex.match(path) is not None
+
+
+def parse_rules(lines, base=""):
+    """
+    解析规则文本
+
+    Args:
+        lines (iterable): 规则行
+        base (str, optional): 规则所在的目录
+
+    Returns:
+        list: ScanRule列表
+    """
+    rules = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        rules.append(ScanRule(line, base))
+    return rules
+
+
+class ScanRules:
+    """
+    某个目录生效的扫描规则
+
+    每个目录持有从扫描根目录到自身累积的排除规则；子目录中存在忽略文件时，
+    通过for_subdirectory派生出追加了该文件规则的新对象，没有忽略文件的目录共享上级对象。
+    """
+
+    def __init__(self, exclude=(), include=(), ignore_file=DEFAULT_IGNORE_FILE):
+        """
+        初始化扫描规则
+
+        Args:
+            exclude (list, optional): 排除模式，相对于扫描根目录
+            include (list, optional): 包含模式，非空时只保留至少匹配其中一个的文件（不影响目录）
+            ignore_file (str, optional): 各文件夹中忽略文件的名称，为空时不读取忽略文件
+        """
+        self.exclude_patterns = list(exclude or [])
+        self.include_patterns = list(include or [])
+        self.ignore_file = ignore_file or ""
+        self.rules = []
+        self.include_rules = []
+
+    @classmethod
+    def from_config(cls, scan_config):
+        """
+        根据folder_scan配置创建扫描规则
+
+        Args:
+            scan_config (dict): folder_scan配置
+
+        Returns:
+            ScanRules: 扫描规则
+        """
+        return cls(
+            scan_config.get("exclude", []),
+            scan_config.get("include", []),
+            scan_config.get("ignore_file", DEFAULT_IGNORE_FILE)
+        )
+
+    def for_root(self, root_path):
+        """
+        创建扫描根目录使用的规则
+
+        Args:
+            root_path (str): 扫描根目录
+
+        Returns:
+            ScanRules: 规则相对于根目录的副本
+        """
+        base = _normalize_path(root_path)
+        rules = self._copy()
+        rules.rules = parse_rules(self.exclude_patterns, base)
+        rules.include_rules = parse_rules(self.include_patterns, base)
+        return rules
+
+    def for_subdirectory(self, directory, files):
+        """
+        获取目录内生效的规则，目录中存在忽略文件时追加其中的规则
+
+        Args:
+            directory (str): 目录路径
+            files (list): 目录中的文件条目（os.DirEntry或带name、path属性的对象）
+
+        Returns:
+            ScanRules: 目录内生效的规则
+        """
+        if not self.ignore_file:
+            return self
+
+        for entry in files:
+            if entry.name == self.ignore_file:
+                try:
+                    with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                        extra_rules = parse_rules(f, _normalize_path(directory))
+                except OSError:
+                    return self
+                if not extra_rules:
+                    return self
+                rules = self._copy()
+                rules.rules = self.rules + extra_rules
+                return rules
+        return self
+
+    def excludes_directory(self, path):
+        """
+        判断目录是否应被剪枝
+
+        Args:
+            path (str): 目录路径
+
+        Returns:
+            bool: 是否排除
+        """
+        return self._is_excluded(_normalize_path(path), True)
+
+    def includes_file(self, path, name=None):
+        """
+        判断文件是否应保留
+
+        Args:
+            path (str): 文件路径
+            name (str, optional): 文件名，用于识别忽略文件
+
+        Returns:
+            bool: 是否保留
+        """
+        if self.ignore_file and (name or os.path.basename(path)) == self.ignore_file:
+            return False
+
+        path = _normalize_path(path)
+        if self.include_rules and not any(rule.matches(path, False) for rule in self.include_rules):
+            return False
+        return not self._is_excluded(path, False)
+
+    def filter(self, directory, subdirectories, files):
+        """
+        筛选单个目录的列举结果
+
+        Args:
+            directory (str): 目录路径
+            subdirectories (list): 子目录路径列表
+            files (list): 文件条目列表
+
+        Returns:
+            tuple: (目录内生效的规则, 保留的子目录路径列表, 保留的文件条目列表)
+        """
+        rules = self.for_subdirectory(directory, files)
+
+        subdirectories = [subdirectory for subdirectory in subdirectories if not rules.excludes_directory(subdirectory)]
+        files = [entry for entry in files if rules.includes_file(entry.path, entry.name)]
+        return rules, subdirectories, files
+
+    def _is_excluded(self, path, is_directory):
+        """
+        按规则顺序判断路径是否被排除，后出现的规则优先
+
+        Args:
+            path (str): "/"分隔的路径
+            is_directory (bool): 路径是否为目录
+
+        Returns:
+            bool: 是否排除
+        """
+        for rule in reversed(self.rules):
+            if rule.matches(path, is_directory):
+                return not rule.negate
+        return False
+
+    def _copy(self):
+        """
+        复制规则对象
+
+        Returns:
+            ScanRules: 副本
+        """
+        rules = ScanRules(self.exclude_patterns, self.include_patterns, self.ignore_file)
+        rules.rules = self.rules
+        rules.include_rules = self.include_rules
+        return rules
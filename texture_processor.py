@@ -5,11 +5,19 @@
 用于处理纹理导入和设置
 
 此模块提供了导入纹理、设置纹理属性和组织纹理的功能。
+UDIM纹理集（TextureSet）只导入一次，生成一个虚拟纹理。
+来自zip压缩包的纹理在导入前才解压到本地缓存。
+导入管道按纹理类型和设置从pipeline_cache获取，不再为每个纹理复制和删除管道。
 """
 
 import os
 import unreal
 
+from asset_catalog import TextureSet
+from archive_source import get_archive_cache
+from config_manager import get_cache_dir
+from pipeline_cache import PipelineSettings, get_pipeline_cache
+
 class TextureProcessor:
     """纹理处理类，用于导入和处理纹理"""
 
@@ -33,6 +41,12 @@ class TextureProcessor:
         self.texture_special_folders = self.config.get("texture_special_folders", {})
         self.use_special_folders = self.texture_special_folders.get("enabled", False)
 
+        # 压缩包成员的解压缓存
+        self.archive_cache = get_archive_cache(get_cache_dir(self.config, "ArchiveCache"))
+
+        # 按设置复用的Interchange导入管道
+        self.pipeline_cache = get_pipeline_cache(self.config)
+
     def import_texture(self, texture_file, target_path):
         """
         导入纹理文件
@@ -44,25 +58,14 @@ class TextureProcessor:
         Returns:
             object: 导入的纹理对象
         """
-        # 创建临时管道路径
-        transient_path = "/Interchange/Pipelines/Transient/"
-        transient_pipeline_path = transient_path + "CustomTexturePipeline"
-
-        # 删除可能存在的临时管道
-        self.editor_asset_subsystem.delete_directory(transient_path)
-
-        # 复制默认纹理管道
-        pipeline = self.editor_asset_subsystem.duplicate_asset(
-            "/Interchange/Pipelines/DefaultTexturePipeline",
-            transient_pipeline_path
-        )
-
-        # 根据纹理类型配置管道
+        # 根据纹理类型记录管道设置，类型和设置相同的纹理共用同一个管道（见pipeline_cache）
+        settings = PipelineSettings()
         texture_type = self._get_texture_type(texture_file)
-        self._configure_texture_pipeline(pipeline, texture_type)
+        is_texture_set = isinstance(texture_file, TextureSet)
+        self._configure_texture_pipeline(settings, texture_type, import_udims=is_texture_set)
 
-        # 创建源数据
-        source_data = unreal.InterchangeManager.create_source_data(texture_file.file_path)
+        # 创建源数据（压缩包中的纹理先解压到本地缓存）
+        source_data = unreal.InterchangeManager.create_source_data(self.archive_cache.local_path(texture_file))
 
         # 创建导入参数
         import_asset_parameters = unreal.ImportAssetParameters()
@@ -70,19 +73,16 @@ class TextureProcessor:
 
         # 添加配置的管道
         import_asset_parameters.override_pipelines.append(
-            unreal.SoftObjectPath(transient_pipeline_path + ".CustomTexturePipeline")
+            unreal.SoftObjectPath(self.pipeline_cache.get("/Interchange/Pipelines/DefaultTexturePipeline", settings))
         )
 
         # 获取Interchange管理器并导入资产
         interchange_manager = unreal.InterchangeManager.get_interchange_manager_scripted()
         result = interchange_manager.import_asset(target_path, source_data, import_asset_parameters)
 
-        # 清理临时管道
-        self.editor_asset_subsystem.delete_directory(transient_path)
-
-        # 如果导入成功，设置纹理属性
-        if result and self.config.get("compress_textures", True):
-            self._set_texture_properties(result, texture_type)
+        # 如果导入成功，设置纹理属性；UDIM纹理集始终需要开启虚拟纹理
+        if result and (self.config.get("compress_textures", True) or is_texture_set):
+            self._set_texture_properties(result, texture_type, virtual_texture=is_texture_set)
 
         return result
 
@@ -136,13 +136,14 @@ class TextureProcessor:
         # 如果没有匹配的模式，返回False
         return False, None, None
 
-    def _configure_texture_pipeline(self, pipeline, texture_type):
+    def _configure_texture_pipeline(self, pipeline, texture_type, import_udims=False):
         """
         配置纹理导入管道
 
         Args:
-            pipeline: 要配置的管道对象
+            pipeline (PipelineSettings): 记录管道设置的对象
             texture_type (str): 纹理类型
+            import_udims (bool, optional): 是否把同名的UDIM贴图一起导入为一个纹理
         """
         # 获取纹理类型的设置
         settings = self.texture_settings.get(texture_type, {})
@@ -173,13 +174,19 @@ class TextureProcessor:
             unreal.log_warning(f"无效的纹理组: {texture_group}")
             pipeline.texture_pipeline.texture_group = unreal.TextureGroup.WORLD
 
-    def _set_texture_properties(self, texture_asset, texture_type):
+        # UDIM纹理集：导入编号最小的贴图时由Interchange收集其余贴图；
+        # 引擎版本不支持此设置时由PipelineSettings.apply记录警告并使用默认行为
+        if import_udims:
+            pipeline.texture_pipeline.set_editor_property("import_udims", True)
+
+    def _set_texture_properties(self, texture_asset, texture_type, virtual_texture=False):
         """
         设置纹理属性
 
         Args:
             texture_asset: 导入的纹理资产
             texture_type (str): 纹理类型
+            virtual_texture (bool, optional): 是否开启虚拟纹理流送（UDIM纹理集）
         """
         # 获取纹理对象
         texture_object = unreal.AssetRegistryHelpers.get_asset(texture_asset)
@@ -218,6 +225,10 @@ class TextureProcessor:
         except AttributeError:
             unreal.log_warning(f"无效的纹理组: {texture_group}")
 
+        # UDIM纹理只能以虚拟纹理的形式使用
+        if virtual_texture:
+            texture_object.set_editor_property("virtual_texture_streaming", True)
+
         # 保存纹理
         unreal.EditorAssetLibrary.save_loaded_asset(texture_object)
 
@@ -230,7 +241,7 @@ class TextureProcessor:
             target_path (str): 基础目标路径
 
         Returns:
-            dict: 导入的纹理映射 {纹理文件路径: 导入的纹理资产}
+            dict: 导入的纹理映射 {纹理键(ID或文件路径): 导入的纹理资产}
         """
         imported_textures = {}
 
@@ -284,6 +295,8 @@ class TextureProcessor:
 
                 # 记录导入的纹理
                 if imported_texture:
-                    imported_textures[texture_file.file_path] = imported_texture
+                    imported_textures[texture_file.key] = imported_texture
+                    if isinstance(texture_file, TextureSet):
+                        unreal.log(f"已将 {len(texture_file.tiles)} 块UDIM贴图导入为一个虚拟纹理: {texture_file.file_name}")
 
         return imported_textures
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+监视导入模块
+用于监视源文件夹，只导入新增或修改的文件
+
+此模块在后台线程中运行：FolderWatcher合并连续的文件变化后，使用扫描索引增量扫描文件夹，
+确认变化的文件已停止增长，再让包含这些文件的AssetFile依次经过纹理、模型、材质和组织阶段。
+已导入的资产在多轮之间保留，未变化的模型可以继续关联新导入的纹理。
+"""
+
+import os
+import threading
+
+import unreal
+
+from folder_scanner import FolderScanner
+from folder_watcher import FolderWatcher, wait_for_stable_files
+from archive_source import is_archive
+from asset_processor import AssetProcessor
+from texture_processor import TextureProcessor
+from material_creator import MaterialCreator
+from asset_organizer import AssetOrganizer
+
+
+class WatchImporter:
+    """监视导入类，在后台线程中持续导入源文件夹中的变化"""
+
+    def __init__(self, source_folder, config, log=None):
+        """
+        初始化监视导入器
+
+        Args:
+            source_folder (str): 监视的源文件夹
+            config (dict): 配置字典
+            log (callable, optional): 日志输出函数，默认为unreal.log
+        """
+        self.source_folder = source_folder
+        self.config = dict(config)
+        self.log = log or unreal.log
+
+        # 监视模式依赖扫描索引计算变化
+        self.config["folder_scan"] = dict(self.config.get("folder_scan", {}), use_index=True)
+
+        watch_config = self.config.get("watch_folder", {})
+        self.debounce_seconds = watch_config.get("debounce_seconds", 2.0)
+        self.stable_seconds = watch_config.get("stable_seconds", 1.0)
+        self.poll_interval = watch_config.get("poll_interval", 2.0)
+        self.use_inotify = watch_config.get("use_inotify", True)
+
+        self.folder_scanner = FolderScanner(self.config)
+        self.asset_processor = AssetProcessor(self.config)
+        self.texture_processor = TextureProcessor(self.config) if self.config.get("process_textures", True) else None
+        self.material_creator = MaterialCreator(self.config) if self.config.get("create_materials", True) else None
+        self.asset_organizer = AssetOrganizer(self.config) if self.config.get("organize_folders", True) else None
+
+        # 多轮之间保留的导入结果
+        self.imported_assets = {}
+        self.imported_textures = {}
+
+        # 上一轮仍在写入、等待下一轮导入的文件
+        self.pending_paths = set()
+
+        self.stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        """bool: 监视线程是否正在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        在后台线程中开始监视
+
+        Returns:
+            bool: 是否成功开始
+        """
+        if self.is_running:
+            return False
+        if is_archive(self.source_folder) or not os.path.isdir(self.source_folder):
+            self.log(f"无法监视: {self.source_folder} 不是文件夹")
+            return False
+
+        self.stop_event.clear()
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """请求停止监视，当前正在进行的导入完成后线程退出"""
+        self.stop_event.set()
+
+    def run(self):
+        """监视循环，启动时先导入自上次扫描以来的变化"""
+        root_rules = self.folder_scanner.scan_rules.for_root(self.source_folder)
+        watcher = FolderWatcher(
+            self.source_folder,
+            self.debounce_seconds,
+            self.poll_interval,
+            self.use_inotify,
+            exclude_directory=root_rules.excludes_directory
+        )
+        self.log(f"开始监视文件夹: {self.source_folder}（{watcher.backend_name}）")
+
+        try:
+            # 编辑器关闭期间在原位置被覆盖写入的文件不会改变目录的修改时间，启动时检查所有文件
+            self.import_changes([self.source_folder])
+            while not self.stop_event.is_set():
+                # 有仍在写入的文件时定时重新检查，即使没有新的事件
+                timeout = self.debounce_seconds + self.stable_seconds if self.pending_paths else None
+                changed = watcher.wait_for_changes(self.stop_event, timeout)
+                if self.stop_event.is_set():
+                    break
+                if changed or self.pending_paths:
+                    self.import_changes(changed)
+        except Exception as e:
+            self.log(f"监视过程中出错: {str(e)}")
+            import traceback
+            self.log(traceback.format_exc())
+        finally:
+            watcher.close()
+            self.asset_processor.stop_maya_conversion()
+            self.log("已停止监视文件夹")
+
+    def import_changes(self, changed_paths=None):
+        """
+        增量扫描并导入新增或修改的文件
+
+        Args:
+            changed_paths (iterable, optional): 监视器报告的变化路径，所在目录未变化时也与扫描索引比较，
+                在原位置被覆盖写入的文件因此也会重新导入
+
+        Returns:
+            int: 本轮导入的资产文件数量
+        """
+        assets = self.folder_scanner.scan_folder(self.source_folder, changed_paths)
+        changes = self.folder_scanner.last_scan_changes or {}
+
+        if changes.get("removed"):
+            self.log(f"{len(changes['removed'])} 个文件已删除，已导入的资产保持不变")
+
+        candidates = set(changes.get("added", [])) | set(changes.get("modified", [])) | self.pending_paths
+        if not candidates:
+            return 0
+
+        stable, growing = wait_for_stable_files(candidates, self.stable_seconds, self.stop_event)
+        stable = set(stable)
+        self.pending_paths = set(growing)
+
+        # UDIM纹理集和LOD链只在所有组成文件都写入完成后导入
+        changed_files = []
+        for asset_file in self._iter_assets(assets):
+            source_paths = asset_file.source_paths()
+            if not any(path in stable or path in self.pending_paths for path in source_paths):
+                continue
+            if any(path in self.pending_paths for path in source_paths):
+                self.pending_paths.update(path for path in source_paths if path in candidates)
+                continue
+            changed_files.append(asset_file)
+
+        # FBX嵌入的纹理不在源文件夹中，随FBX一起导入；相同内容已导入过时不再导入
+        changed_files.extend(
+            texture_file for texture_file in self.folder_scanner.embedded_textures_for(changed_files)
+            if texture_file.key not in self.imported_textures
+        )
+
+        if self.pending_paths:
+            self.log(f"{len(self.pending_paths)} 个文件仍在写入，稍后导入")
+        if not changed_files:
+            return 0
+
+        self.log(f"检测到 {len(changed_files)} 个新增或修改的资产文件")
+        self._import_assets(self.folder_scanner.create_assets_dict(changed_files))
+        return len(changed_files)
+
+    def _import_assets(self, changed):
+        """
+        让变化的资产依次经过纹理、模型、材质和组织阶段
+
+        Args:
+            changed (dict): 只包含变化资产的按类型分组的资产字典
+        """
+        target_path = self.config["target_path"]
+
+        # MA文件由mayapy在后台转换为FBX，与导入纹理同时进行
+        self.asset_processor.start_maya_conversion(changed["ma"])
+
+        # 1. 导入纹理
+        imported_textures = {}
+        if self.texture_processor and any(changed["textures"].values()):
+            imported_textures = self.texture_processor.organize_textures(changed["textures"], target_path)
+            self.imported_textures.update(imported_textures)
+            self.log(f"已导入 {len(imported_textures)} 个纹理")
+
+        # 2. 导入FBX和MA文件
+        imported_assets = {}
+        for asset_file in changed["fbx"]:
+            imported_asset = self.asset_processor.import_asset(asset_file, target_path)
+            if asset_file.key in self.asset_processor.mapped_meshes:
+                self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+            elif imported_asset:
+                imported_assets[asset_file.key] = imported_asset
+                self.log(f"已导入: {asset_file.file_name}")
+            else:
+                self.log(f"导入失败: {asset_file.file_name}")
+
+        for asset_file in changed["ma"]:
+            imported_asset = self.asset_processor.import_maya_file(asset_file, target_path)
+            if asset_file.key in self.asset_processor.mapped_meshes:
+                self.log(f"几何体与已导入的网格相同，使用已有的网格: {asset_file.file_name} -> {imported_asset}")
+            elif imported_asset:
+                imported_assets[asset_file.key] = imported_asset
+                self.log(f"已导入: {asset_file.file_name}")
+            else:
+                self.log(f"导入失败: {asset_file.file_name}")
+        self.imported_assets.update(imported_assets)
+
+        # 3. 为变化的模型，以及纹理发生变化的已导入模型创建材质
+        created_materials = {}
+        if self.material_creator:
+            meshes = {asset_file.key: asset_file for asset_file in changed["fbx"] + changed["ma"]}
+            for textures in changed["textures"].values():
+                for texture_file in textures:
+                    related_meshes = (self.folder_scanner.relationships.meshes_for(texture_file)
+                                      + self.folder_scanner.texture_links.meshes_for(texture_file))
+                    for mesh_file in related_meshes:
+                        if mesh_file.key in self.imported_assets:
+                            meshes.setdefault(mesh_file.key, mesh_file)
+
+            if meshes:
+                created_materials = self.material_creator.create_materials_for_assets(
+                    {"fbx": list(meshes.values())}, self.imported_assets, self.imported_textures, target_path,
+                    self.folder_scanner.texture_links
+                )
+                self.log(f"已创建 {len(created_materials)} 个材质实例")
+
+        # 4. 组织本轮导入的资产
+        if self.asset_organizer and imported_assets:
+            self.asset_organizer.organize_imported_assets(
+                changed, imported_assets, imported_textures, created_materials, target_path
+            )
+
+    def _iter_assets(self, assets):
+        """
+        遍历资产字典中的所有资产文件
+
+        Args:
+            assets (dict): 按类型分组的资产字典
+
+        Yields:
+            AssetFile: 资产文件对象
+        """
+        yield from assets.get("fbx", [])
+        yield from assets.get("ma", [])
+        for textures in assets.get("textures", {}).values():
+            yield from textures